@@ -0,0 +1,217 @@
+# ai/audio_io.py
+
+"""
+Microphone stream settings and a file-backed virtual audio device.
+
+STT opens the microphone with the settings `mic-test.py --benchmark --save`
+recommends (STT_AUDIO_SETTINGS, default audio_settings.json): device,
+blocksize and latency. Without the file, sounddevice defaults are used.
+
+A device named "file:<path.wav>" is virtual: 16-bit mono WAV audio is
+delivered from a thread in real time, with sounddevice's callback signature,
+timing info and overflow flag. STT and the benchmark run headless on it (CI,
+servers without a sound card). Opened as a duplex stream, whatever is written
+to the output comes back on the input one round trip later (speaker → mic).
+"""
+
+import json
+import threading
+import time
+import wave
+from array import array
+from collections import namedtuple
+
+from .env import getenv
+
+DEFAULT_SETTINGS_PATH = "audio_settings.json"
+# Keys passed to the input stream; the rest of the settings file is the benchmark's evidence
+STREAM_KEYS = ("device", "blocksize", "latency")
+FILE_DEVICE_PREFIX = "file:"
+
+# Virtual device: block length when the stream leaves it to the device (blocksize=0),
+# buffering per direction for latency="low"/"high" (seconds, PortAudio-like), and
+# how many blocks it holds for a late callback before input is lost
+VIRTUAL_BLOCK_SECONDS = 0.02
+VIRTUAL_LATENCY = {"low": 0.01, "high": 0.1}
+VIRTUAL_BUFFER_BLOCKS = 4
+
+StreamTime = namedtuple("StreamTime", ["inputBufferAdcTime", "outputBufferDacTime", "currentTime"])
+
+
+class StreamStatus:
+    """Stands in for sounddevice.CallbackFlags."""
+
+    __slots__ = ("input_overflow",)
+
+    def __init__(self, input_overflow: bool = False):
+        self.input_overflow = input_overflow
+
+    def __bool__(self):
+        return self.input_overflow
+
+    def __str__(self):
+        return "input overflow" if self.input_overflow else ""
+
+
+def load_stream_settings(path: str = None, logger=None) -> dict:
+    """
+    Input stream keyword arguments from the settings file.
+
+    Returns:
+        dict: device / blocksize / latency that are set; {} when there is no file
+    """
+    path = path or getenv("STT_AUDIO_SETTINGS", DEFAULT_SETTINGS_PATH)
+    try:
+        with open(path, encoding="utf-8") as f:
+            settings = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        if logger:
+            logger.error(f"Audio - ignoring unreadable stream settings {path}: {e}")
+        return {}
+    stream = {key: settings[key] for key in STREAM_KEYS if settings.get(key) is not None}
+    if logger:
+        logger.info(f"Audio - input stream settings from {path}: {stream}")
+    return stream
+
+
+def is_file_device(device) -> bool:
+    return isinstance(device, str) and device.startswith(FILE_DEVICE_PREFIX)
+
+
+def open_input_stream(device=None, **kwargs):
+    """sounddevice.InputStream, or a FileStream for a "file:" device."""
+    if is_file_device(device):
+        return FileStream(device[len(FILE_DEVICE_PREFIX):], **kwargs)
+    from .stt import load_sounddevice
+    return load_sounddevice().InputStream(device=device, **kwargs)
+
+
+def read_wav(path: str, samplerate: int) -> bytes:
+    """16-bit mono PCM frames of a WAV file recorded at samplerate."""
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2 or f.getnchannels() != 1:
+            raise ValueError(f"{path}: virtual devices need 16-bit mono WAV")
+        if f.getframerate() != samplerate:
+            raise ValueError(f"{path}: recorded at {f.getframerate()} Hz, stream wants {samplerate} Hz")
+        return f.readframes(f.getnframes())
+
+
+class FileStream:
+    """
+    Virtual device with the sounddevice stream interface (start/stop/close,
+    callback from its own thread). Input loops over the WAV file.
+
+    Block n covers input frames [n * blocksize, (n + 1) * blocksize). Its
+    callback is due latency seconds after the block's last sample was
+    "captured"; when the callback thread falls more than
+    VIRTUAL_BUFFER_BLOCKS blocks behind, the oldest blocks are dropped and the
+    next callback reports input_overflow. With duplex=True the callback is
+    (indata, outdata, frames, time, status) and output block n is heard on the
+    input from frame (n + 1) * blocksize + 2 * latency * samplerate.
+    """
+
+    def __init__(self, path: str, samplerate: int = 16000, channels: int = 1, dtype: str = "int16",
+                 callback=None, blocksize: int = 0, latency=None, duplex: bool = False,
+                 clock=time.perf_counter, **kwargs):
+        if channels != 1 or dtype != "int16":
+            raise ValueError("virtual devices are int16 mono")
+        self.path = path
+        self.samplerate = samplerate
+        self.callback = callback
+        self.blocksize = blocksize or int(samplerate * VIRTUAL_BLOCK_SECONDS)
+        if latency is None:
+            latency = "high"    # sounddevice's default
+        self.latency = VIRTUAL_LATENCY[latency] if isinstance(latency, str) else float(latency)
+        self.duplex = duplex
+        self.clock = clock
+        self.data = read_wav(path, samplerate)
+        if not self.data:
+            raise ValueError(f"{path}: no audio")
+        self.dropped_blocks = 0
+        self._loopback = array("h")     # output heard on the input, from frame _loopback_start
+        self._loopback_start = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"file-device:{self.path}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self):
+        self.stop()
+
+    @property
+    def time(self) -> float:
+        return self.clock()
+
+    def _input_block(self, block: int) -> memoryview:
+        size = self.blocksize * 2
+        start = block * size % len(self.data)
+        raw = self.data[start:start + size]
+        while len(raw) < size:
+            raw += self.data[:size - len(raw)]
+        if not self.duplex:
+            return memoryview(raw)
+
+        samples = array("h")
+        samples.frombytes(raw)
+        first = block * self.blocksize - self._loopback_start
+        for i in range(max(0, first), min(len(self._loopback), first + self.blocksize)):
+            samples[i - first] = max(-32768, min(32767, samples[i - first] + self._loopback[i]))
+        # Loopback audio before this block has been heard
+        if first > 0:
+            del self._loopback[:first]
+            self._loopback_start += first
+        return memoryview(samples.tobytes())
+
+    def _play(self, block: int, outdata: bytearray):
+        played = array("h")
+        played.frombytes(bytes(outdata))
+        delay = round(2 * self.latency * self.samplerate)
+        offset = (block + 1) * self.blocksize + delay - self._loopback_start
+        if len(self._loopback) < offset + len(played):
+            self._loopback.extend([0] * (offset + len(played) - len(self._loopback)))
+        for i, sample in enumerate(played):
+            self._loopback[offset + i] += sample
+
+    def _run(self):
+        block_seconds = self.blocksize / self.samplerate
+        started = self.clock()
+        block = 0
+        while True:
+            adc = started + block * block_seconds
+            due = adc + block_seconds + self.latency
+            wait = due - self.clock()
+            if wait > 0 and self._stop.wait(wait):
+                return
+            if self._stop.is_set():
+                return
+
+            now = self.clock()
+            overflow = False
+            behind = int((now - due) / block_seconds)
+            if behind >= VIRTUAL_BUFFER_BLOCKS:
+                skipped = behind - VIRTUAL_BUFFER_BLOCKS + 1
+                block += skipped
+                self.dropped_blocks += skipped
+                adc = started + block * block_seconds
+                overflow = True
+
+            indata = self._input_block(block)
+            timing = StreamTime(adc, now + self.latency if self.duplex else 0.0, now)
+            status = StreamStatus(input_overflow=overflow)
+            if self.duplex:
+                outdata = bytearray(self.blocksize * 2)
+                self.callback(indata, outdata, self.blocksize, timing, status)
+                self._play(block, outdata)
+            else:
+                self.callback(indata, self.blocksize, timing, status)
+            block += 1
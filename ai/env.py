@@ -0,0 +1,19 @@
+# ai/env.py
+
+"""
+Environment variable access. python-dotenv is only imported (and .env only
+read) the first time a value is needed, keeping it off the import path.
+"""
+
+import os
+
+_env_loaded = False
+
+
+def getenv(name: str, default: str = None) -> str:
+    global _env_loaded
+    if not _env_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _env_loaded = True
+    return os.getenv(name, default)
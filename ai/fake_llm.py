@@ -0,0 +1,119 @@
+# ai/fake_llm.py
+
+"""
+Local fake LLM backend with injectable latency and failures.
+Drop-in for the Gemini backend in tests, load runs and CI:
+
+    llm = LLM(logger=logger, backend=FakeLLMBackend(latency=0.8, responses={"...": "yes"}))
+"""
+
+import asyncio
+import random
+import re
+
+
+class FakeUsage:
+    def __init__(self, prompt_token_count: int, candidates_token_count: int, cached_content_token_count: int = 0):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+        self.cached_content_token_count = cached_content_token_count
+
+
+class FakeResponse:
+    def __init__(self, text: str, usage_metadata: FakeUsage = None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeLLMBackend:
+    """
+    Args:
+        responses: Map of substring → reply; first substring found in the prompt wins
+        default_response: Reply when no substring matches
+        responder: Optional callable(prompt) -> str, overrides responses
+        latency: Base latency in seconds for every call (time to the first word)
+        token_latency: Time to generate each further word of the reply; generate()
+            returns after all of them, generate_stream() yields each as it is ready
+        jitter: Extra uniform random latency (0..jitter) per call
+        error_rate: Probability (0..1) that a call raises
+        latency_fn: Optional callable(call_number) -> seconds, overrides latency/jitter
+        seed: Random seed for reproducible jitter/errors
+    """
+
+    def __init__(
+        self,
+        responses: dict = None,
+        default_response: str = "others",
+        responder=None,
+        latency: float = 0.0,
+        token_latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        latency_fn=None,
+        seed: int = None,
+    ):
+        self.responses = responses or {}
+        self.default_response = default_response
+        self.responder = responder
+        self.latency = latency
+        self.token_latency = token_latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.latency_fn = latency_fn
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.prompts = []
+
+    async def generate(self, prompt: str, temperature: float, system_instruction: str = None, cached_content: str = None):
+        response = await self._first_word(prompt, system_instruction)
+        if self.token_latency:
+            await asyncio.sleep(self.token_latency * max(0, len(response.text.split()) - 1))
+        return response
+
+    async def generate_stream(self, prompt: str, temperature: float, system_instruction: str = None,
+                              cached_content: str = None):
+        """The reply a word at a time: the first after the call latency, then one per token_latency."""
+        response = await self._first_word(prompt, system_instruction)
+        return self._words(response)
+
+    async def _first_word(self, prompt: str, system_instruction: str = None) -> FakeResponse:
+        self.calls += 1
+        call_number = self.calls
+        self.prompts.append(prompt)
+
+        if self.latency_fn is not None:
+            delay = self.latency_fn(call_number)
+        else:
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            raise RuntimeError(f"FakeLLMBackend injected error on call {call_number}")
+
+        text = self._reply(prompt)
+        full_prompt = f"{system_instruction or ''}{prompt}"
+        usage = FakeUsage(
+            prompt_token_count=max(1, len(full_prompt) // 4),
+            candidates_token_count=max(1, len(text) // 4),
+        )
+        return FakeResponse(text, usage)
+
+    async def _words(self, response: FakeResponse):
+        words = re.findall(r"\S+\s*", response.text)
+        for i, word in enumerate(words):
+            if i and self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            # Usage arrives with the last chunk, as with Gemini
+            yield FakeResponse(word, response.usage_metadata if i == len(words) - 1 else None)
+
+    async def prefix_cache(self, template) -> str:
+        return None
+
+    def _reply(self, prompt: str) -> str:
+        if self.responder is not None:
+            return self.responder(prompt)
+        for needle, reply in self.responses.items():
+            if needle in prompt:
+                return reply
+        return self.default_response
@@ -0,0 +1,93 @@
+# ai/fallback_classifier.py
+
+"""
+Local yes/no/others keyword classifier.
+Used when the LLM is unavailable (circuit open) or timed out, so intent
+checks degrade to keyword matching instead of sending everyone to retry.
+"""
+
+import re
+
+# NO keywords are checked first to avoid false positives ("ji nahi" contains "ji")
+NO_KEYWORDS = [
+    "nahi",
+    "nahin",
+    "abhi nahi",
+    "order nahi",
+    "nahi karna",
+    "cancel",
+    "galat",
+    "wrong number",
+    "no",
+    "نہیں",
+    "نہی",
+    "غلط",
+    "کینسل",
+]
+
+YES_KEYWORDS = [
+    "ji",
+    "jee",
+    "haan",
+    "han",
+    "bilkul",
+    "theek",
+    "sahi",
+    "karna hai",
+    "karna he",
+    "likh lein",
+    "likh lo",
+    "yes",
+    "جی",
+    "ہاں",
+    "ہان",
+    "بالکل",
+    "ٹھیک",
+    "صحیح",
+    "درست",
+]
+
+
+def _normalize(text: str) -> str:
+    text = text.lower().strip()
+    text = re.sub(r"[^\w\s]", " ", text)
+    return f" {' '.join(text.split())} "
+
+
+def classify_yes_no(text: str) -> str:
+    """
+    Returns "yes", "no" or "others" using whole-word keyword matching.
+    """
+    if not text:
+        return "others"
+
+    normalized = _normalize(text)
+
+    for word in NO_KEYWORDS:
+        if f" {word} " in normalized:
+            return "no"
+
+    for word in YES_KEYWORDS:
+        if f" {word} " in normalized:
+            return "yes"
+
+    return "others"
+
+
+def confident_yes_no(transcript) -> str:
+    """
+    Fast path before an LLM intent call. Returns "yes" / "no" when the STT
+    words are all high-confidence and the keywords give a clear answer,
+    "others" when the words are too unreliable to classify at all (the
+    caller should re-prompt), or None to ask the LLM as usual.
+    Plain strings (no word confidences) always return None.
+    """
+    if getattr(transcript, "is_unreliable", None) is None:
+        return None
+    if transcript.is_unreliable():
+        return "others"
+    if transcript.is_confident():
+        intent = classify_yes_no(transcript)
+        if intent != "others":
+            return intent
+    return None
@@ -1,57 +1,570 @@
 # ai/llm.py
 
-from google import genai
-from google.genai import types
-from dotenv import load_dotenv
-import os
+import asyncio
+import time
+from functools import lru_cache
 
-# Load environment variables
-load_dotenv()
+from metrics.voice_agent import LLM_EMPTY_RESPONSES, LLM_ERRORS, LLM_FIRST_TOKEN, LLM_LATENCY
+from quota import QuotaExceeded, get_limiter, is_rate_limited
+from replay.recorder import get_active_recorder
+from .env import getenv
+from .prompts import prompt_registry
+from .resilience import CircuitBreaker, LatencyTracker
 
-gemini_developer_api_key = os.getenv("GEMINI_DEVELOPER_API_KEY")
-client = genai.Client(api_key=gemini_developer_api_key)
+MODEL_NAME = 'gemini-2.5-flash'
+# Gemini only accepts explicit context caches above this size (gemini-2.5-flash).
+# Smaller static prefixes are sent as system_instruction instead.
+MIN_CACHE_TOKENS = 1024
+CACHE_TTL = "3600s"
 
-class LLM:
+# Per-call deadline budget (seconds) unless the caller passes one
+DEFAULT_DEADLINE = 4.0
+
+# Returned instead of a response when the deadline budget runs out.
+# Orchestrators compare against this to tell a slow LLM apart from an unclear caller.
+LLM_TIMEOUT = "__LLM_TIMEOUT__"
+
+
+@lru_cache(maxsize=None)
+def load_genai_types():
+    from google.genai import types
+    return types
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    """
+    Process-wide Gemini client, built on first use (or by the startup warmup)
+    so importing this module doesn't pull in google.genai.
+    """
+    from google import genai
+    return genai.Client(api_key=getenv("GEMINI_DEVELOPER_API_KEY"))
+
+
+class GeminiBackend:
+    """
+    Async Gemini transport. Everything provider-specific lives here so the
+    LLM class can run against FakeLLMBackend in tests.
+    """
+
+    # Static-prefix caches shared by every backend: template key -> cache name (or None)
+    _prefix_caches = {}
 
     def __init__(self, logger=None):
-        self.api_key = os.getenv("GEMINI_DEVELOPER_API_KEY")
-        self.client = genai.Client(api_key=self.api_key)
         self.logger = logger
 
-    async def get_response(self, prompt: str, temperature: float = 0.0) -> str:
+    async def generate(self, prompt: str, temperature: float, system_instruction: str = None, cached_content: str = None):
+        types = load_genai_types()
+        return await get_client().aio.models.generate_content(
+            model=MODEL_NAME,
+            contents=types.Part.from_text(text=prompt),
+            config=types.GenerateContentConfig(
+                temperature=temperature,
+                top_p=0.95,
+                top_k=20,
+                system_instruction=system_instruction,
+                cached_content=cached_content,
+            ),
+        )
+
+    async def generate_stream(self, prompt: str, temperature: float, system_instruction: str = None,
+                              cached_content: str = None):
+        """Async iterator of partial responses; each chunk's .text is the next piece of the reply."""
+        types = load_genai_types()
+        return await get_client().aio.models.generate_content_stream(
+            model=MODEL_NAME,
+            contents=types.Part.from_text(text=prompt),
+            config=types.GenerateContentConfig(
+                temperature=temperature,
+                top_p=0.95,
+                top_k=20,
+                system_instruction=system_instruction,
+                cached_content=cached_content,
+            ),
+        )
+
+    async def prefix_cache(self, template) -> str:
+        """
+        Returns the Gemini cache name holding this template's static prefix,
+        creating it on first use. Returns None when the prefix is too small
+        to cache or caching failed.
+        """
+        if template.key in GeminiBackend._prefix_caches:
+            return GeminiBackend._prefix_caches[template.key]
+
+        cache_name = None
+        if template.static_prefix_tokens >= MIN_CACHE_TOKENS:
+            try:
+                types = load_genai_types()
+                cache = await get_client().aio.caches.create(
+                    model=MODEL_NAME,
+                    config=types.CreateCachedContentConfig(
+                        display_name=template.key,
+                        system_instruction=template.static_prefix,
+                        ttl=CACHE_TTL,
+                    ),
+                )
+                cache_name = cache.name
+                if self.logger:
+                    self.logger.info(f"LLM cached static prefix for {template.key}: {cache_name}")
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"LLM prefix cache failed for {template.key}, using system instruction: {e}")
+
+        GeminiBackend._prefix_caches[template.key] = cache_name
+        return cache_name
+
+
+# Shared by every LLM instance using the default Gemini backend, so the
+# breaker sees the error rate of the whole process, not of one orchestrator.
+_default_breaker = CircuitBreaker()
+_default_latency = LatencyTracker()
+_default_first_token_latency = LatencyTracker()
+
+
+class LLMStream:
+    """
+    A reply read as it is generated:
+
+        stream = llm.stream_response(prompt)
+        async for text in stream:       # pieces of the reply, in order
+            ...
+        stream.result                   # what get_response() would have returned
+
+    Stopping early (await stream.aclose(), or cancelling the reader) closes
+    the request to the provider.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.failure = None     # LLM_TIMEOUT or "" when the call failed before any text
+        self._chunks = None
+
+    @property
+    def result(self) -> str:
+        return self.text.strip() if self.failure is None else self.failure
+
+    def __aiter__(self):
+        return self._chunks
+
+    async def aclose(self):
+        await self._chunks.aclose()
+
+
+class LLM:
+
+    def __init__(self, logger=None, backend=None, breaker=None, latency_tracker=None, deadline: float = DEFAULT_DEADLINE,
+                 limiter=None, prompt_versions: dict = None):
+        """
+        Args:
+            prompt_versions: Template name -> version to send instead of the
+                latest (prompt evaluation, A/B runs)
+        """
+        self.logger = logger
+        self.deadline = deadline
+        self.prompt_versions = prompt_versions or {}
+        if backend is None:
+            self.backend = GeminiBackend(logger=logger)
+            self.breaker = breaker or _default_breaker
+            self.latency = latency_tracker or _default_latency
+            # Process-wide Gemini quota, shared by every orchestrator and call
+            self.limiter = limiter or get_limiter("llm", logger)
+        else:
+            self.backend = backend
+            self.breaker = breaker or CircuitBreaker()
+            self.latency = latency_tracker or LatencyTracker()
+            self.limiter = limiter
+        # Time to first text of streamed calls; hedges streams without skewing self.latency
+        self.first_token_latency = _default_first_token_latency if backend is None else LatencyTracker()
+
+    async def get_response(self, prompt: str, temperature: float = 0.0, deadline: float = None) -> str:
         """
         Single method to get LLM response for any prompt.
         This is the ONLY public method - all prompt engineering stays in orchestrators.
-        
+
         Args:
             prompt: The prompt to send to the LLM
             temperature: Temperature setting for response randomness (default: 0 for deterministic)
-        
+            deadline: Time budget in seconds (default: self.deadline)
+
         Returns:
-            str: The LLM's response text
+            str: The LLM's response text, LLM_TIMEOUT if the deadline ran out
+                 (including no Gemini quota in time), "" on error or while the
+                 circuit breaker is open
         """
-        
-        try:
+
+        if self.logger:
+            self.logger.info(f"LLM Prompt: {prompt}")
+
+        if not self.breaker.allow_request():
             if self.logger:
-                self.logger.info(f"LLM Prompt: {prompt}")
+                self.logger.warning("LLM circuit open - skipping call")
+            LLM_ERRORS.labels("circuit_open").inc()
+            return ""
 
-            response = client.models.generate_content(
-                model='gemini-2.5-flash',
-                contents=types.Part.from_text(text=prompt),
-                config=types.GenerateContentConfig(
-                    temperature=temperature,
-                    top_p=0.95,
-                    top_k=20,
-                ),
+        started = time.monotonic()
+        try:
+            response = await self._call_with_deadline(
+                lambda: self.backend.generate(prompt, temperature),
+                deadline or self.deadline,
             )
             result = response.text.strip()
 
             if self.logger:
                 self.logger.info(f"LLM Response: {result}")
-            
+
+            self._record_tokens("adhoc", response)
+            self._record_call("adhoc", prompt, result, started)
+
             return result
-        
+
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.error(f"LLM Timeout after {deadline or self.deadline}s")
+            self._record_call("adhoc", prompt, LLM_TIMEOUT, started)
+            return LLM_TIMEOUT
+
+        except QuotaExceeded as e:
+            return self._rate_limited("adhoc", prompt, e, started)
+
         except Exception as e:
             if self.logger:
                 self.logger.error(f"LLM Error: {e}")
-            return ""
\ No newline at end of file
+            LLM_ERRORS.labels("error").inc()
+            self._record_call("adhoc", prompt, "", started, failed=True)
+            return ""
+
+    async def get_prompt_response(self, template_name: str, variables: dict, temperature: float = 0.0, deadline: float = None) -> str:
+        """
+        Get LLM response for a registered prompt template (latest version,
+        unless pinned in prompt_versions).
+        The static prefix is sent once as cached context (or system instruction),
+        only the per-call part is sent as the prompt.
+
+        Args:
+            template_name: Name of a template in the prompt registry
+            variables: Values for the template's per-call part
+            temperature: Temperature setting for response randomness (default: 0 for deterministic)
+            deadline: Time budget in seconds (default: self.deadline)
+
+        Returns:
+            str: The LLM's response text, the template's local fallback result while
+                 the circuit breaker is open, LLM_TIMEOUT if the deadline ran out
+                 (including no Gemini quota in time), "" on error
+        """
+
+        template = prompt_registry.get(template_name, self.prompt_versions.get(template_name))
+        prompt = template.render(**variables)
+
+        if self.logger:
+            self.logger.info(f"LLM Prompt [{template.key}]: {prompt}")
+
+        if not self.breaker.allow_request():
+            LLM_ERRORS.labels("circuit_open").inc()
+            return self._fallback(template, variables)
+
+        started = time.monotonic()
+        try:
+            cache_name = await self.backend.prefix_cache(template)
+            if cache_name:
+                call = lambda: self.backend.generate(prompt, temperature, cached_content=cache_name)
+            else:
+                call = lambda: self.backend.generate(prompt, temperature, system_instruction=template.static_prefix)
+
+            response = await self._call_with_deadline(call, deadline or self.deadline)
+            result = response.text.strip()
+
+            if self.logger:
+                self.logger.info(f"LLM Response [{template.key}]: {result}")
+
+            self._record_tokens(template.key, response)
+            self._record_call(template.key, prompt, result, started)
+
+            return result
+
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.error(f"LLM Timeout [{template.key}] after {deadline or self.deadline}s")
+            self._record_call(template.key, prompt, LLM_TIMEOUT, started)
+            return LLM_TIMEOUT
+
+        except QuotaExceeded as e:
+            return self._rate_limited(template.key, prompt, e, started)
+
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"LLM Error [{template_name}]: {e}")
+            LLM_ERRORS.labels("error").inc()
+            self._record_call(template.key, prompt, "", started, failed=True)
+            return ""
+
+    def stream_response(self, prompt: str, temperature: float = 0.0, deadline: float = None) -> LLMStream:
+        """
+        Like get_response(), but the reply is yielded as it is generated, so
+        the agent can start speaking before the LLM has finished.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            temperature: Temperature setting for response randomness (default: 0 for deterministic)
+            deadline: Time budget in seconds for the first text, and for each
+                gap between pieces after it (default: self.deadline)
+
+        Returns:
+            LLMStream: iterate it for the reply's text; .result afterwards
+        """
+        if self.logger:
+            self.logger.info(f"LLM Prompt (stream): {prompt}")
+
+        async def open_stream():
+            return await self._open_stream(prompt, temperature)
+
+        stream = LLMStream()
+        stream._chunks = self._stream(stream, "adhoc", prompt, open_stream, deadline or self.deadline)
+        return stream
+
+    def stream_prompt_response(self, template_name: str, variables: dict, temperature: float = 0.0,
+                               deadline: float = None) -> LLMStream:
+        """
+        stream_response() for a registered prompt template (static prefix
+        cached as in get_prompt_response()).
+
+        Returns:
+            LLMStream: iterate it for the reply's text; while the circuit
+            breaker is open it yields the template's local fallback, if any
+        """
+        template = prompt_registry.get(template_name, self.prompt_versions.get(template_name))
+        prompt = template.render(**variables)
+
+        if self.logger:
+            self.logger.info(f"LLM Prompt (stream) [{template.key}]: {prompt}")
+
+        async def open_stream():
+            cache_name = await self.backend.prefix_cache(template)
+            if cache_name:
+                return await self._open_stream(prompt, temperature, cached_content=cache_name)
+            return await self._open_stream(prompt, temperature, system_instruction=template.static_prefix)
+
+        stream = LLMStream()
+        stream._chunks = self._stream(stream, template.key, prompt, open_stream, deadline or self.deadline,
+                                      fallback=lambda: self._fallback(template, variables))
+        return stream
+
+    async def _open_stream(self, prompt: str, temperature: float, **kwargs):
+        """Backend stream; backends without generate_stream (replay) answer in one chunk."""
+        if hasattr(self.backend, "generate_stream"):
+            return await self.backend.generate_stream(prompt, temperature, **kwargs)
+        response = await self.backend.generate(prompt, temperature, **kwargs)
+
+        async def single():
+            yield response
+        return single()
+
+    async def _stream(self, stream: LLMStream, key: str, prompt: str, open_stream, deadline: float, fallback=None):
+        if not self.breaker.allow_request():
+            LLM_ERRORS.labels("circuit_open").inc()
+            stream.failure = fallback() if fallback else ""
+            if stream.failure:
+                stream.text, stream.failure = stream.failure, None
+                yield stream.text
+            elif self.logger:
+                self.logger.warning(f"LLM circuit open - skipping stream [{key}]")
+            return
+
+        async def first_chunk():
+            # Opened and answered counts as the call succeeding (and is what hedging races)
+            chunks = await open_stream()
+            try:
+                return chunks, await chunks.__anext__()
+            except StopAsyncIteration:
+                return chunks, None
+
+        started = time.monotonic()
+        try:
+            chunks, chunk = await self._call_with_deadline(first_chunk, deadline, latency=self.first_token_latency)
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.error(f"LLM Timeout [{key}] waiting {deadline}s for the first text")
+            stream.failure = LLM_TIMEOUT
+            self._record_call(key, prompt, LLM_TIMEOUT, started)
+            return
+        except QuotaExceeded as e:
+            stream.failure = self._rate_limited(key, prompt, e, started)
+            return
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"LLM Error [{key}]: {e}")
+            LLM_ERRORS.labels("error").inc()
+            stream.failure = ""
+            self._record_call(key, prompt, "", started, failed=True)
+            return
+
+        LLM_FIRST_TOKEN.labels(key).observe(time.monotonic() - started)
+        last = chunk
+        try:
+            while chunk is not None:
+                text = getattr(chunk, "text", None) or ""
+                if text:
+                    stream.text += text
+                    yield text
+                try:
+                    chunk = await asyncio.wait_for(chunks.__anext__(), deadline)
+                except StopAsyncIteration:
+                    break
+                last = chunk
+        except asyncio.TimeoutError:
+            # Part of the reply may already be spoken - keep it, and end the stream here
+            if self.logger:
+                self.logger.error(f"LLM stream [{key}] stalled for {deadline}s after: {stream.text}")
+            LLM_ERRORS.labels("timeout").inc()
+            self.breaker.record_failure()
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"LLM stream error [{key}] after: {stream.text}: {e}")
+            LLM_ERRORS.labels("error").inc()
+            self.breaker.record_failure()
+        except (asyncio.CancelledError, GeneratorExit):
+            if self.logger:
+                self.logger.info(f"LLM stream [{key}] stopped by the reader after: {stream.text}")
+            raise
+        finally:
+            # Also runs when the reader stops early (barge-in): close the provider request
+            close = getattr(chunks, "aclose", None)
+            if close:
+                await close()
+
+        if self.logger:
+            self.logger.info(f"LLM Response (stream) [{key}]: {stream.text.strip()}")
+        if last is not None:
+            self._record_tokens(key, last)
+        self._record_call(key, prompt, stream.text.strip(), started)
+
+    async def _call_with_deadline(self, call, deadline: float, latency: LatencyTracker = None):
+        """
+        Runs call() within the deadline budget.
+        If no answer arrives by the recent p95 latency, a duplicate (hedged)
+        request is sent and whichever finishes first wins. latency is the
+        tracker the p95 comes from (default: self.latency).
+        Raises asyncio.TimeoutError when the budget runs out, QuotaExceeded
+        when no Gemini quota is available in time.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        latency = latency or self.latency
+
+        async def limited_call():
+            # Every attempt takes quota; a 429 pauses the shared limiter and the
+            # attempt queues again for as long as the budget allows
+            while True:
+                if self.limiter:
+                    await self.limiter.acquire(timeout=deadline - (loop.time() - start))
+                try:
+                    return await call()
+                except Exception as e:
+                    if self.limiter is None or not is_rate_limited(e):
+                        raise
+                    self.limiter.throttle()
+
+        pending = {asyncio.ensure_future(limited_call())}
+        last_error = None
+        recorded = False
+
+        try:
+            hedge_delay = latency.p95()
+            if hedge_delay is not None and hedge_delay < deadline:
+                done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+                # No hedging while requests are queueing for quota - it would only add to the queue
+                if not done and (self.limiter is None or not self.limiter.queued):
+                    if self.logger:
+                        self.logger.info(f"LLM hedging request after {hedge_delay:.3f}s (p95)")
+                    pending.add(asyncio.ensure_future(limited_call()))
+
+            while pending:
+                remaining = deadline - (loop.time() - start)
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        latency.add(loop.time() - start)
+                        recorded = True
+                        self.breaker.record_success()
+                        return task.result()
+                    last_error = task.exception()
+
+            if last_error is not None and not pending:
+                # Running out of quota says nothing about the backend's health
+                if not isinstance(last_error, QuotaExceeded):
+                    recorded = True
+                    self.breaker.record_failure()
+                raise last_error
+
+            recorded = True
+            self.breaker.record_failure()
+            raise asyncio.TimeoutError()
+
+        finally:
+            for task in pending:
+                task.cancel()
+            if not recorded:
+                # No verdict on the backend (no quota, or cancelled by a hangup,
+                # barge-in or a reader dropping the stream) - a half-open trial
+                # must not stay in flight forever
+                self.breaker.release_trial()
+
+    def _rate_limited(self, key: str, prompt: str, error: QuotaExceeded, started: float) -> str:
+        """
+        No quota in time. Reported as LLM_TIMEOUT so orchestrators fall back
+        to keywords instead of reading "" as an unclear caller.
+        """
+        if self.logger:
+            self.logger.error(f"LLM Rate limited [{key}]: {error}")
+        LLM_ERRORS.labels("rate_limited").inc()
+        recorder = get_active_recorder()
+        if recorder:
+            recorder.llm_call(key, prompt, LLM_TIMEOUT, time.monotonic() - started)
+        return LLM_TIMEOUT
+
+    def _fallback(self, template, variables: dict) -> str:
+        """Local answer used while the circuit breaker is open."""
+        if template.fallback is None:
+            if self.logger:
+                self.logger.warning(f"LLM circuit open - no fallback for {template.key}")
+            return ""
+
+        result = template.fallback(variables)
+        if self.logger:
+            self.logger.warning(f"LLM circuit open - local fallback for {template.key}: {result}")
+        return result
+
+    def _record_call(self, key: str, prompt: str, result: str, started: float, failed: bool = False):
+        """
+        Record the call in the metrics and the active call trace, if recording.
+        failed: the call raised (already counted in LLM_ERRORS) and returns ""
+        """
+        latency = time.monotonic() - started
+        if result == LLM_TIMEOUT:
+            LLM_ERRORS.labels("timeout").inc()
+        elif not failed:
+            LLM_LATENCY.labels(key).observe(latency)
+            if not result:
+                LLM_EMPTY_RESPONSES.inc()
+
+        recorder = get_active_recorder()
+        if recorder:
+            recorder.llm_call(key, prompt, result, latency)
+
+    def _record_tokens(self, key: str, response):
+        """Log token usage for one call and add it to the registry totals."""
+        usage = getattr(response, "usage_metadata", None)
+        if usage is None:
+            return
+
+        prompt_tokens = usage.prompt_token_count or 0
+        cached_tokens = usage.cached_content_token_count or 0
+        output_tokens = usage.candidates_token_count or 0
+        prompt_registry.record_usage(key, prompt_tokens, cached_tokens, output_tokens)
+
+        if self.logger:
+            self.logger.info(
+                f"LLM Tokens [{key}]: prompt={prompt_tokens} cached={cached_tokens} output={output_tokens}"
+            )
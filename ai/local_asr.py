@@ -0,0 +1,387 @@
+# ai/local_asr.py
+
+"""
+Local CPU speech recognition, behind the client interface STT already uses
+for Speechmatics (on / start_session / send_audio / stop_session), so STT
+can send a turn to either backend.
+
+LocalASRClient finds the end of each utterance in the turn's audio with an
+energy VAD and hands the utterance to the process-wide LocalASRPool. The
+pool's worker processes each load a small multilingual Whisper model
+(faster-whisper, int8 on CPU; Urdu is one of its languages) and the final
+transcript comes back as a Speechmatics-style AddTranscript message.
+
+Batching: Whisper's encoder always runs over a 30 s window, so a 1 s
+"جی ہاں" costs as much as 30 s of speech. Utterances from concurrent calls
+that arrive within batch_window are packed into one window, separated by
+silence, recognised in one pass, and the words are split back by timestamp.
+"""
+
+import asyncio
+import importlib.util
+import math
+import os
+import time
+from array import array
+from functools import lru_cache
+
+from metrics.voice_agent import STT_LOCAL_BATCH, STT_LOCAL_LATENCY
+from .env import getenv
+
+SAMPLE_RATE = 16000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+# Whisper sees 30 s; keep packed batches just under it
+WINDOW_SECONDS = 28.0
+# Silence between packed utterances, so words never straddle two of them
+GAP_SECONDS = 1.0
+BATCH_WINDOW = 0.05
+
+# Energy VAD: int16 RMS above SPEECH_RMS is speech; an utterance ends after
+# ENDPOINT_SILENCE of non-speech and is kept from PREROLL before speech started
+SPEECH_RMS = 500.0
+ENDPOINT_SILENCE = 0.6
+PREROLL = 0.2
+MIN_SPEECH = 0.15
+MAX_UTTERANCE = 15.0
+
+DEFAULT_MODEL = "small"
+
+
+@lru_cache(maxsize=None)
+def local_asr_available() -> bool:
+    """True when faster-whisper is installed."""
+    return importlib.util.find_spec("faster_whisper") is not None
+
+
+def rms(pcm: bytes) -> float:
+    samples = array("h")
+    samples.frombytes(pcm[:len(pcm) - len(pcm) % 2])
+    if not samples:
+        return 0.0
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+
+class WhisperRecognizer:
+    """faster-whisper on CPU. Loaded once per worker process."""
+
+    def __init__(self, model: str = DEFAULT_MODEL, threads: int = 1, language: str = "ur"):
+        from faster_whisper import WhisperModel
+        import numpy as np
+        self._np = np
+        self.language = language
+        self.model = WhisperModel(model, device="cpu", compute_type="int8", cpu_threads=threads)
+
+    def recognize(self, pcm: bytes) -> list:
+        """16 kHz int16 mono PCM → [(word, start, end, confidence)]."""
+        audio = self._np.frombuffer(pcm, dtype=self._np.int16).astype(self._np.float32) / 32768.0
+        segments, _ = self.model.transcribe(
+            audio, language=self.language, beam_size=1, word_timestamps=True,
+            condition_on_previous_text=False, vad_filter=False,
+        )
+        return [(word.word.strip(), word.start, word.end, word.probability)
+                for segment in segments for word in (segment.words or []) if word.word.strip()]
+
+
+class FakeRecognizer:
+    """
+    Stand-in recogniser for CI and benchmarks: every stretch of speech (by
+    energy) comes back as text, after burning rtf x audio seconds of CPU
+    like a real model would.
+    """
+
+    def __init__(self, text: str = "جی ہاں", rtf: float = 0.05, window_cost: float = 0.0):
+        self.words = text.split()
+        self.rtf = rtf
+        self.window_cost = window_cost      # fixed CPU seconds per pass (Whisper's 30 s encoder)
+
+    def recognize(self, pcm: bytes) -> list:
+        deadline = time.process_time() + self.window_cost + self.rtf * len(pcm) / BYTES_PER_SECOND
+        while time.process_time() < deadline:
+            pass
+        words = []
+        for start, end in _speech_regions(pcm):
+            step = (end - start) / len(self.words)
+            words += [(word, start + i * step, start + (i + 1) * step, 0.9) for i, word in enumerate(self.words)]
+        return words
+
+
+def _speech_regions(pcm: bytes, frame_seconds: float = 0.02) -> list:
+    frame = int(BYTES_PER_SECOND * frame_seconds)
+    regions = []
+    start = None
+    for offset in range(0, len(pcm), frame):
+        t = offset / BYTES_PER_SECOND
+        if rms(pcm[offset:offset + frame]) >= SPEECH_RMS:
+            if start is None:
+                start = t
+            last = t + frame_seconds
+        elif start is not None and t - last >= GAP_SECONDS / 2:
+            regions.append((start, last))
+            start = None
+    if start is not None:
+        regions.append((start, last))
+    return regions
+
+
+def pack(utterances: list) -> tuple:
+    """
+    One PCM buffer holding every utterance, GAP_SECONDS of silence apart.
+
+    Returns:
+        (pcm, spans): spans[i] is utterance i's (start, end) in seconds
+    """
+    gap = bytes(int(GAP_SECONDS * BYTES_PER_SECOND))
+    pcm = bytearray()
+    spans = []
+    for utterance in utterances:
+        if pcm:
+            pcm += gap
+        start = len(pcm) / BYTES_PER_SECOND
+        pcm += utterance
+        spans.append((start, len(pcm) / BYTES_PER_SECOND))
+    return bytes(pcm), spans
+
+
+def split(words: list, spans: list) -> list:
+    """Words of a packed pass, back per utterance with utterance-relative times."""
+    results = [[] for _ in spans]
+    for word, start, end, confidence in words:
+        middle = (start + end) / 2
+        # The utterance whose span (plus half the gap on each side) holds the word's middle
+        for i, (span_start, span_end) in enumerate(spans):
+            if span_start - GAP_SECONDS / 2 <= middle < span_end + GAP_SECONDS / 2:
+                results[i].append((word, max(0.0, start - span_start), max(0.0, end - span_start), confidence))
+                break
+    return results
+
+
+# Worker process state
+_recognizer = None
+
+
+def _init_worker(factory, kwargs: dict):
+    global _recognizer
+    _recognizer = factory(**kwargs)
+
+
+def _worker_ready() -> int:
+    """Runs in a worker once its initializer (model load) has finished."""
+    return os.getpid()
+
+
+def _recognize_batch(utterances: list) -> tuple:
+    """Runs in a worker: one recogniser pass over the packed batch."""
+    started = time.process_time()
+    pcm, spans = pack(utterances)
+    words = _recognizer.recognize(pcm)
+    return split(words, spans), time.process_time() - started
+
+
+class LocalASRPool:
+    """
+    Worker processes running the recogniser, fed in batches.
+
+    Args:
+        workers: worker processes (each loads its own model)
+        recognizer_factory: picklable callable(**recognizer_kwargs) -> object with recognize(pcm)
+        batch_window: seconds to wait for more utterances before sending a batch
+    """
+
+    def __init__(self, workers: int = 1, recognizer_factory=WhisperRecognizer, recognizer_kwargs: dict = None,
+                 batch_window: float = BATCH_WINDOW, logger=None):
+        self.workers = workers
+        self.batch_window = batch_window
+        self.logger = logger
+        # Not imported at module level - multiprocessing would land on the STT import path
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        # spawn, as in worker/supervisor.py: the parent already runs metrics,
+        # diagnostics and recording threads, which fork would copy mid-flight
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(recognizer_factory, recognizer_kwargs or {}),
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._pending = []          # (pcm, future)
+        self._pending_seconds = 0.0
+        self._flush_handle = None
+        self.batches = 0
+        self.utterances = 0
+        self.cpu_seconds = 0.0
+        self.audio_seconds = 0.0
+
+    async def warm(self):
+        """
+        Starts every worker and waits for its model to load, so the first
+        local turn (often a Speechmatics fallback) doesn't pay for it.
+        """
+        loop = asyncio.get_running_loop()
+        # The executor starts a process per queued task, up to max_workers
+        await asyncio.gather(*(loop.run_in_executor(self.executor, _worker_ready) for _ in range(self.workers)))
+
+    async def recognize(self, pcm: bytes) -> list:
+        """16 kHz int16 PCM of one utterance → [(word, start, end, confidence)]."""
+        loop = asyncio.get_running_loop()
+        seconds = len(pcm) / BYTES_PER_SECOND
+        if self._pending and self._pending_seconds + GAP_SECONDS + seconds > WINDOW_SECONDS:
+            self._flush()
+        future = loop.create_future()
+        self._pending.append((pcm, future))
+        self._pending_seconds += seconds + (GAP_SECONDS if len(self._pending) > 1 else 0.0)
+        if self._pending_seconds >= WINDOW_SECONDS - GAP_SECONDS or not self.batch_window:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending, self._pending_seconds = self._pending, [], 0.0
+        if batch:
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: list):
+        loop = asyncio.get_running_loop()
+        utterances = [pcm for pcm, _ in batch]
+        STT_LOCAL_BATCH.observe(len(batch))
+        try:
+            results, cpu = await loop.run_in_executor(self.executor, _recognize_batch, utterances)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Local ASR - batch of {len(batch)} failed: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.utterances += len(batch)
+        self.cpu_seconds += cpu
+        self.audio_seconds += sum(len(pcm) for pcm in utterances) / BYTES_PER_SECOND
+        for (_, future), words in zip(batch, results):
+            if not future.done():
+                future.set_result(words)
+
+    @property
+    def real_time_factor(self) -> float:
+        """Worker CPU seconds per second of speech recognised."""
+        return self.cpu_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool = None
+
+
+def get_local_pool(logger=None) -> LocalASRPool:
+    """Process-wide pool: STT_LOCAL_MODEL, STT_LOCAL_WORKERS, STT_LOCAL_THREADS, STT_LOCAL_BATCH_WINDOW."""
+    global _pool
+    if _pool is None:
+        workers = int(getenv("STT_LOCAL_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+        kwargs = {"model": getenv("STT_LOCAL_MODEL", DEFAULT_MODEL), "threads": int(getenv("STT_LOCAL_THREADS", 1))}
+        _pool = LocalASRPool(workers, WhisperRecognizer, kwargs,
+                             batch_window=float(getenv("STT_LOCAL_BATCH_WINDOW", BATCH_WINDOW)), logger=logger)
+        if logger:
+            logger.info(f"Local ASR - {workers} workers, model {kwargs['model']}")
+    return _pool
+
+
+class LocalASRClient:
+    """
+    One STT turn on the local recogniser, shaped like the Speechmatics
+    AsyncClient: audio in through send_audio(), AddTranscript messages out
+    through the registered handlers (on the event loop).
+    """
+
+    def __init__(self, pool: LocalASRPool, logger=None):
+        self.pool = pool
+        self.logger = logger
+        self.handlers = {}
+        self.active = False
+        self._utterance = bytearray()
+        self._preroll = bytearray()
+        self._speaking = False
+        self._speech_seconds = 0.0
+        self._silence = 0.0
+        self._position = 0.0            # seconds of turn audio received
+        self._utterance_start = 0.0
+        self._tasks = set()
+
+    def on(self, event: str, handler):
+        self.handlers[event] = handler
+
+    def _emit(self, event: str, message: dict):
+        handler = self.handlers.get(event)
+        if handler:
+            handler(message)
+
+    async def start_session(self, transcription_config=None, audio_format=None):
+        encoding = getattr(audio_format, "encoding", "pcm_s16le")
+        if encoding != "pcm_s16le" or getattr(audio_format, "sample_rate", SAMPLE_RATE) != SAMPLE_RATE:
+            raise ValueError(f"local ASR takes pcm_s16le at {SAMPLE_RATE} Hz, not {encoding}")
+        self.active = True
+        self._emit("RecognitionStarted", {"message": "RecognitionStarted"})
+
+    async def send_audio(self, payload: bytes):
+        if not self.active:
+            return
+        seconds = len(payload) / BYTES_PER_SECOND
+        speech = rms(payload) >= SPEECH_RMS
+        self._position += seconds
+
+        if not self._speaking:
+            if speech:
+                self._speaking = True
+                self._utterance = bytearray(self._preroll)
+                self._utterance_start = self._position - seconds - len(self._preroll) / BYTES_PER_SECOND
+                self._speech_seconds = 0.0
+                self._silence = 0.0
+            else:
+                self._preroll += payload
+                del self._preroll[:max(0, len(self._preroll) - int(PREROLL * BYTES_PER_SECOND))]
+                return
+
+        self._utterance += payload
+        if speech:
+            self._speech_seconds += seconds
+            self._silence = 0.0
+        else:
+            self._silence += seconds
+        if self._silence >= ENDPOINT_SILENCE or len(self._utterance) >= MAX_UTTERANCE * BYTES_PER_SECOND:
+            self._end_utterance()
+
+    def _end_utterance(self):
+        utterance, start = bytes(self._utterance), self._utterance_start
+        self._speaking = False
+        self._utterance = bytearray()
+        self._preroll = bytearray()
+        if self._speech_seconds < MIN_SPEECH:
+            return      # a click or a cough
+        task = asyncio.ensure_future(self._recognize(utterance, start))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _recognize(self, utterance: bytes, start: float):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            words = await self.pool.recognize(utterance)
+        except Exception as e:
+            self._emit("Error", {"message": "Error", "reason": str(e)})
+            return
+        STT_LOCAL_LATENCY.observe(loop.time() - started)
+        results = [{
+            "type": "word",
+            "start_time": start + word_start,
+            "end_time": start + word_end,
+            "alternatives": [{"content": word, "confidence": confidence}],
+        } for word, word_start, word_end, confidence in words]
+        if not results:
+            return
+        results.append({"type": "punctuation", "is_eos": True, "alternatives": [{"content": ".", "confidence": 1.0}]})
+        self._emit("AddTranscript", {"message": "AddTranscript", "results": results})
+
+    async def stop_session(self):
+        self.active = False
@@ -0,0 +1,137 @@
+# ai/prompts.py
+
+"""
+Prompt template registry.
+
+Every prompt is a named, versioned template split into:
+- a static prefix (rules/instructions that never change between calls)
+- a variable part rendered per call (question, user response, ...)
+
+Keeping the static prefix separate lets the LLM layer send it as a
+system instruction or a Gemini cached context instead of re-sending it
+inside every prompt, and lets us account tokens per template.
+"""
+
+# Rough chars-per-token ratio used for local estimates before the provider
+# reports real usage. Good enough for cache eligibility decisions.
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local token estimate for a piece of text."""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class PromptTemplate:
+    """
+    One named, versioned prompt.
+
+    Args:
+        name: Template name used by callers, e.g. "address_intent"
+        version: Integer version, bump whenever the wording changes
+        static_prefix: Fixed instruction text shared by every call
+        variable_template: str.format() template for the per-call part
+        fallback: Optional callable(variables) -> str used instead of the LLM
+                  when the LLM circuit breaker is open
+    """
+
+    def __init__(self, name: str, version: int, static_prefix: str, variable_template: str, fallback=None):
+        self.name = name
+        self.version = version
+        self.static_prefix = static_prefix.strip()
+        self.variable_template = variable_template.strip()
+        self.fallback = fallback
+        self.static_prefix_tokens = estimate_tokens(self.static_prefix)
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@v{self.version}"
+
+    def render(self, **variables) -> str:
+        """Render only the per-call part of the prompt."""
+        return self.variable_template.format(**variables)
+
+    def full_prompt(self, **variables) -> str:
+        """Render the complete prompt (static prefix + per-call part)."""
+        return f"{self.static_prefix}\n\n{self.render(**variables)}"
+
+
+class PromptStats:
+    """Running token totals for one template version."""
+
+    def __init__(self):
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.output_tokens = 0
+
+    def to_dict(self) -> dict:
+        calls = self.calls or 1
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "output_tokens": self.output_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / calls, 1),
+            "avg_output_tokens": round(self.output_tokens / calls, 1),
+        }
+
+
+class PromptRegistry:
+    """
+    Holds all prompt templates and their token accounting.
+    One registry per process - templates are registered once at import time.
+    """
+
+    def __init__(self):
+        self._templates = {}  # name -> {version: PromptTemplate}
+        self._stats = {}      # template key -> PromptStats
+
+    def register(self, template: PromptTemplate) -> PromptTemplate:
+        versions = self._templates.setdefault(template.name, {})
+        if template.version in versions:
+            raise ValueError(f"Prompt template already registered: {template.key}")
+        versions[template.version] = template
+        self._stats[template.key] = PromptStats()
+        return template
+
+    def get(self, name: str, version: int = None) -> PromptTemplate:
+        """Return a template by name; latest version unless one is given."""
+        versions = self._templates.get(name)
+        if not versions:
+            raise KeyError(f"Unknown prompt template: {name}")
+        if version is None:
+            version = max(versions)
+        if version not in versions:
+            raise KeyError(f"Unknown prompt template version: {name}@v{version}")
+        return versions[version]
+
+    def names(self) -> list:
+        return sorted(self._templates)
+
+    def versions(self, name: str) -> list:
+        """Registered versions of a template, oldest first."""
+        return sorted(self._templates.get(name, {}))
+
+    def record_usage(self, key: str, prompt_tokens: int, cached_tokens: int, output_tokens: int):
+        stats = self._stats.setdefault(key, PromptStats())
+        stats.calls += 1
+        stats.prompt_tokens += prompt_tokens or 0
+        stats.cached_tokens += cached_tokens or 0
+        stats.output_tokens += output_tokens or 0
+
+    def summary(self) -> dict:
+        """Token accounting per template key, including the static prefix size."""
+        summary = {}
+        for name, versions in self._templates.items():
+            for template in versions.values():
+                entry = self._stats[template.key].to_dict()
+                entry["static_prefix_tokens"] = template.static_prefix_tokens
+                summary[template.key] = entry
+        return summary
+
+
+# Process-wide registry shared by every LLM instance
+prompt_registry = PromptRegistry()
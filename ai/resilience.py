@@ -0,0 +1,124 @@
+# ai/resilience.py
+
+"""
+Latency tracking and circuit breaking for the LLM layer.
+Both are plain in-process objects - shared by every LLM instance that
+talks to the same backend.
+"""
+
+import time
+from collections import deque
+
+
+class LatencyTracker:
+    """
+    Rolling window of successful call latencies (seconds).
+    Used to pick the hedging delay from the recent p95.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def add(self, latency: float):
+        self.samples.append(latency)
+
+    def percentile(self, pct: float) -> float:
+        """Returns the given percentile, or None until enough samples are collected."""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def p95(self) -> float:
+        return self.percentile(95)
+
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker.
+
+    closed    → calls go through, outcomes recorded in a rolling window
+    open      → error rate crossed the threshold, calls are skipped until cooldown ends
+    half_open → cooldown ended, one trial call decides between closed and open;
+                a trial that never reports back expires after another cooldown
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: float = 0.5,
+        window: int = 20,
+        min_calls: int = 10,
+        cooldown: float = 30.0,
+        clock=time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.min_calls = min_calls
+        self.cooldown = cooldown
+        self.clock = clock
+        self.outcomes = deque(maxlen=window)  # True = failure
+        self.state = self.CLOSED
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.trial_started_at = None
+
+    def allow_request(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+
+        if self.state == self.OPEN:
+            if self.clock() - self.opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            self.trial_in_flight = False
+
+        # Half open: let exactly one trial call through. A trial lost without
+        # an outcome (a path that forgot to release it) must not block forever
+        if self.trial_in_flight and self.clock() - self.trial_started_at < self.cooldown:
+            return False
+        self.trial_in_flight = True
+        self.trial_started_at = self.clock()
+        return True
+
+    def record_success(self):
+        if self.state == self.HALF_OPEN:
+            self._close()
+            return
+        self.outcomes.append(False)
+
+    def release_trial(self):
+        """
+        The call ended without saying anything about the backend (no quota,
+        cancelled): if it was the half-open trial, let the next request try.
+        """
+        if self.state == self.HALF_OPEN:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        if self.state == self.HALF_OPEN:
+            self._open()
+            return
+        self.outcomes.append(True)
+        if len(self.outcomes) >= self.min_calls and self.error_rate() >= self.failure_threshold:
+            self._open()
+
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return sum(self.outcomes) / len(self.outcomes)
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = self.clock()
+        self.trial_in_flight = False
+
+    def _close(self):
+        self.state = self.CLOSED
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.outcomes.clear()
@@ -0,0 +1,302 @@
+# ai/speech.py
+
+"""
+Templated speech: prompts split into static segments and dynamic slots.
+
+    ADDRESS_CONFIRMATION = speech_registry.register(SpeechTemplate(
+        "address_confirmation",
+        "Meri baat {customer_name} se ho rahi hai. Aap ka address {customer_address} hai, ...",
+    ))
+    await tts.play_audio(ADDRESS_CONFIRMATION.fill(customer_name=name, customer_address=address))
+
+fill() returns a SpokenPrompt - the full text (a str, so turn-taking, logs
+and traces keep working) that also remembers its parts. With a synthesizer
+configured, TTS renders a SpokenPrompt part by part from a SegmentCache:
+
+- static segments are rendered once (prerender() at startup, or on first
+  use) and kept for the life of the process
+- slot values ("John Doe", "G-8, Islamabad") and plain prompts go through a
+  bounded LRU cache, and are synthesized on demand on a miss
+
+Every part starts synthesizing at once, and playback of the first static
+segment begins while the slots are still being synthesized. Consecutive
+segments are joined with a short crossfade, so the joins don't click.
+
+Generated replies (LLM.stream_response()) are cut into sentences by
+SentenceChunker as the tokens arrive, and TTS.play_stream() speaks each one
+while the rest is still being generated.
+"""
+
+import asyncio
+import os
+import string
+import weakref
+from array import array
+from collections import OrderedDict
+
+from metrics.voice_agent import TTS_SEGMENT_CACHE
+
+SAMPLE_RATE = 16000
+CROSSFADE_SECONDS = 0.012
+DEFAULT_SLOT_CACHE_SIZE = 512
+
+# Streamed text is cut after these when followed by whitespace ("1.5", "Rs.500" stay whole)
+SENTENCE_ENDS = ".!?\u06d4\u061f\n"     # includes Urdu full stop and question mark
+PHRASE_ENDS = ",;:\u060c"              # includes Urdu comma
+
+
+class SpokenPrompt(str):
+    """
+    Prompt text plus its parts: [(text, static)]. "Sorry. " + prompt keeps
+    the parts, with the prefix as a static segment.
+    """
+
+    def __new__(cls, text: str, parts: list):
+        self = super().__new__(cls, text)
+        self.parts = parts
+        return self
+
+    def __reduce__(self):
+        return (SpokenPrompt, (str(self), self.parts))
+
+    def __add__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return SpokenPrompt(str(self) + other, self.parts + [(str(other), True)])
+
+    def __radd__(self, other):
+        if not isinstance(other, str):
+            return NotImplemented
+        return SpokenPrompt(other + str(self), [(other, True)] + self.parts)
+
+
+class SpeechTemplate:
+    """
+    A spoken prompt with {slot} placeholders (str.format() syntax, no format specs).
+    """
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.text = text
+        self.segments = []      # [(literal text, slot name or None)]
+        for literal, field, _, _ in string.Formatter().parse(text):
+            self.segments.append((literal, field))
+
+    @property
+    def static_parts(self) -> list:
+        return [literal for literal, _ in self.segments if literal.strip()]
+
+    def fill(self, **slots) -> SpokenPrompt:
+        parts = []
+        for literal, field in self.segments:
+            if literal:
+                parts.append((literal, True))
+            if field is not None:
+                parts.append((str(slots[field]), False))
+        return SpokenPrompt("".join(text for text, _ in parts), parts)
+
+
+class SpeechRegistry:
+    """Spoken templates whose static segments are prerendered at startup."""
+
+    def __init__(self):
+        self._templates = {}
+
+    def register(self, template: SpeechTemplate) -> SpeechTemplate:
+        if template.name in self._templates:
+            raise ValueError(f"Speech template already registered: {template.name}")
+        self._templates[template.name] = template
+        return template
+
+    def templates(self) -> list:
+        return list(self._templates.values())
+
+
+# Process-wide registry, filled at import time by orchestrator/prompts.py
+speech_registry = SpeechRegistry()
+
+
+class SegmentCache:
+    """
+    Synthesized audio per segment text. Concurrent requests for the same
+    text share one synthesis.
+
+    Args:
+        synthesizer: object with async synthesize(text) -> 16 kHz int16 PCM
+        max_slots: LRU size for slot values and plain prompts (TTS_SLOT_CACHE_SIZE)
+    """
+
+    def __init__(self, synthesizer, max_slots: int = None):
+        self.synthesizer = synthesizer
+        self.max_slots = max_slots or int(os.getenv("TTS_SLOT_CACHE_SIZE", DEFAULT_SLOT_CACHE_SIZE))
+        self._static = {}
+        self._slots = OrderedDict()
+        self._inflight = {}
+
+    def cached(self, text: str) -> bool:
+        return text in self._static or text in self._slots
+
+    async def audio(self, text: str, static: bool) -> bytes:
+        kind = "static" if static else "slot"
+        pcm = self._static.get(text)
+        if pcm is None:
+            pcm = self._slots.get(text)
+            if pcm is not None:
+                self._slots.move_to_end(text)
+        if pcm is not None:
+            TTS_SEGMENT_CACHE.labels(kind, "hit").inc()
+            return pcm
+
+        TTS_SEGMENT_CACHE.labels(kind, "miss").inc()
+        future = self._inflight.get(text)
+        if future is None:
+            future = asyncio.ensure_future(self.synthesizer.synthesize(text))
+            self._inflight[text] = future
+            future.add_done_callback(lambda f: self._store(text, static, f))
+        # shield: a caller giving up (barge-in) doesn't cancel audio others are waiting for
+        return await asyncio.shield(future)
+
+    def _store(self, text: str, static: bool, future: asyncio.Future):
+        self._inflight.pop(text, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        if static:
+            self._static[text] = future.result()
+            return
+        self._slots[text] = future.result()
+        self._slots.move_to_end(text)
+        while len(self._slots) > self.max_slots:
+            self._slots.popitem(last=False)
+
+    async def prerender(self, templates: list):
+        """Synthesize every static segment of the templates (once)."""
+        texts = {part.strip() for template in templates for part in template.static_parts}
+        await asyncio.gather(*(self.audio(text, True) for text in texts if not self.cached(text)))
+
+
+# Process-wide caches: synthesizer -> SegmentCache (TTS instances are per step, per call)
+_segment_caches = weakref.WeakKeyDictionary()
+
+
+def get_segment_cache(synthesizer) -> SegmentCache:
+    """The process's SegmentCache for this synthesizer - shared by every TTS using it."""
+    cache = _segment_caches.get(synthesizer)
+    if cache is None:
+        cache = _segment_caches[synthesizer] = SegmentCache(synthesizer)
+    return cache
+
+
+class SentenceChunker:
+    """
+    Cuts streamed text into speakable chunks. Chunks end at sentence ends;
+    until the first chunk is out, also at a phrase end (comma) once
+    min_phrase characters are pending, so speech starts early without
+    chopping up the rest. Runs without punctuation are cut at a space
+    after max_chars.
+
+        chunker = SentenceChunker()
+        for token in tokens:
+            for chunk in chunker.push(token):
+                speak(chunk)
+        speak(chunker.flush())
+    """
+
+    def __init__(self, min_phrase: int = 24, max_chars: int = 160):
+        self.min_phrase = min_phrase
+        self.max_chars = max_chars
+        self.chunks = 0
+        self._buffer = ""
+
+    def push(self, text: str) -> list:
+        """Adds text; returns the chunks it completed."""
+        self._buffer += text
+        completed = []
+        while True:
+            cut = self._boundary()
+            if cut is None:
+                return completed
+            chunk, self._buffer = self._buffer[:cut].strip(), self._buffer[cut:].lstrip()
+            if chunk:
+                completed.append(chunk)
+                self.chunks += 1
+
+    def flush(self) -> str:
+        """The remaining text, at the end of the stream."""
+        chunk, self._buffer = self._buffer.strip(), ""
+        if chunk:
+            self.chunks += 1
+        return chunk
+
+    def _boundary(self):
+        buffer = self._buffer
+        # The last character can't be a boundary yet: the next one decides
+        for i in range(len(buffer) - 1):
+            ch = buffer[i]
+            ends = ch in SENTENCE_ENDS or (ch in PHRASE_ENDS and self.chunks == 0 and i + 1 >= self.min_phrase)
+            if ends and buffer[i + 1].isspace():
+                return i + 1
+        if len(buffer) > self.max_chars:
+            space = buffer.rfind(" ", 0, self.max_chars)
+            return space if space > 0 else self.max_chars
+        return None
+
+
+class SegmentJoiner:
+    """
+    Joins consecutive PCM segments with a linear crossfade. Holds back each
+    segment's last fade samples until the next one (or flush()) arrives.
+    """
+
+    def __init__(self, fade_samples: int = int(SAMPLE_RATE * CROSSFADE_SECONDS)):
+        self.fade = fade_samples
+        self._tail = array("h")
+
+    def push(self, pcm: bytes) -> bytes:
+        samples = array("h")
+        samples.frombytes(pcm)
+        overlap = min(len(self._tail), len(samples), self.fade)
+        for i in range(overlap):
+            w = (i + 1) / (overlap + 1)
+            mixed = self._tail[len(self._tail) - overlap + i] * (1.0 - w) + samples[i] * w
+            samples[i] = max(-32768, min(32767, int(mixed)))
+        head = self._tail[:len(self._tail) - overlap]
+        keep = min(self.fade, len(samples))
+        out = head + samples[:len(samples) - keep]
+        self._tail = samples[len(samples) - keep:]
+        return out.tobytes()
+
+    def flush(self) -> bytes:
+        tail, self._tail = self._tail, array("h")
+        return tail.tobytes()
+
+
+class PacedOutput:
+    """Audio sink that takes as long as the audio lasts (a speaker or call leg at real time)."""
+
+    def __init__(self, sample_rate: int = SAMPLE_RATE):
+        self.sample_rate = sample_rate
+
+    async def write(self, pcm: bytes):
+        await asyncio.sleep(len(pcm) / 2 / self.sample_rate)
+
+
+class FakeSynthesizer:
+    """
+    Stand-in TTS engine for tests and benchmarks: a request costs latency +
+    per_char x len(text) seconds and returns a quiet tone lasting as long as
+    the text would take to speak.
+    """
+
+    def __init__(self, latency: float = 0.25, per_char: float = 0.005, chars_per_second: float = 14.0,
+                 sample_rate: int = SAMPLE_RATE):
+        self.latency = latency
+        self.per_char = per_char
+        self.chars_per_second = chars_per_second
+        self.sample_rate = sample_rate
+        self.requests = 0
+
+    async def synthesize(self, text: str) -> bytes:
+        self.requests += 1
+        await asyncio.sleep(self.latency + self.per_char * len(text))
+        samples = int(len(text) / self.chars_per_second * self.sample_rate)
+        return array("h", (1000 if (i // 40) % 2 else -1000 for i in range(samples))).tobytes()
@@ -1,61 +1,136 @@
 # stt.py - Refactored: Only handles speech-to-text transcription
 
 import asyncio
-import os
-import sounddevice as sd
-from speechmatics.rt import AsyncClient, AudioFormat, TranscriptionConfig
-from dotenv import load_dotenv
+from functools import lru_cache
+from types import SimpleNamespace
 
-# Load environment variables
-load_dotenv()
+from handoff.transcript import get_active_transcript
+from metrics.voice_agent import STT_AUDIO_FRAMES, STT_ENDPOINT_DELAY, STT_FALLBACKS, STT_TURNS
+from quota import QuotaExceeded, get_limiter, is_rate_limited
+from recording import get_active_recording
+from replay.recorder import get_active_recorder
+from .audio_io import load_stream_settings, open_input_stream
+from .env import getenv
+from .local_asr import LocalASRClient, get_local_pool, local_asr_available
+from .transcript import Transcript, TranscriptBuilder
+from .upstream import UpstreamEncoder
+from .warmup import warmup
 
-speechmatics_api_key = os.getenv("SPEECHMATICS_API_KEY")
 SAMPLE_RATE = 16000
 SILENCE_TIMEOUT = 3.0  # Wait 3 seconds of silence before returning transcription
+ECHO_TAIL = 0.15  # Keep the mic gated this long after the prompt ends (speaker echo)
+
+SPEECHMATICS = "speechmatics"
+LOCAL = "local"
+
+
+# Heavy SDKs are imported on first use (or by the startup warmup), not at import time
+@lru_cache(maxsize=None)
+def load_speechmatics():
+    import speechmatics.rt
+    return speechmatics.rt
+
+
+@lru_cache(maxsize=None)
+def load_sounddevice():
+    import sounddevice
+    return sounddevice
+
+
+def _silence_like(frame) -> memoryview:
+    """Zeroed int16 frame of the same size (anything with .tobytes())."""
+    return memoryview(bytes(len(frame.tobytes())))
+
 
 class STT:
-    def __init__(self, logger=None):
-        self.api_key = os.getenv("SPEECHMATICS_API_KEY")
+    def __init__(self, logger=None, client_factory=None, input_stream_factory=None, upstream_encoding: str = None,
+                 limiter=None, backend: str = None, local_turns=None, local_client_factory=None):
+        self.api_key = getenv("SPEECHMATICS_API_KEY")
+        # "pcm_s16le" (16 kHz, default) or "mulaw" (8 kHz, 4x less uplink bandwidth)
+        self.upstream_encoding = upstream_encoding or getenv("STT_UPSTREAM_ENCODING", "pcm_s16le")
         self.sample_rate = 16000
-        self.silence_timeout = 3.0
+        self.silence_timeout = SILENCE_TIMEOUT
+        self.poll_interval = 0.1
         self.logger = logger # Logger injected from outside
+        # Factories let replay/tests swap Speechmatics and the microphone for stubs
+        self.client_factory = client_factory or (lambda: load_speechmatics().AsyncClient(api_key=self.api_key))
+        # Stubbed clients get plain session config objects, so offline runs don't need the SDK
+        self.uses_sdk = client_factory is None
+        # Microphone device / blocksize / latency recommended by mic-test.py --benchmark, if saved
+        self.stream_settings = load_stream_settings(logger=logger) if input_stream_factory is None else {}
+        self.input_stream_factory = input_stream_factory or (
+            lambda **kwargs: open_input_stream(**{**self.stream_settings, **kwargs}))
+        # Process-wide Speechmatics session quota (stubbed clients are not limited)
+        self.limiter = limiter or (get_limiter("stt", logger) if client_factory is None else None)
+        # Local CPU recogniser: every turn (STT_BACKEND=local), the turn types in
+        # STT_LOCAL_TURNS (e.g. "yes_no"), and any turn Speechmatics can't start.
+        # Off for stubbed Speechmatics clients and when faster-whisper isn't installed
+        self.backend = backend or getenv("STT_BACKEND", SPEECHMATICS)
+        if local_turns is None:
+            local_turns = [turn.strip() for turn in getenv("STT_LOCAL_TURNS", "").split(",")]
+        self.local_turns = set(filter(None, local_turns))
+        if local_client_factory is None and client_factory is None and local_asr_available():
+            local_client_factory = lambda: LocalASRClient(get_local_pool(logger), logger=logger)
+        self.local_client_factory = local_client_factory
+
+    def backend_for(self, turn_type: str = None) -> str:
+        """Recognition backend for a turn of this type ("speechmatics" or "local")."""
+        if self.local_client_factory is None:
+            return SPEECHMATICS
+        if self.backend == LOCAL or turn_type in self.local_turns:
+            return LOCAL
+        return SPEECHMATICS
 
-    async def transcribe(self) -> str:
+    async def transcribe(self, prompt_end: asyncio.Future = None, listening: asyncio.Future = None,
+                         turn_type: str = None) -> Transcript:
         """
         Single method to capture audio and return transcribed text.
         This is the ONLY public method - all logic stays in orchestrators.
+
+        Args:
+            prompt_end: Resolves to the loop time the agent's prompt finished
+                playing. Until then (plus ECHO_TAIL) the microphone is sent to
+                Speechmatics as silence, so STT can be armed during playback
+            listening: Set to the loop time the microphone went live
+            turn_type: What the turn asks for ("yes_no", "address", ...),
+                used to pick the recognition backend
         
         Returns:
-            str: The transcribed text from user speech
+            Transcript: The transcribed text from user speech (a str), with
+            per-word timings, confidences and alternatives
         """
         
         # Internal state for this transcription session
         accumulated_text = ""
+        words = TranscriptBuilder()
         current_segment = ""
         last_speech_time = None
+        last_final_time = None
         silence_confirmed = False
         session_active = True
-        
-        client = AsyncClient(api_key=speechmatics_api_key)
+        # Mic frames before this loop time are echo of the prompt
+        gate_until = float("inf") if prompt_end is not None else 0.0
+
+        recorder = get_active_recorder()
+        recording = get_active_recording()
 
         if self.logger:
             self.logger.info("STT transcribe() called - starting session")
+
+        if recorder:
+            recorder.turn_start()
         
         def on_transcript(msg):
-            nonlocal accumulated_text, current_segment, last_speech_time, silence_confirmed
-            
+            nonlocal accumulated_text, current_segment, last_speech_time, last_final_time, silence_confirmed
+
+            if recorder:
+                recorder.transcript(msg)
+
             results = msg.get("results", [])
             is_final = any(result.get("is_eos", False) for result in results)
             
-            # Build transcript from word results
-            full_transcript = ""
-            for result in results:
-                if result.get("type") == "word":
-                    alternatives = result.get("alternatives", [])
-                    if alternatives:
-                        full_transcript += alternatives[0].get("content", "") + " "
-            
-            full_transcript = full_transcript.strip()
+            # Build transcript from word results (keeps timings, confidences and alternatives)
+            full_transcript = words.add_results(results).strip()
             
             # Handle partial transcripts
             if not is_final:
@@ -95,6 +170,7 @@ class STT:
             
             # Mark when we received final speech
             last_speech_time = asyncio.get_event_loop().time()
+            last_final_time = last_speech_time
             silence_confirmed = False
         
         async def monitor_silence():
@@ -102,13 +178,13 @@ class STT:
             nonlocal current_segment, last_speech_time, silence_confirmed, session_active, accumulated_text
             
             while session_active:
-                await asyncio.sleep(0.1)
+                await asyncio.sleep(self.poll_interval)
                 
                 if last_speech_time is not None and not silence_confirmed:
                     current_time = asyncio.get_event_loop().time()
                     time_since_speech = current_time - last_speech_time
                     
-                    if time_since_speech >= SILENCE_TIMEOUT:
+                    if time_since_speech >= self.silence_timeout:
                         #print(f"\n✅ Silence detected ({SILENCE_TIMEOUT}s) - ending transcription")
                         if self.logger:
                             self.logger.info(f"STT silence detected after {self.silence_timeout}s - ending transcription")
@@ -119,32 +195,31 @@ class STT:
                         await client.stop_session()
                         session_active = False
         
-        # Register event handlers
-        client.on("AddTranscript", on_transcript)
-        client.on("RecognitionStarted", lambda msg: print("🎤 Listening..."))
-        client.on("Error", lambda msg: print(f"❌ STT Error: {msg}"))
-        
-        try:
-            # Start Speechmatics session
-            await client.start_session(
-                transcription_config=TranscriptionConfig(
-                    language="ur",
-                    operating_point="enhanced",
-                    enable_partials=True
-                ),
-                audio_format=AudioFormat(
-                    encoding="pcm_s16le",
-                    sample_rate=SAMPLE_RATE
-                )
-            )
-
-            if self.logger:
-                self.logger.info("STT Speechmatics session started successfully")
+        def connect(client):
+            # Register event handlers
+            client.on("AddTranscript", on_transcript)
+            client.on("RecognitionStarted", lambda msg: print("🎤 Listening..."))
+            client.on("Error", lambda msg: print(f"❌ STT Error: {msg}"))
 
+        backend = self.backend_for(turn_type)
+        try:
+            client, encoder = await self._start_session(backend, connect)
         except Exception as e:
+            if backend == LOCAL or self.local_client_factory is None:
+                if self.logger:
+                    self.logger.error(f"STT failed to start session: {e}")
+                raise
+            # Network trouble or no Speechmatics quota - take this turn locally
+            reason = "quota" if isinstance(e, QuotaExceeded) else "error"
+            STT_FALLBACKS.labels(reason).inc()
             if self.logger:
-                self.logger.error(f"STT failed to start session: {e}")
-            raise
+                self.logger.warning(f"STT Speechmatics unavailable ({reason}: {e}), using local ASR for this turn")
+            backend = LOCAL
+            client, encoder = await self._start_session(backend, connect)
+
+        STT_TURNS.labels(backend).inc()
+        if self.logger:
+            self.logger.info(f"STT {backend} session started successfully")
         
         # Get event loop
         loop = asyncio.get_event_loop()
@@ -152,13 +227,32 @@ class STT:
         # Start silence monitoring
         monitor_task = asyncio.create_task(monitor_silence())
         
+        def open_gate(future):
+            nonlocal gate_until
+            gate_until = future.result() + ECHO_TAIL if not future.cancelled() else 0.0
+
+        if prompt_end is not None:
+            if prompt_end.done():
+                open_gate(prompt_end)
+            else:
+                prompt_end.add_done_callback(open_gate)
+
         # Audio callback
         def audio_callback(indata, frames, time, status):
             if session_active:
-                asyncio.run_coroutine_threadsafe(client.send_audio(indata.tobytes()), loop)
+                STT_AUDIO_FRAMES.inc()
+                # While the prompt is playing send silence, keeping the audio timeline intact
+                frame = indata if loop.time() >= gate_until else _silence_like(indata)
+                asyncio.run_coroutine_threadsafe(client.send_audio(encoder.encode(frame)), loop)
+                if recorder:
+                    # Runs on the audio thread - hand the write to the event loop
+                    loop.call_soon_threadsafe(recorder.audio, indata.tobytes())
+                if recording:
+                    # Only queues the frame - the recording writer thread does the disk I/O
+                    recording.inbound(indata)
         
         # Start audio stream
-        stream = sd.InputStream(
+        stream = self.input_stream_factory(
             samplerate=SAMPLE_RATE,
             channels=1,
             dtype="int16",
@@ -166,13 +260,15 @@ class STT:
         )
         
         stream.start()
+        if listening is not None and not listening.done():
+            listening.set_result(loop.time())
         if self.logger:
             self.logger.info("STT audio stream started")
         
         try:
             # Wait until session ends
             while session_active:
-                await asyncio.sleep(0.1)
+                await asyncio.sleep(self.poll_interval)
         
         except Exception as e:
             if self.logger:
@@ -187,10 +283,75 @@ class STT:
             await client.stop_session()
             if self.logger:
                 self.logger.info("STT session cleaned up and closed")
+                self.logger.debug(
+                    f"STT upstream {encoder.encoding}@{encoder.sample_rate}: "
+                    f"{encoder.bytes_in} bytes captured, {encoder.bytes_out} bytes sent"
+                )
+
+        final_text = words.build(accumulated_text.strip())
+        if last_final_time is not None:
+            STT_ENDPOINT_DELAY.observe(loop.time() - last_final_time)
+
+        if recorder:
+            recorder.turn_end(final_text)
 
-        final_text = accumulated_text.strip()
+        transcript = get_active_transcript()
+        if transcript:
+            transcript.caller(final_text)
 
         if self.logger:
             self.logger.info(f"STT transcribe() complete - final result: {final_text}")
+            if final_text.word_count:
+                self.logger.debug(
+                    f"STT {final_text.word_count} words, confidence "
+                    f"mean {final_text.confidence:.2f} / min {final_text.min_confidence:.2f}"
+                )
+
+        return final_text
+
+    def _session_config(self, encoder: UpstreamEncoder) -> dict:
+        """start_session() arguments: SDK config objects, or the same fields as plain objects for stubs."""
+        transcription = dict(language="ur", operating_point="enhanced", enable_partials=True)
+        audio_format = dict(encoding=encoder.encoding, sample_rate=encoder.sample_rate)
+        if self.uses_sdk:
+            rt = load_speechmatics()
+            return {"transcription_config": rt.TranscriptionConfig(**transcription),
+                    "audio_format": rt.AudioFormat(**audio_format)}
+        return {"transcription_config": SimpleNamespace(**transcription),
+                "audio_format": SimpleNamespace(**audio_format)}
+
+    async def _start_session(self, backend: str, connect) -> tuple:
+        """
+        Opens a recognition session on the backend, with connect(client)
+        registering the event handlers first.
+
+        Returns:
+            (client, encoder)
+        """
+        if backend == LOCAL:
+            client = self.local_client_factory()
+            connect(client)
+            encoder = UpstreamEncoder("pcm_s16le", input_rate=SAMPLE_RATE)
+            await client.start_session(audio_format=encoder)
+            return client, encoder
+
+        # Returns immediately unless the startup warmup is still loading the SDK
+        await warmup.wait_ready("stt")
+
+        client = self.client_factory()
+        connect(client)
+        encoder = UpstreamEncoder(self.upstream_encoding, input_rate=SAMPLE_RATE)
+        session_config = self._session_config(encoder)
 
-        return final_text
\ No newline at end of file
+        # Start Speechmatics session - waits for session quota; raises QuotaExceeded
+        # when none frees up within the limiter's max wait
+        while True:
+            if self.limiter:
+                await self.limiter.acquire()
+            try:
+                await client.start_session(**session_config)
+                return client, encoder
+            except Exception as e:
+                if self.limiter is None or not is_rate_limited(e):
+                    raise
+                self.limiter.throttle()
@@ -0,0 +1,137 @@
+# ai/transcript.py
+
+"""
+Structured STT result. A Transcript is the recognised text (it is a str, so
+existing callers keep working) plus per-word timings, confidences and the
+N-best alternatives Speechmatics returned for each word.
+
+Word data is kept column-wise in typed arrays instead of a dict per word:
+one string table for every word and alternative, and parallel start / end /
+confidence arrays indexed by word.
+"""
+
+from array import array
+from collections import namedtuple
+
+# A turn whose every word is at least this confident can skip the LLM when
+# the keyword classifier gives a clear answer
+CONFIDENT = 0.85
+# Below this mean confidence the words are too unreliable to send to the LLM;
+# the orchestrator re-prompts instead
+UNRELIABLE = 0.35
+
+Word = namedtuple("Word", ["content", "start", "end", "confidence"])
+
+
+class Transcript(str):
+    """
+    Recognised text with word-level detail.
+
+    Word i is _strings[_alt_start[i]] (the best alternative); its remaining
+    alternatives are _strings[_alt_start[i] + 1 : _alt_start[i + 1]] with
+    confidences in _alt_confidence at the same positions.
+    """
+
+    def __new__(cls, text: str = "", strings=None, alt_start=None, alt_confidence=None,
+                starts=None, ends=None):
+        self = super().__new__(cls, text)
+        self._strings = strings if strings is not None else []
+        self._alt_start = alt_start if alt_start is not None else array("I", [0])
+        self._alt_confidence = alt_confidence if alt_confidence is not None else array("f")
+        self._starts = starts if starts is not None else array("d")
+        self._ends = ends if ends is not None else array("d")
+        return self
+
+    def __reduce__(self):
+        return (Transcript, (str(self), self._strings, self._alt_start, self._alt_confidence,
+                             self._starts, self._ends))
+
+    @property
+    def word_count(self) -> int:
+        return len(self._starts)
+
+    def word(self, i: int) -> Word:
+        """Best alternative for word i, with its timing and confidence."""
+        first = self._alt_start[i]
+        return Word(self._strings[first], self._starts[i], self._ends[i], self._alt_confidence[first])
+
+    def words(self) -> list:
+        return [self.word(i) for i in range(self.word_count)]
+
+    def alternatives(self, i: int) -> list:
+        """N-best list for word i as (content, confidence), best first."""
+        first, last = self._alt_start[i], self._alt_start[i + 1]
+        return [(self._strings[j], self._alt_confidence[j]) for j in range(first, last)]
+
+    def _best_confidences(self) -> list:
+        return [self._alt_confidence[self._alt_start[i]] for i in range(self.word_count)]
+
+    @property
+    def confidence(self):
+        """Mean confidence of the best words, or None when there are no word results."""
+        if not self.word_count:
+            return None
+        return sum(self._best_confidences()) / self.word_count
+
+    @property
+    def min_confidence(self):
+        if not self.word_count:
+            return None
+        return min(self._best_confidences())
+
+    @property
+    def start_time(self):
+        return self._starts[0] if self.word_count else None
+
+    @property
+    def end_time(self):
+        return self._ends[-1] if self.word_count else None
+
+    def is_confident(self, threshold: float = CONFIDENT) -> bool:
+        """True when every word is at least threshold confident (False without word data)."""
+        lowest = self.min_confidence
+        return lowest is not None and lowest >= threshold
+
+    def is_unreliable(self, threshold: float = UNRELIABLE) -> bool:
+        """True when the words are too unsure to act on (False without word data)."""
+        mean = self.confidence
+        return mean is not None and mean < threshold
+
+
+class TranscriptBuilder:
+    """
+    Collects word results from AddTranscript messages during one STT turn.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self.alt_start = array("I", [0])
+        self.alt_confidence = array("f")
+        self.starts = array("d")
+        self.ends = array("d")
+
+    def add_results(self, results: list) -> str:
+        """
+        Append the word results of one message.
+
+        Returns:
+            str: the message text (best alternative of each word, space separated)
+        """
+        text = []
+        for result in results:
+            if result.get("type") != "word":
+                continue
+            alternatives = result.get("alternatives") or []
+            if not alternatives:
+                continue
+            for alternative in alternatives:
+                self.strings.append(alternative.get("content", ""))
+                self.alt_confidence.append(alternative.get("confidence", 1.0))
+            self.alt_start.append(len(self.strings))
+            self.starts.append(result.get("start_time", 0.0))
+            self.ends.append(result.get("end_time", 0.0))
+            text.append(alternatives[0].get("content", ""))
+        return " ".join(text)
+
+    def build(self, text: str) -> Transcript:
+        return Transcript(text, self.strings, self.alt_start, self.alt_confidence, self.starts, self.ends)
@@ -1,13 +1,193 @@
 # ai/tts.py
+import asyncio
+import time
+
+from handoff.transcript import get_active_transcript
+from metrics.voice_agent import TTS_TIME_TO_FIRST_AUDIO, TURN_LATENCY
+from recording import get_active_recording
+from replay.recorder import get_active_recorder
+from .speech import PacedOutput, SegmentCache, SegmentJoiner, SentenceChunker, get_segment_cache, speech_registry
+
+SPEAKING_RATE = 14.0  # characters per second of synthesized Urdu/English speech
+
+# Speech engine for TTS instances created without one (None: prompts are only printed)
+_default_synthesizer = None
+
+
+def set_default_synthesizer(synthesizer):
+    """Process-wide speech engine; warmup prerenders its static segments at startup."""
+    global _default_synthesizer
+    _default_synthesizer = synthesizer
+
+
+def get_default_synthesizer():
+    return _default_synthesizer
+
+
 class TTS:
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, synthesizer=None, output=None, cache: SegmentCache = None):
+        """
+        Args:
+            synthesizer: TTS engine (async synthesize(text) -> 16 kHz int16 PCM);
+                default: set_default_synthesizer()'s; without one, prompts are only printed
+            output: Audio sink with async write(pcm) (default: paced at real time)
+            cache: Segment cache (default: the process-wide one for the synthesizer)
+        """
         self.logger = logger
+        synthesizer = synthesizer if synthesizer is not None else _default_synthesizer
+        self.synthesizer = synthesizer
+        self.output = output or PacedOutput()
+        self.cache = cache or (get_segment_cache(synthesizer) if synthesizer else None)
+
+    def estimate_duration(self, text: str) -> float:
+        """Expected playback time in seconds, used to arm STT before the prompt ends."""
+        return len(text) / SPEAKING_RATE
 
     async def play_audio(self, text: str) -> str:
+        started = time.perf_counter()
+        recording = self._announce(text)
+
+        if self.synthesizer is None:
+            # TODO: Implement actual TTS service
+            print(f"🔊 TTS Played: {text}")
+            TTS_TIME_TO_FIRST_AUDIO.observe(time.perf_counter() - started)
+        else:
+            await self._speak(text, started, recording)
+
+        return text
+
+    async def play_stream(self, text_stream, stop: asyncio.Event = None) -> str:
+        """
+        Speaks a reply while it is being generated (LLM.stream_response()).
+        The text is cut into sentences (the first one possibly at a comma);
+        each is played as soon as it is complete, and synthesis of the next
+        overlaps playback of the current one.
+
+        Args:
+            text_stream: Async iterable of text pieces
+            stop: Set on barge-in - playback stops and generation is cancelled
+                (cancelling the call does the same)
+
+        Returns:
+            str: What was spoken - less than the full reply after a barge-in
+        """
+        started = time.perf_counter()
+        ready = asyncio.Queue()     # (chunk, synthesis task or None), None at the end
+        spoken = []
+
+        async def generate():
+            chunker = SentenceChunker()
+            try:
+                async for text in text_stream:
+                    for chunk in chunker.push(text):
+                        ready.put_nowait(self._start_synthesis(chunk))
+                tail = chunker.flush()
+                if tail:
+                    ready.put_nowait(self._start_synthesis(tail))
+            finally:
+                ready.put_nowait(None)
+
+        async def speak():
+            while True:
+                item = await ready.get()
+                if item is None:
+                    return
+                chunk, audio = item
+                recording = self._announce(chunk)
+                try:
+                    if audio is None:
+                        print(f"🔊 TTS Played: {chunk}")
+                        pcm = b""
+                    else:
+                        pcm = await audio
+                    if not spoken:
+                        TTS_TIME_TO_FIRST_AUDIO.observe(time.perf_counter() - started)
+                    spoken.append(chunk)
+                    await self._write(pcm, recording)
+                finally:
+                    if audio:
+                        audio.cancel()
+
+        generator = asyncio.ensure_future(generate())
+        speaker = asyncio.ensure_future(speak())
+        stopped = asyncio.ensure_future(stop.wait()) if stop else None
+        try:
+            await asyncio.wait({speaker, stopped} - {None}, return_when=asyncio.FIRST_COMPLETED)
+            if speaker.done():
+                speaker.result()
+                generator.result()
+            elif self.logger:
+                self.logger.info(f"TTS stream stopped (barge-in) after: {' '.join(spoken)}")
+        finally:
+            for task in (generator, speaker, stopped):
+                if task:
+                    task.cancel()
+            # Chunks generated but not played: their synthesis is no longer needed
+            while not ready.empty():
+                item = ready.get_nowait()
+                if item and item[1]:
+                    item[1].cancel()
+        return " ".join(spoken)
+
+    def _start_synthesis(self, chunk: str):
+        if self.synthesizer is None:
+            return chunk, None
+        return chunk, asyncio.ensure_future(self.synthesizer.synthesize(chunk))
+
+    def _announce(self, text: str):
+        """Logs the prompt to the call's trace, transcript and recording; returns the recording."""
         if self.logger:
             self.logger.info(f"TTS Playing: {text}")
 
-        # TODO: Implement actual TTS service
+        recorder = get_active_recorder()
+        if recorder:
+            recorder.tts(text)
+
+        transcript = get_active_transcript()
+        if transcript:
+            turn_latency = transcript.since_caller()
+            if turn_latency is not None:
+                TURN_LATENCY.observe(turn_latency)
+            transcript.agent(text)
+
+        recording = get_active_recording()
+        if recording:
+            # Outbound PCM goes through recording.outbound() once TTS produces audio
+            recording.prompt(text)
+        return recording
+
+    async def prerender(self):
+        """Synthesize the static segments of every registered speech template."""
+        if self.cache:
+            await self.cache.prerender(speech_registry.templates())
+
+    async def _speak(self, text: str, started: float, recording):
+        """
+        Plays a prompt segment by segment: templated prompts (SpokenPrompt)
+        as cached static segments + slots, other text as one cached segment.
+        """
+        parts = [(part.strip(), static) for part, static in getattr(text, "parts", [(text, False)])]
+        # Everything starts synthesizing now; playback starts with the first segment
+        # while the later ones (usually the slots) are still on their way
+        pending = [asyncio.ensure_future(self.cache.audio(part, static)) for part, static in parts if part]
+        joiner = SegmentJoiner()
+        first_audio = True
+        try:
+            for segment in pending:
+                pcm = joiner.push(await segment)
+                if first_audio and pcm:
+                    TTS_TIME_TO_FIRST_AUDIO.observe(time.perf_counter() - started)
+                    first_audio = False
+                await self._write(pcm, recording)
+            await self._write(joiner.flush(), recording)
+        finally:
+            for segment in pending:
+                segment.cancel()
         print(f"🔊 TTS Played: {text}")
 
-        return text
\ No newline at end of file
+    async def _write(self, pcm: bytes, recording):
+        if not pcm:
+            return
+        if recording:
+            recording.outbound(pcm)
+        await self.output.write(pcm)
\ No newline at end of file
@@ -0,0 +1,76 @@
+# ai/turn.py
+
+"""
+Pipelined turn-taking: ask a question and listen for the answer.
+
+Instead of play_audio() then transcribe(), STT is armed while the prompt is
+still playing, so the Speechmatics session and the microphone are already
+live when the prompt ends. STT gets the prompt's end time and keeps the
+microphone gated until then (plus a short echo tail), so the agent's own
+voice is never transcribed.
+"""
+
+import asyncio
+
+from metrics.voice_agent import TURN_LISTEN_GAP
+
+# Start STT this long before the prompt is expected to end - covers session
+# setup and mic start
+ARM_LEAD = 1.0
+
+
+class TurnTaker:
+    """
+    Plays a prompt and captures the reply with STT armed during playback.
+    """
+
+    def __init__(self, stt, tts, logger=None, arm_lead: float = ARM_LEAD):
+        self.stt = stt
+        self.tts = tts
+        self.logger = logger
+        self.arm_lead = arm_lead
+
+    async def ask(self, prompt: str, turn_type: str = None):
+        """
+        Play prompt and return the caller's reply.
+
+        Args:
+            prompt: The text the agent says
+            turn_type: Kind of answer expected ("yes_no", "address", ...);
+                STT picks its recognition backend by it
+
+        Returns:
+            Transcript: what STT.transcribe() returned for the reply
+        """
+        loop = asyncio.get_running_loop()
+        prompt_end = loop.create_future()
+        listening = loop.create_future()
+
+        estimate = getattr(self.tts, "estimate_duration", None)
+        arm_after = max(0.0, estimate(prompt) - self.arm_lead) if estimate else 0.0
+
+        playback = asyncio.create_task(self.tts.play_audio(prompt))
+        listen = None
+        try:
+            # Arm STT near the end of playback (or as soon as playback finishes)
+            await asyncio.wait({playback}, timeout=arm_after)
+            kwargs = {"turn_type": turn_type} if turn_type else {}
+            listen = asyncio.create_task(self.stt.transcribe(prompt_end=prompt_end, listening=listening, **kwargs))
+            await playback
+            prompt_end.set_result(loop.time())
+        except BaseException:
+            playback.cancel()
+            if listen:
+                listen.cancel()
+            raise
+
+        reply = await listen
+
+        if listening.done():
+            # Dead air between the end of the prompt and a live microphone
+            # (0 when STT was ready before the prompt finished)
+            gap = max(0.0, listening.result() - prompt_end.result())
+            TURN_LISTEN_GAP.observe(gap)
+            if self.logger:
+                self.logger.debug(f"Turn - prompt end to listening: {gap * 1000:.0f} ms")
+        return reply
@@ -0,0 +1,55 @@
+# ai/upstream.py
+
+"""
+Upstream audio encoding for the Speechmatics stream.
+
+    pcm_s16le  16 kHz 16-bit PCM   256 kbit/s  (default, frames sent as captured)
+    mulaw      8 kHz G.711 μ-law    64 kbit/s  (resampled + encoded per frame)
+
+Select with STT(upstream_encoding=...) or the STT_UPSTREAM_ENCODING env var.
+NumPy and the codec tables are only loaded for the μ-law mode.
+"""
+
+UPSTREAM_SAMPLE_RATES = {
+    "pcm_s16le": 16000,
+    "mulaw": 8000,
+}
+
+
+class UpstreamEncoder:
+    """
+    Converts captured 16 kHz int16 frames into the upstream encoding.
+    One encoder per STT session - the resampler keeps filter state across frames.
+    """
+
+    def __init__(self, encoding: str = "pcm_s16le", input_rate: int = 16000):
+        if encoding not in UPSTREAM_SAMPLE_RATES:
+            raise ValueError(f"Unsupported upstream encoding: {encoding} (use one of {list(UPSTREAM_SAMPLE_RATES)})")
+        self.encoding = encoding
+        self.sample_rate = UPSTREAM_SAMPLE_RATES[encoding]
+        self.input_rate = input_rate
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+        if encoding == "mulaw":
+            import numpy as np
+            from telephony import g711
+            from telephony.resample import PolyphaseResampler
+
+            self._np = np
+            self._g711 = g711
+            self._resampler = PolyphaseResampler(self.sample_rate, input_rate)
+
+    def encode(self, frame) -> bytes:
+        """frame: anything with .tobytes() holding int16 PCM at input_rate."""
+        raw = frame.tobytes()
+        self.bytes_in += len(raw)
+
+        if self.encoding == "pcm_s16le":
+            payload = raw
+        else:
+            samples = self._np.frombuffer(raw, dtype=self._np.int16)
+            payload = self._g711.encode_ulaw(self._resampler.process(samples))
+
+        self.bytes_out += len(payload)
+        return payload
@@ -0,0 +1,139 @@
+# ai/warmup.py
+
+"""
+Background startup warmup.
+
+The controller starts it right away and only waits for the audio device;
+SDK imports and connection setup keep running while the greeting plays.
+STT waits on its own readiness signal before opening a session, so the
+first turn never races a half-loaded SDK.
+
+Components:
+- audio: sounddevice/PortAudio loaded and devices enumerated
+- stt:   speechmatics SDK imported, DNS + TLS to the RT endpoint done
+- llm:   google.genai imported, client built, auth + TLS connection pooled
+- pricing: price list loaded and every deal basket precomputed
+- local_asr: local recogniser workers started and their models loaded
+  (only when faster-whisper is installed)
+- tts:   static segments of every speech template synthesized into the
+  process-wide segment cache (only when a synthesizer is configured)
+"""
+
+import asyncio
+import ssl
+import time
+from urllib.parse import urlparse
+
+from .env import getenv
+
+DEFAULT_SPEECHMATICS_URL = "wss://eu2.rt.speechmatics.com/v2"
+
+
+class Warmup:
+
+    def __init__(self):
+        self.logger = None
+        self.timings = {}   # component -> seconds
+        self._events = {}   # component -> asyncio.Event
+        self._tasks = []
+
+    def start(self, logger=None):
+        """Kick off all warmup steps in the background. Safe to call once per process."""
+        if self._events:
+            return
+        self.logger = logger
+        steps = {
+            "audio": self._warm_audio,
+            "stt": self._warm_stt,
+            "llm": self._warm_llm,
+            "pricing": self._warm_pricing,
+        }
+        from .local_asr import local_asr_available
+        if local_asr_available():
+            steps["local_asr"] = self._warm_local_asr
+        from .tts import get_default_synthesizer
+        if get_default_synthesizer() is not None:
+            steps["tts"] = self._warm_tts
+        for name, step in steps.items():
+            self._events[name] = asyncio.Event()
+            self._tasks.append(asyncio.create_task(self._run(name, step)))
+
+    async def wait_ready(self, component: str, timeout: float = None) -> bool:
+        """
+        Wait until a component has finished warming up.
+        Returns immediately when warmup was never started (tests, replay).
+
+        Returns:
+            bool: False if the timeout ran out first
+        """
+        event = self._events.get(component)
+        if event is None:
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            if self.logger:
+                self.logger.warning(f"Warmup - '{component}' not ready after {timeout}s, continuing")
+            return False
+
+    async def _run(self, name: str, step):
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            # Best effort - the real call will surface the error with full context
+            if self.logger:
+                self.logger.warning(f"Warmup - {name} failed: {e}")
+        finally:
+            self.timings[name] = time.perf_counter() - started
+            self._events[name].set()
+            if self.logger:
+                self.logger.info(f"Warmup - {name} ready in {self.timings[name] * 1000:.0f} ms")
+
+    async def _warm_audio(self):
+        from .stt import load_sounddevice
+        sd = await asyncio.to_thread(load_sounddevice)
+        await asyncio.to_thread(sd.query_devices)
+
+    async def _warm_stt(self):
+        from .stt import load_speechmatics
+        await asyncio.to_thread(load_speechmatics)
+
+        # Each transcribe() opens its own websocket, so only DNS and the TLS
+        # handshake path can be warmed here (OS resolver cache, route, certs).
+        url = urlparse(getenv("SPEECHMATICS_RT_URL", DEFAULT_SPEECHMATICS_URL))
+        secure = url.scheme == "wss"
+        port = url.port or (443 if secure else 80)
+        if secure:
+            _, writer = await asyncio.open_connection(url.hostname, port, ssl=ssl.create_default_context(), server_hostname=url.hostname)
+        else:
+            _, writer = await asyncio.open_connection(url.hostname, port)
+        writer.close()
+        await writer.wait_closed()
+
+    async def _warm_llm(self):
+        from .llm import get_client, load_genai_types, MODEL_NAME
+        client = await asyncio.to_thread(get_client)
+        await asyncio.to_thread(load_genai_types)
+
+        # Cheap authenticated request: resolves DNS, completes TLS and auth,
+        # and leaves a pooled keep-alive connection for the first real prompt.
+        await client.aio.models.get(model=MODEL_NAME)
+
+    async def _warm_local_asr(self):
+        from .local_asr import get_local_pool
+        await get_local_pool(self.logger).warm()
+
+    async def _warm_tts(self):
+        import orchestrator.prompts  # noqa: F401 - registers the speech templates
+        from .tts import TTS
+        await TTS(logger=self.logger).prerender()
+
+    async def _warm_pricing(self):
+        from pricing import get_engine
+        await asyncio.to_thread(get_engine, self.logger)
+
+
+# Process-wide warmup shared by the controller and the AI classes
+warmup = Warmup()
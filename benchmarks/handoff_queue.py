@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Handoff Queue Benchmark
+Peak-hour burst: thousands of calls routed to agents at once, then every
+agent finishing calls and pulling the next one until the queue drains.
+Reports the cost per transfer of the heap-based desk next to a naive
+linear-scan desk (scan the queue for the top priority, scan agents for the
+least loaded) at the same sizes.
+
+    python benchmarks/handoff_queue.py --calls 1000 10000 50000 --agents 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from handoff import Agent, AgentPool, HandoffDesk
+from handoff.queue import DEFAULT_REASON_BOOST, REASON_BOOST, VALUE_BOOST
+
+REASONS = list(REASON_BOOST)
+
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_calls(n: int, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    return [
+        (f"92300{i:07d}", rng.choice(REASONS), round(rng.random(), 2))
+        for i in range(n)
+    ]
+
+
+def run_heap(calls: list, agents: int) -> dict:
+    clock = VirtualClock()
+    desk = HandoffDesk(pool=AgentPool(Agent(f"agent-{i:04d}") for i in range(agents)), clock=clock)
+
+    started = time.perf_counter()
+    for msisdn, reason, value in calls:
+        clock.now += 0.001
+        desk.submit(msisdn, reason, context={"msisdn": msisdn}, customer_value=value)
+    submit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    while desk.assignments:
+        clock.now += 0.01
+        desk.complete(next(iter(desk.assignments)))
+    drain_seconds = time.perf_counter() - started
+
+    return {"submit_us": submit_seconds / len(calls) * 1e6, "transfer_us": drain_seconds / len(calls) * 1e6,
+            "assigned": desk.total_assigned}
+
+
+def run_naive(calls: list, agents: int) -> dict:
+    """Same policy with lists: O(n) queue scan + O(agents) agent scan per transfer."""
+    now = 0.0
+    queue = []
+    loads = {f"agent-{i:04d}": 0 for i in range(agents)}
+    assignments = {}
+
+    def dispatch():
+        while queue:
+            agent_id = min(loads, key=loads.get)
+            if loads[agent_id] >= 1:
+                return
+            best = min(range(len(queue)), key=lambda i: queue[i][0])
+            _, handoff_id = queue.pop(best)
+            loads[agent_id] += 1
+            assignments[handoff_id] = agent_id
+
+    started = time.perf_counter()
+    for handoff_id, (_, reason, value) in enumerate(calls):
+        now += 0.001
+        boost = REASON_BOOST.get(reason, DEFAULT_REASON_BOOST) + VALUE_BOOST * value
+        queue.append((now - boost, handoff_id))
+        dispatch()
+    submit_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    assigned = 0
+    while assignments:
+        handoff_id = next(iter(assignments))
+        loads[assignments.pop(handoff_id)] -= 1
+        assigned += 1
+        dispatch()
+    drain_seconds = time.perf_counter() - started
+
+    return {"submit_us": submit_seconds / len(calls) * 1e6, "transfer_us": drain_seconds / len(calls) * 1e6,
+            "assigned": assigned}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent handoff queue benchmark")
+    parser.add_argument("--calls", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--agents", type=int, default=200)
+    parser.add_argument("--naive-max", type=int, default=20000, help="Skip the naive desk above this many calls")
+    args = parser.parse_args()
+
+    print("\n📞 HANDOFF QUEUE BENCHMARK")
+    print("=" * 60)
+    print(f"  agents: {args.agents}")
+    print(f"  {'calls':>8}  {'heap submit':>12}  {'heap transfer':>14}  {'naive submit':>13}  {'naive transfer':>15}")
+    for n in args.calls:
+        calls = make_calls(n)
+        heap = run_heap(calls, args.agents)
+        assert heap["assigned"] == n
+        if n <= args.naive_max:
+            naive = run_naive(calls, args.agents)
+            naive_cols = f"{naive['submit_us']:>10.1f} µs  {naive['transfer_us']:>12.1f} µs"
+        else:
+            naive_cols = f"{'-':>13}  {'-':>15}"
+        print(f"  {n:>8}  {heap['submit_us']:>9.1f} µs  {heap['transfer_us']:>11.1f} µs  {naive_cols}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
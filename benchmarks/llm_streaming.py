@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+LLM Streaming Benchmark
+Time to first audio for generated replies (order readbacks, clarification
+questions): waiting for the whole LLM response before synthesizing it,
+against streaming the response and speaking it a sentence at a time.
+Reports time to first audio and time until the reply has been spoken. Runs
+on the simulation's virtual clock with the fake LLM and synthesizer, so the
+latencies are exact and the run is instant.
+
+    python benchmarks/llm_streaming.py --replies 200 --first-token 0.4 --token-latency 0.03
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.fake_llm import FakeLLMBackend
+from ai.llm import LLM
+from ai.speech import FakeSynthesizer, PacedOutput
+from ai.tts import TTS
+from sim.loop import run
+
+ITEMS = ["Zinger Burger", "Chicken Tikka Pizza", "Club Sandwich", "Beef Burger", "Chicken Wrap"]
+EXTRAS = ["Fries", "Drink", "Coleslaw", "Garlic Bread"]
+
+
+def readback(rng: random.Random) -> str:
+    """A generated order readback of one to three sentences after an acknowledgement."""
+    quantity = rng.randint(1, 4)
+    extras = " aur ".join(rng.sample(EXTRAS, rng.randint(1, 2)))
+    sentences = [
+        f"Ji bilkul, aap ka order {quantity} {rng.choice(ITEMS)} ke saath {extras} hai.",
+        f"Is ka total {rng.randint(6, 40) * 50} rupay banta hai.",
+        "Delivery takreeban chalees minute mein ho jayegi.",
+        "Kya main aap ka order confirm kar doon?",
+    ]
+    return " ".join(sentences[:1] + rng.sample(sentences[1:], rng.randint(1, 3)))
+
+
+class TimedOutput(PacedOutput):
+    """Paced output that notes when the first audio of a reply was written."""
+
+    def __init__(self):
+        super().__init__()
+        self.first = None
+
+    async def write(self, pcm: bytes):
+        if self.first is None:
+            self.first = asyncio.get_running_loop().time()
+        await super().write(pcm)
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+async def speak_replies(args, replies: list, streamed: bool) -> dict:
+    loop = asyncio.get_running_loop()
+    first_audio, total = [], []
+    for reply in replies:
+        llm = LLM(backend=FakeLLMBackend(default_response=reply, latency=args.first_token,
+                                         token_latency=args.token_latency))
+        output = TimedOutput()
+        tts = TTS(synthesizer=FakeSynthesizer(latency=args.tts_latency, per_char=args.per_char), output=output)
+        started = loop.time()
+        if streamed:
+            await tts.play_stream(llm.stream_response("readback"))
+        else:
+            await tts.play_audio(await llm.get_response("readback"))
+        first_audio.append(output.first - started)
+        total.append(loop.time() - started)
+    return {"ttfa_p50": percentile(first_audio, 50), "ttfa_p95": percentile(first_audio, 95),
+            "total_p50": percentile(total, 50)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM streaming time-to-first-audio benchmark")
+    parser.add_argument("--replies", type=int, default=200)
+    parser.add_argument("--first-token", type=float, default=0.4, help="LLM time to first token (s)")
+    parser.add_argument("--token-latency", type=float, default=0.03, help="LLM seconds per word after the first")
+    parser.add_argument("--tts-latency", type=float, default=0.25, help="Synthesizer latency per request (s)")
+    parser.add_argument("--per-char", type=float, default=0.005, help="Synthesizer seconds per character")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    replies = [readback(rng) for _ in range(args.replies)]
+    words = sorted(len(reply.split()) for reply in replies)
+
+    print("\n🌊 LLM STREAMING BENCHMARK")
+    print("=" * 78)
+    print(f"  {args.replies} replies ({words[len(words) // 2]} words p50), LLM {args.first_token * 1000:.0f} ms "
+          f"+ {args.token_latency * 1000:.0f} ms/word, TTS {args.tts_latency * 1000:.0f} ms "
+          f"+ {args.per_char * 1000:.1f} ms/char")
+    print(f"  {'mode':>10}  {'TTFA p50':>9}  {'TTFA p95':>9}  {'spoken p50':>10}")
+    for mode, streamed in (("full", False), ("streamed", True)):
+        # TTS prints every reply it plays
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            r = run(speak_replies(args, replies, streamed))
+        print(f"  {mode:>10}  {r['ttfa_p50'] * 1000:>6.0f} ms  {r['ttfa_p95'] * 1000:>6.0f} ms  "
+              f"{r['total_p50']:>8.2f} s")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
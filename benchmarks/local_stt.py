@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Local STT Benchmark
+Real-time factor and concurrency per core of the local CPU recogniser.
+Bursts of short utterances (as when many calls answer a yes/no question at
+once) go through LocalASRPool with 1..N worker processes, with and without
+batching. Reports per utterance latency (end of speech to words), CPU seconds
+per second of speech (RTF), and how many concurrent turns each core handles
+while p95 latency stays within the budget.
+
+    python benchmarks/local_stt.py --workers 1 2 4 --concurrency 1 4 16 32
+    python benchmarks/local_stt.py --wav yes.wav no.wav --model base
+    python benchmarks/local_stt.py --fake --fake-rtf 0.02 --window-cost 0.3     # no model needed (CI)
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import sys
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.audio_io import read_wav
+from ai.local_asr import BYTES_PER_SECOND, SAMPLE_RATE, FakeRecognizer, LocalASRPool, WhisperRecognizer
+
+
+def synthetic_utterance(seconds: float, frequency: float = 220.0) -> bytes:
+    """A voiced tone burst with 0.2 s of silence either side."""
+    silence = bytes(int(0.2 * BYTES_PER_SECOND))
+    tone = array("h", (int(4000 * math.sin(2 * math.pi * frequency * i / SAMPLE_RATE))
+                       for i in range(int(seconds * SAMPLE_RATE))))
+    return silence + tone.tobytes() + silence
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+async def run_burst(pool: LocalASRPool, utterances: list, concurrency: int, rounds: int) -> dict:
+    latencies = []
+    audio = 0.0
+    started = time.perf_counter()
+    for r in range(rounds):
+        batch = [utterances[(r * concurrency + i) % len(utterances)] for i in range(concurrency)]
+        audio += sum(len(pcm) for pcm in batch) / BYTES_PER_SECOND
+
+        async def one(pcm):
+            t = time.perf_counter()
+            await pool.recognize(pcm)
+            latencies.append(time.perf_counter() - t)
+
+        await asyncio.gather(*(one(pcm) for pcm in batch))
+    wall = time.perf_counter() - started
+    return {"p50": percentile(latencies, 50), "p95": percentile(latencies, 95),
+            "throughput": audio / wall}
+
+
+async def run_config(args, utterances: list, workers: int, batch_window: float) -> list:
+    if args.fake:
+        factory, kwargs = FakeRecognizer, {"rtf": args.fake_rtf, "window_cost": args.window_cost}
+    else:
+        factory, kwargs = WhisperRecognizer, {"model": args.model, "threads": args.threads}
+    pool = LocalASRPool(workers, factory, kwargs, batch_window=batch_window)
+    try:
+        # Start every worker and load its model before timing
+        await asyncio.gather(*(pool.recognize(utterances[0]) for _ in range(workers)))
+        rows = []
+        for concurrency in args.concurrency:
+            pool.cpu_seconds = pool.audio_seconds = 0.0
+            result = await run_burst(pool, utterances, concurrency, args.rounds)
+            result.update(concurrency=concurrency, rtf=pool.real_time_factor)
+            rows.append(result)
+        return rows
+    finally:
+        pool.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local STT real-time factor / concurrency benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--rounds", type=int, default=3, help="Bursts per concurrency level")
+    parser.add_argument("--wav", nargs="*", default=[], help="16 kHz mono WAV utterances (default: synthetic)")
+    parser.add_argument("--seconds", type=float, default=1.5, help="Synthetic utterance length")
+    parser.add_argument("--model", default="small")
+    parser.add_argument("--threads", type=int, default=1, help="CPU threads per worker")
+    parser.add_argument("--budget", type=float, default=1.0, help="p95 latency budget in seconds")
+    parser.add_argument("--fake", action="store_true", help="FakeRecognizer instead of Whisper")
+    parser.add_argument("--fake-rtf", type=float, default=0.05)
+    parser.add_argument("--window-cost", type=float, default=0.3, help="Fake: CPU seconds per pass")
+    args = parser.parse_args()
+
+    utterances = [read_wav(path, SAMPLE_RATE) for path in args.wav] or [synthetic_utterance(args.seconds)]
+    engine = "fake" if args.fake else f"whisper-{args.model} int8, {args.threads} thread(s)/worker"
+
+    print("\n🗣️  LOCAL STT BENCHMARK")
+    print("=" * 78)
+    print(f"  engine: {engine}   utterances: {len(utterances)}   p95 budget: {args.budget:.2f} s")
+    print(f"  {'workers':>7}  {'batching':>8}  {'concurrent':>10}  {'p50':>8}  {'p95':>8}  "
+          f"{'RTF':>6}  {'speech s/s':>10}")
+    for workers in args.workers:
+        for batching, window in (("off", 0.0), ("on", 0.05)):
+            rows = asyncio.run(run_config(args, utterances, workers, window))
+            for row in rows:
+                print(f"  {workers:>7}  {batching:>8}  {row['concurrency']:>10}  {row['p50']:>6.3f} s  "
+                      f"{row['p95']:>6.3f} s  {row['rtf']:>6.3f}  {row['throughput']:>10.1f}")
+            within = [row["concurrency"] for row in rows if row["p95"] <= args.budget]
+            per_core = max(within) / (workers * args.threads) if within else 0
+            print(f"  {'':>7}  {'':>8}  → {per_core:.1f} concurrent turns per core within budget")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Order Outbox Benchmark
+Confirms N orders against a local stub POS that can be slow, fail batches
+(HTTP 503) or answer after the client has timed out (so retries hit the
+POS's duplicate check). Reports what a call pays to confirm an order
+(outbox append vs. a synchronous POS request), how long the backlog takes
+to drain, and checks every order reached the POS exactly once.
+
+    python benchmarks/outbox_pos.py --orders 2000
+    python benchmarks/outbox_pos.py --orders 2000 --latency-ms 300 --failure-rate 0.3 --drop-rate 0.1
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from outbox import OutboxOrder, OutboxSender, OutboxStore, POSClient, POSError, StubPOS
+
+
+def make_order(i: int) -> dict:
+    return {"call_id": f"bench-{i:06d}", "msisdn": f"92300{i:07d}", "order_item": "zinger burger",
+            "quantity": "2", "extra": "fries", "cost": {"total": 1630, "currency": "PKR"}}
+
+
+def percentile(values, p):
+    return float(np.percentile(values, p)) if len(values) else 0.0
+
+
+def run_outbox(args, pos: StubPOS, directory: str) -> dict:
+    store = OutboxStore(os.path.join(directory, "outbox.db"))
+    client = POSClient(pos.url, timeout=args.timeout)
+    sender = OutboxSender(store, client, batch_size=args.batch_size, lease=args.timeout * 3,
+                          base_backoff=0.05, max_backoff=1.0, poll_interval=0.05)
+    sender.start()
+
+    append_us = []
+    started = time.perf_counter()
+    for i in range(args.orders):
+        t0 = time.perf_counter_ns()
+        store.append(f"bench-{i:06d}", make_order(i))
+        sender.wake()
+        append_us.append((time.perf_counter_ns() - t0) / 1000)
+    # A resumed call confirming again must not create a second order
+    store.append("bench-000000", make_order(0))
+
+    while store.backlog()[0] and time.perf_counter() - started < args.deadline:
+        time.sleep(0.05)
+    drain_seconds = time.perf_counter() - started
+    sender.close()
+    client.close()
+
+    return {
+        "append_us_p50": percentile(append_us, 50),
+        "append_us_p99": percentile(append_us, 99),
+        "drain_s": drain_seconds,
+        "store": store.counts(),
+        **sender.stats(),
+    }
+
+
+def run_sync(args, pos: StubPOS, count: int) -> dict:
+    """Each call submits its own order and waits for the POS (with immediate retries)."""
+    client = POSClient(pos.url, timeout=args.timeout)
+    wait_ms = []
+    for i in range(count):
+        order = OutboxOrder(i, f"sync-{i:06d}", make_order(i), 1, time.time())
+        t0 = time.perf_counter()
+        for _ in range(10):
+            try:
+                client.submit([order])
+                break
+            except POSError:
+                pass
+        wait_ms.append((time.perf_counter() - t0) * 1000)
+    client.close()
+    return {"wait_ms_p50": percentile(wait_ms, 50), "wait_ms_p99": percentile(wait_ms, 99)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Order outbox against a stub POS")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Stub POS delay per request")
+    parser.add_argument("--failure-rate", type=float, default=0.2, help="Share of batches answered 503")
+    parser.add_argument("--drop-rate", type=float, default=0.05, help="Share of batches answered after timeout")
+    parser.add_argument("--timeout", type=float, default=1.0, help="POS client timeout (s)")
+    parser.add_argument("--sync-calls", type=int, default=50, help="Calls for the synchronous comparison")
+    parser.add_argument("--deadline", type=float, default=120.0)
+    args = parser.parse_args()
+
+    pos = StubPOS(latency=args.latency_ms / 1000, failure_rate=args.failure_rate, drop_rate=args.drop_rate,
+                  timeout=args.timeout, seed=0).start()
+    directory = tempfile.mkdtemp(prefix="outbox-bench-")
+    try:
+        result = run_outbox(args, pos, directory)
+        print(f"Outbox: {args.orders} orders, batch {args.batch_size}, POS latency {args.latency_ms:.0f} ms, "
+              f"failure {args.failure_rate:.0%}, late answers {args.drop_rate:.0%}")
+        print(f"  append per call:  p50 {result['append_us_p50']:.0f} us   p99 {result['append_us_p99']:.0f} us")
+        print(f"  drained in:       {result['drain_s']:.2f} s  ({result['batches']} batches, "
+              f"{result['retries']} order retries, {pos.duplicates} duplicates absorbed by POS)")
+        print(f"  outbox rows:      {result['store']}")
+
+        sync = run_sync(args, pos, args.sync_calls)
+        print(f"Synchronous submit ({args.sync_calls} calls):")
+        print(f"  call waits:       p50 {sync['wait_ms_p50']:.0f} ms   p99 {sync['wait_ms_p99']:.0f} ms")
+
+        delivered = sum(1 for key in pos.orders if key.startswith("bench-"))
+        exactly_once = delivered == args.orders and result["store"].get("sent") == args.orders
+        print(f"\nPOS received {delivered}/{args.orders} orders, each once: {'OK' if exactly_once else 'FAILED'}")
+        return 0 if exactly_once else 1
+    finally:
+        pos.close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
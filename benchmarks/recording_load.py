@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Call Recording Load Benchmark
+Simulates N concurrent calls delivering 20 ms inbound frames (and optional
+outbound frames) from an audio thread, once with recording off and once on,
+and compares the audio path: time spent per frame hand-off and tick jitter.
+--slow-disk-ms adds a delay to every writer batch to show the memory budget
+holding (chunks are dropped and counted, the audio path is not slowed).
+
+    python benchmarks/recording_load.py --calls 200 --seconds 20
+    python benchmarks/recording_load.py --calls 200 --slow-disk-ms 500 --max-pending-mb 8
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recording import RecordingWriter
+
+FRAME_SECONDS = 0.02
+FRAME_SAMPLES = 320  # 20 ms at 16 kHz
+
+
+def percentile(values, p):
+    return float(np.percentile(values, p)) if len(values) else 0.0
+
+
+def run_audio_thread(recordings, seconds: float, outbound: bool) -> dict:
+    """One tick every 20 ms delivers a frame per call, like PortAudio callbacks."""
+    frame = np.random.default_rng(0).integers(-3000, 3000, FRAME_SAMPLES, dtype=np.int16)
+    handoff_ns = []
+    lateness = []
+
+    ticks = int(seconds / FRAME_SECONDS)
+    started = time.perf_counter()
+    for tick in range(ticks):
+        due = started + tick * FRAME_SECONDS
+        now = time.perf_counter()
+        if now < due:
+            time.sleep(due - now)
+        lateness.append((time.perf_counter() - due) * 1000)
+
+        for recording in recordings:
+            t0 = time.perf_counter_ns()
+            if recording is not None:
+                recording.inbound(frame)
+                if outbound:
+                    recording.outbound(frame)
+            handoff_ns.append(time.perf_counter_ns() - t0)
+
+    return {
+        "handoff_us_p50": percentile(handoff_ns, 50) / 1000,
+        "handoff_us_p99": percentile(handoff_ns, 99) / 1000,
+        "handoff_us_max": max(handoff_ns) / 1000,
+        "tick_late_ms_p50": percentile(lateness, 50),
+        "tick_late_ms_p99": percentile(lateness, 99),
+        "tick_late_ms_max": max(lateness),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recording overhead under concurrent calls")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--seconds", type=float, default=20.0)
+    parser.add_argument("--outbound", action="store_true", help="Also record an outbound frame per tick")
+    parser.add_argument("--compress", action="store_true")
+    parser.add_argument("--segment-mb", type=int, default=32)
+    parser.add_argument("--max-pending-mb", type=int, default=64)
+    parser.add_argument("--slow-disk-ms", type=float, default=0.0, help="Artificial delay per writer batch")
+    parser.add_argument("--dir", help="Recording directory (default: temporary, removed afterwards)")
+    args = parser.parse_args()
+
+    directory = args.dir or tempfile.mkdtemp(prefix="recording-bench-")
+
+    baseline = run_audio_thread([None] * args.calls, args.seconds, args.outbound)
+
+    writer = RecordingWriter(
+        directory,
+        segment_bytes=args.segment_mb * 1024 * 1024,
+        max_pending_bytes=args.max_pending_mb * 1024 * 1024,
+        compress=args.compress,
+    )
+    if args.slow_disk_ms:
+        apply = writer._apply
+
+        def slow_apply(item, _last=[0.0]):
+            # One stall per batch, not per chunk
+            if time.monotonic() - _last[0] > writer.flush_interval:
+                time.sleep(args.slow_disk_ms / 1000)
+                _last[0] = time.monotonic()
+            return apply(item)
+        writer._apply = slow_apply
+
+    writer.start()
+    recordings = [writer.open_call(f"bench-{i}", f"92300{i:07d}", 16000) for i in range(args.calls)]
+
+    peak_pending = [0]
+
+    def sample_pending():
+        while not stop_sampling:
+            peak_pending[0] = max(peak_pending[0], writer.pending_bytes)
+            time.sleep(0.01)
+
+    stop_sampling = False
+    sampler = threading.Thread(target=sample_pending, daemon=True)
+    sampler.start()
+
+    recorded = run_audio_thread(recordings, args.seconds, args.outbound)
+
+    for recording in recordings:
+        recording.close()
+    close_started = time.perf_counter()
+    writer.close(timeout=60)
+    drain_seconds = time.perf_counter() - close_started
+    stop_sampling = True
+    sampler.join()
+
+    on_disk = sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory) for name in names
+    )
+    stats = writer.stats()
+
+    print("\n🎙️  CALL RECORDING LOAD BENCHMARK")
+    print("=" * 60)
+    print(f"  calls: {args.calls}   audio: {args.seconds:.0f}s   frames/s: {args.calls / FRAME_SECONDS:.0f}")
+    print(f"  {'':24}{'off':>12}{'on':>12}")
+    for key in baseline:
+        print(f"  {key:24}{baseline[key]:>12.3f}{recorded[key]:>12.3f}")
+    print(f"  written:              {stats['written_bytes'] / 1e6:.1f} MB")
+    print(f"  dropped:              {stats['dropped_bytes'] / 1e6:.1f} MB")
+    print(f"  peak pending memory:  {peak_pending[0] / 1e6:.1f} MB (budget {args.max_pending_mb} MB)")
+    print(f"  on disk:              {on_disk / 1e6:.1f} MB in {stats['segments_closed']} segments")
+    print(f"  drain on close:       {drain_seconds * 1000:.0f} ms")
+    print("=" * 60)
+
+    if not args.dir:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+Measures cold import time of main.py, the import cost of each heavy SDK,
+and time from process start to the first TTS prompt.
+
+Every measurement runs in a fresh interpreter so nothing is cached.
+
+    python benchmarks/startup.py --runs 5 --report startup.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SDK_MODULES = ["google.genai", "speechmatics.rt", "sounddevice", "dotenv"]
+
+# Runs inside the child interpreter: import main, then start the controller
+# and stop at the first TTS prompt.
+FIRST_PROMPT_SNIPPET = r"""
+import time
+t0 = time.perf_counter()
+import asyncio, json, sys
+sys.path.insert(0, {root!r})
+import main
+import_s = time.perf_counter() - t0
+
+import ai.tts
+
+class FirstPrompt(Exception):
+    pass
+
+async def play_audio(self, text):
+    raise FirstPrompt(time.perf_counter() - t0)
+
+ai.tts.TTS.play_audio = play_audio
+first_prompt_s = None
+try:
+    asyncio.run(main.voice_agent_controller())
+except FirstPrompt as e:
+    first_prompt_s = e.args[0]
+print("RESULT " + json.dumps({{"import_s": import_s, "first_prompt_s": first_prompt_s}}))
+"""
+
+IMPORT_SNIPPET = r"""
+import time, json
+t0 = time.perf_counter()
+try:
+    import {module}
+    ok = True
+except (ImportError, OSError):
+    # OSError: sounddevice without PortAudio (headless machines)
+    ok = False
+print("RESULT " + json.dumps({{"seconds": time.perf_counter() - t0, "ok": ok}}))
+"""
+
+
+def run_child(code: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    for line in out.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    raise RuntimeError(f"Benchmark child failed:\n{out.stderr}")
+
+
+def summarize(values: list) -> dict:
+    values = [v for v in values if v is not None]
+    if not values:
+        return {}
+    return {
+        "min_ms": round(min(values) * 1000, 1),
+        "median_ms": round(statistics.median(values) * 1000, 1),
+        "max_ms": round(max(values) * 1000, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice agent startup benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--report", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    print("\n⏱️  STARTUP BENCHMARK")
+    print("=" * 60)
+
+    sdk = {}
+    for module in SDK_MODULES:
+        results = [run_child(IMPORT_SNIPPET.format(module=module)) for _ in range(args.runs)]
+        if not results[0]["ok"]:
+            print(f"  {module:<18} not installed")
+            continue
+        sdk[module] = summarize([r["seconds"] for r in results])
+        print(f"  {module:<18} import median {sdk[module]['median_ms']} ms")
+
+    runs = [run_child(FIRST_PROMPT_SNIPPET.format(root=ROOT)) for _ in range(args.runs)]
+    report = {
+        "runs": args.runs,
+        "sdk_import": sdk,
+        "main_import": summarize([r["import_s"] for r in runs]),
+        "time_to_first_prompt": summarize([r["first_prompt_s"] for r in runs]),
+    }
+
+    print("-" * 60)
+    print(f"  main.py import      median {report['main_import'].get('median_ms')} ms")
+    print(f"  time to 1st prompt  median {report['time_to_first_prompt'].get('median_ms')} ms")
+    print("=" * 60)
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📋 Report written to: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
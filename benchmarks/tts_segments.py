@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+TTS Segment Cache Benchmark
+The address confirmation prompt for many calls (different customers, some
+repeat callers), synthesized as one sentence per call against the templated
+path. In the templated path, static segments are prerendered, slots are
+synthesized on demand through the LRU cache, and playback starts before
+the slots are ready.
+Reports time to first audio, time until the whole prompt has played,
+synthesis requests and characters synthesized. Runs on the simulation's
+virtual clock, so the synthesizer's latencies are exact and the run is
+instant.
+
+    python benchmarks/tts_segments.py --calls 1000 --customers 400 --latency 0.25 --per-char 0.005
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.speech import FakeSynthesizer, PacedOutput
+from ai.tts import TTS
+from orchestrator.prompts import ADDRESS_CONFIRMATION
+from sim.loop import run
+
+NAMES = ["Ali Raza", "Ayesha Khan", "Bilal Ahmed", "Fatima Noor", "Hamza Malik", "Sana Iqbal", "Usman Tariq"]
+AREAS = ["G-8", "G-9", "F-7", "I-10", "DHA Phase 2", "Bahria Town", "Gulberg"]
+
+
+class TimedOutput(PacedOutput):
+    """Paced output that notes when the first and last audio of a prompt were written."""
+
+    def __init__(self):
+        super().__init__()
+        self.first = None
+
+    async def write(self, pcm: bytes):
+        if self.first is None:
+            self.first = asyncio.get_running_loop().time()
+        await super().write(pcm)
+
+
+def customers(n: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    return [(rng.choice(NAMES), f"House {rng.randint(1, 400)}, {rng.choice(AREAS)}, Islamabad") for _ in range(n)]
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+async def play_calls(args, calls: list, templated: bool) -> dict:
+    synthesizer = FakeSynthesizer(latency=args.latency, per_char=args.per_char)
+    tts = TTS(synthesizer=synthesizer)
+    if templated:
+        await tts.prerender()
+    prerender_requests = synthesizer.requests
+    chars = 0
+    original = synthesizer.synthesize
+
+    async def counting(text):
+        nonlocal chars
+        chars += len(text)
+        return await original(text)
+
+    synthesizer.synthesize = counting
+    loop = asyncio.get_running_loop()
+    first_audio, total = [], []
+    for name, address in calls:
+        prompt = ADDRESS_CONFIRMATION.fill(customer_name=name, customer_address=address)
+        tts.output = output = TimedOutput()
+        started = loop.time()
+        await tts.play_audio(prompt if templated else str(prompt))
+        first_audio.append(output.first - started)
+        total.append(loop.time() - started)
+    return {
+        "ttfa_p50": percentile(first_audio, 50), "ttfa_p95": percentile(first_audio, 95),
+        "total_p50": percentile(total, 50),
+        "requests": synthesizer.requests - prerender_requests, "prerendered": prerender_requests,
+        "chars": chars,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TTS segment cache benchmark")
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--customers", type=int, default=400, help="Distinct customers among the calls")
+    parser.add_argument("--latency", type=float, default=0.25, help="Synthesizer latency per request (s)")
+    parser.add_argument("--per-char", type=float, default=0.005, help="Synthesizer seconds per character")
+    args = parser.parse_args()
+
+    pool = customers(args.customers)
+    rng = random.Random(11)
+    calls = [rng.choice(pool) for _ in range(args.calls)]
+
+    print("\n🔊 TTS SEGMENT CACHE BENCHMARK")
+    print("=" * 78)
+    print(f"  {args.calls} calls, {args.customers} customers, synthesizer {args.latency * 1000:.0f} ms "
+          f"+ {args.per_char * 1000:.1f} ms/char")
+    print(f"  {'mode':>10}  {'TTFA p50':>9}  {'TTFA p95':>9}  {'played p50':>10}  {'requests':>8}  {'chars':>8}")
+    for mode, templated in (("sentence", False), ("templated", True)):
+        # TTS prints every prompt it plays
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            r = run(play_calls(args, calls, templated))
+        print(f"  {mode:>10}  {r['ttfa_p50'] * 1000:>6.0f} ms  {r['ttfa_p95'] * 1000:>6.0f} ms  "
+              f"{r['total_p50']:>8.2f} s  {r['requests']:>8}  {r['chars']:>8}"
+              + (f"   (+{r['prerendered']} prerendered)" if r["prerendered"] else ""))
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
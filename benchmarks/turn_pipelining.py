@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Turn Pipelining Benchmark
+One question/answer turn with a simulated TTS prompt, Speechmatics session
+setup and a caller who answers the moment the prompt ends. Compares
+play_audio() then transcribe() against TurnTaker.ask() (STT armed during
+playback) and reports the dead air between prompt end and a live mic (the
+start of the caller's answer that gets clipped) and how many prompt-echo
+frames reached STT.
+
+    python benchmarks/turn_pipelining.py --prompt-seconds 3 --setup-ms 400
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from ai import STT
+from ai.turn import TurnTaker
+
+FRAME_SECONDS = 0.02
+
+
+class Caller:
+    """Starts talking when the prompt ends; the mic hears the prompt (echo) before that."""
+
+    def __init__(self):
+        self.prompt_end = None
+
+    def frame(self) -> np.ndarray:
+        speaking = self.prompt_end is not None and time.monotonic() >= self.prompt_end
+        return np.full((int(16000 * FRAME_SECONDS), 1), 1000 if speaking else 300, dtype=np.int16)
+
+
+class FakeClient:
+    def __init__(self, setup_seconds: float, caller: Caller):
+        self.setup_seconds = setup_seconds
+        self.caller = caller
+        self.handlers = {}
+        self.speech_frames = 0
+        self.echo_frames = 0
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    async def start_session(self, **kwargs):
+        await asyncio.sleep(self.setup_seconds)
+
+    async def send_audio(self, payload: bytes):
+        sample = int.from_bytes(payload[:2], "little")
+        if sample == 1000:
+            self.speech_frames += 1
+            if self.speech_frames == 10:
+                self.handlers["AddTranscript"]({"results": [
+                    {"type": "word", "start_time": 0.0, "end_time": 0.3,
+                     "alternatives": [{"content": "جی", "confidence": 0.95}]},
+                    {"type": "punctuation", "is_eos": True, "alternatives": [{"content": "."}]},
+                ]})
+        elif sample == 300:
+            self.echo_frames += 1
+
+    async def stop_session(self):
+        pass
+
+
+class FakeStream:
+    def __init__(self, caller: Caller, callback=None, **kwargs):
+        self.caller = caller
+        self.callback = callback
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+        def feed():
+            while self.running:
+                self.callback(self.caller.frame(), 320, None, None)
+                time.sleep(FRAME_SECONDS)
+        threading.Thread(target=feed, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        pass
+
+
+class FakeTTS:
+    def __init__(self, seconds: float, caller: Caller):
+        self.seconds = seconds
+        self.caller = caller
+
+    def estimate_duration(self, text: str) -> float:
+        return self.seconds
+
+    async def play_audio(self, text: str) -> str:
+        await asyncio.sleep(self.seconds)
+        self.caller.prompt_end = time.monotonic()
+        return text
+
+
+async def run_turn(pipelined: bool, prompt_seconds: float, setup_seconds: float) -> dict:
+    caller = Caller()
+    client = FakeClient(setup_seconds, caller)
+    live = {}
+
+    def stream_factory(**kwargs):
+        live["at"] = time.monotonic()
+        return FakeStream(caller, **kwargs)
+
+    stt = STT(client_factory=lambda: client, input_stream_factory=stream_factory)
+    stt.silence_timeout = 0.3
+    tts = FakeTTS(prompt_seconds, caller)
+
+    if pipelined:
+        await TurnTaker(stt, tts).ask("question")
+    else:
+        await tts.play_audio("question")
+        await stt.transcribe()
+
+    # Anything the caller said before the mic was live is lost
+    gap = max(0.0, live["at"] - caller.prompt_end)
+    return {"gap_ms": gap * 1000, "echo_frames": client.echo_frames}
+
+
+async def main_async(args):
+    print("\n🔁 TURN PIPELINING BENCHMARK")
+    print("=" * 60)
+    print(f"  prompt: {args.prompt_seconds:.1f}s   session setup: {args.setup_ms} ms")
+    for name, pipelined in (("sequential", False), ("pipelined", True)):
+        result = await run_turn(pipelined, args.prompt_seconds, args.setup_ms / 1000)
+        print(f"  {name:<11} dead air {result['gap_ms']:>6.0f} ms   "
+              f"echo frames sent to STT {result['echo_frames']}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequential vs pipelined turn-taking")
+    parser.add_argument("--prompt-seconds", type=float, default=3.0)
+    parser.add_argument("--setup-ms", type=int, default=400, help="Simulated Speechmatics session setup")
+    args = parser.parse_args()
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Upstream Encoding Benchmark
+Streams the same recorded audio to a Speechmatics-compatible websocket once
+per upstream encoding (16 kHz PCM vs 8 kHz μ-law) through the real SDK client
+and compares bytes sent, encoder CPU cost and parity.
+
+By default a local fake endpoint is started: it speaks enough of the RT
+protocol for the SDK (RecognitionStarted / AudioAdded / EndOfTranscript),
+keeps the audio it received, and parity is measured on the signal itself -
+SNR of what the server decodes vs the original, full band and in the
+300-3400 Hz speech band. With --url (and SPEECHMATICS_API_KEY) the real
+service is used instead and the final transcripts are compared word by word.
+
+    python benchmarks/upstream_encoding.py --trace logs/traces/923001234567.vacall
+    python benchmarks/upstream_encoding.py --wav sample_ur.wav --url wss://eu2.rt.speechmatics.com/v2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import wave
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai.upstream import UPSTREAM_SAMPLE_RATES, UpstreamEncoder
+from telephony import g711
+from telephony.resample import PolyphaseResampler
+
+SAMPLE_RATE = 16000
+FRAME_SAMPLES = 320  # 20 ms, a typical PortAudio callback size
+
+
+def load_trace_audio(path: str) -> np.ndarray:
+    from replay.replayer import CallTrace
+
+    trace = CallTrace(path)
+    frames = [payload for turn in trace.turns for _, payload in turn.audio]
+    return np.frombuffer(b"".join(frames), dtype=np.int16)
+
+
+def load_wav_audio(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as f:
+        if f.getsampwidth() != 2:
+            raise ValueError(f"{path}: expected 16-bit PCM")
+        samples = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16)
+        if f.getnchannels() > 1:
+            samples = samples[::f.getnchannels()]
+        rate = f.getframerate()
+    if rate != SAMPLE_RATE:
+        samples = PolyphaseResampler(SAMPLE_RATE, rate).process(samples)
+    return samples
+
+
+def synthetic_speech(seconds: float) -> np.ndarray:
+    """Voiced-speech-like test signal: harmonic stack with a moving pitch and syllable envelope."""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    signal = sum(np.sin(k * phase) / k for k in range(1, 25))
+    envelope = np.clip(np.sin(2 * np.pi * 3.0 * t), 0, None) ** 0.5
+    noise = np.random.default_rng(0).normal(0, 0.02, len(t))
+    return (np.clip(signal * envelope * 0.25 + noise, -1, 1) * 32767).astype(np.int16)
+
+
+def decode_received(audio: bytes, encoding: str) -> np.ndarray:
+    """What the server hears, brought back to 16 kHz for comparison."""
+    if encoding == "pcm_s16le":
+        return np.frombuffer(audio, dtype=np.int16)
+    return PolyphaseResampler(SAMPLE_RATE, UPSTREAM_SAMPLE_RATES[encoding]).process(g711.decode(audio, "ulaw"))
+
+
+def band_limit(samples: np.ndarray, low: float = 300.0, high: float = 3400.0) -> np.ndarray:
+    spectrum = np.fft.rfft(samples.astype(np.float64))
+    freqs = np.fft.rfftfreq(len(samples), 1 / SAMPLE_RATE)
+    spectrum[(freqs < low) | (freqs > high)] = 0
+    return np.fft.irfft(spectrum, len(samples))
+
+
+def snr_db(reference: np.ndarray, received: np.ndarray) -> float:
+    """SNR after aligning for the resampler's group delay."""
+    reference = reference.astype(np.float64)
+    received = received.astype(np.float64)
+    best = None
+    for lag in range(0, 64):
+        n = min(len(reference), len(received) - lag)
+        if n <= 0:
+            break
+        ref, rec = reference[:n], received[lag:lag + n]
+        noise = np.sum((ref - rec) ** 2)
+        snr = float("inf") if noise == 0 else 10 * np.log10(np.sum(ref ** 2) / noise)
+        best = snr if best is None else max(best, snr)
+    return best
+
+
+class FakeSpeechmaticsEndpoint:
+    """Minimal RT websocket server that records the audio it receives."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.sessions = []  # {"audio_format", "audio", "messages"}
+        self.server = None
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/v2"
+
+    async def start(self):
+        from websockets.asyncio.server import serve
+
+        self.server = await serve(self._handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _handle(self, connection):
+        session = {"audio_format": None, "audio": bytearray(), "messages": 0}
+        self.sessions.append(session)
+        seq_no = 0
+        async for message in connection:
+            session["messages"] += 1
+            if isinstance(message, bytes):
+                session["audio"] += message
+                seq_no += 1
+                await connection.send(json.dumps({"message": "AudioAdded", "seq_no": seq_no}))
+                continue
+
+            msg = json.loads(message)
+            if msg.get("message") == "StartRecognition":
+                session["audio_format"] = msg.get("audio_format")
+                await connection.send(json.dumps({"message": "RecognitionStarted", "id": f"fake-{len(self.sessions)}"}))
+            elif msg.get("message") == "EndOfStream":
+                await connection.send(json.dumps({"message": "EndOfTranscript"}))
+
+
+async def stream_once(samples: np.ndarray, encoding: str, url: str, api_key: str, realtime: bool) -> dict:
+    """One session through the real SDK client; returns bytes, CPU and transcript."""
+    from speechmatics import rt
+
+    encoder = UpstreamEncoder(encoding, input_rate=SAMPLE_RATE)
+    client = rt.AsyncClient(api_key=api_key, url=url)
+    finals = []
+    client.on(rt.ServerMessageType.ADD_TRANSCRIPT, lambda msg: finals.append(msg["metadata"]["transcript"]))
+
+    await client.start_session(
+        transcription_config=rt.TranscriptionConfig(language="ur", operating_point="enhanced"),
+        audio_format=rt.AudioFormat(encoding=encoder.encoding, sample_rate=encoder.sample_rate),
+    )
+
+    encode_cpu = 0.0
+    frames = 0
+    for start in range(0, len(samples), FRAME_SAMPLES):
+        frame = samples[start:start + FRAME_SAMPLES]
+        cpu_start = time.process_time()
+        payload = encoder.encode(frame)
+        encode_cpu += time.process_time() - cpu_start
+        await client.send_audio(payload)
+        frames += 1
+        if realtime:
+            await asyncio.sleep(len(frame) / SAMPLE_RATE)
+
+    await client.stop_session()
+    await client.close()
+
+    return {
+        "encoding": encoding,
+        "sample_rate": encoder.sample_rate,
+        "frames": frames,
+        "bytes_captured": encoder.bytes_in,
+        "bytes_sent": encoder.bytes_out,
+        "encode_cpu_seconds": encode_cpu,
+        "transcript": " ".join(t.strip() for t in finals if t.strip()),
+    }
+
+
+def word_agreement(reference: str, hypothesis: str) -> float:
+    """1 - word error rate (Levenshtein over words)."""
+    ref, hyp = reference.split(), hypothesis.split()
+    if not ref:
+        return 1.0 if not hyp else 0.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return max(0.0, 1 - prev[-1] / len(ref))
+
+
+async def run(args) -> list:
+    if args.trace:
+        samples = load_trace_audio(args.trace)
+    elif args.wav:
+        samples = load_wav_audio(args.wav)
+    else:
+        samples = synthetic_speech(args.seconds)
+    if not len(samples):
+        raise SystemExit("No audio found in input")
+
+    endpoint = None
+    if args.url:
+        from ai.env import getenv
+        url, api_key = args.url, getenv("SPEECHMATICS_API_KEY")
+    else:
+        endpoint = FakeSpeechmaticsEndpoint()
+        await endpoint.start()
+        url, api_key = endpoint.url, "fake-key"
+
+    results = []
+    try:
+        for encoding in UPSTREAM_SAMPLE_RATES:
+            result = await stream_once(samples, encoding, url, api_key, realtime=bool(args.url))
+            result["audio_seconds"] = len(samples) / SAMPLE_RATE
+            if endpoint is not None:
+                received = decode_received(bytes(endpoint.sessions[-1]["audio"]), encoding)
+                result["server_audio_format"] = endpoint.sessions[-1]["audio_format"]
+                result["snr_db"] = snr_db(samples, received)
+                result["speech_band_snr_db"] = snr_db(band_limit(samples), band_limit(received))
+            results.append(result)
+    finally:
+        if endpoint is not None:
+            await endpoint.close()
+
+    if args.url:
+        baseline = results[0]["transcript"]
+        for result in results:
+            result["transcript_agreement"] = word_agreement(baseline, result["transcript"])
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Speechmatics upstream encodings")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--trace", help="Recorded call (.vacall) - all turns' audio is streamed")
+    source.add_argument("--wav", help="16-bit WAV file (resampled to 16 kHz if needed)")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Synthetic audio length when no input is given")
+    parser.add_argument("--url", help="Real RT endpoint; default is a local fake endpoint")
+    parser.add_argument("--report", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print("\n📡 UPSTREAM ENCODING BENCHMARK")
+    print("=" * 60)
+    for result in results:
+        seconds = result["audio_seconds"]
+        print(f"  {result['encoding']} @ {result['sample_rate']} Hz")
+        print(f"    bytes sent:        {result['bytes_sent']} ({result['bytes_sent'] * 8 / seconds / 1000:.1f} kbit/s)")
+        print(f"    vs captured:       {result['bytes_sent'] / result['bytes_captured'] * 100:.1f}%")
+        print(f"    encode CPU:        {result['encode_cpu_seconds'] * 1000:.1f} ms "
+              f"({result['encode_cpu_seconds'] / seconds * 100:.3f}% of one core)")
+        if "snr_db" in result:
+            print(f"    SNR full band:     {result['snr_db']:.1f} dB")
+            print(f"    SNR 300-3400 Hz:   {result['speech_band_snr_db']:.1f} dB")
+        if "transcript_agreement" in result:
+            print(f"    transcript:        {result['transcript']}")
+            print(f"    word agreement:    {result['transcript_agreement'] * 100:.1f}% vs {results[0]['encoding']}")
+    print("=" * 60)
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"📝 Report written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
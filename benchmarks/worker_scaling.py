@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Worker Scaling Benchmark
+Runs a fixed batch of synthetic calls (transcript JSON parsing + logging +
+simulated I/O waits) through the supervisor with 1..N worker processes and
+reports calls/second, so capacity per core can be checked for linear scaling.
+
+    python benchmarks/worker_scaling.py --calls 400 --max-workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from worker.supervisor import Supervisor
+
+
+def run_batch(workers: int, calls: int, messages_per_turn: int) -> dict:
+    supervisor = Supervisor(num_workers=workers, handler_spec="worker.calls:run_synthetic_call")
+    supervisor.start()
+    try:
+        # Let every worker finish spawning before the clock starts
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline and not all(h.metrics for h in supervisor.workers):
+            time.sleep(0.05)
+
+        started = time.perf_counter()
+        for i in range(calls):
+            supervisor.dispatch(f"9230000{i:05d}", messages_per_turn=messages_per_turn)
+        supervisor.wait_idle()
+        elapsed = time.perf_counter() - started
+    finally:
+        supervisor.stop()
+
+    return {
+        "workers": workers,
+        "calls": calls,
+        "seconds": round(elapsed, 3),
+        "calls_per_second": round(calls / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Worker process scaling benchmark")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--messages-per-turn", type=int, default=400)
+    parser.add_argument("--report", help="Write JSON report to this path")
+    args = parser.parse_args()
+
+    print("\n🧵 WORKER SCALING BENCHMARK")
+    print("=" * 60)
+
+    results = []
+    workers = 1
+    while workers <= args.max_workers:
+        result = run_batch(workers, args.calls, args.messages_per_turn)
+        result["speedup"] = round(result["calls_per_second"] / results[0]["calls_per_second"], 2) if results else 1.0
+        results.append(result)
+        print(f"  {workers:>2} workers: {result['calls_per_second']:>8} calls/s  (x{result['speedup']})")
+        workers *= 2
+
+    print("=" * 60)
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📋 Report written to: {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+# diagnostics/__init__.py
+
+"""
+Event-loop lag watchdog and runtime sampling profiler.
+"""
+
+from .calls import set_current_call
+from .control import Diagnostics, start_diagnostics
+from .profiler import SamplingProfiler
+from .watchdog import LoopWatchdog
+
+__all__ = ['set_current_call', 'Diagnostics', 'start_diagnostics', 'SamplingProfiler', 'LoopWatchdog']
@@ -0,0 +1,50 @@
+# diagnostics/calls.py
+
+"""
+Which call is a task working for?
+
+run_call() tags its task with the call id; a task factory copies the tag
+onto every task created from inside the call (STT silence monitor, LLM
+hedges, ...), so a sampler on another thread can map the loop's current
+task back to a call.
+"""
+
+import asyncio
+import contextvars
+import weakref
+
+_current_call = contextvars.ContextVar("diagnostics_call_id", default=None)
+_task_calls = weakref.WeakKeyDictionary()   # task -> call id
+
+
+def set_current_call(call_id: str):
+    """Called at the start of a call, inside the call's task."""
+    _current_call.set(call_id)
+    task = asyncio.current_task()
+    if task is not None:
+        _task_calls[task] = call_id
+
+
+def call_of_task(task):
+    return _task_calls.get(task) if task is not None else None
+
+
+def active_calls() -> list:
+    return sorted({call_id for call_id in list(_task_calls.values()) if call_id})
+
+
+def install_task_factory(loop):
+    """Makes tasks inherit the creating call's id. Keeps any factory already installed."""
+    previous = loop.get_task_factory()
+
+    def factory(loop, coro, **kwargs):
+        if previous is not None:
+            task = previous(loop, coro, **kwargs)
+        else:
+            task = asyncio.Task(coro, loop=loop, **kwargs)
+        call_id = _current_call.get()
+        if call_id is not None:
+            _task_calls[task] = call_id
+        return task
+
+    loop.set_task_factory(factory)
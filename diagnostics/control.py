@@ -0,0 +1,134 @@
+# diagnostics/control.py
+
+"""
+Local control socket for runtime diagnostics.
+
+A Unix socket (owner-only) served from its own thread, so it still answers
+while the event loop is stuck. One JSON line per request and reply:
+
+    status                          watchdog stats, active calls, running profiles
+    stalls                          recent loop stalls with the blocking stacks
+    profile start [call_id] [ms]    sample one call (or the whole process)
+    profile stop <profile_id>       stop and write profiles/<profile_id>.folded
+
+    python -m diagnostics.ctl --pid <pid> profile start
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import socketserver
+import threading
+
+from .calls import active_calls, install_task_factory
+from .profiler import DEFAULT_INTERVAL, SamplingProfiler
+from .watchdog import DEFAULT_THRESHOLD, LoopWatchdog
+
+
+def default_socket_path(pid: int = None) -> str:
+    return f"/tmp/voice-agent-{pid or os.getpid()}.sock"
+
+
+class Diagnostics:
+    """Watchdog + profilers for one event loop, controlled over a Unix socket."""
+
+    def __init__(self, loop, watchdog: LoopWatchdog, socket_path: str, logger=None):
+        self.loop = loop
+        self.loop_thread_id = threading.get_ident()
+        self.watchdog = watchdog
+        self.socket_path = socket_path
+        self.logger = logger
+        self.profilers = {}
+        self._ids = itertools.count(1)
+        self._server = None
+
+    def handle(self, command: str) -> dict:
+        parts = command.split()
+        if not parts:
+            return {"error": "empty command"}
+
+        if parts[0] == "status":
+            return {
+                "pid": os.getpid(),
+                "watchdog": dict(self.watchdog.stats(), last_stall=None),
+                "calls": active_calls(),
+                "profiles": [p.info() for p in self.profilers.values()],
+            }
+        if parts[0] == "stalls":
+            return {"stalls": self.watchdog.stalls}
+
+        if parts[:2] == ["profile", "start"]:
+            call_id = parts[2] if len(parts) > 2 and parts[2] != "-" else None
+            interval = float(parts[3]) / 1000 if len(parts) > 3 else DEFAULT_INTERVAL
+            profile_id = f"{os.getpid()}-{next(self._ids)}" + (f"-{call_id}" if call_id else "-process")
+            profiler = SamplingProfiler(profile_id, self.loop, self.loop_thread_id, call_id, interval)
+            profiler.start()
+            self.profilers[profile_id] = profiler
+            if self.logger:
+                self.logger.info(f"Diagnostics - profiling started: {profile_id}")
+            return {"id": profile_id}
+
+        if parts[:2] == ["profile", "stop"] and len(parts) > 2:
+            profiler = self.profilers.pop(parts[2], None)
+            if profiler is None:
+                return {"error": f"no running profile {parts[2]}"}
+            path = profiler.stop()
+            if self.logger:
+                self.logger.info(f"Diagnostics - profile written: {path} ({profiler.sample_count} samples)")
+            return {"path": path, "samples": profiler.sample_count}
+
+        return {"error": f"unknown command: {command}"}
+
+    def serve(self):
+        diagnostics = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                line = self.rfile.readline().decode("utf-8").strip()
+                try:
+                    reply = diagnostics.handle(line)
+                except Exception as e:
+                    reply = {"error": str(e)}
+                self.wfile.write((json.dumps(reply, default=str) + "\n").encode("utf-8"))
+
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        old_umask = os.umask(0o177)
+        try:
+            self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, Handler)
+        finally:
+            os.umask(old_umask)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="diagnostics-control", daemon=True).start()
+        if self.logger:
+            self.logger.info(f"Diagnostics - control socket {self.socket_path}")
+
+    def close(self):
+        self.watchdog.stop()
+        for profiler in self.profilers.values():
+            profiler.stop()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def start_diagnostics(logger=None, socket_path: str = None, threshold: float = None) -> Diagnostics:
+    """
+    Call from inside the running loop (controller or worker) before calls start.
+    Threshold defaults to LOOP_LAG_THRESHOLD (seconds); the socket to DIAG_SOCKET.
+    """
+    loop = asyncio.get_running_loop()
+    install_task_factory(loop)
+
+    watchdog = LoopWatchdog(
+        threshold=threshold or float(os.getenv("LOOP_LAG_THRESHOLD", DEFAULT_THRESHOLD)),
+        logger=logger,
+    )
+    watchdog.start(loop)
+
+    diagnostics = Diagnostics(loop, watchdog, socket_path or os.getenv("DIAG_SOCKET") or default_socket_path(), logger)
+    diagnostics.serve()
+    return diagnostics
@@ -0,0 +1,51 @@
+# diagnostics/ctl.py
+
+"""
+Client for the diagnostics control socket.
+
+    python -m diagnostics.ctl --pid 4242 status
+    python -m diagnostics.ctl --pid 4242 profile start                  # whole process
+    python -m diagnostics.ctl --pid 4242 profile start 923001234567-ab12cd34 2
+    python -m diagnostics.ctl --pid 4242 profile stop 4242-1-process
+    flamegraph.pl profiles/4242-1-process.folded > flame.svg
+"""
+
+import argparse
+import json
+import socket
+
+from .control import default_socket_path
+
+
+def send(socket_path: str, command: str) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall((command + "\n").encode("utf-8"))
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data.decode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Voice agent diagnostics control")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--pid", type=int, help="Process id (uses the default socket path)")
+    target.add_argument("--socket", help="Control socket path")
+    parser.add_argument("command", nargs="+", help="status | stalls | profile start [call_id] [ms] | profile stop <id>")
+    args = parser.parse_args()
+
+    reply = send(args.socket or default_socket_path(args.pid), " ".join(args.command))
+    if "stalls" in reply:
+        for stall in reply["stalls"]:
+            print(f"⏱️  blocked {stall['blocked_for'] * 1000:.0f} ms - call {stall['call_id']}, task {stall['task']}")
+            print(stall["stack"])
+    else:
+        print(json.dumps(reply, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
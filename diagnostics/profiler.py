@@ -0,0 +1,105 @@
+# diagnostics/profiler.py
+
+"""
+Sampling profiler that can be switched on at runtime.
+
+A thread wakes every interval and records the stack of each sampled
+thread. For a single call, only loop-thread samples taken while one of the
+call's tasks is running are kept. Output is the "folded" format
+(frame;frame;frame count per line) read by flamegraph.pl, speedscope and
+inferno.
+"""
+
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+
+from .calls import call_of_task
+
+DEFAULT_INTERVAL = 0.005
+DEFAULT_PROFILE_DIR = "profiles"
+
+
+def _folded(frame) -> str:
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class SamplingProfiler:
+    """
+    Args:
+        loop / loop_thread_id: the event loop the calls run on
+        call_id: only sample while this call's tasks run (None = whole process, all threads)
+    """
+
+    def __init__(self, profile_id: str, loop=None, loop_thread_id: int = None, call_id: str = None,
+                 interval: float = DEFAULT_INTERVAL):
+        self.profile_id = profile_id
+        self.loop = loop
+        self.loop_thread_id = loop_thread_id
+        self.call_id = call_id
+        self.interval = interval
+        self.samples = collections.Counter()
+        self.sample_count = 0
+        self.started = None
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self.started = time.time()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"profiler-{self.profile_id}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        own = threading.get_ident()
+        names = {}
+        while self._running:
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+
+            if self.call_id is not None:
+                task = asyncio.current_task(self.loop)
+                frame = frames.get(self.loop_thread_id)
+                if frame is None or call_of_task(task) != self.call_id:
+                    continue
+                self.samples[_folded(frame)] += 1
+                self.sample_count += 1
+                continue
+
+            if len(names) != threading.active_count():
+                names = {t.ident: t.name for t in threading.enumerate()}
+            for thread_id, frame in frames.items():
+                if thread_id == own:
+                    continue
+                self.samples[f"{names.get(thread_id, thread_id)};{_folded(frame)}"] += 1
+            self.sample_count += 1
+
+    def stop(self, directory: str = None) -> str:
+        """Stops sampling and writes <profile_id>.folded. Returns the file path."""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join()
+        directory = directory or os.getenv("PROFILE_DIR", DEFAULT_PROFILE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.profile_id}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
+
+    def info(self) -> dict:
+        return {
+            "id": self.profile_id,
+            "call_id": self.call_id,
+            "interval": self.interval,
+            "samples": self.sample_count,
+            "running_for": time.time() - self.started if self.started else 0.0,
+        }
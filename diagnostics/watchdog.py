@@ -0,0 +1,107 @@
+# diagnostics/watchdog.py
+
+"""
+Event-loop lag watchdog.
+
+A heartbeat callback on the loop measures how late it runs (continuous lag
+histogram). A separate thread checks the heartbeat; when the loop hasn't
+ticked for longer than the threshold, whatever is running on the loop thread
+right now is the blocker, so its stack - and the call it belongs to - is
+captured and logged once per stall.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+
+from metrics import registry
+
+from .calls import call_of_task
+
+DEFAULT_THRESHOLD = 0.1
+HEARTBEAT_INTERVAL = 0.05
+
+LOOP_LAG = registry.histogram(
+    "voice_agent_event_loop_lag_seconds", "How late the loop heartbeat ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+LOOP_STALLS = registry.counter(
+    "voice_agent_event_loop_stalls_total", "Times the loop was blocked longer than the watchdog threshold")
+
+
+class LoopWatchdog:
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, interval: float = HEARTBEAT_INTERVAL,
+                 logger=None, max_reports: int = 50):
+        self.threshold = threshold
+        self.interval = interval
+        self.logger = logger
+        self.max_reports = max_reports
+        self.loop = None
+        self.loop_thread_id = None
+        self.last_beat = time.monotonic()
+        self.max_lag = 0.0
+        self.stalls = []   # {"at", "blocked_for", "call_id", "task", "stack"}
+        self._running = False
+        self._expected = None
+
+    def start(self, loop=None):
+        self.loop = loop or asyncio.get_running_loop()
+        self.loop_thread_id = threading.get_ident()
+        self._running = True
+        self._beat()
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    def stop(self):
+        self._running = False
+
+    def _beat(self):
+        now = time.monotonic()
+        if self._expected is not None:
+            lag = max(0.0, now - self._expected)
+            LOOP_LAG.observe(lag)
+            self.max_lag = max(self.max_lag, lag)
+        self.last_beat = now
+        self._expected = now + self.interval
+        if self._running:
+            self.loop.call_later(self.interval, self._beat)
+
+    def _watch(self):
+        reported_beat = None
+        while self._running:
+            time.sleep(self.interval / 2)
+            beat = self.last_beat
+            blocked_for = time.monotonic() - beat - self.interval
+            if blocked_for > self.threshold and beat != reported_beat:
+                reported_beat = beat
+                self._report(blocked_for)
+
+    def _report(self, blocked_for: float):
+        LOOP_STALLS.inc()
+        frame = sys._current_frames().get(self.loop_thread_id)
+        stack = "".join(traceback.format_stack(frame)) if frame is not None else "<no frame>"
+        task = asyncio.current_task(self.loop)
+        stall = {
+            "at": time.time(),
+            "blocked_for": blocked_for,
+            "call_id": call_of_task(task),
+            "task": task.get_name() if task is not None else None,
+            "stack": stack,
+        }
+        self.stalls.append(stall)
+        del self.stalls[:-self.max_reports]
+
+        if self.logger:
+            self.logger.warning(
+                f"Event loop blocked for >{blocked_for * 1000:.0f} ms "
+                f"(call {stall['call_id']}, task {stall['task']}):\n{stack}"
+            )
+
+    def stats(self) -> dict:
+        return {
+            "threshold": self.threshold,
+            "max_lag": self.max_lag,
+            "stalls": len(self.stalls),
+            "last_stall": self.stalls[-1] if self.stalls else None,
+        }
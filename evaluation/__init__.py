@@ -0,0 +1,9 @@
+# evaluation/__init__.py
+
+"""
+Prompt evaluation: the orchestrators' LLM checks scored over a labeled Urdu / Roman Urdu dataset.
+"""
+
+from .harness import Case, PromptEvaluator, cheapest, load_dataset
+
+__all__ = ['Case', 'PromptEvaluator', 'cheapest', 'load_dataset']
@@ -0,0 +1,194 @@
+# evaluation/harness.py
+
+"""
+Runs the orchestrators' LLM checks over a labeled dataset and scores them.
+
+Each case goes through the same method the call flow uses
+(GreetingOrchestrator._detect_intent, AddressOrchestrator._check_address_intent,
+AddressOrchestrator._reformat_address), so response parsing, keyword fallback
+on timeout and the confident-STT shortcut are measured as they ship. Modes:
+
+- keywords:  classify_yes_no() only - the local classifier, no LLM
+- llm:       plain text, so every case is sent to the LLM
+- fast_path: text with the case's STT word confidence, so confident
+             keyword answers (and unreliable words) skip the LLM
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from collections import Counter, namedtuple
+
+from ai.fallback_classifier import classify_yes_no
+from ai.prompts import prompt_registry
+from ai.transcript import TranscriptBuilder
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DEFAULT_DATASET = os.path.join(DATA_DIR, "prompt_eval.json")
+INTENT_TASKS = ("greeting_intent", "address_intent")
+REFORMAT_TASK = "address_reformat"
+TASKS = INTENT_TASKS + (REFORMAT_TASK,)
+MODES = {
+    "greeting_intent": ("keywords", "llm", "fast_path"),
+    "address_intent": ("keywords", "llm", "fast_path"),
+    "address_reformat": ("llm",),
+}
+# STT word confidence for cases that don't give one (fast_path mode)
+DEFAULT_CONFIDENCE = 0.95
+NOT_AN_ADDRESS = "NOT_AN_ADDRESS"
+
+Case = namedtuple("Case", ["text", "label", "script", "confidence"])
+
+
+def load_dataset(path: str = None) -> dict:
+    """
+    Returns:
+        dict: task -> {"question": str or None, "cases": [Case]}
+    """
+    with open(path or DEFAULT_DATASET, encoding="utf-8") as f:
+        raw = json.load(f)
+    dataset = {}
+    for task, entry in raw.items():
+        if task not in TASKS:
+            raise ValueError(f"Unknown evaluation task: {task}")
+        cases = [Case(c["text"], c["label"], c.get("script", "roman"), c.get("confidence", DEFAULT_CONFIDENCE))
+                 for c in entry["cases"]]
+        dataset[task] = {"question": entry.get("question"), "cases": cases}
+    return dataset
+
+
+def with_confidence(text: str, confidence: float):
+    """Text as a Transcript whose every word has the given STT confidence."""
+    builder = TranscriptBuilder()
+    builder.add_results([{"type": "word", "alternatives": [{"content": word, "confidence": confidence}]}
+                         for word in text.split()])
+    return builder.build(text)
+
+
+def normalize_address(text: str) -> str:
+    text = text.lower().replace("h#", "house number").replace("street #", "street number")
+    return " ".join(re.sub(r"[^\w/-]", " ", text).split())
+
+
+def expected_class(task: str, label: str) -> str:
+    if task == REFORMAT_TASK:
+        return NOT_AN_ADDRESS if label == NOT_AN_ADDRESS else "address"
+    return label
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+class PromptEvaluator:
+    """
+    Scores one task in one mode against one LLM (prompt version pinned via
+    LLM(prompt_versions=...)), concurrency cases at a time.
+    """
+
+    def __init__(self, llm, concurrency: int = 8, logger=None):
+        from orchestrator.address import AddressOrchestrator
+        from orchestrator.greeting import GreetingOrchestrator
+
+        self.llm = llm
+        self.concurrency = concurrency
+        # The checks never speak or listen; STT/TTS are placeholders
+        self.greeting = GreetingOrchestrator(logger=logger, stt=object(), llm=llm, tts=object())
+        self.address = AddressOrchestrator(logger=logger, stt=object(), llm=llm, tts=object())
+
+    async def classify(self, task: str, mode: str, question: str, case: Case) -> tuple:
+        """
+        Returns:
+            tuple: (predicted class, raw result)
+        """
+        if mode == "keywords":
+            intent = classify_yes_no(case.text)
+            return intent, intent
+        text = with_confidence(case.text, case.confidence) if mode == "fast_path" else case.text
+        if task == "greeting_intent":
+            intent = await self.greeting._detect_intent(question, text)
+            return intent, intent
+        if task == "address_intent":
+            intent = await self.address._check_address_intent(question, text)
+            return intent, intent
+        result = await self.address._reformat_address(text)
+        if not result:
+            return "timeout", result    # LLM timed out or failed; the flow asks again
+        return (NOT_AN_ADDRESS if result == NOT_AN_ADDRESS else "address"), result
+
+    async def evaluate(self, task: str, mode: str, question: str, cases: list) -> dict:
+        """
+        Returns:
+            dict: accuracy (overall and per script), confusion matrix
+                  {expected: {predicted: n}}, LLM calls and tokens per case,
+                  latency percentiles (loop seconds) and the misclassified cases
+        """
+        template = prompt_registry.get(task, self.llm.prompt_versions.get(task))
+        before = prompt_registry.summary()[template.key]
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = [None] * len(cases)
+
+        async def one(i: int, case: Case):
+            async with semaphore:
+                started = loop.time()
+                predicted, raw = await self.classify(task, mode, question, case)
+                results[i] = (predicted, raw, loop.time() - started)
+
+        wall = time.perf_counter()
+        await asyncio.gather(*(one(i, case) for i, case in enumerate(cases)))
+        wall = time.perf_counter() - wall
+        after = prompt_registry.summary()[template.key]
+
+        confusion = {}
+        correct, by_script, errors, exact = Counter(), Counter(), [], []
+        latencies = []
+        for case, (predicted, raw, latency) in zip(cases, results):
+            expected = expected_class(task, case.label)
+            confusion.setdefault(expected, Counter())[predicted] += 1
+            by_script[case.script] += 1
+            latencies.append(latency)
+            if predicted == expected:
+                correct["all"] += 1
+                correct[case.script] += 1
+            else:
+                errors.append({"text": case.text, "expected": expected, "predicted": predicted, "raw": raw})
+            if task == REFORMAT_TASK and expected == "address":
+                exact.append(normalize_address(raw or "") == normalize_address(case.label))
+
+        n = len(cases) or 1
+        calls = after["calls"] - before["calls"]
+        row = {
+            "task": task,
+            "version": template.version if mode != "keywords" else None,
+            "mode": mode,
+            "cases": len(cases),
+            "accuracy": correct["all"] / n,
+            "accuracy_by_script": {script: correct[script] / count for script, count in sorted(by_script.items())},
+            "confusion": {expected: dict(predicted) for expected, predicted in confusion.items()},
+            "llm_calls_per_case": calls / n,
+            "prompt_tokens_per_case": (after["prompt_tokens"] - before["prompt_tokens"]) / n,
+            "output_tokens_per_case": (after["output_tokens"] - before["output_tokens"]) / n,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+            "wall_seconds": wall,
+            "errors": errors,
+        }
+        if exact:
+            row["exact_match"] = sum(exact) / len(exact)
+        return row
+
+
+def cheapest(rows: list, min_accuracy: float) -> dict:
+    """The row meeting min_accuracy with the fewest tokens, then lowest p95 latency (None if none does)."""
+    passing = [row for row in rows if row["accuracy"] >= min_accuracy]
+    if not passing:
+        return None
+    return min(passing, key=lambda row: (row["prompt_tokens_per_case"] + row["output_tokens_per_case"],
+                                         row["latency_p95"]))
@@ -0,0 +1,152 @@
+# evaluation/runner.py
+
+"""
+Prompt evaluation: accuracy, confusion, tokens and latency per prompt
+version, backend and mode (see evaluation/harness.py).
+
+Usage:
+    python -m evaluation.runner --backend fake                     # CI, virtual clock, no API key
+    python -m evaluation.runner --backend gemini --concurrency 4 --report eval.json
+    python -m evaluation.runner --backend fake --min-accuracy 0.9  # exit 1 if a task has no passing candidate
+
+The fake backend answers intents with the keyword classifier and reformats
+anything with a number or an address word, with configurable latency. It
+tests the harness and the flow's parsing, not prompt quality.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import sys
+
+from ai.fake_llm import FakeLLMBackend
+from ai.fallback_classifier import classify_yes_no
+from ai.llm import LLM
+from ai.prompts import prompt_registry
+from ai.resilience import CircuitBreaker
+from sim.loop import run
+from .harness import MODES, TASKS, PromptEvaluator, cheapest, load_dataset
+
+import orchestrator.prompts  # noqa: F401 - registers the templates
+
+ADDRESS_WORDS = ("مکان", "ہاؤس", "گلی", "بلاک", "سیکٹر", "makan", "house", "gali", "street", "block", "sector")
+URDU_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹", "0123456789")
+
+
+def fake_responder(prompt: str) -> str:
+    """Deterministic stand-in for the LLM, keyed on the rendered per-call part of each template."""
+    response = re.search(r'Response: "(.*)"', prompt, re.S)
+    if response:
+        return classify_yes_no(response.group(1))
+    text = re.search(r'Text: "(.*)"', prompt, re.S)
+    text = text.group(1).translate(URDU_DIGITS) if text else ""
+    numbers = re.findall(r"\d+", text)
+    if not numbers and not any(word in text.lower() for word in ADDRESS_WORDS):
+        return "NOT_AN_ADDRESS"
+    return f"House Number {numbers[0]}" if numbers else text
+
+
+async def evaluate_all(args, dataset: dict, logger) -> list:
+    loop = asyncio.get_running_loop()
+    rows = []
+    for task in args.tasks:
+        if task not in dataset:
+            continue
+        versions = prompt_registry.versions(task) if args.all_versions \
+            else [prompt_registry.get(task).version]
+        modes = [mode for mode in MODES[task] if mode in args.modes]
+        for mode in modes:
+            # The local classifier doesn't depend on the prompt version
+            for version in (versions[-1:] if mode == "keywords" else versions):
+                if args.backend == "fake":
+                    backend = FakeLLMBackend(responder=fake_responder, latency=args.fake_latency,
+                                             jitter=args.fake_jitter, error_rate=args.fake_error_rate, seed=7)
+                    llm = LLM(logger=logger, backend=backend, breaker=CircuitBreaker(clock=loop.time),
+                              prompt_versions={task: version})
+                else:
+                    llm = LLM(logger=logger, prompt_versions={task: version})
+                evaluator = PromptEvaluator(llm, concurrency=args.concurrency, logger=logger)
+                row = await evaluator.evaluate(task, mode, dataset[task]["question"], dataset[task]["cases"])
+                row["backend"] = "local" if mode == "keywords" else args.backend
+                rows.append(row)
+    return rows
+
+
+def print_report(rows: list, min_accuracy: float = None, show_errors: bool = False) -> bool:
+    """Prints the results; returns False when a task has no candidate meeting min_accuracy."""
+    print("\n🧪 PROMPT EVALUATION")
+    print("=" * 104)
+    print(f"  {'task':<17} {'ver':>3}  {'backend':<7} {'mode':<9} {'n':>3}  {'acc':>5}  {'urdu':>5}  {'roman':>5}  "
+          f"{'LLM/case':>8}  {'tok in':>6}  {'tok out':>7}  {'p50':>7}  {'p95':>7}  {'p99':>7}")
+    for row in rows:
+        scripts = row["accuracy_by_script"]
+        version = f"v{row['version']}" if row["version"] else "-"
+        print(f"  {row['task']:<17} {version:>3}  {row['backend']:<7} {row['mode']:<9} {row['cases']:>3}  "
+              f"{row['accuracy']:>5.0%}  {scripts.get('urdu', 0):>5.0%}  {scripts.get('roman', 0):>5.0%}  "
+              f"{row['llm_calls_per_case']:>8.2f}  {row['prompt_tokens_per_case']:>6.1f}  "
+              f"{row['output_tokens_per_case']:>7.1f}  {row['latency_p50'] * 1000:>4.0f} ms  "
+              f"{row['latency_p95'] * 1000:>4.0f} ms  {row['latency_p99'] * 1000:>4.0f} ms"
+              + (f"   exact {row['exact_match']:.0%}" if "exact_match" in row else ""))
+
+    print("\n  Confusion (expected → predicted)")
+    for row in rows:
+        version = f"v{row['version']}" if row["version"] else "-"
+        cells = "   ".join(f"{expected}: " + ", ".join(f"{p}={n}" for p, n in sorted(predicted.items()))
+                           for expected, predicted in sorted(row["confusion"].items()))
+        print(f"  {row['task']:<17} {version:>3}  {row['mode']:<9}  {cells}")
+        if show_errors:
+            for error in row["errors"]:
+                print(f"      ✗ {error['text']!r}: expected {error['expected']}, got {error['raw']!r}")
+
+    ok = True
+    if min_accuracy is not None:
+        print(f"\n  Cheapest candidate with accuracy ≥ {min_accuracy:.0%}")
+        for task in dict.fromkeys(row["task"] for row in rows):
+            best = cheapest([row for row in rows if row["task"] == task], min_accuracy)
+            if best is None:
+                ok = False
+                print(f"  {task:<17} ❌ none")
+            else:
+                version = f"v{best['version']}" if best["version"] else "-"
+                print(f"  {task:<17} ✅ {best['mode']} {version} ({best['backend']}), accuracy {best['accuracy']:.0%}, "
+                      f"{best['prompt_tokens_per_case'] + best['output_tokens_per_case']:.1f} tokens/case")
+    print("=" * 104)
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt accuracy / latency evaluation")
+    parser.add_argument("--dataset", default=None, help="Labeled cases (default data/prompt_eval.json)")
+    parser.add_argument("--tasks", nargs="+", default=list(TASKS), choices=TASKS)
+    parser.add_argument("--modes", nargs="+", default=["keywords", "llm", "fast_path"],
+                        choices=["keywords", "llm", "fast_path"])
+    parser.add_argument("--backend", default="fake", choices=["fake", "gemini"])
+    parser.add_argument("--all-versions", action="store_true", help="Every registered prompt version, not just the latest")
+    parser.add_argument("--concurrency", type=int, default=8, help="Cases in flight at once")
+    parser.add_argument("--fake-latency", type=float, default=0.4)
+    parser.add_argument("--fake-jitter", type=float, default=0.4)
+    parser.add_argument("--fake-error-rate", type=float, default=0.0)
+    parser.add_argument("--min-accuracy", type=float, default=None)
+    parser.add_argument("--errors", action="store_true", help="List misclassified cases")
+    parser.add_argument("--report", default=None, help="Write the results as JSON")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("voice_agent.evaluation")
+    dataset = load_dataset(args.dataset)
+    # The fake backend runs on the virtual clock: exact latencies, no waiting
+    rows = run(evaluate_all(args, dataset, logger)) if args.backend == "fake" \
+        else asyncio.run(evaluate_all(args, dataset, logger))
+
+    ok = print_report(rows, args.min_accuracy, args.errors)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(rows, f, ensure_ascii=False, indent=2)
+        print(f"📄 Report written to {args.report}")
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
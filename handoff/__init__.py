@@ -0,0 +1,18 @@
+# handoff/__init__.py
+
+"""
+Human agent handoff: agent pool, priority queue, the call's line to the
+desk and the call transcript.
+"""
+
+from .agents import Agent, AgentPool
+from .queue import HandoffPayload, HandoffQueue
+from .desk import HandoffDesk, get_desk
+from .line import AgentLine, activate_line, connect_supervisor, get_active_line, get_handoffs
+from .transcript import CallTranscript, activate_transcript, get_active_transcript
+
+__all__ = [
+    'Agent', 'AgentPool', 'HandoffPayload', 'HandoffQueue', 'HandoffDesk', 'get_desk',
+    'AgentLine', 'activate_line', 'connect_supervisor', 'get_active_line', 'get_handoffs',
+    'CallTranscript', 'activate_transcript', 'get_active_transcript',
+]
@@ -0,0 +1,109 @@
+# handoff/agents.py
+
+"""
+Human agent pool.
+
+Available agents with spare capacity sit in a min-heap keyed by
+(load, agent id), so taking the least-loaded agent and returning one are
+both O(log n). Entries are invalidated lazily: every load/availability
+change pushes a fresh entry and bumps the agent's version; stale entries
+are skipped when they surface and the heap is rebuilt if they pile up.
+"""
+
+import heapq
+import json
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+class Agent:
+    __slots__ = ("agent_id", "name", "capacity", "load", "available", "version")
+
+    def __init__(self, agent_id: str, name: str = None, capacity: int = 1):
+        self.agent_id = agent_id
+        self.name = name or agent_id
+        self.capacity = capacity
+        self.load = 0
+        self.available = True
+        self.version = 0
+
+    @property
+    def has_capacity(self) -> bool:
+        return self.available and self.load < self.capacity
+
+    def __repr__(self):
+        return f"Agent({self.agent_id!r}, load={self.load}/{self.capacity}, available={self.available})"
+
+
+class AgentPool:
+
+    def __init__(self, agents=None):
+        self.agents = {}
+        self._heap = []   # (load, agent_id, version)
+        for agent in agents or []:
+            self.add(agent)
+
+    @classmethod
+    def from_file(cls, path: str = None):
+        with open(path or os.path.join(DATA_DIR, "agents.json"), encoding="utf-8") as f:
+            roster = json.load(f)
+        return cls(Agent(a["id"], a.get("name"), a.get("capacity", 1)) for a in roster.get("agents", []))
+
+    def add(self, agent: Agent):
+        self.agents[agent.agent_id] = agent
+        self._touch(agent)
+
+    def _touch(self, agent: Agent):
+        agent.version += 1
+        if agent.has_capacity:
+            heapq.heappush(self._heap, (agent.load, agent.agent_id, agent.version))
+        if len(self._heap) > 4 * len(self.agents) + 64:
+            self._compact()
+
+    def _compact(self):
+        self._heap = [(a.load, a.agent_id, a.version) for a in self.agents.values() if a.has_capacity]
+        heapq.heapify(self._heap)
+
+    def acquire(self):
+        """Takes one slot on the least-loaded available agent. Returns the Agent, or None if all are busy."""
+        while self._heap:
+            load, agent_id, version = heapq.heappop(self._heap)
+            agent = self.agents.get(agent_id)
+            if agent is None or agent.version != version or not agent.has_capacity:
+                continue
+            agent.load += 1
+            self._touch(agent)
+            return agent
+        return None
+
+    def release(self, agent_id: str):
+        """Frees one slot when a handed-off call ends."""
+        agent = self.agents[agent_id]
+        agent.load = max(0, agent.load - 1)
+        self._touch(agent)
+
+    def set_available(self, agent_id: str, available: bool):
+        """Agent going on/off break. Calls already assigned stay with them."""
+        agent = self.agents[agent_id]
+        agent.available = available
+        self._touch(agent)
+
+    def has_capacity(self) -> bool:
+        # Peek past stale entries without popping valid ones
+        while self._heap:
+            load, agent_id, version = self._heap[0]
+            agent = self.agents.get(agent_id)
+            if agent is not None and agent.version == version and agent.has_capacity:
+                return True
+            heapq.heappop(self._heap)
+        return False
+
+    def stats(self) -> dict:
+        agents = self.agents.values()
+        return {
+            "agents": len(self.agents),
+            "available": sum(1 for a in agents if a.available),
+            "busy_slots": sum(a.load for a in agents),
+            "total_slots": sum(a.capacity for a in agents if a.available),
+        }
@@ -0,0 +1,111 @@
+# handoff/desk.py
+
+"""
+Handoff desk: matches waiting calls to agents.
+
+A call is assigned right away when an agent has a free slot, otherwise it
+waits in the priority queue; every freed slot pulls the next call. Each
+assignment is one heap pop on each side, so peak-hour bursts cost
+O(log n) per transfer.
+"""
+
+import itertools
+import time
+
+from .agents import AgentPool
+from .queue import HandoffPayload, HandoffQueue
+
+
+class HandoffDesk:
+    """
+    Args:
+        pool: AgentPool (default: data/agents.json)
+        on_assign: callable(agent, payload, waited_seconds) - connects the call to the agent
+    """
+
+    def __init__(self, pool: AgentPool = None, on_assign=None, clock=time.monotonic, logger=None):
+        self.pool = pool if pool is not None else AgentPool.from_file()
+        self.queue = HandoffQueue(clock=clock)
+        self.on_assign = on_assign
+        self.logger = logger
+        self.assignments = {}   # handoff_id -> agent_id (until completed)
+        self._ids = itertools.count(1)
+        self.total_assigned = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def submit(self, msisdn: str, reason: str, context: dict = None, transcript: list = None,
+               customer_value: float = 0.0, handoff_id=None) -> HandoffPayload:
+        """handoff_id: caller-chosen id (workers name their own), else the next local one."""
+        payload = HandoffPayload(
+            handoff_id=handoff_id if handoff_id is not None else next(self._ids),
+            msisdn=msisdn,
+            reason=reason,
+            context=context or {},
+            transcript=transcript or [],
+            customer_value=customer_value,
+        )
+        self.queue.push(payload)
+        if self.logger:
+            self.logger.info(f"Handoff - {payload.handoff_id} queued ({msisdn}, reason={reason}, value={customer_value})")
+        self.dispatch()
+        return payload
+
+    def dispatch(self) -> int:
+        """Assigns waiting calls while agents have free slots. Returns how many were assigned."""
+        assigned = 0
+        while len(self.queue) and self.pool.has_capacity():
+            payload, waited = self.queue.pop()
+            agent = self.pool.acquire()
+            self.assignments[payload.handoff_id] = agent.agent_id
+            self.total_assigned += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            assigned += 1
+            if self.logger:
+                self.logger.info(f"Handoff - {payload.handoff_id} assigned to {agent.agent_id} after {waited:.1f}s")
+            if self.on_assign:
+                self.on_assign(agent, payload, waited)
+        return assigned
+
+    def complete(self, handoff_id: int):
+        """Agent finished the call: free the slot and pull the next waiting call."""
+        agent_id = self.assignments.pop(handoff_id, None)
+        if agent_id is not None:
+            self.pool.release(agent_id)
+            self.dispatch()
+
+    def abandon(self, handoff_id: int):
+        """
+        Caller hung up while still waiting. If the assignment was already on
+        its way to the call, the agent is freed as well.
+        """
+        self.queue.cancel(handoff_id)
+        self.complete(handoff_id)
+
+    def status(self, handoff_id: int) -> str:
+        if handoff_id in self.assignments:
+            return f"assigned:{self.assignments[handoff_id]}"
+        position = self.queue.position(handoff_id)
+        return f"queued:{position}" if position else "done"
+
+    def stats(self) -> dict:
+        return dict(
+            self.pool.stats(),
+            waiting=len(self.queue),
+            in_progress=len(self.assignments),
+            assigned=self.total_assigned,
+            avg_wait=self.total_wait / self.total_assigned if self.total_assigned else 0.0,
+            max_wait=self.max_wait,
+        )
+
+
+# Process-wide desk for single-process runs, created on first handoff (workers use the supervisor's)
+_desk = None
+
+
+def get_desk(logger=None) -> HandoffDesk:
+    global _desk
+    if _desk is None:
+        _desk = HandoffDesk(logger=logger)
+    return _desk
@@ -0,0 +1,194 @@
+# handoff/line.py
+
+"""
+A call's side of the handoff desk.
+
+The desk itself lives in one place: the supervisor when calls run in worker
+processes (so every worker shares one agent roster), otherwise this process.
+get_handoffs() returns the matching front end - SupervisorHandoffs or
+LocalHandoffs - with the same async interface:
+
+    submit(**fields) -> (handoff_id, status)    status "assigned:<agent>" or "queued:<position>"
+    wait_assigned(handoff_id) -> agent_id       the caller is on hold until then
+    complete(handoff_id)                        agent leg over - frees the agent
+    abandon(handoff_id)                         caller hung up while queued
+
+AgentLine ties one call to it: routeCallToAgent() routes through the call's
+active line, and run_call() closes it when the call ends, which completes or
+abandons the handoff.
+"""
+
+import asyncio
+import contextvars
+import itertools
+
+from .desk import get_desk
+
+_active_line = contextvars.ContextVar("active_agent_line", default=None)
+
+
+def get_active_line():
+    """Returns the AgentLine of the call running in this task, or None."""
+    return _active_line.get()
+
+
+def activate_line(line):
+    """Makes line the active one for the current task (and tasks it creates)."""
+    _active_line.set(line)
+
+
+class LocalHandoffs:
+    """This process's own desk - single-process runs (main.py, telephony ingress, sim)."""
+
+    def __init__(self, desk=None, logger=None):
+        self.desk = desk if desk is not None else get_desk(logger)
+        self.desk.on_assign = self._on_assign
+        self._waiters = {}   # handoff_id -> Future resolved with the agent id
+
+    def _on_assign(self, agent, payload, waited):
+        waiter = self._waiters.pop(payload.handoff_id, None)
+        if waiter is not None and not waiter.done():
+            waiter.set_result(agent.agent_id)
+
+    async def submit(self, **fields) -> tuple:
+        payload = self.desk.submit(**fields)
+        return payload.handoff_id, self.desk.status(payload.handoff_id)
+
+    async def wait_assigned(self, handoff_id) -> str:
+        agent_id = self.desk.assignments.get(handoff_id)
+        if agent_id is not None:
+            return agent_id
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters[handoff_id] = waiter
+        try:
+            return await waiter
+        finally:
+            self._waiters.pop(handoff_id, None)
+
+    def complete(self, handoff_id):
+        self.desk.complete(handoff_id)
+
+    def abandon(self, handoff_id):
+        self.desk.abandon(handoff_id)
+
+
+class SupervisorHandoffs:
+    """
+    A worker's front end to the supervisor's desk. Requests go out on the
+    events queue as ("handoff", worker_id, request); the supervisor answers
+    on the worker's inbox with {"handoff_id", "status"}, which CallWorker
+    passes to on_reply().
+    """
+
+    def __init__(self, worker_id: int, events):
+        self.worker_id = worker_id
+        self.events = events
+        self._ids = itertools.count(1)
+        self.status = {}     # handoff_id -> latest status from the supervisor
+        self._waiters = {}   # handoff_id -> [Future resolved with the next status]
+
+    def _send(self, action: str, handoff_id: str, **fields):
+        self.events.put(("handoff", self.worker_id, dict(fields, action=action, handoff_id=handoff_id)))
+
+    def _expect(self, handoff_id: str) -> asyncio.Future:
+        """Future for the next status - registered before anything can yield to the reply reader."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(handoff_id, []).append(waiter)
+        return waiter
+
+    def on_reply(self, reply: dict):
+        handoff_id = reply["handoff_id"]
+        if handoff_id not in self.status:
+            return   # already completed or abandoned on this side
+        self.status[handoff_id] = reply["status"]
+        for waiter in self._waiters.pop(handoff_id, []):
+            if not waiter.done():
+                waiter.set_result(reply["status"])
+
+    async def submit(self, **fields) -> tuple:
+        # Unique across workers; a restarted worker's leftovers are cleared by the supervisor first
+        handoff_id = f"w{self.worker_id}-{next(self._ids)}"
+        self.status[handoff_id] = None
+        reply = self._expect(handoff_id)
+        self._send("submit", handoff_id, **fields)
+        try:
+            return handoff_id, await reply
+        except asyncio.CancelledError:
+            # Hung up before the desk answered; AgentLine never learns the id
+            self.abandon(handoff_id)
+            raise
+
+    async def wait_assigned(self, handoff_id: str) -> str:
+        status = self.status.get(handoff_id)
+        while not (status or "").startswith("assigned:"):
+            status = await self._expect(handoff_id)
+        return status.split(":", 1)[1]
+
+    def complete(self, handoff_id: str):
+        self._forget(handoff_id)
+        self._send("complete", handoff_id)
+
+    def abandon(self, handoff_id: str):
+        self._forget(handoff_id)
+        self._send("abandon", handoff_id)
+
+    def _forget(self, handoff_id: str):
+        self.status.pop(handoff_id, None)
+        self._waiters.pop(handoff_id, None)
+
+
+class AgentLine:
+    """
+    One call's handoff: routed (and held until an agent is free) by
+    routeCallToAgent(), closed by whoever owns the call when it ends.
+    """
+
+    def __init__(self, handoffs, logger=None):
+        self.handoffs = handoffs
+        self.logger = logger
+        self.handoff_id = None
+        self.agent_id = None
+
+    @property
+    def connected(self) -> bool:
+        return self.agent_id is not None
+
+    async def route(self, **fields) -> str:
+        """Submits the handoff and holds the caller until an agent takes it. Returns "assigned:<agent_id>"."""
+        self.handoff_id, status = await self.handoffs.submit(**fields)
+        if not status.startswith("assigned:"):
+            if self.logger:
+                self.logger.info(f"Handoff - {self.handoff_id} on hold ({status})")
+            print(f"⏳ All agents busy - caller on hold ({status})")
+        self.agent_id = await self.handoffs.wait_assigned(self.handoff_id)
+        return f"assigned:{self.agent_id}"
+
+    def close(self):
+        """The call ended: frees the agent after the agent leg, or leaves the queue if still on hold."""
+        if self.handoff_id is None:
+            return
+        if self.connected:
+            self.handoffs.complete(self.handoff_id)
+        else:
+            self.handoffs.abandon(self.handoff_id)
+            if self.logger:
+                self.logger.info(f"Handoff - {self.handoff_id} abandoned, caller hung up on hold")
+        self.handoff_id = None
+
+
+# Process-wide front end, set up on first use (or by connect_supervisor() in a worker)
+_handoffs = None
+
+
+def connect_supervisor(worker_id: int, events) -> SupervisorHandoffs:
+    """Called once in a worker: handoffs go to the supervisor's desk instead of a local one."""
+    global _handoffs
+    _handoffs = SupervisorHandoffs(worker_id, events)
+    return _handoffs
+
+
+def get_handoffs(logger=None):
+    global _handoffs
+    if _handoffs is None:
+        _handoffs = LocalHandoffs(logger=logger)
+    return _handoffs
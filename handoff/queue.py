@@ -0,0 +1,86 @@
+# handoff/queue.py
+
+"""
+Priority queue of calls waiting for a human agent.
+
+Priority = wait time + boost for the failure reason + boost for customer
+value, all in seconds. Every waiting call ages at the same rate, so ordering
+by (enqueued_at - boost) gives the same order at any moment and never needs
+re-heapifying: push and pop stay O(log n).
+"""
+
+import heapq
+import itertools
+import time
+
+# How many seconds of waiting each failure reason is worth
+REASON_BOOST = {
+    "customer_request": 30.0,    # caller asked for a person
+    "address_invalid": 20.0,     # order nearly complete, only the address failed
+    "llm_unavailable": 15.0,     # our outage, not the caller's doing
+    "capacity": 15.0,            # turned away by admission control at peak
+    "unclear_response": 10.0,
+    "not_ordering": 0.0,
+}
+DEFAULT_REASON_BOOST = 5.0
+
+# Seconds of priority for a customer_value of 1.0 (profile value score in [0, 1])
+VALUE_BOOST = 20.0
+
+
+class HandoffPayload:
+    """Everything the agent's screen gets with the call."""
+
+    __slots__ = ("handoff_id", "msisdn", "reason", "context", "transcript", "customer_value")
+
+    def __init__(self, handoff_id: int, msisdn: str, reason: str, context: dict, transcript: list, customer_value: float):
+        self.handoff_id = handoff_id
+        self.msisdn = msisdn
+        self.reason = reason
+        self.context = context
+        self.transcript = transcript
+        self.customer_value = customer_value
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class HandoffQueue:
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._heap = []   # (effective arrival, seq, payload)
+        self._seq = itertools.count()
+        self.enqueued_at = {}   # handoff_id -> enqueue time (waiting calls only)
+
+    def __len__(self) -> int:
+        return len(self.enqueued_at)
+
+    def priority_boost(self, payload: HandoffPayload) -> float:
+        return REASON_BOOST.get(payload.reason, DEFAULT_REASON_BOOST) + VALUE_BOOST * payload.customer_value
+
+    def push(self, payload: HandoffPayload):
+        now = self.clock()
+        self.enqueued_at[payload.handoff_id] = now
+        heapq.heappush(self._heap, (now - self.priority_boost(payload), next(self._seq), payload))
+
+    def pop(self):
+        """Returns (payload, seconds waited) for the highest priority call, or None when empty."""
+        while self._heap:
+            _, _, payload = heapq.heappop(self._heap)
+            enqueued_at = self.enqueued_at.pop(payload.handoff_id, None)
+            if enqueued_at is not None:   # None: caller hung up while waiting
+                return payload, self.clock() - enqueued_at
+        return None
+
+    def cancel(self, handoff_id: int):
+        """Caller hung up - the heap entry is dropped lazily when it surfaces."""
+        self.enqueued_at.pop(handoff_id, None)
+
+    def position(self, handoff_id: int) -> int:
+        """1-based queue position (O(n) - for announcements, not the hot path)."""
+        waiting = sorted(entry for entry in self._heap if entry[2].handoff_id in self.enqueued_at)
+        for rank, (_, _, payload) in enumerate(waiting, 1):
+            if payload.handoff_id == handoff_id:
+                return rank
+        return 0
@@ -0,0 +1,44 @@
+# handoff/transcript.py
+
+"""
+Running transcript of the current call (agent prompts and caller turns),
+kept so a handoff can show the agent what was already said. STT and TTS
+append to the active transcript; it lives only as long as the call.
+"""
+
+import contextvars
+import time
+
+_active_transcript = contextvars.ContextVar("active_call_transcript", default=None)
+
+
+def get_active_transcript():
+    """Returns the transcript of the call running in this task, or None."""
+    return _active_transcript.get()
+
+
+def activate_transcript(transcript):
+    """Makes transcript the active one for the current task (and tasks it creates)."""
+    _active_transcript.set(transcript)
+
+
+class CallTranscript:
+
+    def __init__(self):
+        self.start = time.monotonic()
+        self.lines = []   # (offset seconds, speaker, text)
+
+    def agent(self, text: str):
+        self.lines.append((time.monotonic() - self.start, "agent", text))
+
+    def caller(self, text: str):
+        self.lines.append((time.monotonic() - self.start, "caller", text))
+
+    def since_caller(self):
+        """Seconds since the caller's last turn, if nothing was said after it."""
+        if self.lines and self.lines[-1][1] == "caller":
+            return time.monotonic() - self.start - self.lines[-1][0]
+        return None
+
+    def to_list(self) -> list:
+        return [{"offset": round(offset, 2), "speaker": speaker, "text": text} for offset, speaker, text in self.lines]
@@ -0,0 +1,9 @@
+# history/__init__.py
+
+"""
+Order history: the last few confirmed orders of each customer, for the repeat-order fast path.
+"""
+
+from .store import OrderHistory, PastOrder, describe, get_history
+
+__all__ = ['OrderHistory', 'PastOrder', 'describe', 'get_history']
@@ -0,0 +1,176 @@
+# history/store.py
+
+"""
+Per-customer order history on SQLite in WAL mode.
+
+Only the last few confirmed orders of each customer are kept (ORDER_HISTORY_KEEP,
+default 3): recording an order prunes that customer's older rows in the
+same transaction, so the file stays at a few rows per regular no matter
+how long it runs. Orders are stored as menu ids from the price quote
+(item, quantity, extras), not the transcribed text.
+
+Rows are keyed by call id, so a resumed call recording its order again is
+a no-op. A lookup is one indexed range read on (msisdn, ordered_at) -
+tens of microseconds - and every worker process reads the same file, so a
+regular is recognised whichever worker takes the call.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from functools import lru_cache
+
+from worker.shared_index import build_menu_mapping, get_index
+
+DEFAULT_HISTORY_PATH = "order_history.db"
+DEFAULT_KEEP = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    call_id     TEXT PRIMARY KEY,
+    msisdn      TEXT NOT NULL,
+    item        TEXT NOT NULL,
+    quantity    INTEGER NOT NULL,
+    extras      TEXT NOT NULL,
+    total       INTEGER,
+    ordered_at  REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS orders_by_customer ON orders (msisdn, ordered_at);
+"""
+
+PastOrder = namedtuple("PastOrder", ["item", "quantity", "extras", "total", "ordered_at"])
+
+
+@lru_cache(maxsize=None)
+def _menu_names() -> dict:
+    return {record["id"]: record["name"] for record in build_menu_mapping().values()}
+
+
+def menu_name(menu_id: str) -> str:
+    """
+    Display name of a menu id (the id itself if unknown). Inside a worker this
+    reads the supervisor's shared menu index instead of parsing data/menu.json.
+    """
+    index = get_index("menu")
+    if index is None:
+        return _menu_names().get(menu_id, menu_id)
+    record = index.get(menu_id)    # also holds aliases - only an exact id counts
+    return record["name"] if record and record["id"] == menu_id else menu_id
+
+
+def describe(order: PastOrder) -> str:
+    """Roman Urdu readback, e.g. "2 Zinger Burger, Fries aur Drink"."""
+    parts = [f"{order.quantity} {menu_name(order.item)}"]
+    parts += [menu_name(extra) for extra in order.extras]
+    if len(parts) == 1:
+        return parts[0]
+    return ", ".join(parts[:-1]) + " aur " + parts[-1]
+
+
+class OrderHistory:
+    """
+    Args:
+        path: SQLite file (ORDER_HISTORY_DB, default order_history.db), or ":memory:"
+        keep: orders kept per customer (ORDER_HISTORY_KEEP, default 3)
+        clock: wall-clock seconds; timestamps are shared between processes
+    """
+
+    def __init__(self, path: str = None, keep: int = None, clock=time.time):
+        self.path = path or os.getenv("ORDER_HISTORY_DB", DEFAULT_HISTORY_PATH)
+        self.keep = keep or int(os.getenv("ORDER_HISTORY_KEEP", DEFAULT_KEEP))
+        self.clock = clock
+        # sqlite3 connections stay on the thread that opened them
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    @property
+    def in_memory(self) -> bool:
+        """Private to this process (and thread): writes never wait on another process's lock."""
+        return self.path == ":memory:"
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def record(self, call_id: str, msisdn: str, quote: dict, ordered_at: float = None) -> bool:
+        """
+        Adds a confirmed order and drops the customer's orders beyond keep.
+
+        Args:
+            quote: the priced order (Quote.to_dict(): item, quantity, extras, total)
+            ordered_at: defaults to now (simulations seed older orders)
+
+        Returns:
+            bool: False if this call's order is already recorded
+        """
+        db = self._connect()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = db.execute(
+                "INSERT OR IGNORE INTO orders (call_id, msisdn, item, quantity, extras, total, ordered_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (call_id, msisdn, quote["item"], quote["quantity"], ",".join(quote.get("extras", ())),
+                 quote.get("total"), self.clock() if ordered_at is None else ordered_at),
+            )
+            db.execute(
+                "DELETE FROM orders WHERE msisdn = ? AND call_id NOT IN "
+                "(SELECT call_id FROM orders WHERE msisdn = ? ORDER BY ordered_at DESC LIMIT ?)",
+                (msisdn, msisdn, self.keep),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return cursor.rowcount == 1
+
+    def recent(self, msisdn: str) -> list:
+        """The customer's kept orders as PastOrder, newest first."""
+        rows = self._connect().execute(
+            "SELECT item, quantity, extras, total, ordered_at FROM orders "
+            "WHERE msisdn = ? ORDER BY ordered_at DESC LIMIT ?",
+            (msisdn, self.keep),
+        ).fetchall()
+        return [PastOrder(item, quantity, tuple(extras.split(",")) if extras else (), total, ordered_at)
+                for item, quantity, extras, total, ordered_at in rows]
+
+    def last_order(self, msisdn: str):
+        """The customer's most recent order, or None for a new customer."""
+        if not msisdn:
+            return None
+        orders = self.recent(msisdn)
+        return orders[0] if orders else None
+
+    def customers(self) -> int:
+        return self._connect().execute("SELECT COUNT(DISTINCT msisdn) FROM orders").fetchone()[0]
+
+    def close(self):
+        """Closes this thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
+
+
+_history = None
+_history_lock = threading.Lock()
+
+
+def get_history(logger=None) -> OrderHistory:
+    """Process-wide order history on ORDER_HISTORY_DB."""
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = OrderHistory()
+            if logger:
+                logger.info(f"History - using {_history.path}, keeping {_history.keep} orders per customer")
+    return _history
@@ -1,9 +1,49 @@
-# ai/tts.py
+# integration/routeToAgent.py
+from handoff import AgentLine, get_active_line, get_active_transcript, get_handoffs
+from metrics.voice_agent import ROUTED_TO_AGENT
+
+
 class RouteToAgent:
     def __init__(self, logger=None):
         self.logger = logger
 
-    async def routeCallToAgent(self) -> str:
-        # TO DO: Implement actual routing logic in future sprint
-        print("📞 Call routed to agent")
-        pass
\ No newline at end of file
+    async def routeCallToAgent(self, context=None, reason: str = "unclear_response", orchestrator: str = "unknown") -> str:
+        """
+        Hands the call to a human agent with everything collected so far.
+        The caller stays on hold until an agent is free; the agent is freed
+        when the call's line closes (run_call, once the agent leg ends).
+
+        Args:
+            context: the call's (partially filled) context
+            reason: why the flow gave up - see handoff.queue.REASON_BOOST
+            orchestrator: the step that routed the call (for metrics)
+
+        Returns:
+            str: "assigned:<agent_id>"
+        """
+        ROUTED_TO_AGENT.labels(orchestrator).inc()
+        context = context or {}
+        profile = context.get("customer_profile") or {}
+        transcript = get_active_transcript()
+
+        # Flows run without run_call (sim, replay) have no line: hand over and free the agent right away
+        line = get_active_line()
+        own_line = line is None
+        if own_line:
+            line = AgentLine(get_handoffs(self.logger), logger=self.logger)
+        try:
+            status = await line.route(
+                msisdn=context.get("msisdn"),
+                reason=reason,
+                context=dict(context.items()),
+                transcript=transcript.to_list() if transcript else [],
+                customer_value=float(profile.get("customer_value", 0.0)),
+            )
+            if self.logger:
+                self.logger.info(f"RouteToAgent - handoff {line.handoff_id} ({reason}): {status}")
+        finally:
+            if own_line:
+                line.close()
+
+        print(f"📞 Call routed to agent ({status})")
+        return status
@@ -1,21 +1,48 @@
 # logger.py
+import contextvars
 import logging
 import os
 from datetime import datetime
 from logging.handlers import TimedRotatingFileHandler
 
+# Call id and conversation step of the call the current task is serving.
+# Every log line carries them so logindex/ can find one call's lines.
+_log_call_id = contextvars.ContextVar("log_call_id", default="-")
+_log_step = contextvars.ContextVar("log_step", default="-")
 
-def setup_logger() -> logging.Logger:
+LOG_FORMAT = "%(asctime)s.%(msecs)03d | %(levelname)-8s | %(call_id)s | %(step)s | %(message)s"
+
+
+def set_log_context(call_id: str = None, step: str = None):
+    """Tags log lines from the current task (and tasks it creates) with the call id / step."""
+    if call_id is not None:
+        _log_call_id.set(call_id)
+    if step is not None:
+        _log_step.set(step)
+
+
+class _CallContextFilter(logging.Filter):
+    def filter(self, record):
+        record.call_id = _log_call_id.get()
+        record.step = _log_step.get()
+        return True
+
+
+def setup_logger(suffix: str = None) -> logging.Logger:
     """
     Returns a logger that writes to a daily-rotated file with timestamp-based filename.
     Keeps up to 30 days of log history.
+
+    Args:
+        suffix: Optional filename suffix, e.g. "worker-2", so processes started
+                in the same second don't share one file
     """
     # Create logs/ folder if it doesn't exist
     os.makedirs("logs", exist_ok=True)
 
     # Datetime-stamped filename
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    log_filename = f"logs/{timestamp}.log"
+    log_filename = f"logs/{timestamp}_{suffix}.log" if suffix else f"logs/{timestamp}.log"
 
     # Create logger
     logger = logging.getLogger("voice_agent")
@@ -32,10 +59,8 @@ def setup_logger() -> logging.Logger:
             encoding="utf-8"
         )
         file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(logging.Formatter(
-            "%(asctime)s | %(levelname)-8s | %(message)s",
-            datefmt="%Y-%m-%d %H:%M:%S"
-        ))
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S"))
+        file_handler.addFilter(_CallContextFilter())
         
         logger.addHandler(file_handler)
         
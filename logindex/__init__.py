@@ -0,0 +1,10 @@
+# logindex/__init__.py
+
+"""
+Incremental index over rotated session logs, queried with logindex.cli.
+"""
+
+from .index import LogIndex
+from .parser import parse_line
+
+__all__ = ['LogIndex', 'parse_line']
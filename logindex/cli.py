@@ -0,0 +1,97 @@
+# logindex/cli.py
+
+"""
+Query tool for the log index. Every command first indexes whatever was
+appended to logs/ since the last run (skip with --no-update).
+
+    python -m logindex.cli calls --msisdn 923001234567
+    python -m logindex.cli show 923001234567-ab12cd34
+    python -m logindex.cli show --msisdn 923001234567          # latest call of that number
+    python -m logindex.cli calls --step address --since "2026-10-19 09:00"
+    python -m logindex.cli stats --since "2026-10-19"
+"""
+
+import argparse
+import time
+from datetime import datetime
+
+from .index import LogIndex
+
+
+def parse_time(value: str):
+    if value is None:
+        return None
+    for fmt in ("%Y-%m-%d %H:%M:%S", "%Y-%m-%d %H:%M", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"Unrecognised time: {value}")
+
+
+def fmt_time(ts: float) -> str:
+    return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search voice agent logs by call")
+    parser.add_argument("--logs", default="logs", help="Log directory")
+    parser.add_argument("--no-update", action="store_true", help="Query the index as it is")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("build", help="Index new log data")
+
+    calls = sub.add_parser("calls", help="List calls")
+    show = sub.add_parser("show", help="Print one call's log lines")
+    stats = sub.add_parser("stats", help="Latency summary")
+    for p in (calls, show, stats):
+        p.add_argument("--since", type=parse_time)
+        p.add_argument("--until", type=parse_time)
+    for p in (calls, show):
+        p.add_argument("--msisdn")
+        p.add_argument("--step", help="Only calls that reached this step")
+    show.add_argument("call_id", nargs="?")
+    stats.add_argument("--call", dest="call_id")
+    args = parser.parse_args()
+
+    index = LogIndex(args.logs)
+    if not args.no_update or args.command == "build":
+        started = time.perf_counter()
+        counts = index.update()
+        if args.command == "build":
+            print(f"🗂️  Indexed {counts['bytes'] / 1e6:.1f} MB from {counts['files']} files: "
+                  f"{counts['spans']} spans, {counts['events']} latency events "
+                  f"in {(time.perf_counter() - started) * 1000:.0f} ms")
+            return
+
+    started = time.perf_counter()
+
+    if args.command == "calls":
+        found = index.find_calls(msisdn=args.msisdn, step=args.step, since=args.since, until=args.until)
+        for call in found:
+            print(f"{fmt_time(call['first'])}  {call['last'] - call['first']:7.1f}s  "
+                  f"{call['msisdn'] or '-':15} {call['id']:40} {','.join(call['steps'])}")
+        print(f"🔎 {len(found)} calls in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    elif args.command == "show":
+        call_id = args.call_id
+        if call_id is None:
+            found = index.find_calls(msisdn=args.msisdn, step=args.step, since=args.since, until=args.until)
+            if not found:
+                print("🔎 No matching call")
+                return
+            call_id = found[-1]["id"]
+        for text in index.call_lines(call_id):
+            print(text, end="")
+        print(f"🔎 {call_id} in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    elif args.command == "stats":
+        summary = index.stats(call_id=args.call_id, since=args.since, until=args.until)
+        print(f"📊 {summary.pop('calls')} calls")
+        for name, values in summary.items():
+            print(f"  {name:13} n={values['count']:<6} p50={values['p50'] * 1000:7.0f} ms  "
+                  f"p95={values['p95'] * 1000:7.0f} ms  max={values['max'] * 1000:7.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
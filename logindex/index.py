@@ -0,0 +1,272 @@
+# logindex/index.py
+
+"""
+Incremental on-disk index over rotated log files.
+
+    logs/.index/
+        state.json   files (by inode, so rotation renames keep their offsets),
+                     calls (id, msisdn), pending turn-latency state
+        spans.bin    runs of consecutive lines of one call:
+                     call | file | byte offset | length | first ts | last ts | steps bitmask
+        events.bin   latencies parsed from log lines: call | kind | ts | seconds
+
+Only bytes appended since the last run are read. Queries load the span
+table with NumPy and read just the matching byte ranges.
+"""
+
+import json
+import os
+import re
+
+import numpy as np
+
+from .parser import MSISDN_RE, parse_line
+
+SPAN_DTYPE = np.dtype([
+    ("call", "<u4"), ("file", "<u2"), ("offset", "<u8"), ("length", "<u4"),
+    ("first", "<f8"), ("last", "<f8"), ("steps", "u1"),
+])
+EVENT_DTYPE = np.dtype([("call", "<u4"), ("kind", "u1"), ("at", "<f8"), ("seconds", "<f4")])
+
+# Event kinds
+TURN_LATENCY = 1   # STT transcribe() complete → next TTS prompt
+STT_TURN = 2       # STT transcribe() called → complete
+LLM_LATENCY = 3    # LLM Prompt → Response / Timeout / Error
+
+EVENT_NAMES = {TURN_LATENCY: "turn_latency", STT_TURN: "stt_turn", LLM_LATENCY: "llm_latency"}
+
+STEP_BITS = {"greeting": 1, "address": 2, "order_item": 4, "quantity": 8, "extras": 16, "done": 32}
+
+LOG_NAME_RE = re.compile(r"^(.*\.log)(\..+)?$")
+
+
+class LogIndex:
+
+    def __init__(self, log_dir: str = "logs", index_dir: str = None):
+        self.log_dir = log_dir
+        self.index_dir = index_dir or os.path.join(log_dir, ".index")
+        self.spans_path = os.path.join(self.index_dir, "spans.bin")
+        self.events_path = os.path.join(self.index_dir, "events.bin")
+        self.state_path = os.path.join(self.index_dir, "state.json")
+        self.state = {"files": {}, "calls": [], "pending": {}}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                self.state = json.load(f)
+        self._call_refs = {call["id"]: ref for ref, call in enumerate(self.state["calls"])}
+
+    # ---- building ----
+
+    def _call_ref(self, call_id: str) -> int:
+        ref = self._call_refs.get(call_id)
+        if ref is None:
+            ref = len(self.state["calls"])
+            self.state["calls"].append({"id": call_id, "msisdn": None})
+            self._call_refs[call_id] = ref
+        return ref
+
+    def _log_files(self):
+        for name in sorted(os.listdir(self.log_dir)):
+            path = os.path.join(self.log_dir, name)
+            if LOG_NAME_RE.match(name) and os.path.isfile(path):
+                yield path
+
+    def update(self) -> dict:
+        """Indexes everything appended since the last update. Returns counts for this run."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        files = self.state["files"]
+        counts = {"files": 0, "bytes": 0, "spans": 0, "events": 0}
+
+        with open(self.spans_path, "ab") as spans_out, open(self.events_path, "ab") as events_out:
+            for path in self._log_files():
+                stat = os.stat(path)
+                key = f"{stat.st_dev}:{stat.st_ino}"
+                entry = files.get(key)
+                if entry is None:
+                    entry = {"id": len(files), "path": path, "offset": 0}
+                    files[key] = entry
+                entry["path"] = path   # rotation renames the file, the inode stays
+                if stat.st_size < entry["offset"]:
+                    entry["offset"] = 0   # truncated / replaced
+                if stat.st_size == entry["offset"]:
+                    continue
+
+                spans, events, consumed = self._index_range(path, entry["id"], entry["offset"])
+                entry["offset"] += consumed
+                if len(spans):
+                    spans_out.write(spans.tobytes())
+                if len(events):
+                    events_out.write(events.tobytes())
+                counts["files"] += 1
+                counts["bytes"] += consumed
+                counts["spans"] += len(spans)
+                counts["events"] += len(events)
+
+        with open(self.state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(self.state_path + ".tmp", self.state_path)
+        return counts
+
+    def _index_range(self, path: str, file_id: int, offset: int):
+        with open(path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        end = data.rfind(b"\n") + 1   # only whole lines; the rest is still being written
+        data = data[:end]
+
+        base_name = LOG_NAME_RE.match(os.path.basename(path)).group(1)
+        session_key = f"session:{base_name}"
+        pending = self.state["pending"]
+        spans, events = [], []
+        current = None   # [call_ref, start, end, first, last, steps]
+        current_key = None
+        position = offset
+
+        for raw in data.split(b"\n")[:-1]:
+            line_start = position
+            position += len(raw) + 1
+            parsed = parse_line(raw.decode("utf-8", "replace"))
+
+            if parsed is None:
+                if current is not None:
+                    current[2] = position   # continuation of the previous record
+                continue
+
+            key = parsed.call_id or session_key
+            if key != current_key:
+                if current is not None:
+                    spans.append(tuple(current))
+                current = [self._call_ref(key), line_start, position, parsed.timestamp, parsed.timestamp, 0]
+                current_key = key
+            current[2] = position
+            current[4] = parsed.timestamp
+            current[5] |= STEP_BITS.get(parsed.step, 0)
+
+            self._extract(current[0], key, parsed, pending, events)
+
+        if current is not None:
+            spans.append(tuple(current))
+
+        span_array = np.array(
+            [(ref, file_id, start, stop - start, first, last, steps) for ref, start, stop, first, last, steps in spans],
+            dtype=SPAN_DTYPE,
+        )
+        return span_array, np.array(events, dtype=EVENT_DTYPE), end
+
+    def _extract(self, call_ref: int, key: str, line, pending: dict, events: list):
+        """Pulls msisdn and latency events out of known log lines."""
+        message = line.message
+        call = self.state["calls"][call_ref]
+        if call["msisdn"] is None:
+            m = MSISDN_RE.search(message)
+            if m:
+                call["msisdn"] = m.group(1)
+
+        state = pending.setdefault(key, {})
+        ts = line.timestamp
+
+        if message.startswith("STT transcribe() called"):
+            state["stt_start"] = ts
+        elif message.startswith("STT transcribe() complete"):
+            if "stt_start" in state:
+                events.append((call_ref, STT_TURN, ts, ts - state.pop("stt_start")))
+            state["stt_done"] = ts
+        elif message.startswith("TTS Playing:"):
+            if "stt_done" in state:
+                events.append((call_ref, TURN_LATENCY, ts, ts - state.pop("stt_done")))
+        elif message.startswith("LLM Prompt"):
+            state["llm_start"] = ts
+        elif message.startswith(("LLM Response", "LLM Timeout", "LLM Error", "LLM circuit open")):
+            if "llm_start" in state:
+                events.append((call_ref, LLM_LATENCY, ts, ts - state.pop("llm_start")))
+
+        if not state:
+            pending.pop(key, None)
+
+    # ---- querying ----
+
+    def _spans(self) -> np.ndarray:
+        if not os.path.exists(self.spans_path):
+            return np.zeros(0, dtype=SPAN_DTYPE)
+        return np.fromfile(self.spans_path, dtype=SPAN_DTYPE)
+
+    def _events(self) -> np.ndarray:
+        if not os.path.exists(self.events_path):
+            return np.zeros(0, dtype=EVENT_DTYPE)
+        return np.fromfile(self.events_path, dtype=EVENT_DTYPE)
+
+    def find_calls(self, msisdn: str = None, call_id: str = None, step: str = None,
+                   since: float = None, until: float = None) -> list:
+        """Matching calls as dicts: id, msisdn, first, last, steps."""
+        refs = [
+            ref for ref, call in enumerate(self.state["calls"])
+            if (call_id is None or call["id"] == call_id) and (msisdn is None or call["msisdn"] == msisdn)
+        ]
+        spans = self._spans()
+        spans = spans[np.isin(spans["call"], refs)]
+        if since is not None:
+            spans = spans[spans["last"] >= since]
+        if until is not None:
+            spans = spans[spans["first"] <= until]
+
+        calls = []
+        for ref in np.unique(spans["call"]):
+            mine = spans[spans["call"] == ref]
+            steps = int(np.bitwise_or.reduce(mine["steps"]))
+            if step is not None and not steps & STEP_BITS.get(step, 0):
+                continue
+            call = self.state["calls"][ref]
+            calls.append({
+                "id": call["id"],
+                "msisdn": call["msisdn"],
+                "first": float(mine["first"].min()),
+                "last": float(mine["last"].max()),
+                "steps": [name for name, bit in STEP_BITS.items() if steps & bit],
+            })
+        return sorted(calls, key=lambda c: c["first"])
+
+    def call_lines(self, call_id: str):
+        """Yields the call's log text in order, reading only its byte ranges."""
+        ref = self._call_refs.get(call_id)
+        if ref is None:
+            return
+        paths = {entry["id"]: entry["path"] for entry in self.state["files"].values()}
+        spans = self._spans()
+        spans = spans[spans["call"] == ref]
+        spans = spans[np.lexsort((spans["offset"], spans["first"]))]
+
+        handles = {}
+        try:
+            for span in spans:
+                file_id = int(span["file"])
+                if file_id not in handles:
+                    handles[file_id] = open(paths[file_id], "rb")
+                f = handles[file_id]
+                f.seek(int(span["offset"]))
+                yield f.read(int(span["length"])).decode("utf-8", "replace")
+        finally:
+            for f in handles.values():
+                f.close()
+
+    def stats(self, call_id: str = None, since: float = None, until: float = None) -> dict:
+        """Latency percentiles per event kind (seconds)."""
+        events = self._events()
+        if call_id is not None:
+            events = events[events["call"] == self._call_refs.get(call_id, -1)]
+        if since is not None:
+            events = events[events["at"] >= since]
+        if until is not None:
+            events = events[events["at"] <= until]
+
+        summary = {"calls": len(np.unique(events["call"])) if len(events) else 0}
+        for kind, name in EVENT_NAMES.items():
+            values = events["seconds"][events["kind"] == kind].astype(np.float64)
+            if not len(values):
+                continue
+            summary[name] = {
+                "count": int(len(values)),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+                "max": float(values.max()),
+                "mean": float(values.mean()),
+            }
+        return summary
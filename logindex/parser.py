@@ -0,0 +1,70 @@
+# logindex/parser.py
+
+"""
+Parsing of voice agent log lines.
+
+    2026-10-19 07:28:33.123 | INFO     | 923001234567-ab12cd34 | address | Address - ...   (current)
+    2026-02-13 14:30:00 | INFO     | Address - ...                                         (before call ids)
+
+Lines that don't start with a timestamp continue the previous record
+(tracebacks, multi-line stacks).
+"""
+
+import re
+import time
+
+LINE_RE = re.compile(
+    r"^(?P<ts>\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)(?:\.(?P<ms>\d{3}))? \| (?P<level>[A-Z]+)\s* \| "
+    r"(?:(?P<call>\S+) \| (?P<step>\S+) \| )?(?P<message>.*)$"
+)
+MSISDN_RE = re.compile(r"msisdn: (\d{6,15})")
+
+# Message prefixes of each step's orchestrator, for lines without a step field
+STEP_PREFIXES = {
+    "Greeting": "greeting",
+    "Address": "address",
+    "OrderItem": "order_item",
+    "Quantity": "quantity",
+    "Extras": "extras",
+}
+
+_second_cache = {}
+
+
+def parse_timestamp(ts: str, ms: str = None) -> float:
+    """Local-time log timestamp → epoch seconds (cached per second, strptime is slow)."""
+    base = _second_cache.get(ts)
+    if base is None:
+        base = time.mktime(time.strptime(ts, "%Y-%m-%d %H:%M:%S"))
+        if len(_second_cache) > 100_000:
+            _second_cache.clear()
+        _second_cache[ts] = base
+    return base + (int(ms) / 1000 if ms else 0.0)
+
+
+class LogLine:
+    __slots__ = ("timestamp", "level", "call_id", "step", "message")
+
+    def __init__(self, timestamp: float, level: str, call_id: str, step: str, message: str):
+        self.timestamp = timestamp
+        self.level = level
+        self.call_id = call_id
+        self.step = step
+        self.message = message
+
+
+def parse_line(line: str):
+    """Returns a LogLine, or None for a continuation line."""
+    m = LINE_RE.match(line)
+    if m is None:
+        return None
+
+    message = m.group("message")
+    call_id = m.group("call")
+    step = m.group("step")
+    if call_id == "-":
+        call_id = None
+    if step in (None, "-"):
+        step = STEP_PREFIXES.get(message.split(" -", 1)[0]) if " - " in message else None
+
+    return LogLine(parse_timestamp(m.group("ts"), m.group("ms")), m.group("level"), call_id, step, message)
@@ -1,8 +1,12 @@
 # main.py - Entry point for the voice agent
 
+import time
+_process_start = time.perf_counter()
+
 import asyncio
 import sys
 import os
+import uuid
 
 # Add current directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -12,91 +16,153 @@ from orchestrator.order_item import OrderItemOrchestrator
 from orchestrator.quantity import QuantityOrchestrator
 from orchestrator.extras import ExtrasOrchestrator
 from orchestrator.address import AddressOrchestrator
+from orchestrator.repeat_order import RepeatOrderOrchestrator
+from orchestrator.prompts import ORDER_TOTAL
 from integration.routeToAgent import RouteToAgent
+from ai import TTS
+from ai.prompts import prompt_registry
+from pricing import get_engine
+from outbox import get_outbox
+from history import get_history
+from quota import get_admission
+from replay.recorder import CallRecorder, activate_recorder
+from recording import CallRecording, activate_recording
+from state import CallContext, CheckpointStore, STEPS
+from handoff import AgentLine, CallTranscript, activate_line, activate_transcript, get_handoffs
+from metrics import start_metrics_server
+from diagnostics import set_current_call, start_diagnostics
+from metrics.voice_agent import ACTIVE_CALLS, CALLS_IN_STEP, HISTORY_LOOKUP
+from ai.warmup import warmup
 
-from logger import setup_logger
+from logger import set_log_context, setup_logger
 
+# Upper bound on waiting for the audio device before the greeting starts
+AUDIO_READY_TIMEOUT = 2.0
 
-async def voice_agent_controller():
+
+async def run_order_flow(context: CallContext, logger, stt=None, llm=None, tts=None, checkpoints=None, outbox=None,
+                         history=None) -> bool:
     """
-    Main controller for the voice agent.
-    Orchestrates the entire order flow.
+    Runs the order flow for one call on the given context, starting at
+    context.step (so a context restored from a checkpoint resumes mid-flow).
+    AI services are optional - pass shared instances, fakes or replay stubs;
+    each orchestrator creates its own otherwise. outbox and history default
+    to the process outbox and order history (simulations and replays pass
+    in-memory ones).
+
+    Returns:
+        bool: True if the order was confirmed
     """
+    services = {"stt": stt, "llm": llm, "tts": tts}
 
-    logger = setup_logger()
-    
-    print("=" * 50)
-    print("🎙️  KFC Voice Agent Started")
-    print("=" * 50)
+    CALLS_IN_STEP.labels(context.step).inc()
+    try:
+        return await _run_order_steps(context, logger, services, checkpoints, outbox, history)
+    finally:
+        CALLS_IN_STEP.labels(context.step).dec()
+
+
+async def _run_order_steps(context: CallContext, logger, services: dict, checkpoints, outbox, history) -> bool:
+
+    def completed(next_step: str):
+        CALLS_IN_STEP.labels(context.step).dec()
+        context.advance(next_step)
+        CALLS_IN_STEP.labels(next_step).inc()
+        set_log_context(step=next_step)
+        if checkpoints:
+            checkpoints.save(context)
+
+    if context.step != STEPS[0]:
+        print(f"\n♻️  Resuming call {context.call_id} at step: {context.step}")
+        logger.info(f"Resuming call {context.call_id} at step '{context.step}' with {context.to_dict()}")
+
+    # A regular's last order, looked up before the greeting plays (one indexed local read)
+    history = history or get_history(logger)
+    last_order = None
+    if context.is_pending("order_item"):
+        started = time.perf_counter()
+        last_order = history.last_order(context["msisdn"])
+        HISTORY_LOOKUP.observe(time.perf_counter() - started)
+        if last_order:
+            logger.info(f"Returning customer {context['msisdn']}, last order: {last_order}")
 
-    await asyncio.sleep(1)  # ✅ 1 second delay before flow starts
-    
-    # Single context dict for entire call
-    context = {
-        "msisdn": "923001234567",   # In real system: passed from incoming call
-        "intent": None,
-        "customer_profile": None,
-        "order_item": None,
-        "quantity": None,
-        "extra": None,
-        "address": None,
-        "cost": None,
-    }
-    
     # Step 1: Greeting and intent detection
-    print("\n📍 Step 1: Greeting")
-    print("-" * 50)
-    greeting_orchestrator = GreetingOrchestrator(logger=logger)
-    should_proceed = await greeting_orchestrator.execute()
-    
-    if not should_proceed:
-        print("\n❌ User chose not to order or unclear response. Ending call.")
-        routeToAgent_orchestrator = RouteToAgent()
-        await routeToAgent_orchestrator.routeCallToAgent()
-        return
+    if context.is_pending("greeting"):
+        print("\n📍 Step 1: Greeting")
+        print("-" * 50)
+        greeting_orchestrator = GreetingOrchestrator(logger=logger, **services)
+        should_proceed = await greeting_orchestrator.execute()
+
+        if not should_proceed:
+            print("\n❌ User chose not to order or unclear response. Ending call.")
+            routeToAgent_orchestrator = RouteToAgent(logger=logger)
+            await routeToAgent_orchestrator.routeCallToAgent(
+                context, reason=greeting_orchestrator.failure_reason, orchestrator="greeting")
+            return False
 
-    print("\n✅ User wants to place an order. Proceeding...")
-    context["intent"] = "order"    # ✅ save intent after greeting confirmed
+        print("\n✅ User wants to place an order. Proceeding...")
+        context["intent"] = "order"    # ✅ save intent after greeting confirmed
+        completed("address")
 
     # Step 5: Collect address
-    print("\n📍 Step 2: Address")
-    print("-" * 50)
-    address_orchestrator = AddressOrchestrator(logger=logger)
-    success = await address_orchestrator.execute(context)
-    
-    if not success:
-        print("\n❌ Failed to collect valid address. Ending call.")
-        return
-    
+    if context.is_pending("address"):
+        print("\n📍 Step 2: Address")
+        print("-" * 50)
+        address_orchestrator = AddressOrchestrator(logger=logger, **services)
+        success = await address_orchestrator.execute(context)
+
+        if not success:
+            print("\n❌ Failed to collect valid address. Ending call.")
+            return False
+        completed("order_item")
+
+    # Regulars: "same as last time?" replaces the item, quantity and extras questions
+    if context.is_pending("order_item") and last_order:
+        print("\n📍 Step 3: Repeat Order")
+        print("-" * 50)
+        repeat_orchestrator = RepeatOrderOrchestrator(logger=logger, **services)
+        if await repeat_orchestrator.execute(context, last_order):
+            context["cost"] = get_engine(logger).quote_context(context)
+            completed("done")
+
     # Step 2: Collect order item
-    print("\n📍 Step 3: Order Item")
-    print("-" * 50)
-    order_item_orchestrator = OrderItemOrchestrator(logger=logger)
-    success = await order_item_orchestrator.execute(context)
-    
-    if not success:
-        print("\n❌ Failed to collect order item. Ending call.")
-        return
-    
+    if context.is_pending("order_item"):
+        print("\n📍 Step 3: Order Item")
+        print("-" * 50)
+        order_item_orchestrator = OrderItemOrchestrator(logger=logger, **services)
+        success = await order_item_orchestrator.execute(context)
+
+        if not success:
+            print("\n❌ Failed to collect order item. Ending call.")
+            return False
+        completed("quantity")
+
     # Step 3: Collect quantity
-    print("\n📍 Step 4: Quantity")
-    print("-" * 50)
-    quantity_orchestrator = QuantityOrchestrator(logger=logger)
-    success = await quantity_orchestrator.execute(context)
-    
-    if not success:
-        print("\n❌ Failed to collect quantity. Ending call.")
-        return
-    
+    if context.is_pending("quantity"):
+        print("\n📍 Step 4: Quantity")
+        print("-" * 50)
+        quantity_orchestrator = QuantityOrchestrator(logger=logger, **services)
+        success = await quantity_orchestrator.execute(context)
+
+        if not success:
+            print("\n❌ Failed to collect quantity. Ending call.")
+            return False
+        completed("extras")
+
     # Step 4: Collect extras
-    print("\n📍 Step 5: Extras")
-    print("-" * 50)
-    extras_orchestrator = ExtrasOrchestrator(logger=logger)
-    success = await extras_orchestrator.execute(context)
-    
-    if not success:
-        print("\n❌ Failed to collect extras. Ending call.")
-        return
+    if context.is_pending("extras"):
+        print("\n📍 Step 5: Extras")
+        print("-" * 50)
+        extras_orchestrator = ExtrasOrchestrator(logger=logger, **services)
+        success = await extras_orchestrator.execute(context)
+
+        if not success:
+            print("\n❌ Failed to collect extras. Ending call.")
+            return False
+
+        # Price the order from the local price list - no pricing service or LLM on the readback path
+        context["cost"] = get_engine(logger).quote_context(context)
+        completed("done")
 
     
     # Final: Display order summary
@@ -111,9 +177,149 @@ async def voice_agent_controller():
         else:
             print(f"  {key.upper()}: {value}")
     
+    cost = context["cost"]
+    if cost:
+        tts = services["tts"] or TTS(logger=logger)
+        await tts.play_audio(ORDER_TOTAL.fill(total=cost["total"]))
+
+    # Durable local append; the POS gets it from the background sender, not on this call
+    outbox = outbox or get_outbox(logger)
+    await _store_write(outbox.store, outbox.submit, context)
+    if cost:
+        await _store_write(history, history.record, context.call_id, context["msisdn"], cost)
+
     print("\n🎉 Order confirmed! Thank you for calling KFC.")
     print("=" * 50)
 
+    logger.info(f"LLM token usage per prompt: {prompt_registry.summary()}")
+    return True
+
+
+async def _store_write(store, write, *args):
+    """
+    Runs a SQLite write off the event loop: another worker process holding the
+    write lock can stall it for up to the busy timeout, and every call on this
+    loop with it. In-memory stores (simulation, replay) are written inline.
+    """
+    if store.in_memory:
+        return write(*args)
+    return await asyncio.to_thread(write, *args)
+
+
+async def voice_agent_controller():
+    """
+    Main controller for the voice agent.
+    Orchestrates the entire order flow.
+    """
+
+    logger = setup_logger()
+    
+    print("=" * 50)
+    print("🎙️  KFC Voice Agent Started")
+    print("=" * 50)
+
+    # Warm SDKs and connections in the background; only the audio device has to be
+    # ready before the greeting - the rest finishes while the greeting plays
+    warmup.start(logger=logger)
+
+    # Optional local metrics endpoint (set METRICS_PORT to enable)
+    if os.getenv("METRICS_PORT"):
+        start_metrics_server(int(os.getenv("METRICS_PORT")), logger=logger)
+
+    # Loop lag watchdog + control socket for on-demand profiling (python -m diagnostics.ctl)
+    diagnostics = start_diagnostics(logger=logger)
+
+    await warmup.wait_ready("audio", timeout=AUDIO_READY_TIMEOUT)
+    logger.info(f"Startup - ready for first prompt after {(time.perf_counter() - _process_start) * 1000:.0f} ms")
+    
+    try:
+        await run_call("923001234567", logger)   # In real system: msisdn passed from incoming call
+    finally:
+        diagnostics.close()
+
+
+def new_call_context(msisdn: str, call_id: str = None) -> CallContext:
+    """Single context for entire call"""
+    return CallContext(msisdn=msisdn, call_id=call_id or f"{msisdn}-{uuid.uuid4().hex[:8]}")
+
+
+async def run_call(msisdn: str, logger, call_id: str = None, resume: bool = False, hangup: asyncio.Event = None,
+                   **services) -> bool:
+    """
+    Runs one call end to end: fresh context, optional call trace and recording, order flow.
+    Used by the local controller and by worker processes.
+
+    Args:
+        call_id: stable id for checkpoints (generated when omitted)
+        resume: continue from call_id's last checkpoint if there is one
+        hangup: set when the caller hangs up (telephony calls); a call handed to
+                an agent stays up until then, and the agent is freed after it
+    """
+    checkpoints = CheckpointStore(logger=logger)
+    context = checkpoints.load(call_id) if resume and call_id else None
+    if context is None:
+        context = new_call_context(msisdn, call_id)
+
+    # Lets the loop watchdog, profiler and log lines attribute this task (and its children) to the call
+    set_current_call(context.call_id)
+    set_log_context(call_id=context.call_id, step=context.step)
+    logger.info(f"Call started - msisdn: {context['msisdn']}, call id: {context.call_id}")
+
+    # The call's place at the handoff desk if it's routed; closing it frees the agent or leaves the queue
+    line = AgentLine(get_handoffs(logger), logger=logger)
+    activate_line(line)
+
+    # New calls queue briefly (or are turned away) while quotas are saturated; resumed calls go straight in
+    admission = get_admission(logger)
+    if not await admission.admit(in_progress=context.step != STEPS[0]):
+        print("\n⏳ Too many calls right now. Routing to an agent.")
+        try:
+            await RouteToAgent(logger=logger).routeCallToAgent(context, reason="capacity", orchestrator="admission")
+            await _agent_leg(line, hangup)
+        finally:
+            line.close()
+            checkpoints.delete(context.call_id)
+        return False
+
+    # What was said so far - handed to the agent if the call is routed
+    activate_transcript(CallTranscript())
+
+    # Optional full-call trace for offline replay (set CALL_TRACE_DIR to enable)
+    recorder = CallRecorder.for_call(context["msisdn"], logger=logger)
+    activate_recorder(recorder)
+
+    # Optional QA audio recording (set CALL_RECORDING_DIR to enable)
+    recording = CallRecording.for_call(context["msisdn"], logger=logger)
+    activate_recording(recording)
+
+    ACTIVE_CALLS.inc()
+    try:
+        confirmed = await run_order_flow(context, logger, checkpoints=checkpoints, **services)
+        await _agent_leg(line, hangup)
+        return confirmed
+    finally:
+        # Hung up on hold: leaves the queue; after the agent leg: frees the agent
+        line.close()
+        ACTIVE_CALLS.dec()
+        admission.release()
+        # Reached on every way a call ends in this process (incl. exit()); only a
+        # dead worker leaves its checkpoint behind for a replacement to resume
+        checkpoints.delete(context.call_id)
+        if recorder:
+            recorder.close()
+        if recording:
+            recording.close()
+
+
+async def _agent_leg(line: AgentLine, hangup: asyncio.Event = None):
+    """
+    A call handed to an agent stays up, bridged to them, until the caller hangs
+    up. Without a hangup signal (local mic, synthetic worker calls) there is no
+    bridge to hold and the agent is freed when the call returns.
+    """
+    if line.connected and hangup is not None:
+        await hangup.wait()
+
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,10 @@
+# metrics/__init__.py
+
+"""
+In-process metrics registry and Prometheus-text endpoint.
+"""
+
+from .registry import MetricsRegistry, registry, LATENCY_BUCKETS
+from .server import start_metrics_server
+
+__all__ = ['MetricsRegistry', 'registry', 'LATENCY_BUCKETS', 'start_metrics_server']
@@ -0,0 +1,229 @@
+# metrics/registry.py
+
+"""
+In-process metrics with Prometheus text exposition.
+
+Recording never takes a lock: every thread (event loop, PortAudio callback,
+writer threads) updates its own shard, and a scrape sums the shards. A shard
+is created - under a lock, once - the first time a thread touches a metric.
+An increment is a thread-local lookup plus one list item add, so it is safe
+to call per audio frame. When a thread exits, its shard is folded into a
+retired total, so short-lived threads (one audio callback thread per STT
+stream, to_thread workers) don't leave shards behind.
+"""
+
+import bisect
+import itertools
+import threading
+import weakref
+
+# Latency buckets in seconds, shared by the voice-agent histograms
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+
+def _format_labels(names: tuple, values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{str(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _ThreadToken:
+    """Kept in a thread's threading.local - collected when the thread exits."""
+
+    __slots__ = ("__weakref__",)
+
+
+class _Sharded:
+    """Per-thread list of numbers; only the owning thread writes to its shard."""
+
+    def __init__(self, size: int):
+        self._size = size
+        self._local = threading.local()
+        self._shards = {}    # key -> shard of a live thread
+        self._retired = [0] * size
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+
+    def shard(self) -> list:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = [0] * self._size
+            token = _ThreadToken()
+            with self._lock:
+                key = next(self._keys)
+                self._shards[key] = shard
+            weakref.finalize(token, self._retire, key)
+            self._local.token = token
+            self._local.shard = shard
+            return shard
+
+    def _retire(self, key: int):
+        # The owning thread is gone, so nothing writes to the shard any more
+        with self._lock:
+            shard = self._shards.pop(key, None)
+            if shard is not None:
+                self._retired = [a + b for a, b in zip(self._retired, shard)]
+
+    def totals(self) -> list:
+        with self._lock:
+            shards = list(self._shards.values())
+            shards.append(self._retired)
+        return [sum(values) for values in zip(*shards)]
+
+
+class Counter:
+
+    def __init__(self, values=()):
+        self.label_values = values
+        self._cells = _Sharded(1)
+
+    def inc(self, amount: float = 1):
+        self._cells.shard()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+
+class Gauge(Counter):
+    """
+    Up/down value (e.g. active calls) - inc() and dec() from any thread, or
+    set() to an absolute value (e.g. a backlog read from a store).
+    """
+
+    def __init__(self, values=()):
+        super().__init__(values)
+        self._base = 0   # last set() value minus the shard total at that moment
+
+    def dec(self, amount: float = 1):
+        self._cells.shard()[0] -= amount
+
+    def set(self, value: float):
+        self._base = value - self._cells.totals()[0]
+
+    @property
+    def value(self) -> float:
+        return self._base + self._cells.totals()[0]
+
+
+class Histogram:
+
+    def __init__(self, values=(), buckets=LATENCY_BUCKETS):
+        self.label_values = values
+        self.buckets = tuple(buckets)
+        # one cell per bucket, one for +Inf, then the sum
+        self._cells = _Sharded(len(self.buckets) + 2)
+
+    def observe(self, value: float):
+        shard = self._cells.shard()
+        shard[bisect.bisect_left(self.buckets, value)] += 1
+        shard[-1] += value
+
+    def snapshot(self):
+        """Returns (cumulative bucket counts incl. +Inf, count, sum)."""
+        totals = self._cells.totals()
+        cumulative, running = [], 0
+        for count in totals[:-1]:
+            running += count
+            cumulative.append(running)
+        return cumulative, running, totals[-1]
+
+
+class Metric:
+    """A named metric family; children per label combination."""
+
+    def __init__(self, kind: str, name: str, help_text: str, labels=(), **options):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self.options = options
+        self._children = {}
+        self._lock = threading.Lock()
+        self._default = None if self.label_names else self._new_child(())
+
+    def _new_child(self, values: tuple):
+        if self.kind == "counter":
+            return Counter(values)
+        if self.kind == "gauge":
+            return Gauge(values)
+        return Histogram(values, **self.options)
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.label_names)
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child(values))
+        return child
+
+    # Unlabelled shortcuts
+    def inc(self, amount: float = 1):
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1):
+        self._default.dec(amount)
+
+    def set(self, value: float):
+        self._default.set(value)
+
+    def observe(self, value: float):
+        self._default.observe(value)
+
+    def children(self) -> list:
+        if self._default is not None:
+            return [self._default]
+        with self._lock:
+            return list(self._children.values())
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for child in self.children():
+            if self.kind == "histogram":
+                cumulative, count, total = child.snapshot()
+                bounds = [str(b) for b in child.buckets] + ["+Inf"]
+                for bound, value in zip(bounds, cumulative):
+                    labels = _format_labels(self.label_names, child.label_values, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {value}")
+                labels = _format_labels(self.label_names, child.label_values)
+                lines.append(f"{self.name}_count{labels} {count}")
+                lines.append(f"{self.name}_sum{labels} {total}")
+            else:
+                labels = _format_labels(self.label_names, child.label_values)
+                lines.append(f"{self.name}{labels} {child.value}")
+        return lines
+
+
+class MetricsRegistry:
+
+    def __init__(self):
+        self._metrics = {}
+
+    def _register(self, kind: str, name: str, help_text: str, labels=(), **options) -> Metric:
+        if name in self._metrics:
+            return self._metrics[name]
+        metric = Metric(kind, name, help_text, labels, **options)
+        self._metrics[name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labels=()) -> Metric:
+        return self._register("counter", name, help_text, labels)
+
+    def gauge(self, name: str, help_text: str, labels=()) -> Metric:
+        return self._register("gauge", name, help_text, labels)
+
+    def histogram(self, name: str, help_text: str, labels=(), buckets=LATENCY_BUCKETS) -> Metric:
+        return self._register("histogram", name, help_text, labels, buckets=buckets)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Process-wide registry
+registry = MetricsRegistry()
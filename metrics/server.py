@@ -0,0 +1,42 @@
+# metrics/server.py
+
+"""
+Prometheus-text endpoint on localhost.
+
+    GET http://127.0.0.1:<METRICS_PORT>/metrics
+
+Served from a daemon thread so a scrape never runs on the call event loop.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .registry import registry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the console
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1", logger=None) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    if logger:
+        logger.info(f"Metrics - serving http://{host}:{server.server_address[1]}/metrics")
+    return server
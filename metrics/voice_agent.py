@@ -0,0 +1,82 @@
+# metrics/voice_agent.py
+
+"""
+The voice agent's metrics, recorded by main, STT, LLM, TTS and RouteToAgent.
+"""
+
+from .registry import registry
+
+# Confirmed order → POS acknowledged; minutes when the POS is down
+DELIVERY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 15.0, 60.0, 300.0, 1800.0)
+# Local index lookups - well under a millisecond when healthy
+LOOKUP_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05)
+# Utterances per local ASR pass
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32)
+
+ACTIVE_CALLS = registry.gauge(
+    "voice_agent_active_calls", "Calls currently in progress")
+CALLS_IN_STEP = registry.gauge(
+    "voice_agent_calls_in_step", "Calls currently in each conversation step", labels=("step",))
+
+TURN_LATENCY = registry.histogram(
+    "voice_agent_turn_latency_seconds", "Caller finished speaking (transcript returned) to next agent prompt")
+STT_ENDPOINT_DELAY = registry.histogram(
+    "voice_agent_stt_endpoint_delay_seconds", "Last final transcript to end of the STT turn")
+LLM_LATENCY = registry.histogram(
+    "voice_agent_llm_latency_seconds", "LLM call latency", labels=("prompt",))
+LLM_FIRST_TOKEN = registry.histogram(
+    "voice_agent_llm_time_to_first_token_seconds", "Streamed LLM call to its first text", labels=("prompt",))
+TTS_TIME_TO_FIRST_AUDIO = registry.histogram(
+    "voice_agent_tts_time_to_first_audio_seconds", "TTS request to first audio played")
+TTS_SEGMENT_CACHE = registry.counter(
+    "voice_agent_tts_segment_cache_total", "TTS segment cache lookups", labels=("kind", "result"))
+TURN_LISTEN_GAP = registry.histogram(
+    "voice_agent_turn_listen_gap_seconds", "Prompt finished playing to STT listening (0 when armed during playback)")
+
+STT_AUDIO_FRAMES = registry.counter(
+    "voice_agent_stt_audio_frames_total", "Audio frames sent to STT")
+STT_TURNS = registry.counter(
+    "voice_agent_stt_turns_total", "STT turns by recognition backend", labels=("backend",))
+STT_FALLBACKS = registry.counter(
+    "voice_agent_stt_fallbacks_total", "Turns moved from Speechmatics to local ASR", labels=("reason",))
+STT_LOCAL_LATENCY = registry.histogram(
+    "voice_agent_stt_local_latency_seconds", "Local ASR: end of utterance to transcript")
+STT_LOCAL_BATCH = registry.histogram(
+    "voice_agent_stt_local_batch_size", "Utterances recognised per local ASR pass", buckets=BATCH_SIZE_BUCKETS)
+LLM_ERRORS = registry.counter(
+    "voice_agent_llm_errors_total", "LLM calls that failed", labels=("kind",))
+LLM_EMPTY_RESPONSES = registry.counter(
+    "voice_agent_llm_empty_responses_total", "LLM calls that returned no text")
+ROUTED_TO_AGENT = registry.counter(
+    "voice_agent_routed_to_agent_total", "Calls handed to a human agent", labels=("orchestrator",))
+
+OUTBOX_BACKLOG = registry.gauge(
+    "voice_agent_outbox_backlog", "Confirmed orders waiting to be sent to the POS")
+OUTBOX_OLDEST_AGE = registry.gauge(
+    "voice_agent_outbox_oldest_age_seconds", "Age of the oldest order waiting for the POS")
+OUTBOX_BATCH_LATENCY = registry.histogram(
+    "voice_agent_outbox_batch_latency_seconds", "POS batch request latency")
+OUTBOX_DELIVERY_DELAY = registry.histogram(
+    "voice_agent_outbox_delivery_delay_seconds", "Order confirmed to accepted by the POS", buckets=DELIVERY_BUCKETS)
+OUTBOX_DELIVERED = registry.counter(
+    "voice_agent_outbox_orders_total", "Orders the POS answered, by outcome", labels=("result",))
+OUTBOX_RETRIES = registry.counter(
+    "voice_agent_outbox_retries_total", "Orders scheduled for another POS attempt", labels=("kind",))
+
+QUOTA_WAIT = registry.histogram(
+    "voice_agent_quota_wait_seconds", "Time a provider request waited for quota", labels=("backend",))
+QUOTA_QUEUE = registry.gauge(
+    "voice_agent_quota_queue", "Provider requests waiting for quota", labels=("backend",))
+QUOTA_REJECTED = registry.counter(
+    "voice_agent_quota_rejected_total", "Provider requests that could not get quota in time", labels=("backend",))
+QUOTA_THROTTLED = registry.counter(
+    "voice_agent_quota_throttled_total", "Provider rate-limit (429) responses", labels=("backend",))
+ADMISSION_WAIT = registry.histogram(
+    "voice_agent_admission_wait_seconds", "New call arrival to admitted or rejected")
+CALLS_REJECTED = registry.counter(
+    "voice_agent_calls_rejected_total", "New calls turned away by admission control")
+
+HISTORY_LOOKUP = registry.histogram(
+    "voice_agent_history_lookup_seconds", "Customer order history lookup at call start", buckets=LOOKUP_BUCKETS)
+REPEAT_ORDERS = registry.counter(
+    "voice_agent_repeat_orders_total", "Repeat-order offers to returning customers, by outcome", labels=("result",))
@@ -2,10 +2,38 @@
 """
 Microphone Diagnostic Tool
 Helps identify why your microphone isn't working
+
+Benchmark mode measures each input device over a grid of blocksize and
+latency settings and recommends the ones STT should open the microphone with:
+
+    python mic-test.py --benchmark
+    python mic-test.py --benchmark --device file:sample_16k.wav --round-trip --report audio_bench.json
+    python mic-test.py --benchmark --save        # write the recommendation to STT_AUDIO_SETTINGS
 """
 
-import sounddevice as sd
+import argparse
+import json
+import os
+import statistics
 import sys
+import threading
+import time
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    # No PortAudio - only file-backed virtual devices can be benchmarked
+    sd = None
+
+from ai.audio_io import DEFAULT_SETTINGS_PATH, FileStream, is_file_device, FILE_DEVICE_PREFIX
+
+SAMPLE_RATE = 16000
+DEFAULT_BLOCKSIZES = (160, 320, 640, 1600)      # 10 / 20 / 40 / 100 ms at 16 kHz
+DEFAULT_LATENCIES = ("low", "high")
+# Round-trip test: one click per interval, heard when the input crosses the threshold
+CLICK_INTERVAL = 0.5
+CLICK_LEVEL = 30000
+CLICK_THRESHOLD = 8000
 
 def diagnose_microphone():
     """Run comprehensive microphone diagnostics."""
@@ -138,6 +166,219 @@ def diagnose_microphone():
     """)
     print("="*60 + "\n")
 
+def _percentile(values, p):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+def _samples(buffer):
+    """int16 samples of a callback buffer (numpy array, memoryview or bytearray)."""
+    return memoryview(buffer).cast("B").cast("h")
+
+
+class StreamProbe:
+    """
+    Callback for one benchmark run. Records arrival time, stream timing info,
+    overflow flags and time spent in the callback; in duplex mode it also
+    plays clicks and finds them on the input (round trip in frames).
+    """
+
+    def __init__(self, samplerate: int, round_trip: bool):
+        self.samplerate = samplerate
+        self.round_trip = round_trip
+        self.arrivals = []
+        self.block_frames = []
+        self.capture_latency = []
+        self.adc_gaps = 0
+        self.overflows = 0
+        self.callback_seconds = 0.0
+        self.round_trips = []
+        self._last_adc = None
+        self._frame = 0                  # frames seen on the input so far
+        self._next_click = 0
+        self._click_at = None            # output frame of the click not heard yet
+
+    def input_callback(self, indata, frames, time_info, status):
+        started = time.perf_counter()
+        self._record(frames, time_info, status)
+        self._frame += frames
+        self.callback_seconds += time.perf_counter() - started
+
+    def duplex_callback(self, indata, outdata, frames, time_info, status):
+        started = time.perf_counter()
+        self._record(frames, time_info, status)
+        if self._click_at is not None:
+            for i, sample in enumerate(_samples(indata)):
+                if abs(sample) >= CLICK_THRESHOLD and self._frame + i >= self._click_at:
+                    self.round_trips.append((self._frame + i - self._click_at) / self.samplerate)
+                    self._click_at = None
+                    break
+        out = _samples(outdata)
+        for i in range(len(out)):
+            out[i] = 0
+        if self._click_at is None and self._frame >= self._next_click:
+            out[0] = CLICK_LEVEL
+            self._click_at = self._frame
+            self._next_click = self._frame + int(CLICK_INTERVAL * self.samplerate)
+        self._frame += frames
+        self.callback_seconds += time.perf_counter() - started
+
+    def _record(self, frames, time_info, status):
+        self.arrivals.append(time.perf_counter())
+        self.block_frames.append(frames)
+        if status and getattr(status, "input_overflow", False):
+            self.overflows += 1
+        adc = getattr(time_info, "inputBufferAdcTime", 0.0) if time_info is not None else 0.0
+        if adc:
+            self.capture_latency.append(time_info.currentTime - adc)
+            # Timestamps more than a block and a half apart: input was lost in between
+            block = frames / self.samplerate
+            if self._last_adc is not None and adc - self._last_adc > 1.5 * block:
+                self.adc_gaps += round((adc - self._last_adc) / block) - 1
+            self._last_adc = adc
+
+    def report(self, wall: float, cpu: float) -> dict:
+        expected = [frames / self.samplerate for frames in self.block_frames[1:]]
+        intervals = [b - a for a, b in zip(self.arrivals, self.arrivals[1:])]
+        jitter = [abs(interval - block) for interval, block in zip(intervals, expected)]
+        return {
+            "callbacks": len(self.arrivals),
+            "block_ms": _ms(statistics.median(self.block_frames) / self.samplerate) if self.block_frames else None,
+            "capture_latency_ms": {"p50": _ms(_percentile(self.capture_latency, 50)),
+                                   "p95": _ms(_percentile(self.capture_latency, 95))},
+            "round_trip_ms": _ms(statistics.median(self.round_trips)) if self.round_trips else None,
+            "jitter_ms": {"p50": _ms(_percentile(jitter, 50)), "p99": _ms(_percentile(jitter, 99)),
+                          "max": _ms(max(jitter)) if jitter else None},
+            "dropped_buffers": max(self.overflows, self.adc_gaps),
+            "overflows": self.overflows,
+            "cpu_percent": round(100 * cpu / wall, 2) if wall else None,
+            "callback_us": round(self.callback_seconds / len(self.arrivals) * 1e6, 1) if self.arrivals else None,
+        }
+
+
+def _open_stream(device, blocksize, latency, probe: StreamProbe):
+    kwargs = dict(samplerate=SAMPLE_RATE, channels=1, dtype="int16", blocksize=blocksize, latency=latency)
+    if is_file_device(device):
+        path = device[len(FILE_DEVICE_PREFIX):]
+        callback = probe.duplex_callback if probe.round_trip else probe.input_callback
+        return FileStream(path, callback=callback, duplex=probe.round_trip, **kwargs)
+    if sd is None:
+        raise RuntimeError("sounddevice/PortAudio not available - use a file: device")
+    if probe.round_trip:
+        # Clicks go to the default output device and come back through the air (or a loopback cable)
+        return sd.Stream(device=(device, None), callback=probe.duplex_callback, **kwargs)
+    return sd.InputStream(device=device, callback=probe.input_callback, **kwargs)
+
+
+def measure(device, blocksize: int, latency, seconds: float, round_trip: bool = False) -> dict:
+    """One benchmark run: open the stream, let it run for seconds, return the probe's report."""
+    probe = StreamProbe(SAMPLE_RATE, round_trip)
+    stream = _open_stream(device, blocksize, latency, probe)
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    stream.start()
+    threading.Event().wait(seconds)
+    stream.stop()
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_started
+    stream.close()
+    return dict(blocksize=blocksize, latency=latency, **probe.report(wall, cpu))
+
+
+def recommend(results: list):
+    """
+    Lowest-latency setting that dropped nothing and whose callbacks were
+    never more than a block late (p99 jitter); lower CPU breaks ties.
+    Falls back to the fewest dropped buffers when no setting was clean.
+    """
+    def score(result):
+        latency = result["capture_latency_ms"]["p95"]
+        if latency is None:
+            latency = result["block_ms"] or 0.0
+        return latency + (result["jitter_ms"]["p99"] or 0.0), result["cpu_percent"] or 0.0
+
+    measured = [r for r in results if "error" not in r and r["callbacks"]]
+    clean = [r for r in measured
+             if r["dropped_buffers"] == 0 and (r["jitter_ms"]["p99"] or 0.0) <= (r["block_ms"] or 0.0)]
+    if clean:
+        return min(clean, key=score)
+    if measured:
+        return min(measured, key=lambda r: (r["dropped_buffers"], score(r)))
+    return None
+
+
+def _benchmark_devices(requested: list) -> list:
+    if requested:
+        return [device if is_file_device(device) or not device.isdigit() else int(device) for device in requested]
+    if sd is None:
+        raise SystemExit("sounddevice/PortAudio not available - pass --device file:<16 kHz mono WAV>")
+    return [sd.query_devices(i)["name"] for i, device in enumerate(sd.query_devices())
+            if device["max_input_channels"] > 0]
+
+
+def run_benchmark(args) -> dict:
+    print("\n" + "=" * 60)
+    print("⏱️  AUDIO INPUT BENCHMARK")
+    print("=" * 60)
+
+    report = {"samplerate": SAMPLE_RATE, "seconds": args.seconds, "generated_at": time.time(), "devices": []}
+    for device in _benchmark_devices(args.device):
+        print(f"\n📍 Device: {device}")
+        results = []
+        for blocksize in args.blocksizes:
+            for latency in args.latencies:
+                try:
+                    result = measure(device, blocksize, latency, args.seconds, args.round_trip)
+                except Exception as e:
+                    result = {"blocksize": blocksize, "latency": latency, "error": str(e)}
+                    print(f"  blocksize {blocksize:5d} latency {latency!s:>5}  ❌ {e}")
+                else:
+                    print(
+                        f"  blocksize {blocksize:5d} latency {latency!s:>5}  "
+                        f"capture p95 {result['capture_latency_ms']['p95']} ms  "
+                        f"round trip {result['round_trip_ms']} ms  "
+                        f"jitter p99 {result['jitter_ms']['p99']} ms  "
+                        f"dropped {result['dropped_buffers']}  cpu {result['cpu_percent']}%"
+                    )
+                results.append(result)
+        best = recommend(results)
+        report["devices"].append({"device": device, "results": results, "recommended": best})
+        if best:
+            print(f"  ✅ Recommended: blocksize {best['blocksize']}, latency {best['latency']}")
+        else:
+            print("  ❌ No setting could be measured")
+
+    # The STT stream opens the first device that had a usable setting
+    chosen = next((d for d in report["devices"] if d["recommended"]), None)
+    report["recommended"] = None
+    if chosen:
+        best = chosen["recommended"]
+        report["recommended"] = {"device": chosen["device"], "blocksize": best["blocksize"], "latency": best["latency"]}
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📄 Report written to {args.report}")
+
+    if args.save:
+        if not report["recommended"]:
+            raise SystemExit("Nothing to save - no setting could be measured")
+        path = os.getenv("STT_AUDIO_SETTINGS", DEFAULT_SETTINGS_PATH)
+        settings = dict(report["recommended"], samplerate=SAMPLE_RATE, measured=chosen["recommended"],
+                        generated_at=report["generated_at"])
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(settings, f, indent=2)
+        os.replace(path + ".tmp", path)
+        print(f"💾 STT stream settings saved to {path}")
+    return report
+
+
 def quick_permission_test():
     """Quick test to see if we can even access the microphone."""
     print("\n🔒 Testing microphone permissions...")
@@ -153,7 +394,35 @@ def quick_permission_test():
         print("\nThis might be a permission issue!")
         return False
 
+def _latency(value: str):
+    return value if value in ("low", "high") else float(value)
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--benchmark", action="store_true", help="measure latency / jitter / drops instead of the interactive test")
+    parser.add_argument("--device", action="append", default=[],
+                        help="device index, name or file:<16 kHz mono WAV> (repeatable; default all input devices)")
+    parser.add_argument("--blocksizes", type=lambda v: [int(b) for b in v.split(",")], default=list(DEFAULT_BLOCKSIZES))
+    parser.add_argument("--latencies", type=lambda v: [_latency(l) for l in v.split(",")], default=list(DEFAULT_LATENCIES),
+                        help="comma separated: low, high or seconds")
+    parser.add_argument("--seconds", type=float, default=3.0, help="run time per setting")
+    parser.add_argument("--round-trip", action="store_true", help="also play clicks and time them back on the input")
+    parser.add_argument("--report", help="write the JSON report here")
+    parser.add_argument("--save", action="store_true", help="write the recommendation to STT_AUDIO_SETTINGS (default audio_settings.json)")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        try:
+            run_benchmark(args)
+        except KeyboardInterrupt:
+            print("\n\n⚠️  Benchmark interrupted.")
+        sys.exit(0)
+
+    if sd is None:
+        print("❌ sounddevice/PortAudio not available")
+        sys.exit(1)
+
     print("\n🎙️  MICROPHONE DIAGNOSTICS")
     print("="*60)
     print("\nThis tool will help identify why your microphone isn't working.")
@@ -10,6 +10,7 @@ from .order_item import OrderItemOrchestrator
 from .quantity import QuantityOrchestrator
 from .extras import ExtrasOrchestrator
 from .address import AddressOrchestrator
+from .repeat_order import RepeatOrderOrchestrator
 
 __all__ = [
     'GreetingOrchestrator',
@@ -17,4 +18,5 @@ __all__ = [
     'QuantityOrchestrator',
     'ExtrasOrchestrator',
     'AddressOrchestrator',
+    'RepeatOrderOrchestrator',
 ]
\ No newline at end of file
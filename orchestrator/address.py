@@ -1,8 +1,12 @@
 # orchestrator/address.py
 
 from ai import STT, LLM, TTS
+from ai.llm import LLM_TIMEOUT
+from ai.fallback_classifier import classify_yes_no, confident_yes_no
+from ai.turn import TurnTaker
 from integration.routeToAgent import RouteToAgent
 from integration.customerProfile import CustomerProfile
+from orchestrator.prompts import ADDRESS_CONFIRMATION, ADDRESS_INTENT, ADDRESS_REFORMAT
 
 
 class AddressOrchestrator:
@@ -10,12 +14,13 @@ class AddressOrchestrator:
     Handles collecting and validating the delivery address.
     """
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, stt=None, llm=None, tts=None):
         self.logger = logger
-        self.stt = STT(logger=logger)
-        self.llm = LLM(logger=logger)
-        self.tts = TTS(logger=logger)
-        self.router = RouteToAgent()
+        self.stt = stt or STT(logger=logger)
+        self.llm = llm or LLM(logger=logger)
+        self.tts = tts or TTS(logger=logger)
+        self.turns = TurnTaker(self.stt, self.tts, logger=logger)
+        self.router = RouteToAgent(logger=logger)
         self.customer_profile_service = CustomerProfile()
     
     async def execute(self, context: dict) -> bool:
@@ -45,18 +50,14 @@ class AddressOrchestrator:
             self.logger.info(f"Address - Profile fetched: {profile}")
 
         # ── Step 2: Build and ask address confirmation question ──────────
-        address_question = (
-            f"Meri baat {customer_name} se ho rahi hai. "
-            f"Aap ka address {customer_address} hai, "
-            f"kya aap isi address par delivery karwana chahtay hain?"
-        )
+        # Static parts are cached audio; only the name and address are synthesized per call
+        address_question = ADDRESS_CONFIRMATION.fill(customer_name=customer_name, customer_address=customer_address)
 
-        await self.tts.play_audio(address_question)
         if self.logger:
-            self.logger.info(f"Address - Asked: {address_question}")
+            self.logger.info(f"Address - Asking: {address_question}")
 
-        # Capture response
-        user_response = await self.stt.transcribe()
+        # Ask and capture response (STT armed during playback)
+        user_response = await self.turns.ask(address_question, turn_type="yes_no")
         print(f"📝 Address (Urdu): {user_response[::-1]}")
         if self.logger:
             self.logger.info(f"Address - User response: {user_response}")
@@ -84,27 +85,43 @@ class AddressOrchestrator:
             # no or others on second attempt → ask for new address
             return await self._collect_new_address(context)           
 
-        else:  # others
+        else:  # others or timeout
             result = await self._get_response_on_others(
-                address_question, context, customer_address
+                address_question, context, customer_address,
+                timed_out=(intent == "timeout")
             )
             return result
         
     async def _check_address_intent(self, address_question: str, user_response: str) -> str:
         """
         Check user response against address confirmation question.
-        Returns: yes, no, or others
+        A confident STT transcript with a clear keyword answer (or one too
+        unreliable to classify) skips the LLM.
+        If the LLM times out, falls back to local keyword matching.
+        Returns: yes, no, others, or timeout (LLM timed out and keywords were inconclusive)
         """
-        prompt = (
-            f"Classify this customer response against question [{address_question}] "
-            f"as 'yes', 'no' or 'others' to confirm address: \"{user_response}\" "
-            f"Reply only with: yes, no or others"
-        )
+        fast_intent = confident_yes_no(user_response)
+        if fast_intent:
+            if self.logger:
+                self.logger.info(
+                    f"Address - STT confidence {user_response.confidence:.2f}, skipping LLM, intent: {fast_intent}"
+                )
+            return fast_intent
 
         if self.logger:
             self.logger.info(f"Address - Sending to LLM for intent check: {user_response}")
 
-        response = await self.llm.get_response(prompt, temperature=0.0)
+        response = await self.llm.get_prompt_response(
+            ADDRESS_INTENT.name,
+            {"question": address_question, "user_response": user_response},
+            temperature=0.0,
+        )
+        if response == LLM_TIMEOUT:
+            fallback_intent = classify_yes_no(user_response)
+            if self.logger:
+                self.logger.warning(f"Address - LLM timed out, keyword fallback intent: {fallback_intent}")
+            return fallback_intent if fallback_intent != "others" else "timeout"
+
         result = response.lower().strip()
 
         if self.logger:
@@ -121,20 +138,22 @@ class AddressOrchestrator:
         self,
         address_question: str,
         context: dict,
-        customer_address: str
+        customer_address: str,
+        timed_out: bool = False
     ) -> bool:
         """
-        Called when first response was 'others'.
+        Called when first response was 'others' (or the intent check timed out).
         Retries once with apology + original question.
         """
-        retry_message = f"Sorry, main aapki baat theek se sun nahi paaya. {address_question}"
-        await self.tts.play_audio(retry_message)
-
+        if timed_out:
+            retry_message = "Maazrat, thori takheer ho gayi. " + address_question
+        else:
+            retry_message = "Sorry, main aapki baat theek se sun nahi paaya. " + address_question
         if self.logger:
-            self.logger.info("Address - Retrying after 'others' response")
+            self.logger.info(f"Address - Retrying after '{'timeout' if timed_out else 'others'}' response")
 
-        # Capture retry response
-        user_response_retry = await self.stt.transcribe()
+        # Ask again and capture retry response
+        user_response_retry = await self.turns.ask(retry_message, turn_type="yes_no")
         print(f"📝 User response (retry): {user_response_retry[::-1]}")
         if self.logger:
             self.logger.info(f"Address - User response (attempt 2): {user_response_retry}")
@@ -166,13 +185,11 @@ class AddressOrchestrator:
         Returns True if valid address collected, False if need to route to agent.
         """
         question = "Apna address bataen?"
-        await self.tts.play_audio(question)
-
         if self.logger:
             self.logger.info("Address - Asking user for address")
         
         # First attempt
-        user_address_response = await self.stt.transcribe()
+        user_address_response = await self.turns.ask(question, turn_type="address")
         print(f"📝 Address: {user_address_response[::-1]}")
         if self.logger:
             self.logger.info(f"Address - User provided: {user_address_response}")
@@ -192,10 +209,8 @@ class AddressOrchestrator:
             self.logger.warning(f"Address - LLM returned NOT_AN_ADDRESS for: {user_address_response}, retrying")
         
         retry_message = "Address ko samajhne mein problem hui. Address doobara bataen."
-        await self.tts.play_audio(retry_message)
-        
         # Second attempt
-        address_response_retry = await self.stt.transcribe()
+        address_response_retry = await self.turns.ask(retry_message, turn_type="address")
         print(f"📝 Address (retry): {address_response_retry[::-1]}")
         if self.logger:
             self.logger.info(f"Address - Retry user response: {address_response_retry}")
@@ -216,7 +231,7 @@ class AddressOrchestrator:
         
         farewell = "Main aap ko staff se connect kar raha hoon jo aap ki help kar sakta hai. Kindly line per rahein."
         await self.tts.play_audio(farewell)
-        await self.router.routeCallToAgent()
+        await self.router.routeCallToAgent(context, reason="address_invalid", orchestrator="address")
         
         return False
 
@@ -244,26 +259,27 @@ class AddressOrchestrator:
         Returns:
             str: Reformatted address in English or "NOT_AN_ADDRESS"
         """
+        if getattr(urdu_address, "is_unreliable", None) and urdu_address.is_unreliable():
+            # Too garbled to be worth an LLM call - ask again straight away
+            if self.logger:
+                self.logger.warning(
+                    f"Address - STT confidence {urdu_address.confidence:.2f} too low, skipping reformat"
+                )
+            return "NOT_AN_ADDRESS"
+
         if self.logger:
             self.logger.info(f"Address - Sending to LLM for reformatting: {urdu_address}")
         
-        prompt = f"""Convert this Urdu text to English address format if it contains an address:
-"{urdu_address}"
-
-Rules:
-- If the text is NOT an address, return: "NOT_AN_ADDRESS"
-- If it is an address:
-  • Transcribe EXACTLY what is spoken - do not add or invent words
-  • Convert all numbers to English numerals (1, 2, 3...)
-  • Replace: مکان/مکان نمبر/ہاؤس نمبر → House Number or H#
-  • Replace: گلی/گلی نمبر → Street Number or Street #
-  • Replace: بلاک → Block
-  • Keep location names in readable English
-  • Output format: House Number [#], [Block Name] Block, [Area], [City]
-
-Output only the reformatted address or "NOT_AN_ADDRESS". Do not add extra words."""
-        
-        response = await self.llm.get_response(prompt, temperature=0.0)
+        response = await self.llm.get_prompt_response(
+            ADDRESS_REFORMAT.name,
+            {"urdu_address": urdu_address},
+            temperature=0.0,
+        )
+        if response == LLM_TIMEOUT:
+            if self.logger:
+                self.logger.warning(f"Address - LLM timed out reformatting: {urdu_address}")
+            return ""
+
         result = response.strip()
 
         if self.logger:
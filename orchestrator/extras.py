@@ -3,6 +3,7 @@
 from ai import STT
 from ai import LLM
 from ai import TTS
+from ai.turn import TurnTaker
 
 
 class ExtrasOrchestrator:
@@ -10,11 +11,12 @@ class ExtrasOrchestrator:
     Handles collecting any extras from the user.
     """
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, stt=None, llm=None, tts=None):
         self.logger = logger
-        self.stt = STT(logger=logger)
-        self.llm = LLM(logger=logger)
-        self.tts = TTS(logger=logger)
+        self.stt = stt or STT(logger=logger)
+        self.llm = llm or LLM(logger=logger)
+        self.tts = tts or TTS(logger=logger)
+        self.turns = TurnTaker(self.stt, self.tts, logger=logger)
 
     
     async def execute(self, context: dict) -> bool:
@@ -30,13 +32,11 @@ class ExtrasOrchestrator:
         
         # Ask for extras
         question = "Kya kuch aur chahiye?"
-        await self.tts.play_audio(question)
-
         if self.logger:
             self.logger.info("Extras - Asking user for extras")
-        
-        # Capture response
-        user_response = await self.stt.transcribe()
+
+        # Play the question and capture the response (STT armed during playback)
+        user_response = await self.turns.ask(question, turn_type="extras")
         print(f"📝 Extras: {user_response[::-1]}")
         if self.logger:
             self.logger.info(f"Extras - User response: {user_response}")
@@ -9,6 +9,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from ai import STT
 from ai import LLM
 from ai import TTS
+from ai.llm import LLM_TIMEOUT
+from ai.turn import TurnTaker
+from ai.fallback_classifier import classify_yes_no, confident_yes_no
+from orchestrator.prompts import GREETING_INTENT
 
 
 class GreetingOrchestrator:
@@ -17,12 +21,14 @@ class GreetingOrchestrator:
     Returns True if user wants to proceed, False otherwise.
     """
     
-    def __init__(self, logger = None):
+    def __init__(self, logger=None, stt=None, llm=None, tts=None):
         self.logger = logger
-        self.stt = STT(logger=logger)
-        self.llm = LLM(logger=logger)
-        self.tts = TTS(logger=logger)
+        self.stt = stt or STT(logger=logger)
+        self.llm = llm or LLM(logger=logger)
+        self.tts = tts or TTS(logger=logger)
+        self.turns = TurnTaker(self.stt, self.tts, logger=logger)
         self.max_retries = 1  # Only 1 retry as per requirements
+        self.failure_reason = None  # why execute() returned False, for the agent handoff
     
     async def execute(self) -> bool:
         """
@@ -34,13 +40,13 @@ class GreetingOrchestrator:
         
         # Step 1: Initial greeting
         greeting = "Assalam o Alaikum, thank you for calling KFC. This is Asad. Kya aap delivery ka order place karna chahtay hain?"
-        await self.tts.play_audio(greeting)
+        prompt = greeting
         
         # Try once, with one retry if needed
         for attempt in range(self.max_retries + 1):
             
-            # Step 2: Capture user response
-            user_response = await self.stt.transcribe()
+            # Step 2: Play the prompt and capture user response (STT armed during playback)
+            user_response = await self.turns.ask(prompt, turn_type="yes_no")
             print(f"📝 User said: {user_response[::-1]}")
             if self.logger:
                 self.logger.info(f"Greeting attempt {attempt + 1} - User said: {user_response}")
@@ -66,17 +72,16 @@ class GreetingOrchestrator:
                 if self.logger:
                     self.logger.info("Greeting - User declined order, routing to staff")
                 #print("✅ greeting tested successfully")
+                self.failure_reason = "not_ordering"
                 return False
             
-            else:  # intent == "others"
-                # Unclear response
+            else:  # intent == "others" or "timeout"
+                # Unclear response (or LLM too slow to tell)
                 if attempt < self.max_retries:
                     if self.logger:
-                        self.logger.info("Greeting - Intent unclear, retrying greeting")
-                    # Play greeting again (only once)
-                    greeting_attempt_second  = "Sorry, main aapki baat theek se sun nahi paaya, Kya aap delivery ka order place karna chahtay hain?"
-                    tts_second_attempt_response = await self.tts.play_audio(greeting_attempt_second)
-                    print(f"🔊 TTS Response: {tts_second_attempt_response}")
+                        self.logger.info(f"Greeting - Intent '{intent}', retrying greeting")
+                    # Play greeting again (only once) on the next attempt
+                    prompt = "Sorry, main aapki baat theek se sun nahi paaya, Kya aap delivery ka order place karna chahtay hain?"
                 else:
                     # After retry, still unclear - transfer to staff
                     farewell = "Main aap ko staff se connect kar raha hoon jo aap ki help kar sakta hai. Kindly line per rahein."
@@ -84,6 +89,7 @@ class GreetingOrchestrator:
                     if self.logger:
                         self.logger.info("Greeting - Intent still unclear after retry, routing to staff")
                     #print("✅ greeting tested successfully")
+                    self.failure_reason = "unclear_response"
                     return False
         
         return False
@@ -91,19 +97,27 @@ class GreetingOrchestrator:
     async def _detect_intent(self, greeting: str, user_response: str) -> str:
         """
         Hybrid intent detection:
-        1. Rule-based keyword matching
+        1. Rule-based keyword matching when the STT words are confident
         2. LLM fallback if unclear
         
         Returns:
-            "yes", "no", or "others"
+            "yes", "no", "others", or "timeout" (LLM timed out and keywords were inconclusive)
         """
 
         if not user_response:
             if self.logger:
                 self.logger.warning("Greeting - Empty user response received")
             return "others"
-        
-        
+
+        # Confident STT words with a clear keyword answer (or words too
+        # unreliable to classify) don't need the LLM
+        fast_intent = confident_yes_no(user_response)
+        if fast_intent:
+            if self.logger:
+                self.logger.info(
+                    f"Greeting - STT confidence {user_response.confidence:.2f}, skipping LLM, intent: {fast_intent}"
+                )
+            return fast_intent
 
         # Normalize text
         # text = user_response.lower().strip()
@@ -168,10 +182,17 @@ class GreetingOrchestrator:
         if self.logger:
             self.logger.info(f"Greeting - Asking LLM to classify response for: {user_response}")
 
-        prompt = f"""Classify this Urdu response aginst question {greeting}
-	as 'yes', 'no' or 'others' to order: "{user_response}" Reply only with: yes, no or others"""
+        response = await self.llm.get_prompt_response(
+            GREETING_INTENT.name,
+            {"question": greeting, "user_response": user_response},
+            temperature=0.0,
+        )
+        if response == LLM_TIMEOUT:
+            fallback_intent = classify_yes_no(user_response)
+            if self.logger:
+                self.logger.warning(f"Greeting - LLM timed out, keyword fallback intent: {fallback_intent}")
+            return fallback_intent if fallback_intent != "others" else "timeout"
 
-        response = await self.llm.get_response(prompt, temperature=0.0)
         result = response.lower().strip()
 
         if self.logger:
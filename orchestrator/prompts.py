@@ -0,0 +1,99 @@
+# orchestrator/prompts.py
+
+"""
+All prompt templates used by the orchestrators.
+Prompt engineering stays in the orchestrator layer - the LLM class only
+knows how to send a registered template.
+
+Bump the version when changing wording so token/accuracy numbers stay
+comparable per version.
+
+Spoken templates (what the agent says, with slots for per-call values) are
+at the end; TTS caches their static segments.
+"""
+
+from ai.prompts import PromptTemplate, prompt_registry
+from ai.speech import SpeechTemplate, speech_registry
+from ai.fallback_classifier import classify_yes_no
+
+
+def _yes_no_fallback(variables: dict) -> str:
+    return classify_yes_no(variables.get("user_response", ""))
+
+
+GREETING_INTENT = prompt_registry.register(PromptTemplate(
+    name="greeting_intent",
+    version=1,
+    static_prefix=(
+        "Classify the Urdu response against the question as 'yes', 'no' or 'others' to order. "
+        "Reply only with: yes, no or others"
+    ),
+    variable_template='Question: {question}\nResponse: "{user_response}"',
+    fallback=_yes_no_fallback,
+))
+
+
+ADDRESS_INTENT = prompt_registry.register(PromptTemplate(
+    name="address_intent",
+    version=1,
+    static_prefix=(
+        "Classify the customer response against the question as 'yes', 'no' or 'others' "
+        "to confirm address. Reply only with: yes, no or others"
+    ),
+    variable_template='Question: [{question}]\nResponse: "{user_response}"',
+    fallback=_yes_no_fallback,
+))
+
+
+REPEAT_ORDER_INTENT = prompt_registry.register(PromptTemplate(
+    name="repeat_order_intent",
+    version=1,
+    static_prefix=(
+        "Classify the customer response against the question as 'yes', 'no' or 'others' "
+        "to repeat their previous order. Reply only with: yes, no or others"
+    ),
+    variable_template='Question: [{question}]\nResponse: "{user_response}"',
+    fallback=_yes_no_fallback,
+))
+
+ADDRESS_REFORMAT = prompt_registry.register(PromptTemplate(
+    name="address_reformat",
+    version=1,
+    static_prefix="""Convert the given Urdu text to English address format if it contains an address.
+
+Rules:
+- If the text is NOT an address, return: "NOT_AN_ADDRESS"
+- If it is an address:
+  • Transcribe EXACTLY what is spoken - do not add or invent words
+  • Convert all numbers to English numerals (1, 2, 3...)
+  • Replace: مکان/مکان نمبر/ہاؤس نمبر → House Number or H#
+  • Replace: گلی/گلی نمبر → Street Number or Street #
+  • Replace: بلاک → Block
+  • Keep location names in readable English
+  • Output format: House Number [#], [Block Name] Block, [Area], [City]
+
+Output only the reformatted address or "NOT_AN_ADDRESS". Do not add extra words.""",
+    variable_template='Text: "{urdu_address}"',
+))
+
+
+# ── Spoken templates ────────────────────────────────────────────────
+
+ADDRESS_CONFIRMATION = speech_registry.register(SpeechTemplate(
+    "address_confirmation",
+    "Meri baat {customer_name} se ho rahi hai. "
+    "Aap ka address {customer_address} hai, "
+    "kya aap isi address par delivery karwana chahtay hain?",
+))
+
+
+REPEAT_ORDER_OFFER = speech_registry.register(SpeechTemplate(
+    "repeat_order_offer",
+    "Pichli dafa aap ne {order} order kiya tha. Kya aap wohi order dobara karna chahtay hain?",
+))
+
+
+ORDER_TOTAL = speech_registry.register(SpeechTemplate(
+    "order_total",
+    "Aap ke order ka total {total} rupay hai.",
+))
@@ -3,6 +3,7 @@
 from ai import STT
 from ai import LLM
 from ai import TTS
+from ai.turn import TurnTaker
 
 
 class QuantityOrchestrator:
@@ -10,11 +11,12 @@ class QuantityOrchestrator:
     Handles collecting the quantity from the user.
     """
 
-    def __init__(self, logger=None):
+    def __init__(self, logger=None, stt=None, llm=None, tts=None):
         self.logger = logger
-        self.stt = STT(logger=logger)
-        self.llm = LLM(logger=logger)
-        self.tts = TTS(logger=logger)
+        self.stt = stt or STT(logger=logger)
+        self.llm = llm or LLM(logger=logger)
+        self.tts = tts or TTS(logger=logger)
+        self.turns = TurnTaker(self.stt, self.tts, logger=logger)
     
     async def execute(self, context: dict) -> bool:
         """
@@ -29,13 +31,11 @@ class QuantityOrchestrator:
         
         # Ask for quantity
         question = "Quantity bataein"
-        await self.tts.play_audio(question)
-
         if self.logger:
             self.logger.info("Quantity - Asking user for quantity")
-        
-        # Capture response
-        user_response = await self.stt.transcribe()
+
+        # Play the question and capture the response (STT armed during playback)
+        user_response = await self.turns.ask(question, turn_type="quantity")
         print(f"📝 Quantity: {user_response[::-1]}")
         if self.logger:
             self.logger.info(f"Quantity - User response: {user_response}")
@@ -0,0 +1,99 @@
+# orchestrator/repeat_order.py
+
+from ai import STT, LLM, TTS
+from ai.llm import LLM_TIMEOUT
+from ai.fallback_classifier import classify_yes_no, confident_yes_no
+from ai.turn import TurnTaker
+from history import PastOrder, describe
+from history.store import menu_name
+from metrics.voice_agent import REPEAT_ORDERS
+from orchestrator.prompts import REPEAT_ORDER_INTENT, REPEAT_ORDER_OFFER
+
+
+class RepeatOrderOrchestrator:
+    """
+    Offers a returning customer their last order in one turn.
+    On yes, order_item, quantity and extra are filled from the history and
+    the item, quantity and extras questions are skipped.
+    """
+
+    def __init__(self, logger=None, stt=None, llm=None, tts=None):
+        self.logger = logger
+        self.stt = stt or STT(logger=logger)
+        self.llm = llm or LLM(logger=logger)
+        self.tts = tts or TTS(logger=logger)
+        self.turns = TurnTaker(self.stt, self.tts, logger=logger)
+
+    async def execute(self, context: dict, last_order: PastOrder) -> bool:
+        """
+        Ask "same as last time?".
+
+        Args:
+            context: Shared context dictionary to store order details
+            last_order: The customer's most recent order
+
+        Returns:
+            bool: True if the customer took the last order (context filled),
+            False to collect the order as usual
+        """
+        question = REPEAT_ORDER_OFFER.fill(order=describe(last_order))
+        if self.logger:
+            self.logger.info(f"Repeat order - Asking: {question}")
+        REPEAT_ORDERS.labels("offered").inc()
+
+        user_response = await self.turns.ask(question, turn_type="yes_no")
+        print(f"📝 Repeat order: {user_response[::-1]}")
+        if self.logger:
+            self.logger.info(f"Repeat order - User response: {user_response}")
+
+        intent = await self._check_intent(question, user_response)
+        if self.logger:
+            self.logger.info(f"Repeat order - Intent: {intent}")
+
+        if intent != "yes":
+            # No, unclear or timed out - take the order the usual way, no retry
+            REPEAT_ORDERS.labels("declined" if intent == "no" else "unclear").inc()
+            await self.tts.play_audio("Theek hai.")
+            return False
+
+        context["order_item"] = menu_name(last_order.item)
+        context["quantity"] = str(last_order.quantity)
+        context["extra"] = ", ".join(menu_name(extra) for extra in last_order.extras)
+        REPEAT_ORDERS.labels("accepted").inc()
+        if self.logger:
+            self.logger.info(
+                f"Repeat order - Filled from history: {context['order_item']} x{context['quantity']} "
+                f"+ [{context['extra']}]"
+            )
+        return True
+
+    async def _check_intent(self, question: str, user_response: str) -> str:
+        """
+        Same yes/no check as the address confirmation.
+        Returns: yes, no, others, or timeout (LLM timed out and keywords were inconclusive)
+        """
+        fast_intent = confident_yes_no(user_response)
+        if fast_intent:
+            if self.logger:
+                self.logger.info(
+                    f"Repeat order - STT confidence {user_response.confidence:.2f}, skipping LLM, intent: {fast_intent}"
+                )
+            return fast_intent
+
+        response = await self.llm.get_prompt_response(
+            REPEAT_ORDER_INTENT.name,
+            {"question": question, "user_response": user_response},
+            temperature=0.0,
+        )
+        if response == LLM_TIMEOUT:
+            fallback_intent = classify_yes_no(user_response)
+            if self.logger:
+                self.logger.warning(f"Repeat order - LLM timed out, keyword fallback intent: {fallback_intent}")
+            return fallback_intent if fallback_intent != "others" else "timeout"
+
+        result = response.lower().strip()
+        if "yes" in result:
+            return "yes"
+        elif "no" in result:
+            return "no"
+        return "others"
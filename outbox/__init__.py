@@ -0,0 +1,15 @@
+# outbox/__init__.py
+
+"""
+Durable order outbox: confirmed orders are stored locally and sent to the POS in the background.
+"""
+
+from .store import OutboxOrder, OutboxStore
+from .pos import POSClient, POSError, StubPOS
+from .sender import OutboxSender
+from .outbox import OrderOutbox, get_outbox, order_payload
+
+__all__ = [
+    'OutboxOrder', 'OutboxStore', 'POSClient', 'POSError', 'StubPOS', 'OutboxSender',
+    'OrderOutbox', 'get_outbox', 'order_payload',
+]
@@ -0,0 +1,83 @@
+# outbox/outbox.py
+
+"""
+Process-wide order outbox used at the end of the order flow.
+
+Confirming an order appends it to the local store and wakes the sender;
+the call moves on without waiting for the POS. The sender only runs when
+POS_URL is set - without it orders still accumulate durably and go out
+once a process with POS_URL starts.
+"""
+
+import atexit
+import os
+import threading
+from datetime import datetime
+
+from .pos import POSClient
+from .sender import OutboxSender
+from .store import OutboxStore
+
+
+def order_payload(context) -> dict:
+    """What the POS receives for a confirmed call."""
+    profile = context.get("customer_profile") or {}
+    return {
+        "call_id": context.call_id,
+        "msisdn": context.get("msisdn"),
+        "customer_id": profile.get("customerId"),
+        "address": context.get("address"),
+        "order_item": context.get("order_item"),
+        "quantity": context.get("quantity"),
+        "extra": context.get("extra"),
+        "cost": context.get("cost"),
+        "confirmed_at": datetime.now().isoformat(timespec="seconds"),
+    }
+
+
+class OrderOutbox:
+
+    def __init__(self, store: OutboxStore, sender=None, logger=None):
+        self.store = store
+        self.sender = sender
+        self.logger = logger
+
+    def submit(self, context) -> bool:
+        """
+        Queues the call's order for the POS; keyed by call id, so resubmitting is a no-op.
+
+        Returns:
+            bool: True if the order was newly queued
+        """
+        added = self.store.append(context.call_id, order_payload(context))
+        if self.logger:
+            state = "queued" if added else "already queued"
+            self.logger.info(f"Outbox - order {context.call_id} {state} for POS")
+        if added and self.sender:
+            self.sender.wake()
+        return added
+
+    def close(self):
+        if self.sender:
+            self.sender.close()
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox(logger=None) -> OrderOutbox:
+    """Process-wide outbox on ORDER_OUTBOX_DB, with a sender when POS_URL is set."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            store = OutboxStore()
+            sender = None
+            if os.getenv("POS_URL"):
+                sender = OutboxSender(store, POSClient(), logger=logger)
+                sender.start()
+            elif logger:
+                logger.warning("Outbox - POS_URL not set, orders are stored but not sent")
+            _outbox = OrderOutbox(store, sender, logger)
+            atexit.register(_outbox.close)
+    return _outbox
@@ -0,0 +1,190 @@
+# outbox/pos.py
+
+"""
+POS batch client and a local stub POS.
+
+Protocol (one HTTP request per batch):
+
+    POST <POS_URL>/orders/batch
+    {"orders": [{"idempotency_key": "...", "order": {...}}, ...]}
+
+    200 {"results": {"<key>": {"status": "accepted" | "duplicate" | "rejected", "reason": "..."}}}
+
+"duplicate" means the POS already has that key (a retry after a lost
+response) and counts as delivered. Keys missing from the results, non-200
+responses, timeouts and connection errors are retried by the sender.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_TIMEOUT = 5.0
+BATCH_PATH = "/orders/batch"
+
+ACCEPTED = "accepted"
+DUPLICATE = "duplicate"
+REJECTED = "rejected"
+
+
+class POSError(Exception):
+    """The batch as a whole was not processed (retryable)."""
+
+
+class POSClient:
+    """
+    Synchronous batch client with a pooled keep-alive connection.
+    Used from the sender thread only.
+    """
+
+    def __init__(self, url: str = None, timeout: float = DEFAULT_TIMEOUT, api_key: str = None):
+        import httpx   # lazy: only processes that send orders pay for the import
+
+        self.url = (url or os.getenv("POS_URL", "")).rstrip("/")
+        if not self.url:
+            raise ValueError("POS_URL is not set")
+        headers = {"Content-Type": "application/json"}
+        api_key = api_key or os.getenv("POS_API_KEY")
+        if api_key:
+            headers["Authorization"] = f"Bearer {api_key}"
+        self._httpx = httpx
+        self._client = httpx.Client(base_url=self.url, timeout=timeout, headers=headers)
+
+    def submit(self, orders: list) -> dict:
+        """
+        Sends one batch.
+
+        Args:
+            orders: OutboxOrder list
+
+        Returns:
+            dict: idempotency key → {"status": ..., "reason": ...} for the keys the POS answered
+
+        Raises:
+            POSError: the POS did not process the batch
+        """
+        body = {"orders": [{"idempotency_key": order.key, "order": order.payload} for order in orders]}
+        try:
+            response = self._client.post(BATCH_PATH, json=body)
+        except self._httpx.TimeoutException as e:
+            raise POSError(f"timeout: {e}") from e
+        except self._httpx.HTTPError as e:
+            raise POSError(f"connection: {e}") from e
+        if response.status_code != 200:
+            raise POSError(f"HTTP {response.status_code}: {response.text[:200]}")
+        try:
+            return response.json()["results"]
+        except (ValueError, KeyError) as e:
+            raise POSError(f"malformed response: {e}") from e
+
+    def close(self):
+        self._client.close()
+
+
+class StubPOS:
+    """
+    Local POS for development and the outbox benchmark.
+
+    Stores accepted orders by idempotency key, answers repeats as
+    "duplicate", and can be made slow or flaky:
+
+    Args:
+        latency: seconds added to every batch
+        failure_rate: share of batches answered with HTTP 503
+        drop_rate: share of batches processed but answered after the client gave up
+            (sleeps past timeout) - exercises duplicate handling on retry
+        reject: predicate(order dict) → reason string to reject an order, or None
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 failure_rate: float = 0.0, drop_rate: float = 0.0, timeout: float = DEFAULT_TIMEOUT,
+                 reject=None, seed: int = None):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.drop_rate = drop_rate
+        self.timeout = timeout
+        self.reject = reject
+        self.orders = {}
+        self.batches = 0
+        self.duplicates = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                if self.path != BATCH_PATH:
+                    self._reply(404, {"error": "not found"})
+                    return
+                status, reply, delay = stub._process(json.loads(body))
+                if delay:
+                    time.sleep(delay)
+                self._reply(status, reply)
+
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _process(self, body: dict) -> tuple:
+        with self._lock:
+            self.batches += 1
+            roll = self._random.random()
+        if roll < self.failure_rate:
+            with self._lock:
+                self.failures += 1
+            return 503, {"error": "unavailable"}, self.latency
+
+        results = {}
+        with self._lock:
+            for entry in body.get("orders", []):
+                key = entry["idempotency_key"]
+                if key in self.orders:
+                    self.duplicates += 1
+                    results[key] = {"status": DUPLICATE}
+                    continue
+                reason = self.reject(entry["order"]) if self.reject else None
+                if reason:
+                    results[key] = {"status": REJECTED, "reason": reason}
+                else:
+                    self.orders[key] = entry["order"]
+                    results[key] = {"status": ACCEPTED}
+
+        delay = self.latency
+        if roll < self.failure_rate + self.drop_rate:
+            delay += self.timeout + 0.5
+        return 200, {"results": results}, delay
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-pos", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
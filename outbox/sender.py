@@ -0,0 +1,164 @@
+# outbox/sender.py
+
+"""
+Background sender: drains the outbox to the POS in batches.
+
+One thread per process claims up to batch_size due orders, sends them in
+one request and records the outcome per order. A failed batch (POS down,
+slow or erroring) is retried with exponential backoff and jitter per
+order; calls never wait on any of this. The backlog (pending orders and
+the age of the oldest one) is published as gauges so a POS slowdown shows
+up before orders are late.
+"""
+
+import random
+import threading
+import time
+
+from metrics.voice_agent import (
+    OUTBOX_BACKLOG, OUTBOX_BATCH_LATENCY, OUTBOX_DELIVERED, OUTBOX_DELIVERY_DELAY, OUTBOX_OLDEST_AGE, OUTBOX_RETRIES,
+)
+from .pos import ACCEPTED, DUPLICATE, REJECTED, POSError
+
+DEFAULT_BATCH_SIZE = 50
+# Longer than the POS timeout, so a batch in flight is never claimed twice
+DEFAULT_LEASE = 30.0
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 300.0
+POLL_INTERVAL = 0.5
+
+
+class OutboxSender:
+    """
+    Args:
+        store: OutboxStore
+        client: anything with submit(orders) → {key: {"status", "reason"}} (POSClient)
+        batch_size: orders per POS request
+        lease: seconds a claimed batch stays hidden from other senders
+    """
+
+    def __init__(self, store, client, batch_size: int = DEFAULT_BATCH_SIZE, lease: float = DEFAULT_LEASE,
+                 base_backoff: float = BASE_BACKOFF, max_backoff: float = MAX_BACKOFF,
+                 poll_interval: float = POLL_INTERVAL, logger=None):
+        self.store = store
+        self.client = client
+        self.batch_size = batch_size
+        self.lease = lease
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self.logger = logger
+
+        self.batches = 0
+        self.delivered = 0
+        self.rejected = 0
+        self.retries = 0
+
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="order-outbox-sender", daemon=True)
+        self._thread.start()
+        if self.logger:
+            self.logger.info(f"Outbox sender started: {self.store.path}")
+
+    def wake(self):
+        """New order appended - send now instead of at the next poll."""
+        self._wake.set()
+
+    def _run(self):
+        try:
+            while not self._stopping:
+                try:
+                    claimed = self.send_due()
+                except Exception:
+                    # e.g. "database is locked" past the busy timeout - the thread must outlive it
+                    if self.logger:
+                        self.logger.exception("Outbox - sender error, retrying after the poll interval")
+                    claimed = 0
+                if not claimed:
+                    self._wake.wait(self.poll_interval)
+                    self._wake.clear()
+        finally:
+            self.store.close()
+
+    def send_due(self) -> int:
+        """Claims and sends one batch. Returns the number of orders claimed."""
+        orders = self.store.claim(self.batch_size, self.lease)
+        if orders:
+            self._send(orders)
+        self._report_backlog()
+        return len(orders)
+
+    def _send(self, orders: list):
+        self.batches += 1
+        started = time.perf_counter()
+        try:
+            results = self.client.submit(orders)
+        except POSError as e:
+            OUTBOX_BATCH_LATENCY.observe(time.perf_counter() - started)
+            self._retry(orders, "batch", str(e))
+            if self.logger:
+                self.logger.warning(f"Outbox - batch of {len(orders)} failed, retrying: {e}")
+            return
+        OUTBOX_BATCH_LATENCY.observe(time.perf_counter() - started)
+
+        sent, rejected, unanswered = [], {}, []
+        for order in orders:
+            result = results.get(order.key) or {}
+            status = result.get("status")
+            if status in (ACCEPTED, DUPLICATE):
+                sent.append(order)
+            elif status == REJECTED:
+                rejected[order.id] = result.get("reason") or "rejected"
+            else:
+                unanswered.append(order)
+
+        if sent:
+            self.store.mark_sent([order.id for order in sent])
+            now = self.store.clock()
+            for order in sent:
+                OUTBOX_DELIVERED.labels("sent").inc()
+                OUTBOX_DELIVERY_DELAY.observe(now - order.created_at)
+            self.delivered += len(sent)
+        if rejected:
+            self.store.mark_rejected(rejected)
+            OUTBOX_DELIVERED.labels("rejected").inc(len(rejected))
+            self.rejected += len(rejected)
+            if self.logger:
+                self.logger.error(f"Outbox - POS rejected {len(rejected)} orders: {rejected}")
+        if unanswered:
+            self._retry(unanswered, "unanswered", "no result from POS")
+
+    def _retry(self, orders: list, kind: str, error: str):
+        OUTBOX_RETRIES.labels(kind).inc(len(orders))
+        self.retries += len(orders)
+        self.store.retry_later({order.id: self._backoff(order.attempts) for order in orders}, error)
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_backoff, self.base_backoff * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _report_backlog(self):
+        pending, oldest = self.store.backlog()
+        OUTBOX_BACKLOG.set(pending)
+        OUTBOX_OLDEST_AGE.set(oldest)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "delivered": self.delivered,
+            "rejected": self.rejected,
+            "retries": self.retries,
+        }
+
+    def close(self, timeout: float = 5.0):
+        """Stops the thread after the batch in flight; pending orders stay in the outbox."""
+        self._stopping = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self.logger:
+            self.logger.info(f"Outbox sender stopped: {self.stats()}")
@@ -0,0 +1,171 @@
+# outbox/store.py
+
+"""
+Durable order outbox on SQLite in WAL mode.
+
+A confirmed order is one INSERT (a single row, no fsync with
+synchronous=NORMAL): it survives the process dying, and WAL lets the
+sender read and update rows while calls keep appending. Rows are keyed by
+an idempotency key (the call id), so a resumed call appending its order
+again is a no-op, and the POS can drop a batch it has already seen.
+
+A row is claimed by pushing its next_attempt_at past a lease, inside one
+write transaction - several worker processes can run senders on the same
+file without sending a row twice at once, and a sender that dies simply
+lets its lease run out.
+
+    status   pending → sent | rejected
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DEFAULT_OUTBOX_PATH = "outbox.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    id               INTEGER PRIMARY KEY,
+    idempotency_key  TEXT NOT NULL UNIQUE,
+    payload          TEXT NOT NULL,
+    status           TEXT NOT NULL DEFAULT 'pending',
+    attempts         INTEGER NOT NULL DEFAULT 0,
+    created_at       REAL NOT NULL,
+    next_attempt_at  REAL NOT NULL,
+    sent_at          REAL,
+    last_error       TEXT
+);
+CREATE INDEX IF NOT EXISTS orders_due ON orders (status, next_attempt_at);
+"""
+
+
+class OutboxOrder:
+    __slots__ = ("id", "key", "payload", "attempts", "created_at")
+
+    def __init__(self, id: int, key: str, payload: dict, attempts: int, created_at: float):
+        self.id = id
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+        self.created_at = created_at
+
+    def __repr__(self):
+        return f"OutboxOrder({self.key!r}, attempts={self.attempts})"
+
+
+class OutboxStore:
+    """
+    Args:
+        path: SQLite file (ORDER_OUTBOX_DB, default outbox.db)
+        clock: wall-clock seconds; timestamps are shared between processes
+    """
+
+    def __init__(self, path: str = None, clock=time.time):
+        self.path = path or os.getenv("ORDER_OUTBOX_DB", DEFAULT_OUTBOX_PATH)
+        self.clock = clock
+        # sqlite3 connections stay on the thread that opened them
+        self._local = threading.local()
+        self._connect().executescript(SCHEMA)
+
+    @property
+    def in_memory(self) -> bool:
+        """Private to this process (and thread): writes never wait on another process's lock."""
+        return self.path == ":memory:"
+
+    def _connect(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def append(self, key: str, payload: dict) -> bool:
+        """
+        Adds a confirmed order.
+
+        Returns:
+            bool: False if an order with this key is already in the outbox
+        """
+        now = self.clock()
+        cursor = self._connect().execute(
+            "INSERT OR IGNORE INTO orders (idempotency_key, payload, created_at, next_attempt_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(payload, ensure_ascii=False, separators=(",", ":")), now, now),
+        )
+        return cursor.rowcount == 1
+
+    def claim(self, limit: int, lease: float) -> list:
+        """Up to limit due orders, oldest first, hidden from other senders for lease seconds."""
+        db = self._connect()
+        now = self.clock()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = db.execute(
+                "SELECT id, idempotency_key, payload, attempts, created_at FROM orders "
+                "WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY id LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            db.executemany(
+                "UPDATE orders SET next_attempt_at = ?, attempts = attempts + 1 WHERE id = ?",
+                [(now + lease, row[0]) for row in rows],
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        return [OutboxOrder(row[0], row[1], json.loads(row[2]), row[3] + 1, row[4]) for row in rows]
+
+    def mark_sent(self, ids: list):
+        now = self.clock()
+        self._connect().executemany(
+            "UPDATE orders SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+            [(now, id) for id in ids],
+        )
+
+    def mark_rejected(self, rejected: dict):
+        """rejected: {id: reason from the POS}. Rejected orders are not retried."""
+        self._connect().executemany(
+            "UPDATE orders SET status = 'rejected', last_error = ? WHERE id = ?",
+            [(reason, id) for id, reason in rejected.items()],
+        )
+
+    def retry_later(self, delays: dict, error: str):
+        """delays: {id: seconds until the next attempt}."""
+        now = self.clock()
+        self._connect().executemany(
+            "UPDATE orders SET next_attempt_at = ?, last_error = ? WHERE id = ?",
+            [(now + delay, error, id) for id, delay in delays.items()],
+        )
+
+    def backlog(self) -> tuple:
+        """(pending orders, age in seconds of the oldest pending order)."""
+        count, oldest = self._connect().execute(
+            "SELECT COUNT(*), MIN(created_at) FROM orders WHERE status = 'pending'"
+        ).fetchone()
+        return count, (self.clock() - oldest) if oldest is not None else 0.0
+
+    def counts(self) -> dict:
+        """Orders per status."""
+        return dict(self._connect().execute("SELECT status, COUNT(*) FROM orders GROUP BY status").fetchall())
+
+    def get(self, key: str):
+        """Row for key as a dict, or None."""
+        db = self._connect()
+        cursor = db.execute("SELECT * FROM orders WHERE idempotency_key = ?", (key,))
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        return dict(zip([column[0] for column in cursor.description], row))
+
+    def close(self):
+        """Closes this thread's connection."""
+        db = getattr(self._local, "db", None)
+        if db is not None:
+            db.close()
+            self._local.db = None
@@ -0,0 +1,11 @@
+# pricing/__init__.py
+
+"""
+Order pricing: price list, deal rules and the engine that fills context["cost"].
+"""
+
+from .rules import PriceTable, Quote
+from .basket import MenuMatcher, parse_quantity
+from .engine import PricingEngine, get_engine
+
+__all__ = ['PriceTable', 'Quote', 'MenuMatcher', 'parse_quantity', 'PricingEngine', 'get_engine']
@@ -0,0 +1,79 @@
+# pricing/basket.py
+
+"""
+Turns the free-text order fields in the call context (Urdu / Roman Urdu as
+transcribed) into menu ids and a quantity for pricing.
+"""
+
+import re
+
+from worker.shared_index import build_menu_mapping, get_index, normalize_key
+
+NUMBER_WORDS = {
+    "ek": 1, "aik": 1, "one": 1, "ایک": 1,
+    "do": 2, "two": 2, "دو": 2,
+    "teen": 3, "three": 3, "تین": 3,
+    "char": 4, "chaar": 4, "four": 4, "چار": 4,
+    "panch": 5, "paanch": 5, "five": 5, "پانچ": 5,
+    "chay": 6, "chhe": 6, "six": 6, "چھ": 6,
+    "saat": 7, "seven": 7, "سات": 7,
+    "aath": 8, "eight": 8, "آٹھ": 8,
+    "nau": 9, "nine": 9, "نو": 9,
+    "das": 10, "ten": 10, "دس": 10,
+}
+
+# Urdu / Arabic-Indic digits → ASCII
+_DIGITS = str.maketrans("۰۱۲۳۴۵۶۷۸۹٠١٢٣٤٥٦٧٨٩", "01234567890123456789")
+_NUMBER_RE = re.compile(r"\d+")
+MAX_ALIAS_WORDS = 3
+
+
+def parse_quantity(text: str, default: int = 1) -> int:
+    """First number in the text (digits or number word), else default."""
+    if not text:
+        return default
+    text = text.translate(_DIGITS)
+    match = _NUMBER_RE.search(text)
+    if match:
+        return int(match.group())
+    for word in normalize_key(re.sub(r"[^\w\s]", " ", text)).split():
+        if word in NUMBER_WORDS:
+            return NUMBER_WORDS[word]
+    return default
+
+
+class MenuMatcher:
+    """
+    Finds menu aliases in transcribed text, longest alias first.
+    Inside a worker (no mapping given) aliases are looked up in the
+    supervisor's shared menu index rather than a per-process copy.
+    """
+
+    def __init__(self, mapping: dict = None):
+        index = get_index("menu") if mapping is None else None
+        if index is not None:
+            self.aliases = index    # keys normalized by the index itself
+        else:
+            mapping = mapping if mapping is not None else build_menu_mapping()
+            self.aliases = {normalize_key(alias): record for alias, record in mapping.items()}
+
+    def find(self, text: str, kind: str) -> list:
+        """
+        Menu ids of the given kind ("item" or "extra") mentioned in text, in order, without repeats.
+        """
+        if not text:
+            return []
+        words = normalize_key(re.sub(r"[^\w\s]", " ", text)).split()
+        found = []
+        i = 0
+        while i < len(words):
+            for size in range(min(MAX_ALIAS_WORDS, len(words) - i), 0, -1):
+                record = self.aliases.get(" ".join(words[i:i + size]))
+                if record:
+                    if record["kind"] == kind and record["id"] not in found:
+                        found.append(record["id"])
+                    i += size
+                    break
+            else:
+                i += 1
+        return found
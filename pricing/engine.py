@@ -0,0 +1,122 @@
+# pricing/engine.py
+
+"""
+Pricing engine: quotes the order in the call context from the local price
+list, and picks up edits to the price file without a restart.
+
+The engine checks the file's modification time at most every
+check_interval seconds (one stat call); when it changed, a new PriceTable
+is built and swapped in. Quotes in flight keep using the table they
+started with, and a broken file is logged and ignored.
+"""
+
+import os
+import threading
+import time
+
+from .basket import MenuMatcher, parse_quantity
+from .rules import DEFAULT_PRICING_FILE, PriceTable
+
+
+class PricingEngine:
+
+    def __init__(self, path: str = None, check_interval: float = 1.0, matcher: MenuMatcher = None, logger=None):
+        self.path = path or os.getenv("PRICING_FILE", DEFAULT_PRICING_FILE)
+        self.check_interval = check_interval
+        self.matcher = matcher or MenuMatcher()
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self.table = None
+        self.reloads = 0
+        self.reload(force=True)
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        Rebuild the price table if the file changed (or force).
+
+        Returns:
+            bool: True if a new table was loaded
+        """
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError as e:
+                if self.logger:
+                    self.logger.error(f"Pricing - cannot stat {self.path}: {e}")
+                if self.table is None:
+                    raise
+                return False
+            if not force and mtime == self._mtime:
+                return False
+
+            started = time.perf_counter()
+            try:
+                table = PriceTable.from_file(self.path)
+            except (ValueError, KeyError, TypeError) as e:
+                if self.logger:
+                    self.logger.error(f"Pricing - ignoring invalid price file {self.path}: {e}")
+                if self.table is None:
+                    raise
+                self._mtime = mtime
+                return False
+
+            self.table = table
+            self._mtime = mtime
+            self.reloads += 1
+            if self.logger:
+                self.logger.info(
+                    f"Pricing - loaded {self.path}: {len(table.table)} baskets precomputed "
+                    f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+                )
+            return True
+
+    def _current_table(self) -> PriceTable:
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self.reload()
+        return self.table
+
+    def quote(self, item_id: str, quantity: int = 1, extras=()):
+        """Best price for a basket of menu ids (see PriceTable.quote)."""
+        return self._current_table().quote(item_id, quantity, extras)
+
+    def quote_context(self, context) -> dict:
+        """
+        Price the order captured in the call context.
+
+        Args:
+            context: Call context with order_item, quantity and extra (transcribed text)
+
+        Returns:
+            dict: Quote.to_dict(), or None when the item isn't recognised
+        """
+        items = self.matcher.find(context.get("order_item") or "", "item")
+        if not items:
+            if self.logger:
+                self.logger.warning(f"Pricing - no menu item found in: {context.get('order_item')}")
+            return None
+
+        quantity = parse_quantity(context.get("quantity") or "")
+        extras = self.matcher.find(context.get("extra") or "", "extra")
+        quote = self.quote(items[0], quantity, extras)
+        if quote is None:
+            if self.logger:
+                self.logger.warning(f"Pricing - no price for {items[0]} x{quantity}")
+            return None
+
+        if self.logger:
+            self.logger.info(f"Pricing - {quote}")
+        return quote.to_dict()
+
+
+_engine = None
+
+
+def get_engine(logger=None) -> PricingEngine:
+    """Process-wide engine, loaded on first use."""
+    global _engine
+    if _engine is None:
+        _engine = PricingEngine(logger=logger)
+    return _engine
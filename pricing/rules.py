@@ -0,0 +1,142 @@
+# pricing/rules.py
+
+"""
+Price list and deal rules, with every basket the flow can produce priced
+up front.
+
+An order is one menu item x quantity plus a set of extras (one of each).
+When the rules are loaded, the best price of every
+(item, quantity 1..max_quantity, extras subset) basket is solved once
+(cheapest combination of deals and single prices, memoized over basket
+counts) and stored in a dict, so a quote during the call is one lookup.
+Baskets above max_quantity are solved on demand with the same memo.
+"""
+
+import json
+import os
+from functools import lru_cache
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DEFAULT_PRICING_FILE = os.path.join(DATA_DIR, "pricing.json")
+# On-demand solving recurses once per deal applied; larger orders go to an agent
+MAX_SOLVE_QUANTITY = 200
+
+
+class Quote:
+    __slots__ = ("item_id", "quantity", "extras", "total", "deals", "currency")
+
+    def __init__(self, item_id: str, quantity: int, extras: tuple, total: int, deals: tuple, currency: str):
+        self.item_id = item_id
+        self.quantity = quantity
+        self.extras = extras
+        self.total = total
+        self.deals = deals          # deal ids applied, one entry per use
+        self.currency = currency
+
+    def to_dict(self) -> dict:
+        return {
+            "item": self.item_id,
+            "quantity": self.quantity,
+            "extras": list(self.extras),
+            "deals": list(self.deals),
+            "total": self.total,
+            "currency": self.currency,
+        }
+
+    def __repr__(self):
+        return f"Quote({self.item_id!r} x{self.quantity} + {list(self.extras)}: {self.total} {self.currency})"
+
+
+class PriceTable:
+    """
+    Immutable pricing rules + precomputed best prices. Build a new one to change prices.
+    """
+
+    def __init__(self, rules: dict):
+        self.currency = rules.get("currency", "PKR")
+        self.max_quantity = rules.get("max_quantity", 10)
+        self.item_prices = dict(rules.get("items", {}))
+        self.extra_prices = dict(rules.get("extras", {}))
+        self.deal_names = {deal["id"]: deal.get("name", deal["id"]) for deal in rules.get("deals", [])}
+
+        # Goods are positions in a count vector: items first, then extras
+        self.goods = list(self.item_prices) + list(self.extra_prices)
+        self._position = {good: i for i, good in enumerate(self.goods)}
+        self._unit_prices = [self.item_prices[g] for g in self.item_prices] + \
+                            [self.extra_prices[g] for g in self.extra_prices]
+        self._extra_bits = {extra: 1 << i for i, extra in enumerate(self.extra_prices)}
+
+        self._deals = []
+        for deal in rules.get("deals", []):
+            components = deal.get("components", {})
+            unknown = [good for good in components if good not in self._position]
+            if unknown:
+                raise ValueError(f"Deal {deal['id']} uses unknown menu ids: {unknown}")
+            counts = [0] * len(self.goods)
+            for good, count in components.items():
+                counts[self._position[good]] = count
+            self._deals.append((deal["id"], deal["price"], tuple(counts)))
+
+        self._best = lru_cache(maxsize=None)(self._solve)
+        self.table = {}
+        self._precompute()
+
+    @classmethod
+    def from_file(cls, path: str = None):
+        with open(path or DEFAULT_PRICING_FILE, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def extras_mask(self, extras) -> int:
+        mask = 0
+        for extra in extras:
+            mask |= self._extra_bits.get(extra, 0)
+        return mask
+
+    def _extras_of(self, mask: int) -> tuple:
+        return tuple(extra for extra, bit in self._extra_bits.items() if mask & bit)
+
+    def _solve(self, counts: tuple):
+        """Cheapest (total, deal ids) for a basket given as a count vector."""
+        best_total = sum(count * price for count, price in zip(counts, self._unit_prices))
+        best_deals = ()
+        for deal_id, deal_price, deal_counts in self._deals:
+            if all(have >= need for have, need in zip(counts, deal_counts)):
+                rest = tuple(have - need for have, need in zip(counts, deal_counts))
+                rest_total, rest_deals = self._best(rest)
+                if deal_price + rest_total < best_total:
+                    best_total = deal_price + rest_total
+                    best_deals = (deal_id,) + rest_deals
+        return best_total, best_deals
+
+    def _basket(self, item_id: str, quantity: int, mask: int) -> tuple:
+        counts = [0] * len(self.goods)
+        counts[self._position[item_id]] = quantity
+        for extra, bit in self._extra_bits.items():
+            if mask & bit:
+                counts[self._position[extra]] = 1
+        return tuple(counts)
+
+    def _precompute(self):
+        for item_id in self.item_prices:
+            for quantity in range(1, self.max_quantity + 1):
+                for mask in range(1 << len(self._extra_bits)):
+                    total, deals = self._best(self._basket(item_id, quantity, mask))
+                    self.table[(item_id, quantity, mask)] = Quote(
+                        item_id, quantity, self._extras_of(mask), total, deals, self.currency
+                    )
+
+    def quote(self, item_id: str, quantity: int = 1, extras=()):
+        """
+        Best price for item_id x quantity plus extras.
+
+        Returns:
+            Quote, or None when item_id is not on the price list
+        """
+        if item_id not in self.item_prices or not 1 <= quantity <= MAX_SOLVE_QUANTITY:
+            return None
+        mask = self.extras_mask(extras)
+        quote = self.table.get((item_id, quantity, mask))
+        if quote is None:
+            total, deals = self._best(self._basket(item_id, quantity, mask))
+            quote = Quote(item_id, quantity, self._extras_of(mask), total, deals, self.currency)
+        return quote
@@ -0,0 +1,15 @@
+# quota/__init__.py
+
+"""
+Provider quota limiting (Gemini, Speechmatics) and admission control for new calls.
+"""
+
+from .limiter import (
+    QuotaExceeded, RateLimiter, TokenBucket, get_limiter, is_rate_limited, set_call_priority,
+)
+from .admission import AdmissionController, get_admission
+
+__all__ = [
+    'QuotaExceeded', 'RateLimiter', 'TokenBucket', 'get_limiter', 'is_rate_limited', 'set_call_priority',
+    'AdmissionController', 'get_admission',
+]
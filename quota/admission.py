@@ -0,0 +1,114 @@
+# quota/admission.py
+
+"""
+Admission control for new calls.
+
+A new call is let in while the process is under its call limit and every
+backend limiter could serve it within a fraction of its max wait. Otherwise
+it queues (first come, first served) for up to max_wait seconds, and is
+turned away at once when the queue is already full. Admitted calls get
+their admission time as quota priority, so their requests are served
+ahead of calls admitted later.
+"""
+
+import asyncio
+import collections
+import os
+import time
+
+from metrics.voice_agent import ADMISSION_WAIT, CALLS_REJECTED
+from .limiter import all_limiters, set_call_priority
+
+ADMISSION_POLL = 0.05
+# A backend counts as saturated once a new request would wait this share of its max wait
+SATURATION = 0.5
+
+
+class AdmissionController:
+    """
+    Args:
+        limiters: RateLimiters whose backlog blocks new calls
+        max_calls: concurrent call limit (None = no limit)
+        max_queue: new calls allowed to wait at once
+        max_wait: longest a new call waits to be admitted (seconds)
+    """
+
+    def __init__(self, limiters=(), max_calls: int = None, max_queue: int = 20, max_wait: float = 3.0,
+                 saturation: float = SATURATION, clock=time.monotonic, logger=None):
+        self.limiters = list(limiters)
+        self.max_calls = max_calls
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.saturation = saturation
+        self.clock = clock
+        self.logger = logger
+        self.active = 0
+        self._queue = collections.deque()
+
+    def has_capacity(self) -> bool:
+        if self.max_calls is not None and self.active >= self.max_calls:
+            return False
+        return all(limiter.expected_wait() <= limiter.max_wait * self.saturation for limiter in self.limiters)
+
+    async def admit(self, in_progress: bool = False) -> bool:
+        """
+        Waits for room for a call in this task.
+
+        Args:
+            in_progress: the call already ran (resumed from a checkpoint) - admitted without queueing
+
+        Returns:
+            bool: False if the call was rejected
+        """
+        started = self.clock()
+        if in_progress or (not self._queue and self.has_capacity()):
+            return self._admitted(started)
+
+        if len(self._queue) >= self.max_queue:
+            return self._rejected(started, "admission queue full")
+
+        ticket = object()
+        self._queue.append(ticket)
+        try:
+            while self.clock() - started < self.max_wait:
+                await asyncio.sleep(ADMISSION_POLL)
+                if self._queue[0] is ticket and self.has_capacity():
+                    return self._admitted(started)
+            return self._rejected(started, f"no capacity within {self.max_wait:.1f}s")
+        finally:
+            self._queue.remove(ticket)
+
+    def _admitted(self, started: float) -> bool:
+        self.active += 1
+        now = self.clock()
+        ADMISSION_WAIT.observe(now - started)
+        set_call_priority(now)
+        return True
+
+    def _rejected(self, started: float, why: str) -> bool:
+        ADMISSION_WAIT.observe(self.clock() - started)
+        CALLS_REJECTED.inc()
+        if self.logger:
+            self.logger.warning(f"Admission - call rejected: {why} (active {self.active}, queued {len(self._queue)})")
+        return False
+
+    def release(self):
+        self.active -= 1
+
+
+_admission = None
+
+
+def get_admission(logger=None) -> AdmissionController:
+    """Process-wide controller over the LLM and STT limiters, configured from the environment."""
+    global _admission
+    if _admission is None:
+        max_calls = os.getenv("MAX_ACTIVE_CALLS")
+        _admission = AdmissionController(
+            all_limiters(logger),
+            max_calls=int(max_calls) if max_calls else None,
+            max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", 20)),
+            max_wait=float(os.getenv("ADMISSION_MAX_WAIT", 3.0)),
+            logger=logger,
+        )
+    return _admission
@@ -0,0 +1,210 @@
+# quota/limiter.py
+
+"""
+Process-wide token-bucket limiters for the provider quotas (Gemini
+requests, Speechmatics session starts).
+
+Requests that find the bucket empty wait in a priority queue ordered by
+when their call was admitted, so calls already in progress are served
+before calls that just started. A wait is bounded: if the queue ahead
+can't drain within the caller's limit, acquire() fails straight away
+instead of sleeping first and failing later. A 429 from the provider
+pauses the bucket, so the whole process backs off rather than every
+call retrying on its own.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import time
+
+from metrics.voice_agent import QUOTA_QUEUE, QUOTA_REJECTED, QUOTA_THROTTLED, QUOTA_WAIT
+
+# Seconds to back off after a 429 without a Retry-After hint
+DEFAULT_THROTTLE = 2.0
+
+_call_priority = contextvars.ContextVar("quota_call_priority", default=None)
+
+
+def set_call_priority(priority: float):
+    """Priority (admission time - lower is served first) for requests made by the current call."""
+    _call_priority.set(priority)
+
+
+def current_priority() -> float:
+    priority = _call_priority.get()
+    return time.monotonic() if priority is None else priority
+
+
+class QuotaExceeded(Exception):
+    """The backend's quota queue could not serve the request in time."""
+
+
+class TokenBucket:
+
+    def __init__(self, rate: float, burst: float, clock=time.monotonic):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self.tokens = burst
+        self.updated = clock()
+
+    def _refill(self) -> float:
+        now = self.clock()
+        # updated is in the future while the bucket is paused
+        if now > self.updated:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+        return now
+
+    def take(self) -> bool:
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def available(self) -> float:
+        self._refill()
+        return self.tokens
+
+    def time_until(self, tokens: float = 1) -> float:
+        """Seconds until the bucket holds this many tokens."""
+        now = self._refill()
+        return max(0.0, self.updated - now) + max(0.0, (tokens - self.tokens) / self.rate)
+
+    def pause(self, seconds: float):
+        """Empties the bucket and stops refilling for seconds."""
+        self._refill()
+        self.tokens = 0.0
+        self.updated = max(self.updated, self.clock() + seconds)
+
+
+class RateLimiter:
+    """
+    Args:
+        name: backend label for metrics ("llm", "stt")
+        rate: requests per second
+        burst: bucket size
+        max_wait: longest a request may queue (seconds)
+    """
+
+    def __init__(self, name: str, rate: float, burst: float, max_wait: float, clock=time.monotonic, logger=None):
+        self.name = name
+        self.max_wait = max_wait
+        self.bucket = TokenBucket(rate, burst, clock)
+        self.logger = logger
+        self._waiters = []          # heap of [priority, seq, future]
+        self._seq = itertools.count()
+        self._timer = None
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def expected_wait(self) -> float:
+        """Seconds a new request would wait behind the current queue."""
+        return self.bucket.time_until(len(self._waiters) + 1)
+
+    async def acquire(self, priority: float = None, timeout: float = None):
+        """
+        Takes one request's worth of quota, waiting in priority order.
+
+        Args:
+            priority: default is the current call's admission time
+            timeout: wait limit, capped at max_wait
+
+        Raises:
+            QuotaExceeded: the wait would exceed the limit
+        """
+        timeout = self.max_wait if timeout is None else min(timeout, self.max_wait)
+        if not self._waiters and self.bucket.take():
+            QUOTA_WAIT.labels(self.name).observe(0.0)
+            return
+
+        if self.expected_wait() > timeout:
+            self._reject(f"expected wait {self.expected_wait():.2f}s > {timeout:.2f}s")
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self._waiters, [current_priority() if priority is None else priority, next(self._seq), future])
+        QUOTA_QUEUE.labels(self.name).inc()
+        self._schedule(loop)
+
+        started = loop.time()
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            self._reject(f"waited {timeout:.2f}s")
+        finally:
+            QUOTA_QUEUE.labels(self.name).dec()
+        QUOTA_WAIT.labels(self.name).observe(loop.time() - started)
+
+    def _reject(self, why: str):
+        QUOTA_REJECTED.labels(self.name).inc()
+        if self.logger:
+            self.logger.warning(f"Quota [{self.name}] - request rejected: {why}")
+        raise QuotaExceeded(f"{self.name} quota: {why}")
+
+    def _schedule(self, loop):
+        if self._timer is None:
+            self._timer = loop.call_soon(self._grant, loop)
+
+    def _grant(self, loop):
+        self._timer = None
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():       # timed out or cancelled
+                heapq.heappop(self._waiters)
+                continue
+            if not self.bucket.take():
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+        if self._waiters:
+            self._timer = loop.call_later(self.bucket.time_until(1), self._grant, loop)
+
+    def throttle(self, retry_after: float = None):
+        """Provider answered 429: pause the bucket for retry_after (or DEFAULT_THROTTLE) seconds."""
+        seconds = retry_after or DEFAULT_THROTTLE
+        self.bucket.pause(seconds)
+        QUOTA_THROTTLED.labels(self.name).inc()
+        if self.logger:
+            self.logger.warning(f"Quota [{self.name}] - provider rate limit hit, pausing {seconds:.1f}s")
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True for a provider rate-limit error (Gemini 429 / RESOURCE_EXHAUSTED, Speechmatics quota_exceeded)."""
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    text = str(error)
+    return code == 429 or "RESOURCE_EXHAUSTED" in text or "quota_exceeded" in text
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+# name → (requests/minute env, default, burst env, default, max wait env, default)
+LIMITS = {
+    "llm": ("GEMINI_RPM", 600, "GEMINI_BURST", 20, "GEMINI_MAX_WAIT", 2.0),
+    "stt": ("SPEECHMATICS_SESSIONS_PER_MIN", 120, "SPEECHMATICS_BURST", 10, "SPEECHMATICS_MAX_WAIT", 5.0),
+}
+
+_limiters = {}
+
+
+def get_limiter(name: str, logger=None) -> RateLimiter:
+    """Process-wide limiter for a backend, configured from the environment on first use."""
+    limiter = _limiters.get(name)
+    if limiter is None:
+        rpm_env, rpm, burst_env, burst, wait_env, wait = LIMITS[name]
+        limiter = RateLimiter(name, _env_float(rpm_env, rpm) / 60.0, _env_float(burst_env, burst),
+                              _env_float(wait_env, wait), logger=logger)
+        _limiters[name] = limiter
+    return limiter
+
+
+def all_limiters(logger=None) -> list:
+    return [get_limiter(name, logger) for name in LIMITS]
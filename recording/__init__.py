@@ -0,0 +1,9 @@
+# recording/__init__.py
+
+"""
+Non-blocking call audio recording for QA.
+"""
+
+from .writer import CallRecording, RecordingWriter, activate_recording, get_active_recording
+
+__all__ = ['CallRecording', 'RecordingWriter', 'activate_recording', 'get_active_recording']
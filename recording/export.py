@@ -0,0 +1,60 @@
+# recording/export.py
+
+"""
+Export one recorded call to WAV for QA listening.
+
+    python -m recording.export <call_id> --out call.wav
+    python -m recording.export <call_id> --direction outbound --dir recordings/
+"""
+
+import argparse
+import json
+import os
+import wave
+
+from .segments import INBOUND, OUTBOUND, read_segment
+
+
+def load_index(directory: str, call_id: str) -> dict:
+    with open(os.path.join(directory, "index", f"{call_id}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def call_audio(directory: str, call_id: str, direction: int = INBOUND) -> bytes:
+    """Concatenated PCM of one direction of a call, in recording order."""
+    meta = load_index(directory, call_id)
+    frames = []
+    for segment in meta["segments"]:
+        for call_ref, chunk_direction, _, pcm in read_segment(os.path.join(directory, "segments", segment)):
+            if call_ref == meta["call_ref"] and chunk_direction == direction:
+                frames.append(pcm)
+    return b"".join(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a recorded call to WAV")
+    parser.add_argument("call_id")
+    parser.add_argument("--dir", default=os.getenv("CALL_RECORDING_DIR", "recordings"))
+    parser.add_argument("--direction", choices=["inbound", "outbound"], default="inbound")
+    parser.add_argument("--out", help="WAV path (default: <call_id>_<direction>.wav)")
+    args = parser.parse_args()
+
+    meta = load_index(args.dir, args.call_id)
+    direction = INBOUND if args.direction == "inbound" else OUTBOUND
+    pcm = call_audio(args.dir, args.call_id, direction)
+    out = args.out or f"{args.call_id}_{args.direction}.wav"
+
+    with wave.open(out, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(meta["sample_rate"])
+        f.writeframes(pcm)
+
+    seconds = len(pcm) / 2 / meta["sample_rate"]
+    print(f"🎙️  {args.call_id} ({meta['msisdn']}): {seconds:.1f}s {args.direction} → {out}")
+    if meta.get("dropped_bytes"):
+        print(f"⚠️  {meta['dropped_bytes']} bytes were dropped while recording (disk too slow)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# recording/segments.py
+
+"""
+Preallocated, memory-mapped segment files for call audio.
+
+Layout (little endian):
+    header:  magic (8s) | used bytes (uint64)
+    chunks:  call ref (uint32) | direction (uint8) | offset seconds (float64) | length (uint32) | PCM
+
+A segment is created at its full size up front, so appending is a memcpy
+into the mapping - no file growth, no write() syscalls on the hot path.
+"used" is refreshed after every batch, so a crash loses at most the last
+batch. Closed segments are truncated to their used size and may be
+gzip-compressed (<name>.vaseg.gz).
+"""
+
+import gzip
+import mmap
+import os
+import shutil
+import struct
+
+MAGIC = b"VAREC001"
+SEGMENT_HEADER = struct.Struct("<8sQ")
+CHUNK_HEADER = struct.Struct("<IBdI")
+
+INBOUND = 1    # caller audio (what STT hears)
+OUTBOUND = 2   # agent audio (what the caller hears)
+
+DEFAULT_SEGMENT_BYTES = 32 * 1024 * 1024
+
+
+class SegmentFile:
+    """One segment open for appending. Used only by the writer thread."""
+
+    def __init__(self, path: str, size: int = DEFAULT_SEGMENT_BYTES):
+        self.path = path
+        self.size = size
+        self.used = SEGMENT_HEADER.size
+        self._file = open(path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+        self._write_header()
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    def _write_header(self):
+        SEGMENT_HEADER.pack_into(self._map, 0, MAGIC, self.used)
+
+    def fits(self, length: int) -> bool:
+        return self.used + CHUNK_HEADER.size + length <= self.size
+
+    def append(self, call_ref: int, direction: int, offset: float, data: bytes) -> int:
+        """Copies one chunk into the mapping. Returns the chunk's position in the segment."""
+        position = self.used
+        CHUNK_HEADER.pack_into(self._map, position, call_ref, direction, offset, len(data))
+        start = position + CHUNK_HEADER.size
+        self._map[start:start + len(data)] = data
+        self.used = start + len(data)
+        return position
+
+    def commit(self):
+        """Publishes everything appended so far (header only - the kernel writes the pages back)."""
+        self._write_header()
+
+    def close(self):
+        self._write_header()
+        self._map.flush()
+        self._map.close()
+        self._file.truncate(self.used)
+        self._file.close()
+
+
+def compress_segment(path: str) -> str:
+    """Gzips a closed segment in place of the raw file. Returns the new path."""
+    compressed = path + ".gz"
+    with open(path, "rb") as src, gzip.open(compressed + ".tmp", "wb", compresslevel=1) as dst:
+        shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(compressed + ".tmp", compressed)
+    os.remove(path)
+    return compressed
+
+
+def read_segment(path: str):
+    """Yields (call_ref, direction, offset, pcm) for every committed chunk of a raw or .gz segment."""
+    if not os.path.exists(path) and os.path.exists(path + ".gz"):
+        path = path + ".gz"
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rb") as f:
+        data = f.read()
+
+    magic, used = SEGMENT_HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError(f"Not a recording segment: {path}")
+
+    position = SEGMENT_HEADER.size
+    while position + CHUNK_HEADER.size <= used:
+        call_ref, direction, offset, length = CHUNK_HEADER.unpack_from(data, position)
+        start = position + CHUNK_HEADER.size
+        yield call_ref, direction, offset, data[start:start + length]
+        position = start + length
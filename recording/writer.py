@@ -0,0 +1,291 @@
+# recording/writer.py
+
+"""
+Background call recording writer.
+
+Producers (the PortAudio callback thread, the event loop) only append to an
+in-memory queue; a single writer thread per process drains it into
+memory-mapped segment files. Pending audio is capped by a byte budget: when
+the disk falls behind, new chunks are dropped and counted per call instead
+of growing memory or blocking the audio path.
+
+    recordings/
+        segments/<pid>-<timestamp>-<n>.vaseg[.gz]   audio of every call, interleaved
+        index/<call_id>.json                         per-call metadata + segment list
+
+Recording is off unless CALL_RECORDING_DIR is set.
+"""
+
+import atexit
+import collections
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+from .segments import DEFAULT_SEGMENT_BYTES, INBOUND, OUTBOUND, SegmentFile, compress_segment
+
+DEFAULT_MAX_PENDING_BYTES = 64 * 1024 * 1024
+FLUSH_INTERVAL = 0.05
+
+_active_recording = contextvars.ContextVar("active_call_recording", default=None)
+
+
+def get_active_recording():
+    """Returns the recording of the call running in this task, or None."""
+    return _active_recording.get()
+
+
+def activate_recording(recording):
+    """Makes recording the active one for the current task (and tasks it creates)."""
+    _active_recording.set(recording)
+
+
+class RecordingWriter:
+    """
+    Args:
+        directory: root of segments/ and index/
+        segment_bytes: preallocated size of each segment file
+        max_pending_bytes: memory budget for queued audio before chunks are dropped
+        compress: gzip segments when they roll over
+    """
+
+    def __init__(self, directory: str, segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+                 max_pending_bytes: int = DEFAULT_MAX_PENDING_BYTES, compress: bool = False,
+                 flush_interval: float = FLUSH_INTERVAL, logger=None):
+        self.directory = directory
+        self.segment_dir = os.path.join(directory, "segments")
+        self.index_dir = os.path.join(directory, "index")
+        self.segment_bytes = segment_bytes
+        self.max_pending_bytes = max_pending_bytes
+        self.compress = compress
+        self.flush_interval = flush_interval
+        self.logger = logger
+
+        self.pending_bytes = 0
+        self.written_bytes = 0
+        self.dropped_bytes = 0
+        self.segments_closed = 0
+
+        self._queue = collections.deque()
+        self._lock = threading.Lock()
+        self._call_refs = itertools.count(1)
+        self._calls = {}          # call_ref -> index metadata (writer thread only)
+        self._segment = None
+        self._segment_count = 0
+        self._stopping = False
+        self._thread = None
+        self._compressor = None
+        self._compress_queue = collections.deque()
+
+    def start(self):
+        os.makedirs(self.segment_dir, exist_ok=True)
+        os.makedirs(self.index_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name="call-recording-writer", daemon=True)
+        self._thread.start()
+        if self.compress:
+            self._compressor = threading.Thread(target=self._run_compressor, name="call-recording-gzip", daemon=True)
+            self._compressor.start()
+        if self.logger:
+            self.logger.info(f"Recording writer started: {self.directory}")
+
+    # ---- producer side (any thread, never blocks on I/O) ----
+
+    def submit(self, call_ref: int, direction: int, offset: float, data: bytes) -> bool:
+        """Queues one PCM chunk. Returns False if it was dropped because the budget is full."""
+        with self._lock:
+            if self.pending_bytes + len(data) > self.max_pending_bytes:
+                self.dropped_bytes += len(data)
+                self._queue.append(("dropped", call_ref, len(data)))
+                return False
+            self.pending_bytes += len(data)
+            self._queue.append(("audio", call_ref, direction, offset, data))
+            return True
+
+    def open_call(self, call_id: str, msisdn: str, sample_rate: int):
+        call_ref = next(self._call_refs)
+        self._queue.append(("open", call_ref, {
+            "call_id": call_id,
+            "call_ref": call_ref,
+            "msisdn": msisdn,
+            "sample_rate": sample_rate,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        }))
+        return CallRecording(self, call_ref, call_id)
+
+    def annotate(self, call_ref: int, key: str, value):
+        """Appends value to a list in the call's index metadata (e.g. TTS prompts)."""
+        self._queue.append(("annotate", call_ref, key, value))
+
+    def close_call(self, call_ref: int, duration: float):
+        self._queue.append(("close", call_ref, duration))
+
+    # ---- writer thread ----
+
+    def _run(self):
+        while True:
+            if not self._queue:
+                if self._stopping:
+                    break
+                time.sleep(self.flush_interval)
+                continue
+
+            written = 0
+            while self._queue:
+                item = self._queue.popleft()
+                written += self._apply(item)
+            if self._segment is not None:
+                self._segment.commit()
+            with self._lock:
+                self.pending_bytes -= written
+            self.written_bytes += written
+
+        self._close_segment()
+
+    def _apply(self, item) -> int:
+        kind, call_ref = item[0], item[1]
+        if kind == "audio":
+            _, _, direction, offset, data = item
+            self._append(call_ref, direction, offset, data)
+            return len(data)
+
+        meta = self._calls.get(call_ref)
+        if kind == "open":
+            self._calls[call_ref] = dict(item[2], segments=[], bytes={"inbound": 0, "outbound": 0}, dropped_bytes=0)
+        elif meta is None:
+            pass
+        elif kind == "dropped":
+            meta["dropped_bytes"] += item[2]
+        elif kind == "annotate":
+            meta.setdefault(item[2], []).append(item[3])
+        elif kind == "close":
+            meta["duration"] = item[2]
+            self._write_index(self._calls.pop(call_ref))
+        return 0
+
+    def _append(self, call_ref: int, direction: int, offset: float, data: bytes):
+        if self._segment is None or not self._segment.fits(len(data)):
+            self._rollover()
+        self._segment.append(call_ref, direction, offset, data)
+
+        meta = self._calls.get(call_ref)
+        if meta is not None:
+            if not meta["segments"] or meta["segments"][-1] != self._segment.name:
+                meta["segments"].append(self._segment.name)
+            meta["bytes"]["inbound" if direction == INBOUND else "outbound"] += len(data)
+
+    def _rollover(self):
+        self._close_segment()
+        self._segment_count += 1
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        name = f"{os.getpid()}-{timestamp}-{self._segment_count:05d}.vaseg"
+        self._segment = SegmentFile(os.path.join(self.segment_dir, name), self.segment_bytes)
+
+    def _close_segment(self):
+        if self._segment is None:
+            return
+        self._segment.close()
+        self.segments_closed += 1
+        if self.compress:
+            self._compress_queue.append(self._segment.path)
+        self._segment = None
+
+    def _write_index(self, meta: dict):
+        path = os.path.join(self.index_dir, f"{meta['call_id']}.json")
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        os.replace(path + ".tmp", path)
+
+    def _run_compressor(self):
+        # Separate thread so a slow gzip never holds up the audio writer
+        while True:
+            if not self._compress_queue:
+                if self._stopping and not self._thread.is_alive():
+                    break
+                time.sleep(0.5)
+                continue
+            path = self._compress_queue.popleft()
+            try:
+                compress_segment(path)
+            except OSError as e:
+                if self.logger:
+                    self.logger.error(f"Recording - compressing {path} failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "pending_bytes": self.pending_bytes,
+            "written_bytes": self.written_bytes,
+            "dropped_bytes": self.dropped_bytes,
+            "segments_closed": self.segments_closed,
+            "open_calls": len(self._calls),
+        }
+
+    def close(self, timeout: float = 10.0):
+        """Drains the queue, closes the current segment and waits for compression."""
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._compressor is not None:
+            self._compressor.join(timeout)
+        if self.logger:
+            self.logger.info(f"Recording writer stopped: {self.stats()}")
+
+
+class CallRecording:
+    """Handle for one call's audio. Cheap to call from the audio thread."""
+
+    def __init__(self, writer: RecordingWriter, call_ref: int, call_id: str):
+        self.writer = writer
+        self.call_ref = call_ref
+        self.call_id = call_id
+        self.start = time.monotonic()
+
+    def inbound(self, frame):
+        """frame: int16 PCM buffer (bytes or numpy array) from the caller."""
+        self.writer.submit(self.call_ref, INBOUND, time.monotonic() - self.start, bytes(frame))
+
+    def outbound(self, frame):
+        """frame: int16 PCM buffer played to the caller."""
+        self.writer.submit(self.call_ref, OUTBOUND, time.monotonic() - self.start, bytes(frame))
+
+    def prompt(self, text: str):
+        self.writer.annotate(self.call_ref, "prompts", {"offset": time.monotonic() - self.start, "text": text})
+
+    def close(self):
+        self.writer.close_call(self.call_ref, time.monotonic() - self.start)
+
+    @classmethod
+    def for_call(cls, msisdn: str, sample_rate: int = 16000, logger=None):
+        """Opens a recording under CALL_RECORDING_DIR, or returns None when recording is off."""
+        writer = get_writer(logger)
+        if writer is None:
+            return None
+        call_id = f"{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}_{msisdn}_{uuid.uuid4().hex[:6]}"
+        return writer.open_call(call_id, msisdn, sample_rate)
+
+
+# Process-wide writer, started on first use
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer(logger=None):
+    """Returns the process writer configured from the environment, or None when recording is off."""
+    global _writer
+    directory = os.getenv("CALL_RECORDING_DIR")
+    if not directory:
+        return None
+    with _writer_lock:
+        if _writer is None:
+            _writer = RecordingWriter(
+                directory,
+                compress=os.getenv("CALL_RECORDING_COMPRESS", "").lower() in ("1", "true", "yes"),
+                logger=logger,
+            )
+            _writer.start()
+            atexit.register(_writer.close)
+    return _writer
@@ -0,0 +1,10 @@
+# replay/__init__.py
+
+"""
+Record-and-replay of full calls for offline performance regression.
+"""
+
+from .container import TraceWriter, TraceReader
+from .recorder import CallRecorder, activate_recorder, get_active_recorder
+
+__all__ = ['TraceWriter', 'TraceReader', 'CallRecorder', 'activate_recorder', 'get_active_recorder']
@@ -0,0 +1,87 @@
+# replay/container.py
+
+"""
+Compact binary container for one recorded call (.vacall).
+
+Layout:
+    MAGIC (8 bytes)
+    record*  where record = kind (uint8) | offset seconds (float64) | length (uint32) | payload
+
+Audio frames are stored as raw int16 PCM bytes, everything else as
+UTF-8 JSON. Offsets are seconds since the start of the call.
+"""
+
+import json
+import struct
+
+MAGIC = b"VACALL01"
+RECORD_HEADER = struct.Struct("<BdI")
+
+# Record kinds
+META = 1          # {"msisdn", "started_at", "sample_rate", ...}
+AUDIO = 2         # raw inbound PCM frame
+TRANSCRIPT = 3    # raw Speechmatics AddTranscript message
+TURN_START = 4    # {"turn": n}
+TURN_END = 5      # {"turn": n, "text", "duration"}
+LLM_CALL = 6      # {"key", "prompt", "response", "latency"}
+TTS = 7           # {"text"}
+TIMING = 8        # {"name", "seconds"}
+
+KIND_NAMES = {
+    META: "meta",
+    AUDIO: "audio",
+    TRANSCRIPT: "transcript",
+    TURN_START: "turn_start",
+    TURN_END: "turn_end",
+    LLM_CALL: "llm",
+    TTS: "tts",
+    TIMING: "timing",
+}
+
+
+class TraceWriter:
+    """Appends records to a .vacall file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+
+    def write(self, kind: int, offset: float, payload: bytes):
+        self._file.write(RECORD_HEADER.pack(kind, offset, len(payload)))
+        self._file.write(payload)
+
+    def write_json(self, kind: int, offset: float, data: dict):
+        self.write(kind, offset, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+
+class TraceReader:
+    """Iterates (kind, offset, payload) records of a .vacall file."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __iter__(self):
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"Not a call trace file: {self.path}")
+
+            while True:
+                header = f.read(RECORD_HEADER.size)
+                if not header:
+                    return
+                if len(header) < RECORD_HEADER.size:
+                    # Truncated trailing record (process died mid-write) - stop cleanly
+                    return
+                kind, offset, length = RECORD_HEADER.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length:
+                    return
+                if kind == AUDIO:
+                    yield kind, offset, payload
+                else:
+                    yield kind, offset, json.loads(payload.decode("utf-8"))
@@ -0,0 +1,93 @@
+# replay/recorder.py
+
+"""
+Per-call recorder. The controller activates one recorder per call; STT, LLM
+and TTS look it up with get_active_recorder() and append what they see.
+Recording is off (None) unless CALL_TRACE_DIR is set.
+"""
+
+import contextvars
+import os
+import time
+from datetime import datetime
+
+from . import container
+
+_active_recorder = contextvars.ContextVar("active_call_recorder", default=None)
+
+
+def get_active_recorder():
+    """Returns the recorder of the call running in this task, or None."""
+    return _active_recorder.get()
+
+
+def activate_recorder(recorder):
+    """Makes recorder the active one for the current task (and tasks it creates)."""
+    _active_recorder.set(recorder)
+
+
+class CallRecorder:
+    """
+    Writes one call's audio frames, raw transcripts, LLM calls, TTS prompts
+    and timings into a single .vacall file.
+    """
+
+    def __init__(self, path: str, msisdn: str = None, logger=None):
+        self.path = path
+        self.logger = logger
+        self.start = time.monotonic()
+        self.turn = 0
+        self.turn_started_at = None
+        self.writer = container.TraceWriter(path)
+        self.writer.write_json(container.META, 0.0, {
+            "msisdn": msisdn,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        })
+        if self.logger:
+            self.logger.info(f"Call trace recording to: {path}")
+
+    @classmethod
+    def for_call(cls, msisdn: str, logger=None):
+        """Creates a recorder under CALL_TRACE_DIR, or returns None when recording is off."""
+        directory = os.getenv("CALL_TRACE_DIR")
+        if not directory:
+            return None
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        return cls(os.path.join(directory, f"{timestamp}_{msisdn}.vacall"), msisdn=msisdn, logger=logger)
+
+    def _now(self) -> float:
+        return time.monotonic() - self.start
+
+    def audio(self, frame: bytes):
+        self.writer.write(container.AUDIO, self._now(), frame)
+
+    def transcript(self, msg: dict):
+        self.writer.write_json(container.TRANSCRIPT, self._now(), msg)
+
+    def turn_start(self):
+        self.turn += 1
+        self.turn_started_at = self._now()
+        self.writer.write_json(container.TURN_START, self.turn_started_at, {"turn": self.turn})
+
+    def turn_end(self, text: str):
+        now = self._now()
+        duration = now - self.turn_started_at if self.turn_started_at is not None else 0.0
+        self.writer.write_json(container.TURN_END, now, {"turn": self.turn, "text": text, "duration": duration})
+
+    def llm_call(self, key: str, prompt: str, response: str, latency: float):
+        self.writer.write_json(container.LLM_CALL, self._now(), {
+            "key": key, "prompt": prompt, "response": response, "latency": latency,
+        })
+
+    def tts(self, text: str):
+        self.writer.write_json(container.TTS, self._now(), {"text": text})
+
+    def timing(self, name: str, seconds: float):
+        self.writer.write_json(container.TIMING, self._now(), {"name": name, "seconds": seconds})
+
+    def close(self):
+        self.timing("call_total", self._now())
+        self.writer.close()
+        if self.logger:
+            self.logger.info(f"Call trace saved: {self.path}")
@@ -0,0 +1,330 @@
+# replay/replayer.py
+
+"""
+Replays a recorded call (.vacall) through the real orchestrators with
+Speechmatics, the microphone and Gemini stubbed from the recording.
+
+Usage:
+    python -m replay.replayer call_traces/2026-02-13_14-30-00_923001234567.vacall
+    python -m replay.replayer trace.vacall --speed 10 --report new.json --baseline old.json
+
+--speed 1 replays in real time; higher values compress every recorded wait
+(transcript arrival, audio frames, LLM latency, silence timeout) by that factor.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+
+from ai.fake_llm import FakeResponse
+from ai.llm import LLM_TIMEOUT
+from history import OrderHistory
+from . import container
+
+
+class RecordedTurn:
+    """Everything STT saw during one transcribe() call, with offsets relative to the turn start."""
+
+    def __init__(self, number: int, start: float):
+        self.number = number
+        self.start = start
+        self.transcripts = []  # (offset, msg)
+        self.audio = []        # (offset, bytes)
+        self.text = None
+        self.duration = None
+
+
+class CallTrace:
+    """Parsed .vacall file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.meta = {}
+        self.turns = []
+        self.llm_calls = []
+        self.tts = []
+        self.timings = {}
+
+        current = None
+        for kind, offset, payload in container.TraceReader(path):
+            if kind == container.META:
+                self.meta = payload
+            elif kind == container.TURN_START:
+                current = RecordedTurn(payload["turn"], offset)
+                self.turns.append(current)
+            elif kind == container.TRANSCRIPT and current is not None:
+                current.transcripts.append((offset - current.start, payload))
+            elif kind == container.AUDIO and current is not None:
+                current.audio.append((offset - current.start, payload))
+            elif kind == container.TURN_END and current is not None:
+                current.text = payload["text"]
+                current.duration = payload["duration"]
+                current = None
+            elif kind == container.LLM_CALL:
+                self.llm_calls.append(payload)
+            elif kind == container.TTS:
+                self.tts.append(payload["text"])
+            elif kind == container.TIMING:
+                self.timings[payload["name"]] = payload["seconds"]
+
+
+class _Frame(bytes):
+    """Stands in for the numpy buffer sounddevice hands to the callback."""
+
+    def tobytes(self) -> bytes:
+        return bytes(self)
+
+
+class ReplayInputStream:
+    """Feeds a turn's recorded audio frames to the STT callback from a background thread."""
+
+    def __init__(self, frames: list, speed: float, callback):
+        self.frames = frames
+        self.speed = speed
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        started = time.monotonic()
+        for offset, frame in self.frames:
+            wait = offset / self.speed - (time.monotonic() - started)
+            if wait > 0 and self._stop.wait(wait):
+                return
+            if self._stop.is_set():
+                return
+            self.callback(_Frame(frame), len(frame) // 2, None, None)
+
+    def stop(self):
+        self._stop.set()
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+
+class ReplaySpeechmaticsClient:
+    """Emits a turn's recorded AddTranscript messages at their recorded offsets."""
+
+    def __init__(self, turn: RecordedTurn, speed: float):
+        self.turn = turn
+        self.speed = speed
+        self.handlers = defaultdict(list)
+        self.bytes_sent = 0
+        self._task = None
+
+    def on(self, event: str, handler):
+        self.handlers[event].append(handler)
+
+    async def start_session(self, transcription_config=None, audio_format=None):
+        for handler in self.handlers["RecognitionStarted"]:
+            handler({"message": "RecognitionStarted"})
+        self._task = asyncio.create_task(self._emit())
+
+    async def _emit(self):
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        for offset, msg in self.turn.transcripts:
+            wait = offset / self.speed - (loop.time() - started)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            for handler in self.handlers["AddTranscript"]:
+                handler(msg)
+
+    async def send_audio(self, data: bytes):
+        self.bytes_sent += len(data)
+
+    async def stop_session(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+
+class ReplayLLMBackend:
+    """Answers prompts with the recorded responses, after the recorded latency."""
+
+    def __init__(self, llm_calls: list, speed: float, logger=None):
+        self.speed = speed
+        self.logger = logger
+        self.responses = defaultdict(deque)
+        self.misses = 0
+        for call in llm_calls:
+            self.responses[call["prompt"]].append(call)
+
+    async def generate(self, prompt: str, temperature: float, system_instruction: str = None, cached_content: str = None):
+        recorded = self.responses.get(prompt)
+        if not recorded:
+            self.misses += 1
+            if self.logger:
+                self.logger.warning(f"Replay - no recorded LLM response for prompt: {prompt}")
+            return FakeResponse("")
+
+        call = recorded.popleft() if len(recorded) > 1 else recorded[0]
+        await asyncio.sleep(call["latency"] / self.speed)
+        if call["response"] == LLM_TIMEOUT:
+            # Recorded call timed out - make the replay time out as well
+            await asyncio.sleep(3600)
+        return FakeResponse(call["response"])
+
+    async def prefix_cache(self, template) -> str:
+        return None
+
+
+class ReplaySession:
+    """Hands out the stubbed client/stream for each successive STT turn."""
+
+    def __init__(self, trace: CallTrace, speed: float):
+        self.trace = trace
+        self.speed = speed
+        self.turn_index = -1
+        self.turn_durations = []
+        self.clients = []
+
+    def _current_turn(self) -> RecordedTurn:
+        if 0 <= self.turn_index < len(self.trace.turns):
+            return self.trace.turns[self.turn_index]
+        return RecordedTurn(self.turn_index + 1, 0.0)  # flow diverged: silent turn
+
+    def client_factory(self):
+        self.turn_index += 1
+        client = ReplaySpeechmaticsClient(self._current_turn(), self.speed)
+        self.clients.append(client)
+        return client
+
+    def input_stream_factory(self, callback=None, **kwargs):
+        return ReplayInputStream(self._current_turn().audio, self.speed, callback)
+
+
+class _TimedSTT:
+    """Wraps STT.transcribe() to time each replayed turn."""
+
+    def __init__(self, stt, session: ReplaySession):
+        self.stt = stt
+        self.session = session
+
+    async def transcribe(self, **kwargs) -> str:
+        # Loop time, so simulated calls on a virtual clock are timed in virtual seconds
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        text = await self.stt.transcribe(**kwargs)
+        self.session.turn_durations.append(loop.time() - started)
+        return text
+
+
+class _CapturingTTS:
+    def __init__(self, tts):
+        self.tts = tts
+        self.played = []
+
+    async def play_audio(self, text: str) -> str:
+        self.played.append(text)
+        return await self.tts.play_audio(text)
+
+    async def play_stream(self, text_stream, stop=None) -> str:
+        text = await self.tts.play_stream(text_stream, stop=stop)
+        self.played.append(text)
+        return text
+
+
+async def replay_call(path: str, speed: float = 1.0, logger=None) -> dict:
+    """
+    Replays one trace through run_order_flow() and returns a timing report
+    comparing the replay against the recording.
+    """
+    from ai import STT, LLM, TTS
+    from ai.stt import SILENCE_TIMEOUT
+    from main import new_call_context, run_order_flow
+
+    logger = logger or logging.getLogger("voice_agent.replay")
+    trace = CallTrace(path)
+    session = ReplaySession(trace, speed)
+
+    stt = STT(
+        logger=logger,
+        client_factory=session.client_factory,
+        input_stream_factory=session.input_stream_factory,
+    )
+    stt.silence_timeout = SILENCE_TIMEOUT / speed
+    stt.poll_interval = stt.poll_interval / speed
+    llm_backend = ReplayLLMBackend(trace.llm_calls, speed, logger=logger)
+    llm = LLM(logger=logger, backend=llm_backend)
+    tts = _CapturingTTS(TTS(logger=logger))
+
+    context = new_call_context(trace.meta.get("msisdn"))
+
+    started = time.monotonic()
+    confirmed = False
+    try:
+        # Empty in-memory history: a recorded call never sees orders placed since
+        confirmed = await run_order_flow(context, logger, stt=_TimedSTT(stt, session), llm=llm, tts=tts,
+                                         history=OrderHistory(":memory:"))
+    except SystemExit:
+        # checkAvailableLocation() still exits the flow - treat as end of call
+        pass
+    total = time.monotonic() - started
+
+    recorded_turns = [turn.duration for turn in trace.turns]
+    return {
+        "trace": path,
+        "speed": speed,
+        "confirmed": confirmed,
+        "context": {k: v for k, v in context.items() if k != "customer_profile"},
+        # Replayed durations are scaled back up by speed so they compare to the recording
+        "total_seconds": {"recorded": trace.timings.get("call_total"), "replayed": total * speed},
+        "turn_seconds": {
+            "recorded": recorded_turns,
+            "replayed": [d * speed for d in session.turn_durations],
+        },
+        "turns": {"recorded": len(trace.turns), "replayed": len(session.turn_durations)},
+        "tts_parity": tts.played == trace.tts,
+        "llm_misses": llm_backend.misses,
+        "audio_bytes_sent": sum(client.bytes_sent for client in session.clients),
+    }
+
+
+def compare_reports(baseline: dict, current: dict) -> list:
+    """Human-readable deltas between two replay reports of the same trace."""
+    lines = []
+    base_total = baseline["total_seconds"]["replayed"]
+    cur_total = current["total_seconds"]["replayed"]
+    lines.append(f"total: {base_total:.3f}s → {cur_total:.3f}s ({cur_total - base_total:+.3f}s)")
+
+    for i, (b, c) in enumerate(zip(baseline["turn_seconds"]["replayed"], current["turn_seconds"]["replayed"]), start=1):
+        lines.append(f"turn {i}: {b:.3f}s → {c:.3f}s ({c - b:+.3f}s)")
+
+    if baseline["context"] != current["context"]:
+        lines.append(f"context differs: {baseline['context']} → {current['context']}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded call trace")
+    parser.add_argument("trace", help="Path to a .vacall file")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed factor (1 = real time)")
+    parser.add_argument("--report", help="Write the JSON report to this path")
+    parser.add_argument("--baseline", help="Compare against an earlier JSON report")
+    args = parser.parse_args()
+
+    report = asyncio.run(replay_call(args.trace, speed=args.speed))
+
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print("\n".join(compare_reports(baseline, report)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+# sim/__init__.py
+
+"""
+Simulation mode: the real order flow over scripted or recorded callers on a virtual clock.
+"""
+
+from .loop import VirtualClock, VirtualTimeLoop, run
+from .script import CallScript, SimSession, load_scripts
+
+__all__ = ['VirtualClock', 'VirtualTimeLoop', 'run', 'CallScript', 'SimSession', 'load_scripts']
@@ -0,0 +1,101 @@
+# sim/loop.py
+
+"""
+Event loop on a virtual clock.
+
+loop.time() reads a VirtualClock instead of the system clock. When the
+loop would block waiting for its next timer, it moves the clock to that
+timer instead of sleeping, so asyncio.sleep(), wait_for() timeouts and
+call_later() fire in order at the right virtual times without any real
+waiting. Callbacks that are already due, and wake-ups from other threads
+(call_soon_threadsafe), are still handled first.
+
+Everything the flow decides from loop time (silence timeout, LLM deadline
+and hedging, the pipelined turn gate) behaves as on a real loop. Work on
+other threads (asyncio.to_thread, executors) is not slowed down, so it
+must not be part of a simulated call.
+"""
+
+import asyncio
+import math
+import selectors
+
+# Timers fire when the clock is within this of their time (the system loop uses
+# the clock's ~1 ns resolution; code that re-arms a timer for the few ns left
+# would never see the clock move)
+CLOCK_RESOLUTION = 1e-12
+
+
+class VirtualClock:
+
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        if seconds > 0:
+            self.now += seconds
+
+    def advance_to(self, when: float):
+        if when > self.now:
+            self.now = when
+
+
+class _VirtualSelector:
+    """Wraps a real selector; a select() with a timeout and nothing ready advances the clock instead."""
+
+    def __init__(self, selector: selectors.BaseSelector, advance):
+        self._selector = selector
+        self._advance = advance
+
+    def select(self, timeout=None):
+        events = self._selector.select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None:
+            # No timers left - only another thread can wake the loop now
+            return self._selector.select(None)
+        self._advance(timeout)
+        return []
+
+    def __getattr__(self, name):
+        return getattr(self._selector, name)
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+
+    def __init__(self, clock: VirtualClock = None):
+        self.clock = clock or VirtualClock()
+        super().__init__(selector=_VirtualSelector(selectors.DefaultSelector(), self._advance))
+        self._clock_resolution = CLOCK_RESOLUTION
+
+    def time(self) -> float:
+        return self.clock.now
+
+    def call_at(self, when, callback, *args, context=None):
+        # Always strictly in the future, so every timer wait moves the clock
+        when = max(when, math.nextafter(self.clock.now, math.inf))
+        return super().call_at(when, callback, *args, context=context)
+
+    def _advance(self, timeout: float):
+        # Land exactly on the next timer; now + timeout can round to just short of it
+        target = self.clock.now + timeout
+        if self._scheduled:
+            target = max(target, self._scheduled[0].when())
+        self.clock.advance_to(target)
+
+
+def run(main, clock: VirtualClock = None):
+    """asyncio.run() on a VirtualTimeLoop."""
+    loop = VirtualTimeLoop(clock)
+    asyncio.set_event_loop(loop)
+    try:
+        return loop.run_until_complete(main)
+    finally:
+        try:
+            loop.run_until_complete(loop.shutdown_asyncgens())
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
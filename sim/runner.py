@@ -0,0 +1,176 @@
+# sim/runner.py
+
+"""
+Runs scripted or recorded calls through the real order flow on a virtual
+clock, many at once, and reports outcomes and (virtual) timings.
+
+Usage:
+    python -m sim.runner data/sim_calls.json --calls 5000 --concurrency 500
+    python -m sim.runner call_traces/*.vacall --report sim.json
+    python -m sim.runner data/sim_calls.json --check-realtime 1
+
+--check-realtime N also runs the first N scripts on a normal event loop in
+real time and fails if the outcome, context, prompts or turn timings differ.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import sys
+import time
+
+from ai.resilience import CircuitBreaker
+from history import OrderHistory
+from outbox import OrderOutbox, OutboxStore
+from replay.replayer import _CapturingTTS, _TimedSTT
+from .loop import run
+from .script import SimSession, load_scripts
+
+# Calls still running after this much virtual time are reported as stuck
+# (e.g. a silent caller: STT only ends a turn after speech)
+DEFAULT_MAX_CALL_SECONDS = 600.0
+# Allowed difference per turn between virtual and real-time runs
+REALTIME_TOLERANCE = 0.25
+
+
+async def simulate_call(script, logger, outbox=None, max_seconds: float = DEFAULT_MAX_CALL_SECONDS) -> dict:
+    """
+    Runs one CallScript through run_order_flow() on the running loop.
+
+    Returns:
+        dict: outcome ("confirmed", "not_confirmed", "exited", "stuck"), call
+              duration and per-turn STT durations in loop seconds, prompts played
+    """
+    from ai import LLM, STT, TTS
+    from main import new_call_context, run_order_flow
+
+    loop = asyncio.get_running_loop()
+    session = SimSession(script)
+    stt = STT(logger=logger, client_factory=session.client_factory, input_stream_factory=session.input_stream_factory)
+    llm = LLM(logger=logger, backend=script.llm_backend(logger), breaker=CircuitBreaker(clock=loop.time))
+    tts = _CapturingTTS(TTS(logger=logger))
+    context = new_call_context(script.msisdn)
+    outbox = outbox or OrderOutbox(OutboxStore(":memory:"))
+    # Each call sees only its script's past orders, a day apart
+    history = OrderHistory(":memory:")
+    for age, order in enumerate(script.history, start=1):
+        history.record(f"{script.name}-{age}", context["msisdn"], order, ordered_at=-86400.0 * age)
+
+    async def flow() -> str:
+        try:
+            confirmed = await run_order_flow(context, logger, stt=_TimedSTT(stt, session), llm=llm, tts=tts, outbox=outbox,
+                                             history=history)
+        except SystemExit:
+            # checkAvailableLocation() still exits the flow - treat as end of call.
+            # Caught inside the task: a SystemExit leaving a task stops the whole loop
+            return "exited"
+        return "confirmed" if confirmed else "not_confirmed"
+
+    started = loop.time()
+    try:
+        outcome = await asyncio.wait_for(flow(), max_seconds)
+    except asyncio.TimeoutError:
+        outcome = "stuck"
+
+    return {
+        "script": script.name,
+        "outcome": outcome,
+        "seconds": loop.time() - started,
+        "turn_seconds": session.turn_durations,
+        "prompts": tts.played,
+        "context": {k: v for k, v in context.items() if k != "customer_profile"},
+    }
+
+
+async def simulate_many(scripts: list, calls: int, concurrency: int, logger, max_seconds: float) -> list:
+    """Runs calls calls (cycling through scripts), up to concurrency at a time, sharing one clock."""
+    semaphore = asyncio.Semaphore(concurrency)
+    outbox = OrderOutbox(OutboxStore(":memory:"))
+
+    async def one(i: int) -> dict:
+        async with semaphore:
+            return await simulate_call(scripts[i % len(scripts)], logger, outbox, max_seconds)
+
+    return await asyncio.gather(*(one(i) for i in range(calls)))
+
+
+def compare_runs(virtual: dict, real: dict, tolerance: float = REALTIME_TOLERANCE) -> list:
+    """Differences between a virtual-clock and a real-time run of the same script."""
+    problems = []
+    for key in ("outcome", "prompts", "context"):
+        if virtual[key] != real[key]:
+            problems.append(f"{key}: {virtual[key]!r} (virtual) != {real[key]!r} (real time)")
+    if len(virtual["turn_seconds"]) != len(real["turn_seconds"]):
+        problems.append(f"turns: {len(virtual['turn_seconds'])} (virtual) != {len(real['turn_seconds'])} (real time)")
+    for i, (v, r) in enumerate(zip(virtual["turn_seconds"], real["turn_seconds"]), start=1):
+        if abs(v - r) > tolerance:
+            problems.append(f"turn {i}: {v:.3f}s (virtual) vs {r:.3f}s (real time)")
+    return problems
+
+
+def summarize(results: list, wall_seconds: float) -> dict:
+    outcomes = {}
+    for result in results:
+        outcomes[result["outcome"]] = outcomes.get(result["outcome"], 0) + 1
+    virtual_seconds = sum(result["seconds"] for result in results)
+    return {
+        "calls": len(results),
+        "outcomes": outcomes,
+        "wall_seconds": wall_seconds,
+        "calls_per_minute": len(results) / wall_seconds * 60 if wall_seconds else None,
+        "simulated_call_seconds": virtual_seconds,
+        "speedup": virtual_seconds / wall_seconds if wall_seconds else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate calls on a virtual clock")
+    parser.add_argument("scripts", nargs="+", help="JSON call scripts and/or .vacall traces")
+    parser.add_argument("--calls", type=int, help="Total calls to run, cycling through the scripts (default: one each)")
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--max-call-seconds", type=float, default=DEFAULT_MAX_CALL_SECONDS)
+    parser.add_argument("--check-realtime", type=int, default=0, metavar="N",
+                        help="Also run the first N scripts in real time and compare")
+    parser.add_argument("--report", help="Write per-call results and the summary to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="Keep the flow's console output and INFO logs")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("voice_agent.sim")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    logger.addHandler(logging.StreamHandler() if args.verbose else logging.NullHandler())
+    scripts = load_scripts(args.scripts)
+    calls = args.calls or len(scripts)
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull, \
+            contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+        started = time.perf_counter()
+        results = run(simulate_many(scripts, calls, args.concurrency, logger, args.max_call_seconds))
+        wall = time.perf_counter() - started
+
+        mismatches = {}
+        for script in scripts[:args.check_realtime]:
+            virtual = run(simulate_call(script, logger, max_seconds=args.max_call_seconds))
+            real = asyncio.run(simulate_call(script, logger, max_seconds=args.max_call_seconds))
+            mismatches[script.name] = compare_runs(virtual, real)
+
+    summary = summarize(results, wall)
+    print(json.dumps(summary, indent=2))
+    for name, problems in mismatches.items():
+        print(f"real-time check {name}: {'OK' if not problems else 'MISMATCH'}")
+        for problem in problems:
+            print(f"  {problem}")
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump({"summary": summary, "calls": results, "realtime_check": mismatches}, f,
+                      indent=2, ensure_ascii=False)
+
+    return 1 if any(mismatches.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# sim/script.py
+
+"""
+Simulated callers: scripted transcripts (JSON) or recorded calls (.vacall),
+turned into the same per-turn form the replayer uses.
+
+Script file (a list of calls):
+
+    [{
+      "name": "new_address",
+      "msisdn": "923001234567",
+      "turns": [
+        {"say": "جی ہاں", "after": 1.5, "confidence": 0.95},
+        ...
+      ],
+      "llm": {"latency": 0.6, "responses": {"substring in prompt": "reply"}, "default": "others"}
+    }]
+
+Each turn is one STT transcribe(): the caller starts speaking "after"
+seconds into the turn (STT is armed ARM_LEAD before the prompt ends),
+speaks at word_seconds per word, and Speechmatics delivers the whole
+utterance as one final (end of speech) message. A turn with "say": ""
+stays silent. Recorded calls replay their own transcript messages, audio
+frames and LLM responses at the recorded offsets.
+"""
+
+import asyncio
+import json
+
+from ai.fake_llm import FakeLLMBackend
+from replay.replayer import CallTrace, RecordedTurn, ReplayLLMBackend, ReplaySession, _Frame
+
+DEFAULT_AFTER = 1.5
+WORD_SECONDS = 0.35
+DEFAULT_MSISDN = "923001234567"
+
+
+def _final_message(text: str, start: float, word_seconds: float, confidence: float) -> dict:
+    results = []
+    for i, word in enumerate(text.split()):
+        results.append({
+            "type": "word",
+            "start_time": start + i * word_seconds,
+            "end_time": start + (i + 1) * word_seconds,
+            "alternatives": [{"content": word, "confidence": confidence}],
+        })
+    results.append({"type": "punctuation", "is_eos": True, "alternatives": [{"content": ".", "confidence": 1.0}]})
+    return {"message": "AddTranscript", "results": results}
+
+
+class CallScript:
+    """One simulated call: what the caller says each turn and how the LLM answers."""
+
+    def __init__(self, name: str, turns: list, msisdn: str = DEFAULT_MSISDN, llm: dict = None, trace: CallTrace = None,
+                 history: list = None):
+        self.name = name
+        self.turns = turns          # RecordedTurn list
+        self.msisdn = msisdn
+        self.llm = llm or {}
+        self.trace = trace
+        self.history = history or []    # caller's past orders (priced quotes), newest first
+
+    @classmethod
+    def from_dict(cls, spec: dict):
+        turns = []
+        for number, turn in enumerate(spec.get("turns", []), start=1):
+            recorded = RecordedTurn(number, 0.0)
+            text = turn.get("say", "")
+            if text:
+                after = turn.get("after", DEFAULT_AFTER)
+                word_seconds = turn.get("word_seconds", WORD_SECONDS)
+                spoken = len(text.split()) * word_seconds
+                message = _final_message(text, after, word_seconds, turn.get("confidence", 0.95))
+                recorded.transcripts.append((after + spoken, message))
+            recorded.text = text
+            turns.append(recorded)
+        return cls(spec.get("name", "call"), turns, spec.get("msisdn", DEFAULT_MSISDN), spec.get("llm"),
+                   history=spec.get("history"))
+
+    @classmethod
+    def from_trace(cls, path: str):
+        trace = CallTrace(path)
+        return cls(path, trace.turns, trace.meta.get("msisdn") or DEFAULT_MSISDN, trace=trace)
+
+    def llm_backend(self, logger=None):
+        if self.trace is not None:
+            return ReplayLLMBackend(self.trace.llm_calls, speed=1.0, logger=logger)
+        return FakeLLMBackend(
+            responses=self.llm.get("responses"),
+            default_response=self.llm.get("default", "others"),
+            latency=self.llm.get("latency", 0.0),
+        )
+
+
+def load_scripts(paths: list) -> list:
+    """CallScripts from JSON script files and .vacall traces."""
+    scripts = []
+    for path in paths:
+        if path.endswith(".vacall"):
+            scripts.append(CallScript.from_trace(path))
+            continue
+        with open(path, encoding="utf-8") as f:
+            specs = json.load(f)
+        scripts.extend(CallScript.from_dict(spec) for spec in (specs if isinstance(specs, list) else [specs]))
+    return scripts
+
+
+class ScriptedInputStream:
+    """Microphone stand-in: delivers a turn's audio frames from loop timers, no thread."""
+
+    def __init__(self, frames: list, callback):
+        self.frames = frames
+        self.callback = callback
+        self._handles = []
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        self._handles = [
+            loop.call_later(offset, self.callback, _Frame(frame), len(frame) // 2, None, None)
+            for offset, frame in self.frames
+        ]
+
+    def stop(self):
+        for handle in self._handles:
+            handle.cancel()
+
+    def close(self):
+        self.stop()
+
+
+class SimSession(ReplaySession):
+    """ReplaySession over a CallScript, with the microphone driven by the event loop."""
+
+    def __init__(self, script: CallScript):
+        super().__init__(script.trace or script, speed=1.0)
+
+    def input_stream_factory(self, callback=None, **kwargs):
+        return ScriptedInputStream(self._current_turn().audio, callback)
@@ -0,0 +1,10 @@
+# state/__init__.py
+
+"""
+Typed per-call state and checkpoint/resume.
+"""
+
+from .call_context import CallContext, STEPS
+from .checkpoint import CheckpointStore
+
+__all__ = ['CallContext', 'STEPS', 'CheckpointStore']
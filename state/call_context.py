@@ -0,0 +1,131 @@
+# state/call_context.py
+
+"""
+Typed per-call state shared by every orchestrator.
+
+Orchestrators keep using context["key"] / context.get("key"); the fixed
+__slots__ layout rejects typos and keeps each context small. The current
+step is tracked alongside the order fields so a checkpoint says where the
+flow stopped.
+
+Binary layout (little endian):
+    magic (4s) | version (uint8) | step (uint8) | call id (uint16 len + UTF-8)
+    per field, in FIELDS order:  tag (uint8) | length (uint32) | value
+        tag 0 = None, 1 = UTF-8 string, 2 = compact JSON (dicts, numbers, lists)
+"""
+
+import json
+import struct
+
+MAGIC = b"VACX"
+VERSION = 1
+HEADER = struct.Struct("<4sBBH")
+FIELD_HEADER = struct.Struct("<BI")
+
+TAG_NONE = 0
+TAG_STR = 1
+TAG_JSON = 2
+
+# Order of the flow; "done" once the order summary has been read out
+STEPS = ("greeting", "address", "order_item", "quantity", "extras", "done")
+
+
+class CallContext:
+    FIELDS = ("msisdn", "intent", "customer_profile", "order_item", "quantity", "extra", "address", "cost")
+
+    __slots__ = FIELDS + ("step", "call_id")
+
+    def __init__(self, msisdn: str = None, call_id: str = None, step: str = STEPS[0], **fields):
+        for name in self.FIELDS:
+            setattr(self, name, None)
+        self.msisdn = msisdn
+        self.call_id = call_id
+        self.step = step
+        for name, value in fields.items():
+            self[name] = value
+
+    # ---- dict-style access used by the orchestrators ----
+
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key: str, value):
+        if key not in self.FIELDS:
+            raise KeyError(f"Unknown call context field: {key}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.FIELDS
+
+    def get(self, key: str, default=None):
+        value = getattr(self, key, None) if key in self.FIELDS else None
+        return default if value is None else value
+
+    def keys(self):
+        return list(self.FIELDS)
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.FIELDS]
+
+    def to_dict(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"CallContext(call_id={self.call_id!r}, step={self.step!r}, {self.to_dict()!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, CallContext):
+            return NotImplemented
+        return (self.call_id, self.step, self.items()) == (other.call_id, other.step, other.items())
+
+    # ---- flow position ----
+
+    def is_pending(self, step: str) -> bool:
+        """True if the flow hasn't completed this step yet."""
+        return STEPS.index(self.step) <= STEPS.index(step)
+
+    def advance(self, step: str):
+        """Marks everything before step as done."""
+        self.step = step
+
+    # ---- binary serialization ----
+
+    def to_bytes(self) -> bytes:
+        call_id = (self.call_id or "").encode("utf-8")
+        parts = [HEADER.pack(MAGIC, VERSION, STEPS.index(self.step), len(call_id)), call_id]
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is None:
+                parts.append(FIELD_HEADER.pack(TAG_NONE, 0))
+                continue
+            if isinstance(value, str):
+                tag, data = TAG_STR, value.encode("utf-8")
+            else:
+                tag, data = TAG_JSON, json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            parts.append(FIELD_HEADER.pack(tag, len(data)))
+            parts.append(data)
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        magic, version, step, call_id_len = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("Not a call context checkpoint")
+
+        position = HEADER.size
+        call_id = data[position:position + call_id_len].decode("utf-8") or None
+        position += call_id_len
+
+        context = cls(call_id=call_id, step=STEPS[step])
+        for name in cls.FIELDS:
+            tag, length = FIELD_HEADER.unpack_from(data, position)
+            position += FIELD_HEADER.size
+            raw = data[position:position + length]
+            position += length
+            if tag == TAG_STR:
+                setattr(context, name, raw.decode("utf-8"))
+            elif tag == TAG_JSON:
+                setattr(context, name, json.loads(raw))
+        return context
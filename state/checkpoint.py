@@ -0,0 +1,62 @@
+# state/checkpoint.py
+
+"""
+Local checkpoint store for in-progress calls.
+
+After each completed step the call's CallContext is written to
+<CALL_CHECKPOINT_DIR>/<call_id>.ctx (write to temp file + rename, so a
+reader never sees half a checkpoint). No fsync: the store only has to
+survive the worker process dying, and the page cache outlives the process.
+The file is removed when the call ends; whatever remains belongs to calls
+whose worker died and can be resumed.
+"""
+
+import os
+import struct
+
+from .call_context import CallContext
+
+DEFAULT_CHECKPOINT_DIR = "checkpoints"
+SUFFIX = ".ctx"
+
+
+class CheckpointStore:
+
+    def __init__(self, directory: str = None, logger=None):
+        self.directory = directory or os.getenv("CALL_CHECKPOINT_DIR", DEFAULT_CHECKPOINT_DIR)
+        self.logger = logger
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, call_id: str) -> str:
+        return os.path.join(self.directory, f"{call_id}{SUFFIX}")
+
+    def save(self, context: CallContext):
+        path = self._path(context.call_id)
+        with open(path + ".tmp", "wb") as f:
+            f.write(context.to_bytes())
+        os.replace(path + ".tmp", path)
+        if self.logger:
+            self.logger.debug(f"Checkpoint - {context.call_id} saved at step '{context.step}'")
+
+    def load(self, call_id: str):
+        """Returns the checkpointed CallContext, or None if the call has none."""
+        try:
+            with open(self._path(call_id), "rb") as f:
+                return CallContext.from_bytes(f.read())
+        except FileNotFoundError:
+            return None
+        except (ValueError, UnicodeDecodeError, struct.error, IndexError) as e:
+            # Truncated or corrupt file (JSONDecodeError is a ValueError)
+            if self.logger:
+                self.logger.error(f"Checkpoint - {call_id} unreadable, starting fresh: {e}")
+            return None
+
+    def delete(self, call_id: str):
+        try:
+            os.remove(self._path(call_id))
+        except FileNotFoundError:
+            pass
+
+    def pending(self) -> list:
+        """Call ids with a checkpoint left behind."""
+        return sorted(name[:-len(SUFFIX)] for name in os.listdir(self.directory) if name.endswith(SUFFIX))
@@ -0,0 +1,10 @@
+# telephony/__init__.py
+
+"""
+Telephony media ingress: G.711 decoding, resampling and call sessions.
+"""
+
+from .ingress import CallSession, TelephonyIngress
+from .resample import PolyphaseResampler
+
+__all__ = ['CallSession', 'TelephonyIngress', 'PolyphaseResampler']
@@ -0,0 +1,70 @@
+# telephony/g711.py
+
+"""
+G.711 μ-law / A-law codecs with NumPy lookup tables.
+
+Decoding is a single table gather per frame (256-entry int16 table).
+Encoding uses a 65536-entry table indexed by the int16 sample, so it is
+one gather as well - no per-sample Python.
+"""
+
+import numpy as np
+
+
+def _build_ulaw_decode_table() -> np.ndarray:
+    u = ~np.arange(256, dtype=np.int32) & 0xFF
+    sign = u & 0x80
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    magnitude = (((mantissa << 3) + 0x84) << exponent) - 0x84
+    return np.where(sign != 0, -magnitude, magnitude).astype(np.int16)
+
+
+def _build_alaw_decode_table() -> np.ndarray:
+    a = np.arange(256, dtype=np.int32) ^ 0x55
+    sign = a & 0x80
+    exponent = (a >> 4) & 0x07
+    mantissa = a & 0x0F
+    magnitude = np.where(
+        exponent == 0,
+        (mantissa << 4) + 8,
+        ((mantissa << 4) + 0x108) << np.maximum(exponent - 1, 0),
+    )
+    return np.where(sign != 0, magnitude, -magnitude).astype(np.int16)
+
+
+def _build_ulaw_encode_table() -> np.ndarray:
+    """int16 sample (offset by 32768) → μ-law byte (same rounding as the ITU reference coder)."""
+    segment_ends = np.array([0x3F, 0x7F, 0xFF, 0x1FF, 0x3FF, 0x7FF, 0xFFF, 0x1FFF], dtype=np.int32)
+    samples = np.arange(-32768, 32768, dtype=np.int32) >> 2
+    mask = np.where(samples < 0, 0x7F, 0xFF)
+    magnitude = np.minimum(np.abs(samples), 8159) + 0x21
+    segment = np.searchsorted(segment_ends, magnitude, side="left")
+    mantissa = (magnitude >> (segment + 1)) & 0x0F
+    encoded = np.where(segment >= 8, 0x7F, (segment << 4) | mantissa)
+    return (encoded ^ mask).astype(np.uint8)
+
+
+ULAW_DECODE = _build_ulaw_decode_table()
+ALAW_DECODE = _build_alaw_decode_table()
+ULAW_ENCODE = _build_ulaw_encode_table()
+
+DECODE_TABLES = {
+    "pcmu": ULAW_DECODE,
+    "ulaw": ULAW_DECODE,
+    "pcma": ALAW_DECODE,
+    "alaw": ALAW_DECODE,
+}
+
+
+def decode(payload: bytes, codec: str) -> np.ndarray:
+    """G.711 payload → int16 PCM samples."""
+    table = DECODE_TABLES.get(codec.lower())
+    if table is None:
+        raise ValueError(f"Unsupported G.711 codec: {codec}")
+    return table[np.frombuffer(payload, dtype=np.uint8)]
+
+
+def encode_ulaw(samples: np.ndarray) -> bytes:
+    """int16 PCM samples → μ-law bytes."""
+    return ULAW_ENCODE[samples.astype(np.int32) + 32768].tobytes()
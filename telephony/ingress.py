@@ -0,0 +1,213 @@
+# telephony/ingress.py
+
+"""
+Telephony audio ingress.
+
+A media gateway (Asterisk/FreeSWITCH, or an RTP/WebSocket bridge) terminates
+the caller's RTP stream and forwards it to us over a local TCP socket, one
+connection per call. Every message is framed as:
+
+    type (uint8) | payload length (uint32, little endian) | payload
+
+    START  0x01  JSON {"call_id": "...", "caller": "923001234567", "codec": "pcmu" | "pcma", "sample_rate": 8000}
+    MEDIA  0x02  raw G.711 payload (typically 20 ms = 160 bytes)
+    STOP   0x03  empty - caller hung up
+
+G.711 is decoded with lookup tables and resampled to 16 kHz, then handed to
+the call's STT exactly like microphone frames.
+
+    python -m telephony.ingress --port 9092
+"""
+
+import argparse
+import asyncio
+import json
+import struct
+import time
+
+from . import g711
+from .resample import PolyphaseResampler
+
+FRAME_HEADER = struct.Struct("<BI")
+
+MSG_START = 0x01
+MSG_MEDIA = 0x02
+MSG_STOP = 0x03
+
+STT_SAMPLE_RATE = 16000
+MAX_PAYLOAD = 64 * 1024
+
+
+class CallAudioStream:
+    """
+    Stands in for sounddevice.InputStream inside STT.transcribe(): while
+    started, every decoded frame of the call goes to the STT callback.
+    """
+
+    def __init__(self, session, callback):
+        self.session = session
+        self.callback = callback
+
+    def start(self):
+        self.session.stream = self
+
+    def stop(self):
+        if self.session.stream is self:
+            self.session.stream = None
+
+    def close(self):
+        self.stop()
+
+
+class CallSession:
+    """One inbound call: caller id, codec state and the currently listening STT stream."""
+
+    def __init__(self, call_id: str, caller: str, codec: str = "pcmu", sample_rate: int = 8000):
+        self.call_id = call_id
+        self.caller = caller
+        self.codec = codec
+        self.sample_rate = sample_rate
+        self.resampler = PolyphaseResampler(STT_SAMPLE_RATE, sample_rate)
+        self.stream = None
+        self.hangup = asyncio.Event()
+        self.audio_seconds = 0.0
+        self.processing_seconds = 0.0
+
+    def push_media(self, payload: bytes):
+        started = time.perf_counter()
+        pcm = self.resampler.process(g711.decode(payload, self.codec))
+        self.processing_seconds += time.perf_counter() - started
+        self.audio_seconds += len(payload) / self.sample_rate
+
+        # Audio outside a listening turn is dropped, same as a closed mic stream
+        if self.stream is not None:
+            self.stream.callback(pcm, len(pcm), None, None)
+
+    def input_stream_factory(self, callback=None, **kwargs):
+        """Passed to STT(input_stream_factory=...) in place of the microphone."""
+        return CallAudioStream(self, callback)
+
+    @property
+    def cpu_ratio(self) -> float:
+        """Decode + resample time as a fraction of call audio time."""
+        return self.processing_seconds / self.audio_seconds if self.audio_seconds else 0.0
+
+
+async def run_ingress_call(session: CallSession, logger):
+    """Default call handler: the real order flow with STT fed from the call's media."""
+    from ai import STT
+    from main import run_call
+
+    stt = STT(logger=logger, input_stream_factory=session.input_stream_factory)
+    try:
+        await run_call(session.caller, logger, stt=stt, hangup=session.hangup)
+    except SystemExit:
+        # The flow still ends some calls with exit(); that ends the call, not the server
+        pass
+
+
+class TelephonyIngress:
+    """
+    Args:
+        on_call: async callable(session, logger) run once per call
+        host / port: local listening address
+    """
+
+    def __init__(self, on_call=run_ingress_call, host: str = "127.0.0.1", port: int = 9092, logger=None):
+        self.on_call = on_call
+        self.host = host
+        self.port = port
+        self.logger = logger
+        self.server = None
+        self.sessions = {}
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        if self.logger:
+            self.logger.info(f"Ingress - listening on {self.host}:{self.port}")
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def _read_message(self, reader):
+        header = await reader.readexactly(FRAME_HEADER.size)
+        kind, length = FRAME_HEADER.unpack(header)
+        if length > MAX_PAYLOAD:
+            raise ValueError(f"Ingress message too large: {length} bytes")
+        payload = await reader.readexactly(length) if length else b""
+        return kind, payload
+
+    async def _handle_connection(self, reader, writer):
+        session = None
+        call_task = None
+        try:
+            kind, payload = await self._read_message(reader)
+            if kind != MSG_START:
+                raise ValueError(f"Ingress expected START, got message type {kind}")
+
+            start = json.loads(payload.decode("utf-8"))
+            session = CallSession(
+                call_id=start.get("call_id", ""),
+                caller=start["caller"],
+                codec=start.get("codec", "pcmu"),
+                sample_rate=start.get("sample_rate", 8000),
+            )
+            self.sessions[session.call_id] = session
+            if self.logger:
+                self.logger.info(f"Ingress - call {session.call_id} from {session.caller} ({session.codec})")
+
+            call_task = asyncio.create_task(self.on_call(session, self.logger))
+
+            while not call_task.done():
+                kind, payload = await self._read_message(reader)
+                if kind == MSG_MEDIA:
+                    session.push_media(payload)
+                elif kind == MSG_STOP:
+                    break
+
+        except asyncio.IncompleteReadError:
+            pass  # gateway closed the connection - treat as hangup
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Ingress - connection error: {e}")
+        finally:
+            if session is not None:
+                session.hangup.set()
+                self.sessions.pop(session.call_id, None)
+                if self.logger:
+                    self.logger.info(
+                        f"Ingress - call {session.call_id} ended, {session.audio_seconds:.1f}s audio, "
+                        f"decode+resample {session.cpu_ratio * 100:.3f}% of a core"
+                    )
+            if call_task is not None and not call_task.done():
+                call_task.cancel()
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telephony media ingress")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9092)
+    args = parser.parse_args()
+
+    from logger import setup_logger
+
+    logger = setup_logger(suffix="ingress")
+    ingress = TelephonyIngress(host=args.host, port=args.port, logger=logger)
+    print(f"☎️  Telephony ingress listening on {args.host}:{args.port}")
+    try:
+        asyncio.run(ingress.serve_forever())
+    except KeyboardInterrupt:
+        print("\n⚠️  Ingress stopped")
+
+
+if __name__ == "__main__":
+    main()
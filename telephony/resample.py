@@ -0,0 +1,71 @@
+# telephony/resample.py
+
+"""
+Streaming polyphase resampler (rational up/down factor), vectorized with NumPy.
+
+Used to turn 8 kHz telephony audio into the 16 kHz PCM that STT expects.
+Filter state carries across frames, so 20 ms packets resample seamlessly.
+"""
+
+from math import gcd
+
+import numpy as np
+
+
+class PolyphaseResampler:
+    """
+    Args:
+        up: Interpolation factor (e.g. 2 for 8 kHz → 16 kHz)
+        down: Decimation factor
+        taps_per_phase: FIR length per polyphase branch (quality vs. cost)
+        beta: Kaiser window beta for the low-pass prototype
+    """
+
+    def __init__(self, up: int, down: int = 1, taps_per_phase: int = 16, beta: float = 8.0):
+        g = gcd(up, down)
+        self.up = up // g
+        self.down = down // g
+        self.taps = taps_per_phase
+
+        # Low-pass prototype at the upsampled rate, cutoff at the lower Nyquist
+        length = self.taps * self.up
+        cutoff = 1.0 / max(self.up, self.down)
+        t = np.arange(length) - (length - 1) / 2.0
+        prototype = cutoff * np.sinc(cutoff * t) * np.kaiser(length, beta) * self.up
+
+        # phases[p, i] = prototype[i * up + p]
+        self.phases = prototype.reshape(self.taps, self.up).T.astype(np.float32)
+        self._tap_offsets = np.arange(self.taps)
+
+        self.reset()
+
+    def reset(self):
+        self.history = np.zeros(self.taps - 1, dtype=np.float32)
+        self.consumed = 0    # input samples consumed so far
+        self.next_out = 0    # index of the next output sample
+
+    def process(self, samples: np.ndarray) -> np.ndarray:
+        """Resample one frame of int16 samples; returns int16 samples."""
+        if len(samples) == 0:
+            return np.zeros(0, dtype=np.int16)
+
+        extended = np.concatenate([self.history, samples.astype(np.float32)])
+        total_in = self.consumed + len(samples)
+
+        # Every output whose newest input sample is already available
+        last_out = (total_in * self.up - 1) // self.down
+        out_index = np.arange(self.next_out, last_out + 1)
+        position = out_index * self.down
+        newest = position // self.up
+        phase = position % self.up
+
+        # Row i holds the taps window for output i, newest sample first
+        base = newest - self.consumed + self.taps - 1
+        window = extended[base[:, None] - self._tap_offsets[None, :]]
+        output = np.einsum("ij,ij->i", window, self.phases[phase])
+
+        self.next_out = last_out + 1
+        self.consumed = total_in
+        self.history = extended[-(self.taps - 1):]
+
+        return np.clip(np.rint(output), -32768, 32767).astype(np.int16)
@@ -0,0 +1,11 @@
+# worker/__init__.py
+
+"""
+Multi-process call handling: a supervisor starts one worker process per
+core and dispatches each new call to the least-loaded worker.
+"""
+
+from .shared_index import SharedIndex, get_index
+from .supervisor import Supervisor
+
+__all__ = ['SharedIndex', 'Supervisor', 'get_index']
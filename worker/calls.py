@@ -0,0 +1,44 @@
+# worker/calls.py
+
+"""
+Call handlers a worker can run. A handler is an async function
+(call: dict, logger) and is passed to the supervisor as "module:function".
+"""
+
+
+async def run_live_call(call: dict, logger):
+    """Runs the real order flow for one call, resuming from its checkpoint when re-dispatched."""
+    from main import run_call
+    return await run_call(call["msisdn"], logger, call_id=call.get("checkpoint_id"), resume=call.get("resume", False))
+
+
+async def run_synthetic_call(call: dict, logger):
+    """
+    CPU + I/O shaped like a real call without any external service:
+    per turn, JSON-parse a stream of transcript messages, log, then wait
+    on simulated network/audio time. Used by benchmarks/worker_scaling.py.
+    """
+    import asyncio
+    import json
+
+    turns = call.get("turns", 5)
+    messages_per_turn = call.get("messages_per_turn", 400)
+    io_seconds = call.get("io_seconds", 0.05)
+
+    message = json.dumps({
+        "message": "AddTranscript",
+        "results": [
+            {"type": "word", "start_time": i * 0.3, "end_time": i * 0.3 + 0.25,
+             "alternatives": [{"content": "زنگر", "confidence": 0.93}]}
+            for i in range(8)
+        ],
+    })
+
+    for turn in range(turns):
+        words = 0
+        for _ in range(messages_per_turn):
+            words += len(json.loads(message)["results"])
+        if logger:
+            logger.debug(f"Synthetic call {call['call_id']} turn {turn + 1}: {words} words")
+        await asyncio.sleep(io_seconds)
+    return True
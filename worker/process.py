@@ -0,0 +1,147 @@
+# worker/process.py
+
+"""
+Worker process: one event loop running many concurrent calls.
+
+Messages in (inbox queue):   {"call_id", "msisdn", ...}, {"handoff_id", "status"} (desk replies) or None to stop
+Events out (events queue):   ("started" | "finished" | "metrics" | "handoff", worker_id, payload)
+"""
+
+import asyncio
+import importlib
+import os
+import queue
+import time
+
+from handoff.line import connect_supervisor
+from .shared_index import attach_indexes
+
+METRICS_INTERVAL = 1.0
+
+
+def load_handler(spec: str):
+    """Resolve "package.module:function" to the call handler coroutine function."""
+    module_name, func_name = spec.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+class CallWorker:
+
+    def __init__(self, worker_id: int, inbox, events, handler, handoffs=None, logger=None):
+        self.worker_id = worker_id
+        self.inbox = inbox
+        self.events = events
+        self.handler = handler
+        self.handoffs = handoffs   # SupervisorHandoffs - gets the desk's replies from the inbox
+        self.logger = logger
+        self.active = {}  # call_id -> task
+        self.completed = 0
+        self.failed = 0
+        self.total_call_seconds = 0.0
+        self.stopping = False
+
+    async def run(self):
+        from diagnostics import start_diagnostics
+
+        loop = asyncio.get_running_loop()
+        diagnostics = start_diagnostics(logger=self.logger)
+        metrics_task = asyncio.create_task(self._report_metrics())
+
+        while True:
+            # Blocking queue read runs in a thread so the loop keeps serving calls
+            message = await loop.run_in_executor(None, self.inbox.get)
+            if message is None:
+                break
+            if "handoff_id" in message:
+                self._on_handoff_reply(message)
+                continue
+            self.active[message["call_id"]] = asyncio.create_task(self._handle(message))
+
+        self.stopping = True
+        if self.active:
+            # Calls on hold for an agent still need the desk's replies to finish
+            replies = asyncio.create_task(self._read_handoff_replies())
+            await asyncio.gather(*self.active.values(), return_exceptions=True)
+            replies.cancel()
+        metrics_task.cancel()
+        self._send_metrics()
+        diagnostics.close()
+
+    def _on_handoff_reply(self, reply: dict):
+        if self.handoffs is not None:
+            self.handoffs.on_reply(reply)
+
+    async def _read_handoff_replies(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # Timed read: a thread parked in get() would hold up the loop's shutdown
+                message = await loop.run_in_executor(None, self.inbox.get, True, METRICS_INTERVAL)
+            except queue.Empty:
+                continue
+            if message is not None and "handoff_id" in message:
+                self._on_handoff_reply(message)
+
+    async def _handle(self, call: dict):
+        call_id = call["call_id"]
+        started = time.monotonic()
+        self.events.put(("started", self.worker_id, {"call_id": call_id}))
+        if self.logger:
+            self.logger.info(f"Worker {self.worker_id} - call {call_id} started ({call.get('msisdn')})")
+
+        outcome = "completed"
+        try:
+            await self.handler(call, self.logger)
+            self.completed += 1
+        except SystemExit:
+            # The flow still ends some calls with exit(); that ends the call, not the worker
+            self.completed += 1
+        except Exception as e:
+            outcome = "failed"
+            self.failed += 1
+            if self.logger:
+                self.logger.error(f"Worker {self.worker_id} - call {call_id} failed: {e}")
+        finally:
+            duration = time.monotonic() - started
+            self.total_call_seconds += duration
+            self.active.pop(call_id, None)
+            self.events.put(("finished", self.worker_id, {
+                "call_id": call_id, "outcome": outcome, "seconds": duration,
+            }))
+
+    async def _report_metrics(self):
+        while True:
+            await asyncio.sleep(METRICS_INTERVAL)
+            self._send_metrics()
+
+    def _send_metrics(self):
+        finished = self.completed + self.failed
+        self.events.put(("metrics", self.worker_id, {
+            "pid": os.getpid(),
+            "active": len(self.active),
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_call_seconds": self.total_call_seconds / finished if finished else 0.0,
+        }))
+
+
+def worker_main(worker_id: int, inbox, events, index_segments: dict, handler_spec: str):
+    """Process entry point."""
+    from logger import setup_logger
+
+    logger = setup_logger(suffix=f"worker-{worker_id}")
+    attach_indexes(index_segments)
+    # Handoffs go to the supervisor's desk - one agent roster for all workers
+    handoffs = connect_supervisor(worker_id, events)
+
+    # Each worker serves its own metrics on METRICS_PORT + 1 + worker_id
+    if os.getenv("METRICS_PORT"):
+        from metrics import start_metrics_server
+        start_metrics_server(int(os.getenv("METRICS_PORT")) + 1 + worker_id, logger=logger)
+    handler = load_handler(handler_spec)
+
+    worker = CallWorker(worker_id, inbox, events, handler, handoffs=handoffs, logger=logger)
+    try:
+        asyncio.run(worker.run())
+    except KeyboardInterrupt:
+        pass
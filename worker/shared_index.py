@@ -0,0 +1,141 @@
+# worker/shared_index.py
+
+"""
+Read-only key → JSON lookup tables in shared memory.
+
+The supervisor builds each index once (menu aliases) and
+workers attach by name, so N workers share one copy instead of each
+loading and parsing the data files.
+
+Layout (little endian):
+    header:  magic (4s) | entry count (uint32)
+    entries: key offset (uint32) | key length (uint16) | value offset (uint32) | value length (uint32)
+             sorted by key bytes
+    blob:    keys and UTF-8 JSON values
+"""
+
+import json
+import os
+import struct
+from multiprocessing import shared_memory
+
+MAGIC = b"VAIX"
+HEADER = struct.Struct("<4sI")
+ENTRY = struct.Struct("<IHII")
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+def normalize_key(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def encode_index(mapping: dict) -> bytes:
+    """Serialize {key: json-able value} into the index layout."""
+    items = sorted((normalize_key(k).encode("utf-8"), json.dumps(v, ensure_ascii=False).encode("utf-8"))
+                   for k, v in mapping.items())
+
+    blob = bytearray()
+    entries = bytearray()
+    blob_start = HEADER.size + ENTRY.size * len(items)
+    for key, value in items:
+        key_offset = blob_start + len(blob)
+        blob += key
+        value_offset = blob_start + len(blob)
+        blob += value
+        entries += ENTRY.pack(key_offset, len(key), value_offset, len(value))
+
+    return HEADER.pack(MAGIC, len(items)) + bytes(entries) + bytes(blob)
+
+
+class SharedIndex:
+    """
+    One index in a shared memory segment.
+    Create with SharedIndex.create() in the supervisor, SharedIndex.attach() in workers.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        self.buf = shm.buf
+        magic, self.count = HEADER.unpack_from(self.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory segment {shm.name} is not an index")
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @classmethod
+    def create(cls, mapping: dict):
+        data = encode_index(mapping)
+        shm = shared_memory.SharedMemory(create=True, size=len(data))
+        shm.buf[:len(data)] = data
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str):
+        # Workers are spawned and share the supervisor's resource tracker,
+        # so attaching doesn't hand ownership (or unlinking) to the worker
+        shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, owner=False)
+
+    def _key_at(self, i: int) -> bytes:
+        key_offset, key_len, _, _ = ENTRY.unpack_from(self.buf, HEADER.size + i * ENTRY.size)
+        return bytes(self.buf[key_offset:key_offset + key_len])
+
+    def get(self, key: str, default=None):
+        """Binary search for key; returns the decoded JSON value."""
+        target = normalize_key(key).encode("utf-8")
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key_at(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self._key_at(lo) == target:
+            _, _, value_offset, value_len = ENTRY.unpack_from(self.buf, HEADER.size + lo * ENTRY.size)
+            return json.loads(bytes(self.buf[value_offset:value_offset + value_len]).decode("utf-8"))
+        return default
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def build_menu_mapping(path: str = None) -> dict:
+    """Every item/extra alias (and name) → its menu record, tagged with its kind."""
+    with open(path or os.path.join(DATA_DIR, "menu.json"), encoding="utf-8") as f:
+        menu = json.load(f)
+
+    mapping = {}
+    for kind in ("items", "extras"):
+        for entry in menu.get(kind, []):
+            record = dict(entry, kind=kind[:-1])
+            for alias in [entry["name"], entry["id"], *entry.get("aliases", [])]:
+                mapping[alias] = record
+    return mapping
+
+
+# Indexes attached in this process (worker side): name → SharedIndex
+_attached = {}
+
+
+def attach_indexes(segment_names: dict):
+    """Called once in a worker with {"menu": shm_name}."""
+    for index_name, segment_name in segment_names.items():
+        _attached[index_name] = SharedIndex.attach(segment_name)
+
+
+def get_index(index_name: str):
+    """Returns the attached index, or None when running outside a worker."""
+    return _attached.get(index_name)
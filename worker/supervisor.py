@@ -0,0 +1,320 @@
+# worker/supervisor.py
+
+"""
+Supervisor + dispatcher for worker processes.
+
+- one worker process per core, each with its own event loop of calls
+- new calls go to the least-loaded live worker
+- crashed workers are restarted; their undelivered calls are re-dispatched and
+  the calls they were running resume from their last step checkpoint
+- per-worker metrics are collected from the shared events queue
+- the menu index is built once and shared via shared memory
+- the handoff desk (agent roster + waiting calls) lives here, so workers
+  share one pool of agents; workers send it their handoffs and it tells the
+  worker holding the caller when an agent takes the call
+
+    python -m worker.supervisor --workers 4 < msisdns.txt
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+import threading
+import time
+
+from handoff import HandoffDesk
+from .process import worker_main
+from .shared_index import SharedIndex, build_menu_mapping
+
+DEFAULT_HANDLER = "worker.calls:run_live_call"
+LIVENESS_INTERVAL = 0.5
+MAX_RESUMES = 2   # a call that keeps killing its worker is given up on
+
+
+class WorkerHandle:
+    """Supervisor-side view of one worker process."""
+
+    def __init__(self, worker_id: int):
+        self.worker_id = worker_id
+        self.process = None
+        self.inbox = None
+        self.calls = set()    # call ids dispatched and not yet finished
+        self.metrics = {}
+        self.restarts = 0
+
+    @property
+    def load(self) -> int:
+        return len(self.calls)
+
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+
+
+class Supervisor:
+
+    def __init__(self, num_workers: int = None, handler_spec: str = DEFAULT_HANDLER, desk: HandoffDesk = None,
+                 logger=None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.handler_spec = handler_spec
+        self.logger = logger
+        self.ctx = multiprocessing.get_context("spawn")
+        self.events = self.ctx.Queue()
+        self.workers = [WorkerHandle(i) for i in range(self.num_workers)]
+        self.indexes = {}
+        self.call_ids = itertools.count(1)
+        self.calls = {}        # call_id -> call dict (until finished)
+        self.finished = 0
+        self.resumed = 0
+        self.lost = 0
+        self.lock = threading.Lock()
+        self.running = False
+        self.stopping = False
+        self._monitor = None
+        self.desk = desk if desk is not None else HandoffDesk(logger=logger)
+        self.desk.on_assign = self._handoff_assigned
+        self.handoff_workers = {}   # handoff_id -> worker holding the caller
+
+    def start(self):
+        self.indexes = {
+            "menu": SharedIndex.create(build_menu_mapping()),
+        }
+        for handle in self.workers:
+            self._spawn(handle)
+
+        self.running = True
+        self._monitor = threading.Thread(target=self._monitor_loop, daemon=True)
+        self._monitor.start()
+
+        if self.logger:
+            self.logger.info(f"Supervisor - started {self.num_workers} workers")
+
+    def _spawn(self, handle: WorkerHandle):
+        handle.inbox = self.ctx.Queue()
+        handle.process = self.ctx.Process(
+            target=worker_main,
+            args=(
+                handle.worker_id,
+                handle.inbox,
+                self.events,
+                {name: index.name for name, index in self.indexes.items()},
+                self.handler_spec,
+            ),
+            name=f"voice-agent-worker-{handle.worker_id}",
+            daemon=True,
+        )
+        handle.process.start()
+
+    def dispatch(self, msisdn: str, **extra) -> int:
+        """Assigns a new call to the least-loaded live worker. Returns the call id."""
+        with self.lock:
+            call_id = next(self.call_ids)
+            call = dict(extra, call_id=call_id, msisdn=msisdn, checkpoint_id=f"{os.getpid()}-{call_id}", resumes=0)
+            self.calls[call_id] = call
+            self._assign(call)
+        return call_id
+
+    def _assign(self, call: dict):
+        alive = [h for h in self.workers if h.is_alive()] or self.workers
+        handle = min(alive, key=lambda h: h.load)
+        handle.calls.add(call["call_id"])
+        handle.inbox.put(call)
+
+    def _monitor_loop(self):
+        last_check = time.monotonic()
+        while self.running:
+            try:
+                kind, worker_id, payload = self.events.get(timeout=LIVENESS_INTERVAL)
+                self._on_event(kind, worker_id, payload)
+            except queue.Empty:
+                pass
+
+            if time.monotonic() - last_check >= LIVENESS_INTERVAL:
+                last_check = time.monotonic()
+                self._restart_crashed()
+
+    def _on_event(self, kind: str, worker_id: int, payload: dict):
+        handle = self.workers[worker_id]
+        with self.lock:
+            if kind == "finished":
+                handle.calls.discard(payload["call_id"])
+                self.calls.pop(payload["call_id"], None)
+                self.finished += 1
+            elif kind == "metrics":
+                handle.metrics = payload
+            elif kind == "handoff":
+                self._on_handoff(worker_id, payload)
+
+    def _on_handoff(self, worker_id: int, request: dict):
+        request = dict(request)
+        action = request.pop("action")
+        handoff_id = request["handoff_id"]
+        if action == "submit":
+            self.handoff_workers[handoff_id] = worker_id
+            self.desk.submit(**request)
+            self._handoff_reply(handoff_id, self.desk.status(handoff_id))
+        else:
+            # "complete" (agent leg over) or "abandon" (hung up on hold - or just as the agent was assigned)
+            self.handoff_workers.pop(handoff_id, None)
+            if action == "complete":
+                self.desk.complete(handoff_id)
+            else:
+                self.desk.abandon(handoff_id)
+
+    def _handoff_assigned(self, agent, payload, waited: float):
+        """Desk on_assign: tells the worker holding the caller to connect it to the agent."""
+        self._handoff_reply(payload.handoff_id, f"assigned:{agent.agent_id}")
+
+    def _handoff_reply(self, handoff_id, status: str):
+        worker_id = self.handoff_workers.get(handoff_id)
+        if worker_id is None:
+            return
+        handle = self.workers[worker_id]
+        if handle.is_alive():
+            handle.inbox.put({"handoff_id": handoff_id, "status": status})
+
+    def _drop_handoffs(self, worker_id: int):
+        """A worker died with its callers: take them off the queue first, then free their agents."""
+        handoff_ids = [h for h, w in self.handoff_workers.items() if w == worker_id]
+        for handoff_id in handoff_ids:
+            self.handoff_workers.pop(handoff_id)
+            self.desk.queue.cancel(handoff_id)
+        for handoff_id in handoff_ids:
+            self.desk.complete(handoff_id)
+
+    def _restart_crashed(self):
+        with self.lock:
+            for handle in self.workers:
+                if self.stopping or handle.is_alive():
+                    continue
+
+                # Calls still sitting in the dead worker's inbox were never started - hand them over.
+                # Calls it was running resume on another worker from their last checkpoint.
+                undelivered = []
+                while True:
+                    try:
+                        call = handle.inbox.get_nowait()
+                    except (queue.Empty, OSError, ValueError):
+                        break
+                    if call is not None and "call_id" in call:   # skip handoff replies
+                        undelivered.append(call)
+
+                undelivered_ids = {call["call_id"] for call in undelivered}
+                resume, lost = [], []
+                for call_id in handle.calls:
+                    call = self.calls.get(call_id)
+                    if call_id in undelivered_ids or call is None:
+                        continue
+                    if call["resumes"] < MAX_RESUMES:
+                        call["resumes"] += 1
+                        call["resume"] = True
+                        resume.append(call)
+                    else:
+                        lost.append(call_id)
+                self.resumed += len(resume)
+                self.lost += len(lost)
+                for call_id in lost:
+                    self.calls.pop(call_id, None)
+                handle.calls.clear()
+
+                exitcode = handle.process.exitcode if handle.process else None
+                if self.logger:
+                    self.logger.error(
+                        f"Supervisor - worker {handle.worker_id} died (exit {exitcode}), "
+                        f"restarting; {len(resume)} calls resuming, {len(lost)} lost, "
+                        f"{len(undelivered)} re-dispatched"
+                    )
+
+                self._drop_handoffs(handle.worker_id)
+                handle.restarts += 1
+                self._spawn(handle)
+                for call in undelivered + resume:
+                    self._assign(call)
+
+    def metrics(self) -> dict:
+        with self.lock:
+            return {
+                "workers": {
+                    handle.worker_id: dict(
+                        handle.metrics,
+                        alive=handle.is_alive(),
+                        load=handle.load,
+                        restarts=handle.restarts,
+                    )
+                    for handle in self.workers
+                },
+                "active_calls": len(self.calls),
+                "finished_calls": self.finished,
+                "resumed_calls": self.resumed,
+                "lost_calls": self.lost,
+                "handoffs": self.desk.stats(),
+            }
+
+    def wait_idle(self, timeout: float = None) -> bool:
+        """Blocks until every dispatched call has finished (or was lost)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self.lock:
+                if not self.calls:
+                    return True
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def stop(self, timeout: float = 5.0):
+        self.stopping = True
+        for handle in self.workers:
+            if handle.is_alive():
+                handle.inbox.put(None)
+        for handle in self.workers:
+            if handle.process is not None:
+                handle.process.join(timeout)
+                if handle.process.is_alive():
+                    handle.process.terminate()
+
+        # Drain the last metrics before shutting the monitor down
+        time.sleep(LIVENESS_INTERVAL)
+        self.running = False
+        if self._monitor is not None:
+            self._monitor.join(timeout)
+
+        for index in self.indexes.values():
+            index.close()
+        self.indexes = {}
+
+        if self.logger:
+            self.logger.info(f"Supervisor - stopped, metrics: {self.metrics()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run voice agent worker processes")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: one per core)")
+    parser.add_argument("--handler", default=DEFAULT_HANDLER, help="Call handler as module:function")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from logger import setup_logger
+
+    logger = setup_logger(suffix="supervisor")
+    supervisor = Supervisor(num_workers=args.workers, handler_spec=args.handler, logger=logger)
+    supervisor.start()
+    print(f"🧵 Supervisor running {supervisor.num_workers} workers - one msisdn per line on stdin")
+
+    try:
+        for line in sys.stdin:
+            msisdn = line.strip()
+            if msisdn:
+                call_id = supervisor.dispatch(msisdn)
+                print(f"📞 Call {call_id} ({msisdn}) dispatched")
+        supervisor.wait_idle()
+    except KeyboardInterrupt:
+        print("\n⚠️  Supervisor interrupted")
+    finally:
+        supervisor.stop()
+        print(f"📊 {supervisor.metrics()}")
+
+
+if __name__ == "__main__":
+    main()